@@ -0,0 +1,289 @@
+"""
+Scalp Archive Writer - 시간별 JSONL 아카이브 배치 기록기
+
+ScalpCollector가 틱마다 수행하던 mkdir/open/flush를 대체한다.
+
+Key Responsibilities:
+- 현재 시간대 파일(YYYYMMDD_HH.jsonl) 핸들을 유지하고 정각에만 교체
+- 틱을 메모리 큐에 모아 flush_interval_ms 주기(또는 max_batch_records 도달 시)로 일괄 write
+- 내구성 정책: fsync_interval_ms 마다 또는 fsync_every_records 레코드 마다 fsync (0이면 비활성)
+- 큐 깊이 / 쓰기 지연을 performance_metrics로 노출
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, IO, List, Optional, Tuple
+
+from observer.performance_metrics import get_metrics
+
+log = logging.getLogger("ScalpArchiveWriter")
+
+
+@dataclass(frozen=True)
+class ArchiveWriterConfig:
+    """Configuration for batched scalp archive writes."""
+    flush_interval_ms: float = 200.0    # 최대 코얼레싱 지연 (bounded interval)
+    max_batch_records: int = 1000       # 큐가 이 크기에 도달하면 즉시 flush
+    max_queue_size: int = 100000        # 안전 한도 (초과 시 드롭)
+    fsync_interval_ms: float = 1000.0   # N ms 마다 fsync (0 = 비활성)
+    fsync_every_records: int = 0        # N 레코드 마다 fsync (0 = 비활성)
+    write_buffer_bytes: int = 1 << 16   # 파일 핸들 버퍼 크기
+
+
+class ScalpArchiveWriter:
+    """
+    Hourly-partitioned JSONL writer with a single background flush thread.
+
+    Producers (WebSocket callback) only append to an in-memory queue; the flush
+    thread owns the open file handle, serializes records and applies the fsync
+    policy. Records are routed by the hour key supplied at write time, so a tick
+    received at 10:59:59 still lands in ``..._10.jsonl`` even if it is flushed
+    after the hour boundary.
+    """
+
+    def __init__(self, base_dir: Path, config: Optional[ArchiveWriterConfig] = None) -> None:
+        self._base_dir = Path(base_dir)
+        self._cfg = config or ArchiveWriterConfig()
+
+        self._queue: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        # Flush-thread owned file state
+        self._io_lock = threading.Lock()
+        self._current_hour: Optional[str] = None
+        self._file: Optional[IO[str]] = None
+        self._records_since_fsync = 0
+        self._last_fsync = time.monotonic()
+
+        # 통계
+        self._total_written = 0
+        self._total_dropped = 0
+        self._total_failed = 0  # 큐에서 꺼냈지만 기록하지 못한 레코드 (OSError / 직렬화 실패)
+        self._total_batches = 0
+        self._total_fsyncs = 0
+        self._last_write_ms = 0.0
+
+    # -----------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------
+    def start(self) -> None:
+        """Start the background flush thread."""
+        if self._running:
+            return
+        self._running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._flush_loop,
+            name="ScalpArchiveFlush",
+            daemon=True,
+        )
+        self._thread.start()
+        log.info(
+            "Scalp archive writer started (dir=%s, flush_ms=%.0f, fsync_ms=%.0f, fsync_records=%d)",
+            self._base_dir, self._cfg.flush_interval_ms,
+            self._cfg.fsync_interval_ms, self._cfg.fsync_every_records,
+        )
+
+    def stop(self) -> None:
+        """Stop the flush thread, drain the queue and close the current file."""
+        if self._running:
+            self._running = False
+            self._stop_event.set()
+            self._wakeup.set()
+            if self._thread and self._thread.is_alive():
+                self._thread.join(timeout=5.0)
+        self.flush()
+        with self._io_lock:
+            self._close_current(fsync=True)
+        log.info(
+            "Scalp archive writer stopped (written=%d, dropped=%d, failed=%d, batches=%d)",
+            self._total_written, self._total_dropped, self._total_failed, self._total_batches,
+        )
+
+    # -----------------------------------------------------
+    # Producer API
+    # -----------------------------------------------------
+    def write(self, record: Dict[str, Any], hour_str: str) -> bool:
+        """
+        Enqueue a record for the given hour partition (non-blocking).
+
+        Args:
+            record: JSON-serializable scalp record
+            hour_str: Partition key in ``YYYYMMDD_HH`` format
+
+        Returns:
+            False if the record was dropped because the queue is full
+        """
+        with self._lock:
+            if len(self._queue) >= self._cfg.max_queue_size:
+                self._total_dropped += 1
+                return False
+            self._queue.append((hour_str, record))
+            depth = len(self._queue)
+
+        if depth >= self._cfg.max_batch_records:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> int:
+        """Synchronously drain the queue. Returns the number of records written."""
+        with self._io_lock:
+            return self._drain()
+
+    # -----------------------------------------------------
+    # Flush thread
+    # -----------------------------------------------------
+    def _flush_loop(self) -> None:
+        interval = self._cfg.flush_interval_ms / 1000.0
+        while not self._stop_event.is_set():
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            try:
+                with self._io_lock:
+                    self._drain()
+            except Exception:
+                log.exception("Error in scalp archive flush loop")
+                time.sleep(1.0)  # Back off on error
+
+    def _drain(self) -> int:
+        """Write all queued records (caller holds ``_io_lock``)."""
+        with self._lock:
+            if not self._queue:
+                return 0
+            batch = self._queue
+            self._queue = deque()
+
+        metrics = get_metrics()
+        start = time.perf_counter()
+        written = 0
+        failed = 0
+        lines: List[str] = []
+        hour: Optional[str] = None
+        for hour_str, record in batch:
+            if hour_str != hour and lines:
+                written, failed = self._write_group(hour, lines, written, failed)
+                lines = []
+            hour = hour_str
+            try:
+                lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+            except (TypeError, ValueError) as e:
+                log.error("Scalp archive record not serializable (dropped): %s", e)
+                failed += 1
+        if lines:
+            written, failed = self._write_group(hour, lines, written, failed)
+
+        try:
+            self._maybe_fsync()
+        except OSError as e:
+            log.error("Scalp archive fsync failed (hour=%s): %s", self._current_hour, e)
+            self._close_current(fsync=False)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._last_write_ms = elapsed_ms
+        self._total_written += written
+        self._total_failed += failed
+        self._total_batches += 1
+
+        metrics.record_timing("scalp_archive_write", elapsed_ms)
+        metrics.increment_counter("scalp_archive_records_written", written)
+        if failed:
+            metrics.increment_counter("scalp_archive_records_failed", failed)
+        metrics.set_gauge("scalp_archive_queue_depth", self.queue_depth)
+        return written
+
+    def _write_group(self, hour_str: str, lines: List[str], written: int, failed: int) -> Tuple[int, int]:
+        """한 시간대 묶음 기록. OSError 면 묶음을 실패로 집계하고 핸들을 닫아 다음 기록 때 다시 연다"""
+        try:
+            return written + self._write_lines(hour_str, lines), failed
+        except OSError as e:
+            log.error("Scalp archive write failed (hour=%s, %d records dropped): %s", hour_str, len(lines), e)
+            self._close_current(fsync=False)
+            return written, failed + len(lines)
+
+    def _write_lines(self, hour_str: str, lines: List[str]) -> int:
+        f = self._file_for_hour(hour_str)
+        f.write("".join(lines))
+        f.flush()
+        self._records_since_fsync += len(lines)
+        return len(lines)
+
+    def _file_for_hour(self, hour_str: str) -> IO[str]:
+        """Return the open handle for ``hour_str``, swapping files at the hour boundary."""
+        if self._file is not None and hour_str == self._current_hour:
+            return self._file
+
+        self._close_current(fsync=True)
+        self._base_dir.mkdir(parents=True, exist_ok=True)
+        path = self._base_dir / f"{hour_str}.jsonl"
+        self._file = open(path, "a", encoding="utf-8", buffering=self._cfg.write_buffer_bytes)
+        self._current_hour = hour_str
+        log.info("Scalp archive file opened: %s", path)
+        return self._file
+
+    def _close_current(self, fsync: bool) -> None:
+        if self._file is None:
+            return
+        try:
+            self._file.flush()
+            if fsync:
+                os.fsync(self._file.fileno())
+                self._total_fsyncs += 1
+            self._file.close()
+        except OSError as e:
+            log.error("Failed to close scalp archive file (hour=%s): %s", self._current_hour, e)
+        finally:
+            self._file = None
+            self._current_hour = None
+            self._records_since_fsync = 0
+            self._last_fsync = time.monotonic()
+
+    def _maybe_fsync(self) -> None:
+        if self._file is None or self._records_since_fsync == 0:
+            return
+        now = time.monotonic()
+        by_records = (
+            self._cfg.fsync_every_records > 0
+            and self._records_since_fsync >= self._cfg.fsync_every_records
+        )
+        by_time = (
+            self._cfg.fsync_interval_ms > 0
+            and (now - self._last_fsync) * 1000 >= self._cfg.fsync_interval_ms
+        )
+        if by_records or by_time:
+            os.fsync(self._file.fileno())
+            self._total_fsyncs += 1
+            self._records_since_fsync = 0
+            self._last_fsync = now
+
+    # -----------------------------------------------------
+    # Stats
+    # -----------------------------------------------------
+    @property
+    def queue_depth(self) -> int:
+        with self._lock:
+            return len(self._queue)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """통계 정보 반환"""
+        return {
+            "queue_depth": self.queue_depth,
+            "total_written": self._total_written,
+            "total_dropped": self._total_dropped,
+            "total_failed": self._total_failed,
+            "total_batches": self._total_batches,
+            "total_fsyncs": self._total_fsyncs,
+            "last_write_ms": self._last_write_ms,
+            "current_hour": self._current_hour,
+        }
@@ -3,6 +3,8 @@ Scalp Collector - Real-time WebSocket data collection for 41 slots
 
 Key Responsibilities (swing 독립형):
 - swing 데이터 없이도 자체 부트스트랩 심볼로 즉시 구독
+- SnapshotChannel 연결 시 Track A 스윕 batch → TriggerEngine → SlotManager 실시간 반영
+- 구독 종목의 체결 tick → TickTriggerDetector → SlotManager (dwell 창 안의 교체 판단)
 - 41개 슬롯(WebSocket) 동적 관리 (SlotManager)
 - 실시간 2Hz 체결 데이터 수집 및 스캘프 로그 저장
 - data/assets/scalp/YYYYMMDD_HH.jsonl 로깅
@@ -10,24 +12,26 @@ Key Responsibilities (swing 독립형):
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import os
 from dataclasses import dataclass, field
 from datetime import datetime, date, time, timedelta
-from typing import List, Dict, Any, Optional, Callable
-from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 from zoneinfo import ZoneInfo
 
 from shared.time_helpers import TimeAwareMixin
 from shared.trading_hours import in_trading_hours
 
 from provider import ProviderEngine
-from trigger.trigger_engine import TriggerEngine
+from trigger.trigger_engine import PriceSnapshot, TriggerEngine
+from trigger.snapshot_channel import SnapshotChannel
+from trigger.tick_trigger import TickTriggerConfig, TickTriggerDetector
 from slot.slot_manager import SlotManager, SlotCandidate
 from slot.slot_manager import SlotManager, SlotCandidate
 from observer.paths import observer_asset_dir, observer_log_dir
-from db.realtime_writer import RealtimeDBWriter
+from db.realtime_writer import BatchedRealtimeDBWriter
+from db.ingest_queue import ScalpTickIngestQueue
+from collector.scalp_archive_writer import ScalpArchiveWriter, ArchiveWriterConfig
 
 from observer.paths import env_file_path
 
@@ -40,7 +44,7 @@ class ScalpConfig:
     market: str = "kr_stocks"
     session_id: str = "track_b_session"
     mode: str = "PROD"
-    max_slots: int = 41  # KIS WebSocket limit
+    max_slots: int = 41  # KIS WebSocket limit per connection (KIS_WS_CONNECTIONS 로 N x 41 까지 확장 가능)
     min_dwell_seconds: int = 120  # 2 minutes minimum slot occupancy
     daily_log_subdir: str = "scalp"  # under config/{subdir}
     trading_start: time = time(9, 30)  # scalp starts 30min after market open
@@ -50,6 +54,19 @@ class ScalpConfig:
         default_factory=lambda: ["005930", "000660", "373220", "051910", "068270", "035720"]
     )
     bootstrap_priority: float = 0.95
+    # Tick-level trigger (WebSocket 체결 → TickTriggerDetector → SlotManager)
+    tick_trigger_enabled: bool = True
+    tick_trigger_flush_ms: float = 500.0  # 후보를 모아 슬롯 / 구독에 반영하는 간격
+    # JSONL 아카이브 배치 기록 (ScalpArchiveWriter)
+    archive_flush_interval_ms: float = 200.0
+    archive_fsync_interval_ms: float = 1000.0  # 0 = 비활성
+    archive_fsync_every_records: int = 0       # 0 = 비활성
+    # DB 적재 큐 (ScalpTickIngestQueue → BatchedRealtimeDBWriter COPY)
+    db_queue_maxsize: int = 10000
+    db_overflow_policy: str = "drop_oldest"  # drop_oldest | spill | block
+    db_spill_subdir: str = "scalp_db_spill"  # under observer asset dir
+    db_batch_size: int = 100
+    db_flush_interval_ms: float = 500.0
 
 
 class ScalpCollector(TimeAwareMixin):
@@ -69,14 +86,23 @@ class ScalpCollector(TimeAwareMixin):
         trigger_engine: Optional[TriggerEngine] = None,
         config: Optional[ScalpConfig] = None,
         on_error: Optional[Callable[[str], None]] = None,
+        snapshot_channel: Optional[SnapshotChannel] = None,
     ) -> None:
         self.engine = engine
         self.trigger_engine = trigger_engine or TriggerEngine()
+        # Track A → Track B hand-off (SwingCollector 가 publish, 다른 스레드/loop 여도 됨)
+        self._snapshot_channel = snapshot_channel
+        self._trigger_task: Optional[asyncio.Task] = None
+        self._debug_mode = False
         self.cfg = config or ScalpConfig()
         self._tz_name = self.cfg.tz_name
         self._init_timezone()
 
-        # Slot manager for 41 WebSocket subscriptions
+        # Slot manager for 41 WebSocket subscriptions (x connections in the WS pool)
+        ws_capacity = getattr(engine, "max_ws_slots", None)
+        if isinstance(ws_capacity, int) and self.cfg.max_slots > ws_capacity:
+            log.warning(f"max_slots={self.cfg.max_slots} exceeds WebSocket capacity {ws_capacity}; clamping")
+            self.cfg.max_slots = ws_capacity
         self.slot_manager = SlotManager(
             max_slots=self.cfg.max_slots,
             min_dwell_seconds=self.cfg.min_dwell_seconds
@@ -87,9 +113,36 @@ class ScalpCollector(TimeAwareMixin):
         self._on_error = on_error
         self._running = False
         self._subscribed_symbols: Dict[str, int] = {}  # symbol -> slot_id
+
+        # Tick-level trigger: 후보는 종목별 최고 우선순위만 모아 flush 간격마다 반영
+        self.tick_detector: Optional[TickTriggerDetector] = None
+        if self.cfg.tick_trigger_enabled:
+            self.tick_detector = TickTriggerDetector(TickTriggerConfig(), on_candidate=self._on_tick_candidate)
+        self._tick_candidates: Dict[str, SlotCandidate] = {}
+        self._tick_flush_task: Optional[asyncio.Task] = None
         
-        # DB 실시간 저장
-        self._db_writer = RealtimeDBWriter()
+        # JSONL 아카이브: 시간별 파일 핸들 유지 + 배치 기록
+        self._archive_writer = ScalpArchiveWriter(
+            observer_asset_dir() / self.cfg.daily_log_subdir,
+            ArchiveWriterConfig(
+                flush_interval_ms=self.cfg.archive_flush_interval_ms,
+                fsync_interval_ms=self.cfg.archive_fsync_interval_ms,
+                fsync_every_records=self.cfg.archive_fsync_every_records,
+            ),
+        )
+
+        # DB 실시간 저장: bounded queue → 단일 소비자 → COPY 배치
+        self._db_writer = BatchedRealtimeDBWriter(
+            batch_size=self.cfg.db_batch_size,
+            flush_interval_ms=self.cfg.db_flush_interval_ms,
+        )
+        self._db_queue = ScalpTickIngestQueue(
+            self._db_writer,
+            session_id=self.cfg.session_id,
+            maxsize=self.cfg.db_queue_maxsize,
+            policy=self.cfg.db_overflow_policy,
+            spill_dir=observer_asset_dir() / self.cfg.db_spill_subdir,
+        )
         
         self._setup_logger()
 
@@ -133,16 +186,20 @@ class ScalpCollector(TimeAwareMixin):
         """
         log.info("ScalpCollector started (max_slots=%d)", self.cfg.max_slots)
         self._running = True
+        self._archive_writer.start()
 
         # DB 연결 초기화
         db_connected = await self._db_writer.connect()
         if db_connected:
+            self._db_writer.start()
+            self._db_queue.start()
             log.info("✅ DB 연결 성공 - 실시간 저장 활성화")
         else:
             log.warning("⚠️ DB 연결 실패 - JSONL 파일만 저장됩니다")
 
         # Debug mode: bypass trading hours check for testing
         debug_mode = os.environ.get("TRACK_B_DEBUG", "").lower() in ("1", "true", "yes")
+        self._debug_mode = debug_mode
         if debug_mode:
             log.info("⚠️ 디버그 모드 활성화 - 장중 체크 우회")
 
@@ -156,6 +213,10 @@ class ScalpCollector(TimeAwareMixin):
         await self._start_websocket()
         log.info("✅ WebSocket 연결 완료")
 
+        # Track A snapshot 소비자 (bootstrap 주기와 별개로 batch 도착 즉시 반영)
+        if self._snapshot_channel is not None:
+            self._trigger_task = asyncio.create_task(self._consume_snapshots(), name="scalp-trigger-feed")
+
         try:
             while self._running:
                 now = self._now()
@@ -186,7 +247,21 @@ class ScalpCollector(TimeAwareMixin):
             if self._on_error:
                 self._on_error(str(e))
         finally:
+            if self._trigger_task is not None:
+                self._trigger_task.cancel()
+                try:
+                    await self._trigger_task
+                except asyncio.CancelledError:
+                    pass
+                self._trigger_task = None
+            if self._tick_flush_task is not None:
+                self._tick_flush_task.cancel()
+                self._tick_flush_task = None
             await self._stop_websocket()
+            self._archive_writer.stop()
+            if self._db_writer.is_connected:
+                await self._db_queue.stop()
+                await self._db_writer.close()
     
     def stop(self) -> None:
         """Stop the collector"""
@@ -203,7 +278,7 @@ class ScalpCollector(TimeAwareMixin):
         Process:
         1. 부트스트랩 심볼 리스트로 SlotCandidate 생성
         2. SlotManager에 할당/교체/오버플로우 기록
-        3. WebSocket 구독/해지 관리
+        3. 슬롯 목표 상태로 WebSocket 구독/해지 일괄 반영 (_sync_subscriptions)
         """
         try:
             candidates = self._generate_bootstrap_candidates()
@@ -214,27 +289,98 @@ class ScalpCollector(TimeAwareMixin):
 
             log.info(f"🎯 Generated {len(candidates)} bootstrap candidates (swing independent mode)")
 
-            for candidate in candidates:
-                result = self.slot_manager.assign_slot(candidate)
+            self._assign_candidates(candidates)
+            await self._sync_subscriptions()
+
+        except Exception as e:
+            log.error(f"Error checking triggers: {e}")
 
-                if result.success:
-                    log.info(
-                        f"✅ Slot {result.slot_id}: {candidate.symbol} "
-                        f"(priority={candidate.priority_score:.2f}, "
-                        f"trigger={candidate.trigger_type})"
-                    )
+    def _assign_candidates(self, candidates: List[SlotCandidate]) -> None:
+        """SlotManager 에 한 라운드 할당 + 결과 로그"""
+        results = self.slot_manager.assign_many(candidates, now=self._now())
+        for candidate, result in zip(candidates, results):
+            if result.success:
+                if result.reason == "already_allocated":
+                    continue
+                log.info(
+                    f"✅ Slot {result.slot_id}: {candidate.symbol} "
+                    f"(priority={candidate.priority_score:.2f}, "
+                    f"trigger={candidate.trigger_type})"
+                )
+                if result.replaced_symbol:
+                    log.info(f"🔄 Replaced {result.replaced_symbol} with {candidate.symbol}")
 
-                    await self._subscribe_symbol(candidate.symbol, result.slot_id)
+            elif result.overflow:
+                log.warning(f"⚠️ Overflow: {candidate.symbol} (priority={candidate.priority_score:.2f})")
 
-                    if result.replaced_symbol:
-                        await self._unsubscribe_symbol(result.replaced_symbol)
-                        log.info(f"🔄 Replaced {result.replaced_symbol} with {candidate.symbol}")
+    async def _consume_snapshots(self) -> None:
+        """SnapshotChannel → _apply_snapshots (채널의 max_latency 내에 shard 묶음 단위로 전달)"""
+        while self._running:
+            try:
+                snapshots = await self._snapshot_channel.next_batch(
+                    timeout=self.cfg.trigger_check_interval_seconds
+                )
+                if snapshots:
+                    await self._apply_snapshots(snapshots)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"Error applying Track A snapshots: {e}", exc_info=True)
 
-                elif result.overflow:
-                    log.warning(f"⚠️ Overflow: {candidate.symbol} (priority={candidate.priority_score:.2f})")
+    async def _apply_snapshots(self, snapshots: List[PriceSnapshot]) -> None:
+        """
+        Track A snapshot 묶음 → TriggerEngine.update → SlotManager → 구독 reconcile.
 
+        장 시작 전(scalp 시간 외)에도 TriggerEngine 히스토리는 계속 쌓고, 슬롯 반영만 건너뛴다.
+        """
+        now = self._now()
+        triggered = self.trigger_engine.update(snapshots, now=now)
+        if not triggered:
+            return
+        if not self._debug_mode and not in_trading_hours(now, self.cfg.trading_start, self.cfg.trading_end):
+            log.debug("%d trigger candidates outside scalp hours - history only", len(triggered))
+            return
+
+        candidates = [
+            SlotCandidate(
+                symbol=c.symbol,
+                trigger_type=c.trigger_type,
+                priority_score=c.priority_score,
+                detected_at=c.detected_at,
+            )
+            for c in triggered
+        ]
+        log.info(f"🎯 {len(candidates)} trigger candidates from {len(snapshots)} Track A snapshots")
+        self._assign_candidates(candidates)
+        await self._sync_subscriptions()
+
+    def _on_tick_candidate(self, candidate: SlotCandidate) -> None:
+        """TickTriggerDetector 콜백 (WebSocket 수신 루프에서 동기 호출)"""
+        current = self._tick_candidates.get(candidate.symbol)
+        if current is None or candidate.priority_score > current.priority_score:
+            self._tick_candidates[candidate.symbol] = candidate
+        if self._tick_flush_task is None or self._tick_flush_task.done():
+            try:
+                self._tick_flush_task = asyncio.get_running_loop().create_task(self._flush_tick_candidates())
+            except RuntimeError:
+                # event loop 밖 (테스트 / 동기 호출) → 다음 flush 때 반영
+                pass
+
+    async def _flush_tick_candidates(self) -> None:
+        """tick_trigger_flush_ms 동안 모은 tick 후보 → SlotManager → 구독 reconcile"""
+        await asyncio.sleep(self.cfg.tick_trigger_flush_ms / 1000.0)
+        candidates = list(self._tick_candidates.values())
+        self._tick_candidates.clear()
+        if not candidates:
+            return
+        if not self._debug_mode and not in_trading_hours(self._now(), self.cfg.trading_start, self.cfg.trading_end):
+            return
+        try:
+            log.info(f"⚡ {len(candidates)} tick-level trigger candidates")
+            self._assign_candidates(candidates)
+            await self._sync_subscriptions()
         except Exception as e:
-            log.error(f"Error checking triggers: {e}")
+            log.error(f"Error applying tick trigger candidates: {e}", exc_info=True)
 
     def _generate_bootstrap_candidates(self) -> List[SlotCandidate]:
         """부트스트랩 심볼 기반 SlotCandidate 생성 (swing 의존성 제거)."""
@@ -284,8 +430,12 @@ class ScalpCollector(TimeAwareMixin):
         """Register callback for WebSocket price updates"""
         callback_count = [0]  # Mutable counter to track callback invocations
         
-        def on_price_update(data: Dict[str, Any]) -> None:
-            """Handle real-time price updates from WebSocket"""
+        def on_price_update(data: Dict[str, Any]) -> Optional[Awaitable[None]]:
+            """Handle real-time price updates from WebSocket.
+
+            Returns an awaitable only when the DB queue applies backpressure
+            (block policy); the WebSocket provider awaits it before reading on.
+            """
             try:
                 callback_count[0] += 1
                 symbol = data.get('symbol', 'UNKNOWN')
@@ -300,14 +450,48 @@ class ScalpCollector(TimeAwareMixin):
                 if callback_count[0] % 100 == 1:
                     log.info(f"📊 Price update callback #{callback_count[0]}: {symbol}")
                 
-                self._log_scalp_data(data)
+                return self._log_scalp_data(data)
             except Exception as e:
                 log.error(f"Error handling price update: {e}", exc_info=True)
+            return None
         
         # Set callback on provider engine
         self.engine.on_price_update = on_price_update
+        # Compact ticks → tick-level trigger detector (on_price_update 보다 먼저 호출됨)
+        if self.tick_detector is not None and hasattr(self.engine, "on_tick"):
+            self.engine.on_tick = self.tick_detector.on_tick
         log.info("✅ Price update callback registered - ready to receive WebSocket data")
     
+    async def _sync_subscriptions(self) -> None:
+        """
+        SlotManager 할당 상태(목표)와 현재 구독을 diff 하여 한 번에 반영.
+
+        engine.reconcile_subscriptions 가 해지 → 구독 프레임을 ack 대기 없이 연속 전송한다.
+        지원하지 않는 engine 은 종목별 subscribe/unsubscribe 로 처리.
+        """
+        desired = self.slot_manager.allocated_symbols()
+        if not hasattr(self.engine, "reconcile_subscriptions"):
+            for symbol in [s for s in self._subscribed_symbols if s not in desired]:
+                await self._unsubscribe_symbol(symbol)
+            for symbol, slot_id in desired.items():
+                await self._subscribe_symbol(symbol, slot_id)
+            return
+        try:
+            result = await self.engine.reconcile_subscriptions(list(desired))
+        except Exception as e:
+            log.error(f"Failed to reconcile subscriptions: {e}", exc_info=True)
+            return
+        subscribed = getattr(getattr(self.engine, "ws", None), "subscribed_symbols", None)
+        if subscribed is None:
+            subscribed = desired
+        previous = self._subscribed_symbols
+        self._subscribed_symbols = {s: desired[s] for s in desired if s in subscribed}
+        if self.tick_detector is not None:
+            for symbol in previous.keys() - self._subscribed_symbols.keys():
+                self.tick_detector.forget(symbol)
+        if result.get("subscribed") or result.get("unsubscribed"):
+            log.info(f"📡 Subscriptions synced: {result} (active={len(self._subscribed_symbols)})")
+
     async def _subscribe_symbol(self, symbol: str, slot_id: int) -> None:
         """Subscribe to a symbol via WebSocket"""
         try:
@@ -335,6 +519,8 @@ class ScalpCollector(TimeAwareMixin):
             success = await self.engine.unsubscribe(symbol)
             if success:
                 del self._subscribed_symbols[symbol]
+                if self.tick_detector is not None:
+                    self.tick_detector.forget(symbol)
                 log.info(f"📴 Unsubscribed: {symbol}")
             else:
                 log.warning(f"Failed to unsubscribe {symbol}: returned False")
@@ -345,12 +531,15 @@ class ScalpCollector(TimeAwareMixin):
     # -----------------------------------------------------
     # Data Logging
     # -----------------------------------------------------
-    def _log_scalp_data(self, data: Dict[str, Any]) -> None:
+    def _log_scalp_data(self, data: Dict[str, Any]) -> Optional[Awaitable[None]]:
         """
         Log real-time scalp data to JSONL file and DB.
         
         File: data/assets/scalp/YYYYMMDD_HH.jsonl (시간별 로테이션)
-        DB: scalp_ticks 테이블
+        DB: scalp_ticks 테이블 (ScalpTickIngestQueue 경유 COPY 배치)
+
+        Returns:
+            block 정책에서 DB 큐가 가득 찬 경우 await 해야 하는 코루틴, 그 외 None
         
         Enhanced record format includes execution time, bid/ask, and volume details
         for scalp strategy analysis.
@@ -358,18 +547,11 @@ class ScalpCollector(TimeAwareMixin):
         Handles both H0STCNT0 format (volume=dict, bid_ask=dict) and JSON body format
         (volume=int, bid_price/ask_price at top level).
         """
-        log_file: Optional[Path] = None
         try:
             now = self._now()
+            # Scalp log partition: data/assets/scalp/YYYYMMDD_HH.jsonl (시간별 로테이션)
             hour_str = now.strftime("%Y%m%d_%H")
             
-            # Scalp log path: data/assets/scalp/YYYYMMDD_HH.jsonl (시간별 로테이션)
-            base_dir = observer_asset_dir()
-            log_dir = base_dir / self.cfg.daily_log_subdir
-            log_dir.mkdir(parents=True, exist_ok=True)
-            
-            log_file = log_dir / f"{hour_str}.jsonl"
-            
             # Format compatibility: volume may be dict (H0STCNT0) or int (JSON body)
             vol = data.get("volume")
             if isinstance(vol, dict):
@@ -410,38 +592,26 @@ class ScalpCollector(TimeAwareMixin):
                 "session_id": self.cfg.session_id
             }
             
-            # 1) 아카이브: 먼저 JSONL에 기록
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(record, ensure_ascii=False) + "\n")
-                f.flush()  # Force flush to disk
+            # 1) 아카이브: JSONL 배치 기록기 큐에 적재 (파일 핸들/fsync는 writer가 관리)
+            if not self._archive_writer.write(record, hour_str):
+                log.warning("Scalp archive queue full - record dropped: %s", record["symbol"])
 
-            # 2) DB 쓰기는 선택적(best-effort). 실패 시 예외 전파하지 않고 done_callback에서 로그만
+            # 2) DB 쓰기는 선택적(best-effort). bounded queue에 적재, 단일 소비자가 COPY 배치로 저장
+            pending: Optional[Awaitable[None]] = None
             if self._db_writer.is_connected:
-                task = asyncio.create_task(
-                    self._db_writer.save_scalp_tick(record, self.cfg.session_id)
-                )
-                def _on_db_done(t):
-                    try:
-                        t.result()
-                    except Exception as e:
-                        log.warning("DB 저장 실패 - JSONL 아카이브만 저장됨: %s", e)
-                task.add_done_callback(_on_db_done)
-
-            # Log every save for visibility (Korean output)
-            symbol = data.get("symbol", "UNKNOWN")
-            price = record["price"].get("current", 0)
-            log.info(f"[저장] {symbol} @ {price:,}원 → {log_file}")
+                pending = self._db_queue.offer(record)
+
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("[저장] %s @ %s원 → %s.jsonl", record["symbol"], record["price"].get("current", 0), hour_str)
+            return pending
         
-        except PermissionError as e:
-            log.error("Permission denied writing scalp data: %s - %s", log_file or "N/A", e)
-        except OSError as e:
-            log.error("OS error writing scalp data: %s - %s", log_file or "N/A", e)
         except Exception as e:
             log.error(
                 "Error logging scalp data: %s (type=%s) - data sample: %s",
                 e, type(e).__name__, repr(data)[:300],
                 exc_info=True
             )
+        return None
     
     def get_stats(self) -> Dict[str, Any]:
         """Get collector statistics"""
@@ -449,6 +619,11 @@ class ScalpCollector(TimeAwareMixin):
         return {
             "subscribed_symbols": len(self._subscribed_symbols),
             "slot_stats": slot_stats,
+            "archive_stats": self._archive_writer.stats,
+            "db_queue_stats": self._db_queue.stats,
+            "db_writer_stats": self._db_writer.stats,
+            "trigger_channel_stats": self._snapshot_channel.stats if self._snapshot_channel else None,
+            "tick_trigger_stats": self.tick_detector.stats if self.tick_detector else None,
             "running": self._running
         }
 
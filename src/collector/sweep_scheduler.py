@@ -0,0 +1,144 @@
+"""
+Deadline-aware sweep planning for Track A (SwingCollector).
+
+- Rate budget: how many REST calls fit into one interval
+  (budget_rps * interval_seconds * utilisation), times symbols_per_request
+  when quotes are fetched in batches
+- Rolling shards: when the universe exceeds that capacity, it is split into
+  N shards by a stable hash of the symbol; sweep k covers shard k % N, so every
+  symbol is sampled exactly every N intervals regardless of universe order.
+- Deadline: each sweep must finish before deadline_ratio * interval so the next
+  sweep starts on time; unfinished symbols are skipped and reported.
+"""
+from __future__ import annotations
+
+import math
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence
+
+
+__all__ = ["SweepPlan", "SweepReport", "SweepScheduler"]
+
+
+@dataclass(frozen=True)
+class SweepPlan:
+    """One sweep: which shard, which symbols, and the time budget."""
+    sweep_index: int
+    shard: int
+    shards: int
+    symbols: List[str]
+    deadline_seconds: float
+    cadence_seconds: float
+
+
+@dataclass
+class SweepReport:
+    """Per-sweep coverage and lag."""
+    sweep_index: int
+    shard: int
+    shards: int
+    planned: int
+    universe_size: int
+    fetched: int = 0
+    failed: int = 0
+    skipped: int = 0
+    duration_seconds: float = 0.0
+    lag_seconds: float = 0.0
+    deadline_missed: bool = False
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def coverage(self) -> float:
+        """fetched / planned (1.0 for an empty plan)"""
+        return self.fetched / self.planned if self.planned else 1.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "sweep_index": self.sweep_index,
+            "shard": self.shard,
+            "shards": self.shards,
+            "planned": self.planned,
+            "universe_size": self.universe_size,
+            "fetched": self.fetched,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "coverage": round(self.coverage, 4),
+            "duration_seconds": round(self.duration_seconds, 3),
+            "lag_seconds": round(self.lag_seconds, 3),
+            "deadline_missed": self.deadline_missed,
+            **self.extra,
+        }
+
+
+class SweepScheduler:
+    """
+    Plans Track A sweeps against a REST rate budget and an interval deadline.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        budget_rps: float,
+        utilisation: float = 0.8,
+        deadline_ratio: float = 0.9,
+        symbols_per_request: int = 1,
+    ) -> None:
+        """
+        Args:
+            interval_seconds: Sweep interval (SwingConfig.interval_minutes * 60)
+            budget_rps: REST requests/sec available to Track A
+            utilisation: Fraction of the budget a sweep may plan for (headroom for retries/Track B)
+            deadline_ratio: Fraction of the interval a sweep may run before remaining symbols are skipped
+            symbols_per_request: Symbols covered by one REST call (multi-price batch size)
+        """
+        if interval_seconds <= 0 or budget_rps <= 0:
+            raise ValueError("interval_seconds and budget_rps must be positive")
+        if not 0 < utilisation <= 1 or not 0 < deadline_ratio <= 1:
+            raise ValueError("utilisation and deadline_ratio must be in (0, 1]")
+        self.interval_seconds = float(interval_seconds)
+        self.budget_rps = float(budget_rps)
+        self.utilisation = utilisation
+        self.deadline_ratio = deadline_ratio
+        self.symbols_per_request = max(1, int(symbols_per_request))
+
+    @property
+    def capacity(self) -> int:
+        """Symbols that fit into one sweep within the deadline."""
+        seconds = self.interval_seconds * self.deadline_ratio
+        return max(1, int(self.budget_rps * seconds * self.utilisation) * self.symbols_per_request)
+
+    def shard_count(self, universe_size: int) -> int:
+        return max(1, math.ceil(universe_size / self.capacity))
+
+    @staticmethod
+    def shard_of(symbol: str, shards: int) -> int:
+        """Stable shard assignment (independent of universe order and process)."""
+        return zlib.crc32(symbol.encode("utf-8")) % shards
+
+    def plan(self, universe: Sequence[str], sweep_index: int) -> SweepPlan:
+        shards = self.shard_count(len(universe))
+        shard = sweep_index % shards
+        if shards == 1:
+            symbols = list(universe)
+        else:
+            symbols = [s for s in universe if self.shard_of(s, shards) == shard]
+        return SweepPlan(
+            sweep_index=sweep_index,
+            shard=shard,
+            shards=shards,
+            symbols=symbols,
+            deadline_seconds=self.interval_seconds * self.deadline_ratio,
+            cadence_seconds=self.interval_seconds * shards,
+        )
+
+    def full_plan(self, universe: Sequence[str], sweep_index: int = 0) -> SweepPlan:
+        """Whole universe, no deadline (e.g. the closing sweep)."""
+        return SweepPlan(
+            sweep_index=sweep_index,
+            shard=0,
+            shards=1,
+            symbols=list(universe),
+            deadline_seconds=math.inf,
+            cadence_seconds=self.interval_seconds,
+        )
@@ -13,10 +13,14 @@ from zoneinfo import ZoneInfo
 from shared.time_helpers import TimeAwareMixin
 from shared.trading_hours import in_trading_hours
 
+from monitoring.prometheus_metrics import get_registry
 from provider import ProviderEngine, KISAuth
 from universe.universe_manager import UniverseManager
 from observer.paths import observer_asset_dir, observer_log_dir
 from db.realtime_writer import RealtimeDBWriter
+from collector.sweep_scheduler import SweepPlan, SweepReport, SweepScheduler
+from trigger.snapshot_channel import SnapshotChannel
+from trigger.trigger_engine import snapshot_from_record
 
 log = logging.getLogger("SwingCollector")
 
@@ -28,7 +32,10 @@ class SwingConfig:
     market: str = f"{os.getenv('MARKET_CODE', 'kr')}_stocks"
     session_id: str = "track_a_session"
     mode: str = "PROD"
-    semaphore_limit: int = 20  # respect 20 req/sec
+    semaphore_limit: int = 20  # concurrent in-flight requests (pacing is done by the rate limiter)
+    sweep_budget_rps: Optional[float] = None  # None → derived from the provider's rate limiter
+    sweep_utilisation: float = 0.8  # fraction of the budget a sweep plans for
+    sweep_deadline_ratio: float = 0.9  # sweep must finish within this fraction of the interval
     daily_log_subdir: str = "swing"  # under config/{subdir}
     trading_start: time = time(9, 0)
     trading_end: time = time(15, 30)
@@ -41,6 +48,7 @@ class SwingCollector(TimeAwareMixin):
         config: Optional[SwingConfig] = None,
         universe_dir: Optional[str] = None,
         on_error: Optional[Callable[[str], None]] = None,
+        snapshot_channel: Optional[SnapshotChannel] = None,
     ) -> None:
         self.engine = engine
         self.cfg = config or SwingConfig()
@@ -54,14 +62,55 @@ class SwingCollector(TimeAwareMixin):
             min_count=100,
         )
         self._on_error = on_error
+        # Track B 트리거 hand-off: batch 도착 즉시 PriceSnapshot publish (JSONL 재파싱 없음)
+        self._snapshot_channel = snapshot_channel
         
         # DB 실시간 저장
         self._db_writer = RealtimeDBWriter()
 
+        # 스윕 스케줄러: 레이트 예산 + 인터벌 데드라인 기반 rolling shard
+        self._sweeper = SweepScheduler(
+            interval_seconds=self.cfg.interval_minutes * 60,
+            budget_rps=self._sweep_budget_rps(),
+            utilisation=self.cfg.sweep_utilisation,
+            deadline_ratio=self.cfg.sweep_deadline_ratio,
+        )
+        self.last_sweep: Optional[SweepReport] = None
+
+        registry = get_registry()
+        self._sweep_duration = registry.histogram(
+            "observer_swing_sweep_duration_seconds",
+            "Track A sweep duration",
+            buckets=[1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 180.0, 240.0, 300.0, 600.0],
+        )
+        self._sweep_coverage = registry.gauge(
+            "observer_swing_sweep_coverage_ratio", "Fetched / planned symbols in the last Track A sweep"
+        )
+        self._sweep_lag = registry.gauge(
+            "observer_swing_sweep_lag_seconds", "Start delay of the last Track A sweep vs its scheduled slot"
+        )
+        self._sweep_skipped = registry.counter(
+            "observer_swing_sweep_skipped_total", "Symbols skipped because a Track A sweep hit its deadline"
+        )
+        self._snapshots_total = registry.counter(
+            "observer_track_a_snapshots_total", "Total Track A snapshots collected"
+        )
+
         self._setup_logger()
 
-        log.info("SwingCollector initialized: market=%s, interval=%dm, semaphore=%d",
-                 self.cfg.market, self.cfg.interval_minutes, self.cfg.semaphore_limit)
+        log.info("SwingCollector initialized: market=%s, interval=%dm, semaphore=%d, sweep_capacity=%d",
+                 self.cfg.market, self.cfg.interval_minutes, self.cfg.semaphore_limit, self._sweeper.capacity)
+
+    def _sweep_budget_rps(self) -> float:
+        """Track A 가 쓸 수 있는 초당 요청 수 (설정값 또는 rate limiter 의 초당/분당 한도 중 작은 값)"""
+        if self.cfg.sweep_budget_rps:
+            return float(self.cfg.sweep_budget_rps)
+        limiter = getattr(getattr(self.engine, "rest", None), "rate_limiter", None)
+        rps = getattr(limiter, "rps_limit", None)
+        rpm = getattr(limiter, "rpm_limit", None)
+        if isinstance(rps, (int, float)) and isinstance(rpm, (int, float)):
+            return float(min(rps, rpm / 60.0))
+        return 15.0
 
     def _setup_logger(self) -> None:
         """Setup specialized file logger for swing strategy"""
@@ -147,8 +196,10 @@ class SwingCollector(TimeAwareMixin):
                           bootstrap_attempt, MAX_BOOTSTRAP_RETRIES, e, wait_time, exc_info=True)
                 await asyncio.sleep(wait_time)
 
-        # Main Loop
+        # Main Loop (fixed cadence: 각 스윕은 예정 슬롯 기준으로 시작, 지연은 lag 로 보고)
         last_in_trading: Optional[bool] = None
+        interval = timedelta(minutes=self.cfg.interval_minutes)
+        next_slot: Optional[datetime] = None
         while True:
             now = self._now()
             in_trading = in_trading_hours(now, self.cfg.trading_start, self.cfg.trading_end)
@@ -160,8 +211,9 @@ class SwingCollector(TimeAwareMixin):
                         self.cfg.trading_end,
                     )
                 last_in_trading = True
+                scheduled = next_slot or now
                 try:
-                    await self.collect_once()
+                    await self.collect_once(scheduled_at=scheduled)
                 except Exception as e:
                     universe_count = len(self._manager.get_current_universe()) if self._manager else 0
                     log.exception("Track A collect_once failed: %s (universe_size=%d, interval=%dm)",
@@ -171,8 +223,23 @@ class SwingCollector(TimeAwareMixin):
                             self._on_error(str(e))
                         except Exception as callback_err:
                             log.warning("Error callback itself failed: %s", callback_err)
-                await asyncio.sleep(self.cfg.interval_minutes * 60)
+
+                next_slot = scheduled + interval
+                wait_s = (next_slot - self._now()).total_seconds()
+                if wait_s > 0:
+                    await asyncio.sleep(wait_s)
+                elif -wait_s >= interval.total_seconds():
+                    log.warning("Track A sweep overran by %.0fs - skipping missed slot(s)", -wait_s)
+                    next_slot = None
             else:
+                next_slot = None
+                if last_in_trading is True and now.time() >= self.cfg.trading_end:
+                    # 마감 직후 1회 전체 스윕: 확정 종가를 기록해 다음 유니버스 빌드를 로컬 필터로 만든다
+                    log.info("Trading window closed - running closing sweep for prev-close cache")
+                    try:
+                        await self.collect_once(full=True)
+                    except Exception as e:
+                        log.warning("Closing sweep failed: %s", e)
                 if last_in_trading is not False:
                     log.info(
                         "Outside trading hours (%s-%s KST) - sleeping 60s",
@@ -186,8 +253,51 @@ class SwingCollector(TimeAwareMixin):
     # -----------------------------------------------------
     # One-shot collection
     # -----------------------------------------------------
-    async def collect_once(self) -> Dict[str, Any]:
-        today = date.today().isoformat()
+    def _quote_batch_size(self) -> int:
+        """요청 1회당 종목 수 (엔진이 멀티종목 시세를 지원하지 않으면 1)"""
+        size = getattr(self.engine, "quote_batch_size", 1)
+        if not isinstance(size, int) or not hasattr(self.engine, "fetch_current_prices"):
+            return 1
+        return max(1, size)
+
+    def _sweep_index(self, scheduled_at: datetime) -> int:
+        """예정 슬롯의 장 시작 기준 순번 (재시작해도 같은 슬롯은 같은 shard)"""
+        open_dt = scheduled_at.replace(
+            hour=self.cfg.trading_start.hour, minute=self.cfg.trading_start.minute, second=0, microsecond=0
+        )
+        return max(0, int((scheduled_at - open_dt).total_seconds() // self._sweeper.interval_seconds))
+
+    def _build_record(self, symbol: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        inst = (payload.get("instruments") or [{}])[0]
+        price = inst.get("price") or {}
+        return {
+            "ts": self._now().isoformat(),
+            "session": self.cfg.session_id,
+            "dataset": "track_a_swing",
+            "market": self.cfg.market,
+            "symbol": symbol,
+            "price": {
+                "open": price.get("open"),
+                "high": price.get("high"),
+                "low": price.get("low"),
+                "close": price.get("close"),
+            },
+            "volume": inst.get("volume"),
+            "bid_price": inst.get("bid_price"),
+            "ask_price": inst.get("ask_price"),
+            "source": "kis",
+        }
+
+    async def collect_once(self, scheduled_at: Optional[datetime] = None, full: bool = False) -> Dict[str, Any]:
+        """
+        Track A 스윕 1회.
+
+        Args:
+            scheduled_at: 이 스윕의 예정 시각 (lag 계산 / shard 선택). None이면 현재 시각
+            full: True면 shard/데드라인 없이 유니버스 전체 (마감 스윕)
+        """
+        import json
+
         # Load universe (with T-1 failover logic inside UniverseManager)
         while True:
             symbols = self._manager.get_current_universe()
@@ -198,71 +308,131 @@ class SwingCollector(TimeAwareMixin):
             log.info("Waiting for universe file (T-0/T-1)...")
             await asyncio.sleep(60)
 
+        now = self._now()
+        scheduled_at = scheduled_at or now
+        sweep_index = self._sweep_index(scheduled_at)
+        self._sweeper.symbols_per_request = self._quote_batch_size()
+        plan: SweepPlan = (
+            self._sweeper.full_plan(symbols, sweep_index) if full else self._sweeper.plan(symbols, sweep_index)
+        )
+        report = SweepReport(
+            sweep_index=plan.sweep_index,
+            shard=plan.shard,
+            shards=plan.shards,
+            planned=len(plan.symbols),
+            universe_size=len(symbols),
+            lag_seconds=max(0.0, (now - scheduled_at).total_seconds()),
+        )
+        if plan.shards > 1:
+            log.info("Sweep %d: shard %d/%d (%d of %d symbols, cadence %.0fs, lag %.1fs)",
+                     plan.sweep_index, plan.shard + 1, plan.shards, report.planned, report.universe_size,
+                     plan.cadence_seconds, report.lag_seconds)
+
         # Prepare JSONL path under data/assets/swing/YYYYMMDD.jsonl
         ymd = datetime.now().strftime("%Y%m%d")
         log_dir = observer_asset_dir() / self.cfg.daily_log_subdir
         log_dir.mkdir(parents=True, exist_ok=True)
         log_path = log_dir / f"{ymd}.jsonl"
 
-        sem = asyncio.Semaphore(self.cfg.semaphore_limit)
-
-        async def fetch(symbol: str) -> Optional[Dict[str, Any]]:
-            async with sem:
-                try:
-                    data = await self.engine.fetch_current_price(symbol)
-                    return {"symbol": symbol, "data": data}
-                except Exception as e:
-                    # tolerate per-symbol failures
-                    log.debug("Symbol %s fetch failed: %s", symbol, e)
-                    return None
-
-        # Gather results and filter out None (failures)
-        raw_results = await asyncio.gather(*(fetch(s) for s in symbols))
-        results: List[Dict[str, Any]] = [r for r in raw_results if r is not None]
-
-        # 1) 아카이브: 먼저 JSONL에 모두 기록 (저장 순서 보장)
-        import json
-        published = 0
+        # 장 마감 이후 스윕의 현재가는 당일 확정 종가 → 다음 유니버스 빌드용 캐시에 기록
+        record_closes = now.time() >= self.cfg.trading_end
+        closes: Dict[str, Any] = {}
         records_for_db: List[Dict[str, Any]] = []
-        
+        published = 0
+
         try:
-            with open(log_path, "a", encoding="utf-8") as f:
-                for item in results:
-                    sym = item["symbol"]
-                    payload = item["data"]
-                    inst = (payload.get("instruments") or [{}])[0]
-                    price = inst.get("price") or {}
-                    record = {
-                        "ts": self._now().isoformat(),
-                        "session": self.cfg.session_id,
-                        "dataset": "track_a_swing",
-                        "market": self.cfg.market,
-                        "symbol": sym,
-                        "price": {
-                            "open": price.get("open"),
-                            "high": price.get("high"),
-                            "low": price.get("low"),
-                            "close": price.get("close"),
-                        },
-                        "volume": inst.get("volume"),
-                        "bid_price": inst.get("bid_price"),
-                        "ask_price": inst.get("ask_price"),
-                        "source": "kis",
-                    }
-                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
-                    published += 1
-                    records_for_db.append(record)
-            
-            if published > 0:
-                log.info(f"[저장] {published} items written to JSONL ({log_path})")
-                
+            archive = open(log_path, "a", encoding="utf-8")
         except (IOError, OSError) as e:
-            log.error(f"[파일 시스템 오류] JSONL 쓰기 실패 (path: {log_path}): {e}")
+            log.error(f"[파일 시스템 오류] JSONL 열기 실패 (path: {log_path}): {e}")
             if self._on_error:
                 self._on_error(f"File write failed: {log_path} | {e}")
-            # JSONL 쓰기 실패하더라도 일단 계속 진행 (메모리상의 records_for_db는 DB 저장이 가능할 수 있음)
+            archive = None
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + plan.deadline_seconds
+        # 멀티종목 시세 지원 시 요청 1회에 batch 단위로 조회
+        batch_size = self._quote_batch_size()
+        batches = [plan.symbols[i:i + batch_size] for i in range(0, len(plan.symbols), batch_size)]
+        pending = iter(batches)
+
+        async def fetch_batch(batch: List[str]) -> List[Dict[str, Any]]:
+            if batch_size > 1:
+                return await self.engine.fetch_current_prices(batch)
+            data = await self.engine.fetch_current_price(batch[0])
+            return [data] if data else []
+
+        async def worker() -> None:
+            nonlocal archive, published
+            # 단일 event loop 에서 iterator 를 공유하므로 각 batch 는 한 worker 만 처리한다
+            for batch in pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    report.skipped += len(batch)
+                    continue
+                try:
+                    if remaining == float("inf"):
+                        contracts = await fetch_batch(batch)
+                    else:
+                        contracts = await asyncio.wait_for(fetch_batch(batch), timeout=remaining)
+                except asyncio.TimeoutError:
+                    report.skipped += len(batch)
+                    continue
+                except Exception as e:
+                    # tolerate per-symbol failures
+                    log.debug("Batch %s.. (%d) fetch failed: %s", batch[0], len(batch), e)
+                    report.failed += len(batch)
+                    continue
+                report.failed += len(batch) - len(contracts)
+
+                snapshots = []
+                for data in contracts:
+                    inst = (data.get("instruments") or [{}])[0]
+                    symbol = inst.get("symbol") or batch[0]
+                    report.fetched += 1
+                    record = self._build_record(symbol, data)
+                    records_for_db.append(record)
+                    if record["price"]["close"]:
+                        if record_closes:
+                            closes[symbol] = record["price"]["close"]
+                        if self._snapshot_channel is not None:
+                            snapshots.append(snapshot_from_record(record))
+
+                    # 1) 아카이브: 도착 즉시 JSONL 에 기록
+                    if archive is not None:
+                        try:
+                            archive.write(json.dumps(record, ensure_ascii=False) + "\n")
+                            published += 1
+                        except (IOError, OSError) as e:
+                            log.error(f"[파일 시스템 오류] JSONL 쓰기 실패 (path: {log_path}): {e}")
+                            if self._on_error:
+                                self._on_error(f"File write failed: {log_path} | {e}")
+                            # JSONL 쓰기 실패하더라도 계속 진행 (records_for_db는 DB 저장이 가능할 수 있음)
+                            archive.close()
+                            archive = None
+
+                # 2) Track B 트리거: batch 단위로 즉시 hand-off
+                if snapshots:
+                    self._snapshot_channel.publish(snapshots)
 
-        # 2) DB 쓰기는 선택적(best-effort). 실패해도 예외 전파하지 않고 로그만 남김
+        try:
+            workers = max(1, min(self.cfg.semaphore_limit, len(batches)))
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        finally:
+            if archive is not None:
+                archive.close()
+
+        report.duration_seconds = loop.time() - started
+        report.deadline_missed = report.skipped > 0
+        if published > 0:
+            log.info(f"[저장] {published} items written to JSONL ({log_path})")
+
+        if record_closes and closes:
+            recorded = self._manager.record_closes(now.date(), closes)
+            if recorded:
+                log.info("Recorded %d closing prices for %s into prev-close cache", recorded, now.date())
+
+        # 3) DB 쓰기는 선택적(best-effort). 실패해도 예외 전파하지 않고 로그만 남김
         db_saved = 0
         if self._db_writer.is_connected and records_for_db:
             for record in records_for_db:
@@ -276,13 +446,24 @@ class SwingCollector(TimeAwareMixin):
         if published > 0 or db_saved > 0:
             log.info(f"[완료] Swing list updated: JSONL={published} | DB={db_saved}")
 
+        # 4) 스윕 커버리지 / 지연 보고
+        self.last_sweep = report
+        self._sweep_duration.observe(report.duration_seconds)
+        self._sweep_coverage.set(round(report.coverage, 4))
+        self._sweep_lag.set(round(report.lag_seconds, 3))
+        self._snapshots_total.increment(report.fetched)
+        if report.skipped:
+            self._sweep_skipped.increment(report.skipped)
+            log.warning("Sweep %d hit its %.0fs deadline: %d/%d symbols skipped",
+                        report.sweep_index, plan.deadline_seconds, report.skipped, report.planned)
 
         return {
             "ok": True,
             "symbols": len(symbols),
-            "fetched": len(results),
+            "fetched": report.fetched,
             "published": published,
             "log_file": str(log_path),
+            "sweep": report.to_dict(),
         }
 
 
@@ -0,0 +1,235 @@
+"""
+Scalp Tick DB Ingest Queue
+
+Track B 틱을 tick당 create_task + 개별 INSERT 대신
+bounded asyncio.Queue → 단일 소비자 → BatchedRealtimeDBWriter(COPY) 경로로 전달한다.
+
+Overflow Policy (큐가 가득 찼을 때):
+- drop_oldest: 가장 오래된 틱을 버리고 새 틱을 적재 (기본값, 최신성 우선)
+- spill:       새 틱을 JSONL spill 파일에 기록 (나중에 migrate_jsonl_to_db로 재적재 가능)
+- block:       생산자가 공간이 생길 때까지 대기 (offer()는 await 가능한 객체를 반환)
+
+카운터: queued / dropped / spilled / handed_off / failed
+- handed_off: writer 에 넘긴 틱 수 (COPY 결과는 writer.stats 의 total_saved / total_failed)
+- failed:     writer 로 넘기지 못한 틱 수 (spill 정책이면 spill 파일로 보내고 spilled 로 집계)
+"""
+import asyncio
+import json
+import logging
+import os
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Dict, IO, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .realtime_writer import BatchedRealtimeDBWriter
+
+log = logging.getLogger("ScalpTickIngestQueue")
+
+
+class OverflowPolicy(str, Enum):
+    """큐 포화 시 처리 정책"""
+    DROP_OLDEST = "drop_oldest"
+    SPILL = "spill"
+    BLOCK = "block"
+
+
+class ScalpTickIngestQueue:
+    """
+    Bounded single-consumer queue in front of BatchedRealtimeDBWriter.
+
+    Producers call offer() from the event loop (sync WebSocket callback);
+    a single consumer task drains up to ``drain_max`` ticks at a time and hands
+    them to the writer, which buffers and flushes them with COPY.
+    """
+
+    def __init__(
+        self,
+        writer: "BatchedRealtimeDBWriter",
+        session_id: str,
+        maxsize: int = 10000,
+        policy: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST,
+        spill_dir: Optional[Path] = None,
+        drain_max: int = 500,
+    ):
+        """
+        Args:
+            writer: COPY 기반 배치 writer
+            session_id: scalp_ticks.session_id 값
+            maxsize: 큐 최대 크기
+            policy: 포화 시 정책 (drop_oldest | spill | block)
+            spill_dir: spill 정책용 JSONL 디렉토리 (spill 정책 시 필수)
+            drain_max: 소비자 1회 처리 최대 틱 수
+        """
+        self._writer = writer
+        self._session_id = session_id
+        self._policy = OverflowPolicy(policy)
+        self._spill_dir = Path(spill_dir) if spill_dir else None
+        self._drain_max = drain_max
+
+        if self._policy is OverflowPolicy.SPILL and self._spill_dir is None:
+            raise ValueError("spill_dir is required for the spill overflow policy")
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._consumer: Optional[asyncio.Task] = None
+        self._spill_file: Optional[IO[str]] = None
+        self._spill_name: Optional[str] = None
+
+        # 통계
+        self._queued = 0
+        self._dropped = 0
+        self._spilled = 0
+        self._handed_off = 0
+        self._failed = 0
+        self._blocked = 0
+
+    # -----------------------------------------------------
+    # Lifecycle
+    # -----------------------------------------------------
+    def start(self) -> None:
+        """단일 소비자 태스크 시작 (실행 중인 이벤트 루프 필요)"""
+        if self._consumer is None or self._consumer.done():
+            self._consumer = asyncio.create_task(self._consume(), name="scalp-db-ingest")
+            log.info("Scalp DB ingest queue started (maxsize=%d, policy=%s)",
+                     self._queue.maxsize, self._policy.value)
+
+    async def stop(self) -> None:
+        """소비자 중지 후 남은 틱을 writer로 넘기고 플러시"""
+        if self._consumer is not None:
+            self._consumer.cancel()
+            try:
+                await self._consumer
+            except asyncio.CancelledError:
+                pass
+            self._consumer = None
+
+        remaining = self._drain_nowait(self._queue.qsize())
+        if remaining:
+            await self._hand_off(remaining)
+        await self._writer.flush()
+        self._close_spill()
+        log.info("Scalp DB ingest queue stopped (%s)", self.stats)
+
+    # -----------------------------------------------------
+    # Producer API
+    # -----------------------------------------------------
+    def offer(self, item: Dict[str, Any]) -> Optional[Awaitable[None]]:
+        """
+        틱 하나를 적재 (non-blocking).
+
+        Returns:
+            None이면 처리 완료. block 정책에서 큐가 가득 찬 경우에만
+            생산자가 await 해야 하는 코루틴을 반환한다.
+        """
+        try:
+            self._queue.put_nowait(item)
+            self._queued += 1
+            return None
+        except asyncio.QueueFull:
+            pass
+
+        if self._policy is OverflowPolicy.DROP_OLDEST:
+            try:
+                self._queue.get_nowait()
+                self._dropped += 1
+            except asyncio.QueueEmpty:
+                pass
+            self._queue.put_nowait(item)
+            self._queued += 1
+            return None
+
+        if self._policy is OverflowPolicy.SPILL:
+            self._spill(item)
+            return None
+
+        self._blocked += 1
+        return self._put_blocking(item)
+
+    async def _put_blocking(self, item: Dict[str, Any]) -> None:
+        await self._queue.put(item)
+        self._queued += 1
+
+    # -----------------------------------------------------
+    # Consumer
+    # -----------------------------------------------------
+    async def _consume(self) -> None:
+        # 부분 배치의 시간 기반 플러시는 writer의 타이머 태스크가 담당한다
+        while True:
+            first = await self._queue.get()
+            items = [first]
+            items.extend(self._drain_nowait(self._drain_max - 1))
+            await self._hand_off(items)
+
+    def _drain_nowait(self, limit: int) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = []
+        while len(items) < limit:
+            try:
+                items.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return items
+
+    async def _hand_off(self, items: List[Dict[str, Any]]) -> None:
+        try:
+            await self._writer.save_scalp_ticks(items, self._session_id)
+        except Exception as e:
+            if self._policy is OverflowPolicy.SPILL:
+                log.warning("Scalp DB ingest hand-off failed, spilling %d ticks: %s", len(items), e)
+                for item in items:
+                    self._spill(item)
+            else:
+                log.warning("Scalp DB ingest hand-off failed (%d ticks lost): %s", len(items), e)
+                self._failed += len(items)
+            return
+        self._handed_off += len(items)
+
+    # -----------------------------------------------------
+    # Spill
+    # -----------------------------------------------------
+    def _spill(self, item: Dict[str, Any]) -> None:
+        try:
+            name = f"{str(item.get('timestamp', ''))[:10].replace('-', '') or 'unknown'}.jsonl"
+            if self._spill_file is None or name != self._spill_name:
+                self._close_spill()
+                self._spill_dir.mkdir(parents=True, exist_ok=True)
+                self._spill_file = open(self._spill_dir / name, "a", encoding="utf-8")
+                self._spill_name = name
+            self._spill_file.write(json.dumps(item, ensure_ascii=False) + "\n")
+            self._spill_file.flush()
+            self._spilled += 1
+        except OSError as e:
+            log.error("Scalp DB spill failed (tick dropped): %s", e)
+            self._dropped += 1
+
+    def _close_spill(self) -> None:
+        if self._spill_file is not None:
+            try:
+                self._spill_file.flush()
+                os.fsync(self._spill_file.fileno())
+                self._spill_file.close()
+            except OSError as e:
+                log.error("Failed to close scalp DB spill file: %s", e)
+            self._spill_file = None
+            self._spill_name = None
+
+    # -----------------------------------------------------
+    # Stats
+    # -----------------------------------------------------
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """통계 정보 반환"""
+        return {
+            "policy": self._policy.value,
+            "depth": self._queue.qsize(),
+            "maxsize": self._queue.maxsize,
+            "queued": self._queued,
+            "dropped": self._dropped,
+            "spilled": self._spilled,
+            "handed_off": self._handed_off,
+            "failed": self._failed,
+            "blocked": self._blocked,
+        }
@@ -11,6 +11,8 @@ DB 연결:
   수집·아카이브(JSONL) 흐름은 계속 진행됨.
 
 Phase 14: BatchedRealtimeDBWriter 추가 - 고빈도 틱 데이터용 마이크로 배치 처리
+- start()/close()로 백그라운드 타이머 플러시 태스크 수명주기 관리
+- 배치 크기 / COPY 지연 히스토그램은 공용 Prometheus 레지스트리(monitoring.prometheus_metrics)에 기록
 """
 import asyncpg
 import asyncio
@@ -20,8 +22,46 @@ import time
 from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 
+from monitoring.prometheus_metrics import MetricHistogram, get_registry
+
 log = logging.getLogger("RealtimeDBWriter")
 
+SCALP_GAP_COLUMNS = ['gap_start_ts', 'gap_end_ts', 'gap_seconds', 'scope', 'reason', 'session_id']
+
+
+def _scalp_gap_records(gaps: List[Dict[str, Any]], session_id: str) -> List[Tuple]:
+    """GapEvent.to_dict() 목록 → scalp_gaps COPY 레코드 (닫힌 gap 은 recovered_at 이 gap_end_ts)"""
+    records = []
+    for gap in gaps:
+        records.append((
+            datetime.fromisoformat(gap["last_update"]),
+            datetime.fromisoformat(gap.get("recovered_at") or gap["detected_at"]),
+            int(round(gap.get("gap_duration_seconds") or 0)),
+            (gap.get("symbol") or gap.get("track_type") or "")[:20],
+            f"{gap.get('track_type')}:{gap.get('gap_type')}"[:100],
+            session_id,
+        ))
+    return records
+
+
+async def _copy_scalp_gaps(pool: "asyncpg.Pool", gaps: List[Dict[str, Any]], session_id: str) -> bool:
+    """scalp_gaps 배치 적재 (COPY 1회)"""
+    if not pool:
+        return False
+    if not gaps:
+        return True
+    try:
+        async with pool.acquire() as conn:
+            await conn.copy_records_to_table(
+                'scalp_gaps',
+                records=_scalp_gap_records(gaps, session_id),
+                columns=SCALP_GAP_COLUMNS,
+            )
+        return True
+    except Exception as e:
+        log.error(f"Failed to save scalp gaps ({len(gaps)}): {e}")
+        return False
+
 
 class RealtimeDBWriter:
     """Track A/B 공통 DB 저장 클래스"""
@@ -189,6 +229,16 @@ class RealtimeDBWriter:
             log.error(f"Failed to save swing bar: {e}")
             return False
 
+    async def save_scalp_gaps(self, gaps: List[Dict[str, Any]], session_id: str) -> bool:
+        """
+        scalp_gaps 테이블에 gap 이벤트 배치 저장
+
+        Args:
+            gaps: GapEvent.to_dict() 목록
+            session_id: 세션 ID
+        """
+        return await _copy_scalp_gaps(self._pool, gaps, session_id)
+
 
 class BatchedRealtimeDBWriter:
     """
@@ -199,11 +249,16 @@ class BatchedRealtimeDBWriter:
 
     Features:
         - 마이크로 배치: 100개 레코드 또는 500ms 마다 플러시
+        - 타이머 플러시: 틱 유입이 멈춰도(점심, 구독 변경, 장마감) flush_interval_ms 내 저장
         - COPY 프로토콜: 개별 INSERT 대비 10배 성능
-        - 비동기 락: 동시 접근 안전
-        - 실패 재시도: 실패한 레코드 재큐잉
+        - 락 분리: append 락은 배치 교체에만 사용, COPY 왕복은 flush 락에서 수행
+        - 실패 재시도: max_retry_count 회 재시도
     """
 
+    # 히스토그램 버킷
+    BATCH_SIZE_BUCKETS = [1, 10, 25, 50, 100, 250, 500, 1000, 5000]
+    FLUSH_LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5]
+
     # 테이블 컬럼 정의
     SCALP_TICK_COLUMNS = [
         'symbol', 'event_time', 'bid_price', 'ask_price',
@@ -231,12 +286,28 @@ class BatchedRealtimeDBWriter:
         self._flush_interval_ms = flush_interval_ms
         self._max_retry_count = max_retry_count
         self._last_flush = time.monotonic()
-        self._lock = asyncio.Lock()
+        self._lock = asyncio.Lock()        # 배치 append/교체 보호 (짧게 유지)
+        self._flush_lock = asyncio.Lock()  # COPY 왕복 직렬화
+        self._flush_task: Optional[asyncio.Task] = None
 
         # 통계
         self._total_saved = 0
         self._total_failed = 0
         self._total_batches = 0
+        self._timer_flushes = 0
+        self._copy_count = 0
+        self._copy_seconds_total = 0.0
+        registry = get_registry()
+        self._batch_size_hist = registry.histogram(
+            "observer_db_copy_batch_size",
+            "Records per scalp_ticks COPY batch",
+            buckets=self.BATCH_SIZE_BUCKETS,
+        )
+        self._flush_latency_hist = registry.histogram(
+            "observer_db_copy_duration_seconds",
+            "scalp_ticks COPY round-trip duration",
+            buckets=self.FLUSH_LATENCY_BUCKETS,
+        )
 
     async def connect(self) -> bool:
         """DB 연결 풀 초기화. DB_HOST/DB_PORT는 환경변수만 사용, 기본 postgres:5432(Docker)."""
@@ -278,10 +349,39 @@ class BatchedRealtimeDBWriter:
             self._connected = False
             return False
 
+    def start(self) -> None:
+        """백그라운드 타이머 플러시 태스크 시작 (실행 중인 이벤트 루프 필요)"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop(), name="db-batch-flush")
+
+    async def stop(self) -> None:
+        """타이머 플러시 태스크 중지 후 남은 배치 플러시"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self._flush_batch()
+
+    async def _flush_loop(self) -> None:
+        """마지막 플러시 이후 flush_interval_ms가 지나면 부분 배치를 플러시"""
+        interval = self._flush_interval_ms / 1000.0
+        while True:
+            wait = self._last_flush + interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            if self._batch:
+                self._timer_flushes += 1
+                await self._flush_batch()
+            else:
+                self._last_flush = time.monotonic()
+
     async def close(self):
-        """연결 풀 종료 (남은 배치 플러시)"""
-        if self._batch:
-            await self._flush_batch()
+        """연결 풀 종료 (타이머 중지 및 남은 배치 플러시)"""
+        await self.stop()
         if self._pool:
             await self._pool.close()
             self._connected = False
@@ -294,15 +394,22 @@ class BatchedRealtimeDBWriter:
         return self._connected and self._pool is not None
 
     @property
-    def stats(self) -> Dict[str, int]:
+    def stats(self) -> Dict[str, Any]:
         """통계 정보 반환"""
         return {
             "total_saved": self._total_saved,
             "total_failed": self._total_failed,
             "total_batches": self._total_batches,
-            "pending_batch_size": len(self._batch)
+            "timer_flushes": self._timer_flushes,
+            "pending_batch_size": len(self._batch),
+            "avg_copy_ms": self._copy_seconds_total / self._copy_count * 1000 if self._copy_count else 0.0,
         }
 
+    @property
+    def histograms(self) -> List[MetricHistogram]:
+        """배치 크기 / COPY 지연 히스토그램 (공용 레지스트리, 프로세스 내 writer 공유)"""
+        return [self._batch_size_hist, self._flush_latency_hist]
+
     def _parse_scalp_tick(self, data: Dict[str, Any], session_id: str) -> Tuple:
         """스캘프 틱 데이터를 DB 레코드 튜플로 변환"""
         # timestamp 파싱
@@ -376,48 +483,97 @@ class BatchedRealtimeDBWriter:
         async with self._lock:
             self._batch.append(record)
 
-            # 플러시 조건 체크
+            # 플러시 조건 체크 (시간 조건은 타이머 태스크도 처리)
             should_flush = (
                 len(self._batch) >= self._batch_size or
                 (time.monotonic() - self._last_flush) * 1000 >= self._flush_interval_ms
             )
 
-            if should_flush:
-                return await self._flush_batch()
-
+        # COPY는 append 락 밖에서 수행하여 생산자를 막지 않는다
+        if should_flush:
+            return await self._flush_batch()
         return True
 
-    async def _flush_batch(self) -> bool:
-        """배치를 DB에 플러시 (COPY 프로토콜 사용)"""
-        if not self._batch:
-            return True
+    async def save_scalp_ticks(self, items: List[Dict[str, Any]], session_id: str) -> bool:
+        """
+        Track B: 여러 틱을 한 번의 락 획득으로 배치에 추가 (ScalpTickIngestQueue 소비자용)
 
-        batch_to_flush = self._batch.copy()
-        self._batch.clear()
-        self._last_flush = time.monotonic()
-        batch_size = len(batch_to_flush)
+        Args:
+            items: WebSocket에서 받은 가격 데이터 목록
+            session_id: 세션 ID
+
+        Returns:
+            배치 추가/플러시 성공 여부
+        """
+        if not self._pool:
+            return False
 
-        for attempt in range(self._max_retry_count):
+        records: List[Tuple] = []
+        for data in items:
             try:
-                async with self._pool.acquire() as conn:
-                    await conn.copy_records_to_table(
-                        'scalp_ticks',
-                        records=batch_to_flush,
-                        columns=self.SCALP_TICK_COLUMNS
-                    )
-
-                self._total_saved += batch_size
-                self._total_batches += 1
-
-                if self._total_batches % 100 == 0:
-                    log.debug("Batch flush #%d: %d records (total: %d)",
-                              self._total_batches, batch_size, self._total_saved)
+                records.append(self._parse_scalp_tick(data, session_id))
+            except Exception as e:
+                log.warning(f"Failed to parse scalp tick: {e}")
+                self._total_failed += 1
+
+        if not records:
+            return True
+
+        async with self._lock:
+            self._batch.extend(records)
+
+            should_flush = (
+                len(self._batch) >= self._batch_size or
+                (time.monotonic() - self._last_flush) * 1000 >= self._flush_interval_ms
+            )
+
+        if should_flush:
+            return await self._flush_batch()
+        return True
+
+    async def _flush_batch(self) -> bool:
+        """배치를 교체(append 락, O(1))한 뒤 락 밖에서 DB에 플러시 (COPY 프로토콜 사용)"""
+        async with self._lock:
+            if not self._batch:
                 return True
+            batch_to_flush = self._batch
+            self._batch = []
+            self._last_flush = time.monotonic()
 
-            except Exception as e:
-                log.warning(f"Batch flush attempt {attempt + 1}/{self._max_retry_count} failed: {e}")
-                if attempt < self._max_retry_count - 1:
-                    await asyncio.sleep(0.1 * (attempt + 1))  # Exponential backoff
+        return await self._copy_batch(batch_to_flush)
+
+    async def _copy_batch(self, batch_to_flush: List[Tuple]) -> bool:
+        """COPY 왕복 수행 (flush 락으로 직렬화, 생산자는 계속 append 가능)"""
+        batch_size = len(batch_to_flush)
+
+        async with self._flush_lock:
+            for attempt in range(self._max_retry_count):
+                try:
+                    started = time.perf_counter()
+                    async with self._pool.acquire() as conn:
+                        await conn.copy_records_to_table(
+                            'scalp_ticks',
+                            records=batch_to_flush,
+                            columns=self.SCALP_TICK_COLUMNS
+                        )
+                    elapsed = time.perf_counter() - started
+                    self._flush_latency_hist.observe(elapsed)
+                    self._batch_size_hist.observe(batch_size)
+                    self._copy_count += 1
+                    self._copy_seconds_total += elapsed
+
+                    self._total_saved += batch_size
+                    self._total_batches += 1
+
+                    if self._total_batches % 100 == 0:
+                        log.debug("Batch flush #%d: %d records (total: %d)",
+                                  self._total_batches, batch_size, self._total_saved)
+                    return True
+
+                except Exception as e:
+                    log.warning(f"Batch flush attempt {attempt + 1}/{self._max_retry_count} failed: {e}")
+                    if attempt < self._max_retry_count - 1:
+                        await asyncio.sleep(0.1 * (attempt + 1))  # Exponential backoff
 
         # 모든 재시도 실패
         log.error(f"Batch flush failed after {self._max_retry_count} attempts ({batch_size} records lost)")
@@ -426,8 +582,11 @@ class BatchedRealtimeDBWriter:
 
     async def flush(self) -> bool:
         """강제 플러시 (셧다운 시 호출)"""
-        async with self._lock:
-            return await self._flush_batch()
+        return await self._flush_batch()
+
+    async def save_scalp_gaps(self, gaps: List[Dict[str, Any]], session_id: str) -> bool:
+        """scalp_gaps 배치 저장 (틱 배치와 별개로 즉시 COPY)"""
+        return await _copy_scalp_gaps(self._pool, gaps, session_id)
 
     async def save_scalp_tick_immediate(self, data: Dict[str, Any], session_id: str) -> bool:
         """
@@ -6,15 +6,27 @@ Key Responsibilities:
 - Detect Track B data gaps (>60 seconds since last update)
 - Classify gap severity (Minor/Major/Critical)
 - Generate gap-marker JSONL records
-- Log gaps to system/gap_YYYYMMDD.jsonl
+- Log gaps to system/gap_YYYYMMDD.jsonl (batched, one append per check)
+- Queue one scalp_gaps row per Track B gap when it closes (flush_db, scheduled from the check tick)
+
+Track B deadline scheduling (hashed timer wheel):
+- 종목마다 다음 severity 임계 시각(deadline)을 timer_resolution_seconds 단위 slot 에 등록
+- update_track_b 는 slot 이동만 수행 (dict/set 연산, O(1))
+- check_all_track_b_gaps 는 현재 시각까지 도래한 slot 의 종목만 방문
+- 공백 중인 종목은 minor → major → critical 로 승격될 때마다 한 번씩 이벤트 (critical 이후 재등록 없음)
+- scalp_gaps 에는 공백이 끝날 때(갱신 / 모니터링 해제) 최고 severity 와 실제 복구 시각으로 한 행만 적재
 """
 from __future__ import annotations
 
+import asyncio
+import heapq
 import json
 import logging
-from dataclasses import dataclass, asdict
+import math
+from collections import Counter, deque
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set, Deque
 from pathlib import Path
 from enum import Enum
 from zoneinfo import ZoneInfo
@@ -49,6 +61,7 @@ class GapEvent:
     last_update: datetime
     detected_at: datetime
     expected_interval_seconds: float
+    recovered_at: Optional[datetime] = None  # 공백이 끝난 시각 (닫힌 gap 만)
     
     def to_dict(self) -> dict:
         return {
@@ -58,7 +71,8 @@ class GapEvent:
             "gap_duration_seconds": self.gap_duration_seconds,
             "last_update": self.last_update.isoformat(),
             "detected_at": self.detected_at.isoformat(),
-            "expected_interval_seconds": self.expected_interval_seconds
+            "expected_interval_seconds": self.expected_interval_seconds,
+            "recovered_at": self.recovered_at.isoformat() if self.recovered_at else None,
         }
 
 
@@ -78,8 +92,15 @@ class GapDetectorConfig:
     track_b_major_threshold_seconds: int = 60     # 60 seconds
     track_b_critical_threshold_seconds: int = 300  # 5 minutes
     
+    # Timer wheel slot width for Track B deadlines
+    timer_resolution_seconds: float = 1.0
+    
     # Gap log settings (resolved via paths.py or fallback)
     gap_ledger_dir: str = ""  # Empty = use system_log_dir() from paths.py
+    
+    # scalp_gaps DB 적재 (flush_db)
+    session_id: str = "track_b_session"
+    db_queue_maxsize: int = 10000  # 초과 시 오래된 이벤트부터 폐기
 
 
 class GapDetector(TimeAwareMixin):
@@ -91,9 +112,10 @@ class GapDetector(TimeAwareMixin):
     - Track B gap detection (per-symbol WebSocket streaming)
     - Gap severity classification (Minor/Major/Critical)
     - Gap-marker generation and logging
+    - Optional scalp_gaps DB writes (db_writer.save_scalp_gaps)
     """
     
-    def __init__(self, config: Optional[GapDetectorConfig] = None) -> None:
+    def __init__(self, config: Optional[GapDetectorConfig] = None, db_writer: Optional[Any] = None) -> None:
         self.cfg = config or GapDetectorConfig()
         self._tz_name = self.cfg.tz_name
         self._init_timezone()
@@ -102,6 +124,35 @@ class GapDetector(TimeAwareMixin):
         self._track_a_last_update: Optional[datetime] = None
         self._track_b_last_updates: Dict[str, datetime] = {}  # symbol -> timestamp
         
+        # Track B timer wheel: slot -> symbols, symbol -> slot, 도래 순서용 slot heap
+        self._resolution = self.cfg.timer_resolution_seconds
+        self._track_b_thresholds = (
+            self.cfg.track_b_minor_threshold_seconds,
+            self.cfg.track_b_major_threshold_seconds,
+            self.cfg.track_b_critical_threshold_seconds,
+        )
+        self._track_b_last_ts: Dict[str, float] = {}  # symbol -> epoch seconds
+        self._wheel: Dict[int, Set[str]] = {}
+        self._deadline_slot: Dict[str, int] = {}
+        self._slot_heap: List[int] = []
+        self._gap_level: Dict[str, int] = {}  # 공백 중인 종목 -> 이미 보고한 severity 수 (1..3)
+        self._open_gaps: Dict[str, GapEvent] = {}  # 공백 중인 종목 -> 마지막(최고 severity) 이벤트
+        
+        # 닫힌 gap 의 scalp_gaps 적재 대기열 (RealtimeDBWriter 호환: save_scalp_gaps / is_connected)
+        self._db_writer = db_writer
+        self._db_pending: Deque[GapEvent] = deque(maxlen=self.cfg.db_queue_maxsize)
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        self.stats = {
+            "track_b_checks": 0,
+            "track_b_visited": 0,
+            "gap_events": 0,
+            "gaps_closed": 0,
+            "ledger_writes": 0,
+            "db_saved": 0,
+            "db_failed": 0,
+        }
+        
         # Ensure gap ledger directory exists
         if self.cfg.gap_ledger_dir:
             self.gap_ledger_dir = Path(self.cfg.gap_ledger_dir)
@@ -177,11 +228,37 @@ class GapDetector(TimeAwareMixin):
         Update Track B last update timestamp for a symbol.
         
         Call this every time Track B receives data for a symbol.
+        Reschedules the symbol's minor-threshold deadline in O(1).
         """
         if timestamp is None:
             timestamp = self._now()
+        if self._gap_level:
+            self._close_gap(symbol, timestamp)
         self._track_b_last_updates[symbol] = timestamp
-        log.debug(f"Track B updated: {symbol} at {timestamp.isoformat()}")
+        ts = timestamp.timestamp()
+        self._track_b_last_ts[symbol] = ts
+        self._schedule(symbol, ts + self._track_b_thresholds[0])
+    
+    def remove_track_b(self, symbol: str, timestamp: Optional[datetime] = None) -> None:
+        """Stop monitoring a symbol (e.g. WebSocket unsubscribe); an open gap ends at timestamp."""
+        if symbol in self._gap_level:
+            self._close_gap(symbol, timestamp or self._now())
+        self._track_b_last_updates.pop(symbol, None)
+        self._track_b_last_ts.pop(symbol, None)
+        self._unschedule(symbol)
+    
+    def _close_gap(self, symbol: str, recovered_at: datetime) -> None:
+        """공백 종료: 최고 severity 이벤트를 실제 종료 시각으로 scalp_gaps 대기열에 1건 적재"""
+        if self._gap_level.pop(symbol, None) is None:
+            return
+        event = self._open_gaps.pop(symbol)
+        self.stats["gaps_closed"] += 1
+        if self._db_writer is not None:
+            self._db_pending.append(replace(
+                event,
+                gap_duration_seconds=(recovered_at - event.last_update).total_seconds(),
+                recovered_at=recovered_at,
+            ))
     
     def check_track_b_gap(
         self, 
@@ -205,9 +282,79 @@ class GapDetector(TimeAwareMixin):
         if current_time is None:
             current_time = self._now()
         
-        last_update = self._track_b_last_updates[symbol]
-        gap_duration = (current_time - last_update).total_seconds()
+        gap_event = self._track_b_event(symbol, (current_time - self._track_b_last_updates[symbol]).total_seconds(), current_time)
+        if gap_event is None:
+            return None
+        
+        log.warning(
+            f"⚠️ Track B GAP DETECTED: {symbol} - {gap_event.gap_type.upper()} "
+            f"({gap_event.gap_duration_seconds:.0f}s since last update)"
+        )
+        
+        self._log_gap_events([gap_event])
+        return gap_event
+    
+    def check_all_track_b_gaps(
+        self, 
+        current_time: Optional[datetime] = None
+    ) -> List[GapEvent]:
+        """
+        Check Track B symbols whose deadline has passed.
+        
+        Only symbols in due timer-wheel slots are visited. Each symbol reports
+        once per severity (minor → major → critical) until it updates again.
         
+        Returns:
+            List of GapEvent for symbols that crossed a new severity threshold
+        """
+        if current_time is None:
+            current_time = self._now()
+        now = current_time.timestamp()
+        self.stats["track_b_checks"] += 1
+        
+        # slot s 는 deadline ∈ ((s-1)*res, s*res] → s-1 구간 시작이 now 이하면 도래 가능
+        horizon = math.floor(now / self._resolution) + 1
+        gaps: List[GapEvent] = []
+        while self._slot_heap and self._slot_heap[0] <= horizon:
+            slot = heapq.heappop(self._slot_heap)
+            bucket = self._wheel.pop(slot, None)
+            if not bucket:
+                continue
+            waiting: Set[str] = set()
+            for symbol in bucket:
+                self.stats["track_b_visited"] += 1
+                last = self._track_b_last_ts[symbol]
+                level = self._gap_level.get(symbol, 0)
+                if now - last < self._track_b_thresholds[level]:
+                    waiting.add(symbol)  # 경계 slot: 아직 deadline 전
+                    continue
+                del self._deadline_slot[symbol]
+                gap_event = self._track_b_event(symbol, now - last, current_time)
+                gaps.append(gap_event)
+                self._open_gaps[symbol] = gap_event
+                # 다음 severity 임계로 재등록 (critical 이후는 갱신될 때까지 대기 없음)
+                level = sum(1 for threshold in self._track_b_thresholds if now - last >= threshold)
+                self._gap_level[symbol] = level
+                if level < len(self._track_b_thresholds):
+                    self._schedule(symbol, last + self._track_b_thresholds[level])
+            if waiting:
+                self._wheel[slot] = waiting
+                heapq.heappush(self._slot_heap, slot)
+                break
+        
+        if gaps:
+            by_type = Counter(g.gap_type for g in gaps)
+            preview = ", ".join(g.symbol for g in gaps[:10]) + (" ..." if len(gaps) > 10 else "")
+            log.warning(
+                f"⚠️ Track B GAP DETECTED: {len(gaps)} symbols "
+                f"({', '.join(f'{k}={v}' for k, v in sorted(by_type.items()))}): {preview}"
+            )
+            self._log_gap_events(gaps)
+        if self._db_pending:
+            self._schedule_flush()
+        return gaps
+    
+    def _track_b_event(self, symbol: str, gap_duration: float, current_time: datetime) -> Optional[GapEvent]:
         # Check against thresholds
         if gap_duration < self.cfg.track_b_minor_threshold_seconds:
             return None
@@ -220,60 +367,107 @@ class GapDetector(TimeAwareMixin):
         else:
             gap_type = GapType.MINOR
         
-        gap_event = GapEvent(
+        return GapEvent(
             track_type=TrackType.TRACK_B.value,
             symbol=symbol,
             gap_type=gap_type.value,
             gap_duration_seconds=gap_duration,
-            last_update=last_update,
+            last_update=self._track_b_last_updates[symbol],
             detected_at=current_time,
             expected_interval_seconds=self.cfg.track_b_expected_interval_seconds
         )
-        
-        log.warning(
-            f"⚠️ Track B GAP DETECTED: {symbol} - {gap_type.value.upper()} "
-            f"({gap_duration:.0f}s since last update)"
-        )
-        
-        self._log_gap_event(gap_event)
-        return gap_event
     
-    def check_all_track_b_gaps(
-        self, 
-        current_time: Optional[datetime] = None
-    ) -> List[GapEvent]:
-        """
-        Check all Track B symbols for gaps.
-        
-        Returns:
-            List of GapEvent for all symbols with gaps
-        """
-        gaps = []
-        for symbol in list(self._track_b_last_updates.keys()):
-            gap = self.check_track_b_gap(symbol, current_time)
-            if gap:
-                gaps.append(gap)
-        return gaps
+    def _schedule(self, symbol: str, deadline: float) -> None:
+        """symbol 의 deadline slot 이동 (같은 slot 이면 no-op)"""
+        slot = math.ceil(deadline / self._resolution)
+        old = self._deadline_slot.get(symbol)
+        if old == slot:
+            return
+        if old is not None:
+            bucket = self._wheel.get(old)
+            if bucket is not None:
+                bucket.discard(symbol)
+        bucket = self._wheel.get(slot)
+        if bucket is None:
+            bucket = self._wheel[slot] = set()
+            heapq.heappush(self._slot_heap, slot)
+        bucket.add(symbol)
+        self._deadline_slot[symbol] = slot
+    
+    def _unschedule(self, symbol: str) -> None:
+        old = self._deadline_slot.pop(symbol, None)
+        if old is not None:
+            bucket = self._wheel.get(old)
+            if bucket is not None:
+                bucket.discard(symbol)
     
     # -----------------------------------------------------
     # Gap Logging
     # -----------------------------------------------------
     def _log_gap_event(self, gap_event: GapEvent) -> None:
+        """Log a single gap event (Track A)."""
+        self._log_gap_events([gap_event])
+    
+    def _log_gap_events(self, gap_events: List[GapEvent]) -> None:
         """
-        Log gap event to gap ledger JSONL file.
+        Append gap events to the gap ledger JSONL file in one write per day.
         
         File: logs/system/gap_YYYYMMDD.jsonl
         """
-        try:
+        if not gap_events:
+            return
+        self.stats["gap_events"] += len(gap_events)
+        
+        by_date: Dict[str, List[str]] = {}
+        for gap_event in gap_events:
             date_str = gap_event.detected_at.strftime("%Y%m%d")
-            ledger_file = self.gap_ledger_dir / f"gap_{date_str}.jsonl"
+            by_date.setdefault(date_str, []).append(json.dumps(gap_event.to_dict(), ensure_ascii=False) + "\n")
+        for date_str, lines in by_date.items():
+            try:
+                ledger_file = self.gap_ledger_dir / f"gap_{date_str}.jsonl"
+                
+                # Write to file
+                with open(ledger_file, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+                self.stats["ledger_writes"] += 1
             
-            # Write to file
-            with open(ledger_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(gap_event.to_dict(), ensure_ascii=False) + "\n")
+            except Exception as e:
+                log.error(f"Failed to log gap events: {e}", exc_info=True)
+    
+    def _schedule_flush(self) -> None:
+        """check tick 에서 flush_db 예약 (실행 중인 event loop 가 없거나 이미 진행 중이면 생략)"""
+        if self._db_writer is None or (self._flush_task is not None and not self._flush_task.done()):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # 동기 호출 → 호출자가 flush_db 를 직접 await
+        self._flush_task = loop.create_task(self.flush_db())
+    
+    async def flush_db(self) -> int:
+        """
+        Write queued closed gaps to scalp_gaps in one batch.
         
+        Returns:
+            Number of events saved (0 when no writer / not connected; events stay queued)
+        """
+        writer = self._db_writer
+        if writer is None or not self._db_pending or not getattr(writer, "is_connected", False):
+            return 0
+        events = list(self._db_pending)
+        self._db_pending.clear()
+        try:
+            saved = await writer.save_scalp_gaps([e.to_dict() for e in events], self.cfg.session_id)
         except Exception as e:
-            log.error(f"Failed to log gap event: {e}", exc_info=True)
+            log.warning("scalp_gaps 저장 실패: %s", e)
+            saved = False
+        if not saved:
+            # 다음 flush 에서 재시도 (maxlen 초과분은 오래된 것부터 폐기)
+            self._db_pending.extendleft(reversed(events))
+            self.stats["db_failed"] += len(events)
+            return 0
+        self.stats["db_saved"] += len(events)
+        return len(events)
 
     # -----------------------------------------------------
     # Utilities
@@ -288,11 +482,9 @@ class GapDetector(TimeAwareMixin):
             track_a_gap = (now - self._track_a_last_update).total_seconds()
         
         track_b_symbols = len(self._track_b_last_updates)
-        track_b_gaps = {}
-        for symbol, last_update in self._track_b_last_updates.items():
-            gap = (now - last_update).total_seconds()
-            if gap >= self.cfg.track_b_minor_threshold_seconds:
-                track_b_gaps[symbol] = gap
+        # 마지막 check 에서 공백으로 보고된 종목만 (전체 순회 없음)
+        now_ts = now.timestamp()
+        track_b_gaps = {symbol: now_ts - self._track_b_last_ts[symbol] for symbol in self._gap_level}
         
         return {
             "track_a_last_update": (
@@ -302,7 +494,10 @@ class GapDetector(TimeAwareMixin):
             "track_a_gap_seconds": track_a_gap,
             "track_b_monitored_symbols": track_b_symbols,
             "track_b_symbols_with_gaps": len(track_b_gaps),
-            "track_b_gaps": track_b_gaps
+            "track_b_gaps": track_b_gaps,
+            "track_b_scheduled_slots": len(self._wheel),
+            "db_pending": len(self._db_pending),
+            "stats": dict(self.stats),
         }
 
 
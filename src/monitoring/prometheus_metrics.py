@@ -14,77 +14,134 @@ Metrics Categories:
 5. Gap Metrics - Detection rate, severity distribution
 6. Rate Limiting Metrics - Token consumption, delay distribution
 7. API Metrics - Call count, latency, error rate
+
+Unified Registry:
+- MetricsRegistry / get_registry(): process-wide registry shared by this collector,
+  observer.performance_metrics (scrape-time collector), DB writer and KIS REST histograms
+- /metrics (observer.api_server) renders the registry; exposition text is cached per
+  metric family / collector block and regenerated only for series that changed
+- Each metric updates under its own lock (writers on the archive / Track A threads,
+  cross-thread cache callers) and renders from a consistent snapshot
 """
 from __future__ import annotations
 
 import asyncio
 import json
 import logging
+import threading
 import time
+from bisect import bisect_left
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, ClassVar, Dict, Iterable, List, NamedTuple, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 log = logging.getLogger("PrometheusMetrics")
 
+# Request / operation latency buckets (seconds)
+LATENCY_BUCKETS_SECONDS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _escape_label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Dict[str, str], extra: Optional[List[Tuple[str, str]]] = None) -> str:
+    """Prometheus label set 문자열 ({k="v",...}). 레이블이 없으면 빈 문자열."""
+    items = list(labels.items()) + (extra or [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in items) + "}"
+
+
+def format_value(value: float) -> str:
+    """Prometheus 샘플 값 포맷 (+Inf / -Inf / NaN 포함)"""
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "+Inf"
+    if value == float("-inf"):
+        return "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
 
 @dataclass
 class MetricCounter:
     """Counter metric (monotonically increasing)"""
+    metric_type: ClassVar[str] = "counter"
+
     name: str
     help_text: str
     value: float = 0.0
     labels: Dict[str, str] = field(default_factory=dict)
+    version: int = field(default=0, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
     
     def increment(self, amount: float = 1.0) -> None:
         """Increment counter"""
-        self.value += amount
+        with self._lock:
+            self.value += amount
+            self.version += 1
     
     def get_prometheus_format(self) -> str:
         """Get Prometheus text format"""
-        labels_str = ""
-        if self.labels:
-            items = [f'{k}="{v}"' for k, v in self.labels.items()]
-            labels_str = f"{{{','.join(items)}}}"
-        
-        return f"{self.name}{labels_str} {self.value}"
+        with self._lock:
+            value = self.value
+        return f"{self.name}{format_labels(self.labels)} {format_value(value)}"
+
+    def render_samples(self) -> List[str]:
+        return [self.get_prometheus_format()]
 
 
 @dataclass
 class MetricGauge:
     """Gauge metric (can increase or decrease)"""
+    metric_type: ClassVar[str] = "gauge"
+
     name: str
     help_text: str
     value: float = 0.0
     labels: Dict[str, str] = field(default_factory=dict)
+    version: int = field(default=0, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
     
     def set(self, value: float) -> None:
         """Set gauge value"""
-        self.value = value
+        with self._lock:
+            if value != self.value:
+                self.value = value
+                self.version += 1
     
     def increment(self, amount: float = 1.0) -> None:
         """Increment gauge"""
-        self.value += amount
+        with self._lock:
+            self.value += amount
+            self.version += 1
     
     def decrement(self, amount: float = 1.0) -> None:
         """Decrement gauge"""
-        self.value -= amount
+        with self._lock:
+            self.value -= amount
+            self.version += 1
     
     def get_prometheus_format(self) -> str:
         """Get Prometheus text format"""
-        labels_str = ""
-        if self.labels:
-            items = [f'{k}="{v}"' for k, v in self.labels.items()]
-            labels_str = f"{{{','.join(items)}}}"
-        
-        return f"{self.name}{labels_str} {self.value}"
+        with self._lock:
+            value = self.value
+        return f"{self.name}{format_labels(self.labels)} {format_value(value)}"
+
+    def render_samples(self) -> List[str]:
+        return [self.get_prometheus_format()]
 
 
 @dataclass
 class MetricHistogram:
-    """Histogram metric (distribution tracking)"""
+    """Histogram metric (distribution tracking, cumulative bucket counts)"""
+    metric_type: ClassVar[str] = "histogram"
+
     name: str
     help_text: str
     buckets: List[float] = field(default_factory=lambda: [0.001, 0.01, 0.1, 1.0, 10.0])
@@ -92,41 +149,213 @@ class MetricHistogram:
     sum_value: float = 0.0
     count: int = 0
     labels: Dict[str, str] = field(default_factory=dict)
+    version: int = field(default=0, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.buckets = sorted(self.buckets)
     
     def observe(self, value: float) -> None:
         """Record observation"""
-        self.sum_value += value
-        self.count += 1
-        
-        for bucket in self.buckets:
-            if value <= bucket:
-                self.bucket_counts[bucket] = self.bucket_counts.get(bucket, 0) + 1
+        with self._lock:
+            self.sum_value += value
+            self.count += 1
+
+            counts = self.bucket_counts
+            for bucket in self.buckets[bisect_left(self.buckets, value):]:
+                counts[bucket] = counts.get(bucket, 0) + 1
+            self.version += 1
     
     def get_prometheus_format(self) -> List[str]:
         """Get Prometheus text format"""
-        labels_str = ""
-        if self.labels:
-            items = [f'{k}="{v}"' for k, v in self.labels.items()]
-            labels_str = f"{{{','.join(items)}}}"
-        
+        # buckets / sum / count 를 같은 시점 값으로 렌더링
+        with self._lock:
+            bucket_counts = dict(self.bucket_counts)
+            sum_value = self.sum_value
+            total = self.count
+
         lines = []
         
         # Buckets
-        for bucket in sorted(self.buckets):
-            count = self.bucket_counts.get(bucket, 0)
-            le_labels = f'{{{",".join(list(self.labels.items()) + [("le", str(bucket))])}'  if self.labels else f'{{le="{bucket}"}}'
+        for bucket in self.buckets:
+            count = bucket_counts.get(bucket, 0)
+            le_labels = format_labels(self.labels, [("le", format_value(float(bucket)))])
             lines.append(f"{self.name}_bucket{le_labels} {count}")
         
         # +Inf bucket
-        inf_labels = "{le=\"+Inf\"}" if not self.labels else f'{{{",".join(self.labels.items()) + [("le", "+Inf")]}'
-        lines.append(f"{self.name}_bucket{inf_labels} {self.count}")
+        lines.append(f"{self.name}_bucket{format_labels(self.labels, [('le', '+Inf')])} {total}")
         
         # Sum and count
-        lines.append(f"{self.name}_sum{labels_str} {self.sum_value}")
-        lines.append(f"{self.name}_count{labels_str} {self.count}")
+        labels_str = format_labels(self.labels)
+        lines.append(f"{self.name}_sum{labels_str} {format_value(sum_value)}")
+        lines.append(f"{self.name}_count{labels_str} {total}")
         
         return lines
 
+    def render_samples(self) -> List[str]:
+        return self.get_prometheus_format()
+
+
+# ============================================================
+# Unified Registry
+# ============================================================
+
+class CollectedBlock(NamedTuple):
+    """
+    Scrape-time metric block supplied by a collector callback.
+
+    - key:    stable identifier (cache key)
+    - token:  change token; the block is re-rendered only when it differs
+    - render: returns the full exposition text (HELP/TYPE + samples) of the block
+    """
+    key: str
+    token: Any
+    render: Callable[[], str]
+
+
+class _Family:
+    __slots__ = ("name", "help_text", "metric_type", "series")
+
+    def __init__(self, name: str, help_text: str, metric_type: str) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.metric_type = metric_type
+        self.series: Dict[Tuple[Tuple[str, str], ...], Any] = {}
+
+
+class MetricsRegistry:
+    """
+    Process-wide Prometheus registry.
+
+    - counter() / gauge() / histogram(): get-or-create by (name, labels)
+    - register_collector(): scrape-time blocks from other metric stores
+      (e.g. observer.performance_metrics sharded histograms, status gauges)
+    - render(): exposition text, re-rendered only for series whose version / token changed;
+      the joined text is reused as-is when nothing changed since the last scrape
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._families: Dict[str, _Family] = {}
+        self._collectors: Dict[str, Callable[[], Iterable[CollectedBlock]]] = {}
+        self._block_cache: Dict[Any, Tuple[Any, str]] = {}
+        self._text_tokens: Optional[List[Tuple[Any, Any]]] = None
+        self._text = ""
+
+    # -----------------------------------------------------
+    # Registration
+    # -----------------------------------------------------
+    def _get_or_create(self, cls, name: str, help_text: str, labels: Optional[Dict[str, str]], **kwargs):
+        labels = dict(labels or {})
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = _Family(name, help_text, cls.metric_type)
+            elif family.metric_type != cls.metric_type:
+                raise ValueError(f"Metric {name} already registered as {family.metric_type}")
+            metric = family.series.get(key)
+            if metric is None:
+                metric = family.series[key] = cls(name, help_text, labels=labels, **kwargs)
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Optional[Dict[str, str]] = None) -> MetricCounter:
+        return self._get_or_create(MetricCounter, name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str, labels: Optional[Dict[str, str]] = None) -> MetricGauge:
+        return self._get_or_create(MetricGauge, name, help_text, labels)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        buckets: Optional[Iterable[float]] = None,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> MetricHistogram:
+        kwargs = {"buckets": list(buckets)} if buckets is not None else {}
+        return self._get_or_create(MetricHistogram, name, help_text, labels, **kwargs)
+
+    def register_collector(self, name: str, collect: Callable[[], Iterable[CollectedBlock]]) -> None:
+        with self._lock:
+            self._collectors[name] = collect
+
+    def unregister_collector(self, name: str) -> None:
+        with self._lock:
+            self._collectors.pop(name, None)
+
+    def get(self, name: str, labels: Optional[Dict[str, str]] = None) -> Optional[Any]:
+        family = self._families.get(name)
+        if family is None:
+            return None
+        return family.series.get(tuple(sorted((labels or {}).items())))
+
+    # -----------------------------------------------------
+    # Exposition
+    # -----------------------------------------------------
+    @staticmethod
+    def _render_family(family: _Family) -> str:
+        lines = [f"# HELP {family.name} {family.help_text}", f"# TYPE {family.name} {family.metric_type}"]
+        for metric in list(family.series.values()):
+            lines.extend(metric.render_samples())
+        return "\n".join(lines)
+
+    def render(self) -> str:
+        """Prometheus text exposition (cached per family / collector block)"""
+        with self._lock:
+            entries: List[Tuple[Any, Any, Callable[[], str]]] = []
+            for family in self._families.values():
+                token = tuple(m.version for m in family.series.values())
+                entries.append((("family", family.name), token, lambda f=family: self._render_family(f)))
+            for collector_name, collect in self._collectors.items():
+                try:
+                    for block in collect():
+                        entries.append(((collector_name, block.key), block.token, block.render))
+                except Exception as e:
+                    log.error("Metrics collector %s failed: %s", collector_name, e)
+                    self.counter("observer_metrics_errors_total", "Total metrics collection errors").increment()
+
+            tokens = [(key, token) for key, token, _ in entries]
+            if tokens == self._text_tokens:
+                return self._text
+
+            cache = self._block_cache
+            blocks = []
+            for key, token, render in entries:
+                cached = cache.get(key)
+                if cached is None or cached[0] != token:
+                    cached = cache[key] = (token, render())
+                if cached[1]:
+                    blocks.append(cached[1])
+
+            live = {key for key, _ in tokens}
+            for key in [k for k in cache if k not in live]:
+                del cache[key]
+
+            self._text_tokens = tokens
+            self._text = "\n".join(blocks) + "\n" if blocks else ""
+            return self._text
+
+
+_registry: Optional[MetricsRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> MetricsRegistry:
+    """프로세스 공용 MetricsRegistry 반환"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry()
+    return _registry
+
+
+def reset_registry() -> None:
+    """공용 레지스트리 초기화 (테스트용)"""
+    global _registry
+    with _registry_lock:
+        _registry = None
+
 
 class PrometheusMetricsCollector:
     """
@@ -142,126 +371,132 @@ class PrometheusMetricsCollector:
     - API call metrics
     """
     
-    def __init__(self) -> None:
+    def __init__(self, registry: Optional[MetricsRegistry] = None) -> None:
         self._tz = ZoneInfo("Asia/Seoul") if ZoneInfo else None
         self._start_time = time.time()
+        self._registry = registry or get_registry()
         self._metrics: Dict[str, Any] = {}
         
         self._init_metrics()
     
     def _init_metrics(self) -> None:
-        """Initialize all metrics"""
+        """Initialize all metrics (registered in the shared registry)"""
+        r = self._registry
         
         # Universe Metrics
-        self._metrics["universe_size"] = MetricGauge(
+        self._metrics["universe_size"] = r.gauge(
             "observer_universe_size",
             "Current universe size (number of symbols)"
         )
         
-        self._metrics["universe_created_total"] = MetricCounter(
+        self._metrics["universe_created_total"] = r.counter(
             "observer_universe_created_total",
             "Total symbols created"
         )
         
-        self._metrics["universe_deleted_total"] = MetricCounter(
+        self._metrics["universe_deleted_total"] = r.counter(
             "observer_universe_deleted_total",
             "Total symbols deleted"
         )
         
         # Track A Metrics
-        self._metrics["track_a_snapshots_total"] = MetricCounter(
+        self._metrics["track_a_snapshots_total"] = r.counter(
             "observer_track_a_snapshots_total",
             "Total Track A snapshots collected"
         )
         
-        self._metrics["track_a_collection_duration_seconds"] = MetricHistogram(
+        self._metrics["track_a_collection_duration_seconds"] = r.histogram(
             "observer_track_a_collection_duration_seconds",
-            "Track A collection operation duration"
+            "Track A collection operation duration",
+            buckets=LATENCY_BUCKETS_SECONDS,
         )
         
         # Track B Metrics
-        self._metrics["track_b_slots_total"] = MetricGauge(
+        self._metrics["track_b_slots_total"] = r.gauge(
             "observer_track_b_slots_total",
             "Total Track B WebSocket slots"
         )
         
-        self._metrics["track_b_slots_allocated"] = MetricGauge(
+        self._metrics["track_b_slots_allocated"] = r.gauge(
             "observer_track_b_slots_allocated",
             "Allocated Track B slots"
         )
         
-        self._metrics["track_b_triggers_total"] = MetricCounter(
+        self._metrics["track_b_triggers_total"] = r.counter(
             "observer_track_b_triggers_total",
             "Total Track B trigger events"
         )
         
-        self._metrics["track_b_collection_speed"] = MetricGauge(
+        self._metrics["track_b_collection_speed"] = r.gauge(
             "observer_track_b_collection_speed",
             "Track B collection speed (items/sec)"
         )
         
         # Token Metrics
-        self._metrics["token_refreshes_total"] = MetricCounter(
+        self._metrics["token_refreshes_total"] = r.counter(
             "observer_token_refreshes_total",
             "Total token refreshes"
         )
         
-        self._metrics["token_validity_seconds"] = MetricGauge(
+        self._metrics["token_validity_seconds"] = r.gauge(
             "observer_token_validity_seconds",
             "Current token validity (seconds remaining)"
         )
         
         # Gap Detection Metrics
-        self._metrics["gaps_detected_total"] = MetricCounter(
+        self._metrics["gaps_detected_total"] = r.counter(
             "observer_gaps_detected_total",
             "Total gaps detected"
         )
         
         self._metrics["gaps_by_severity"] = {
-            "low": MetricCounter("observer_gaps_low_total", "Low severity gaps"),
-            "medium": MetricCounter("observer_gaps_medium_total", "Medium severity gaps"),
-            "high": MetricCounter("observer_gaps_high_total", "High severity gaps"),
+            "low": r.counter("observer_gaps_low_total", "Low severity gaps"),
+            "medium": r.counter("observer_gaps_medium_total", "Medium severity gaps"),
+            "high": r.counter("observer_gaps_high_total", "High severity gaps"),
         }
         
-        self._metrics["gap_detection_duration_seconds"] = MetricHistogram(
+        self._metrics["gap_detection_duration_seconds"] = r.histogram(
             "observer_gap_detection_duration_seconds",
-            "Gap detection operation duration"
+            "Gap detection operation duration",
+            buckets=LATENCY_BUCKETS_SECONDS,
         )
         
         # Rate Limiting Metrics
-        self._metrics["rate_limit_tokens_total"] = MetricCounter(
+        self._metrics["rate_limit_tokens_total"] = r.counter(
             "observer_rate_limit_tokens_total",
             "Total tokens consumed"
         )
         
-        self._metrics["rate_limit_delays_total"] = MetricCounter(
+        self._metrics["rate_limit_delays_total"] = r.counter(
             "observer_rate_limit_delays_total",
             "Total rate limit delays"
         )
         
-        self._metrics["rate_limit_delay_duration_seconds"] = MetricHistogram(
+        self._metrics["rate_limit_delay_duration_seconds"] = r.histogram(
             "observer_rate_limit_delay_duration_seconds",
-            "Rate limit delay duration"
+            "Rate limit delay duration",
+            buckets=LATENCY_BUCKETS_SECONDS,
         )
         
         # API Metrics
-        self._metrics["api_requests_total"] = MetricCounter(
+        self._metrics["api_requests_total"] = r.counter(
             "observer_api_requests_total",
             "Total API requests"
         )
         
-        self._metrics["api_request_duration_seconds"] = MetricHistogram(
+        self._metrics["api_request_duration_seconds"] = r.histogram(
             "observer_api_request_duration_seconds",
-            "API request duration"
+            "API request duration",
+            buckets=LATENCY_BUCKETS_SECONDS,
         )
         
-        self._metrics["api_errors_total"] = MetricCounter(
+        self._metrics["api_errors_total"] = r.counter(
             "observer_api_errors_total",
             "Total API errors"
         )
         
         # System Metrics
-        self._metrics["system_uptime_seconds"] = MetricGauge(
+        self._metrics["system_uptime_seconds"] = r.gauge(
             "observer_system_uptime_seconds",
             "System uptime"
         )
@@ -381,41 +616,12 @@ class PrometheusMetricsCollector:
         Export all metrics in Prometheus text format
         
         Returns:
-            Text format suitable for Prometheus scraping
+            Text format suitable for Prometheus scraping (shared registry exposition)
         """
-        lines = []
-        
         # Update system metrics
         self.update_uptime()
         
-        lines.append("# HELP observer_universe_size Current universe size (number of symbols)")
-        lines.append("# TYPE observer_universe_size gauge")
-        
-        for name, metric in self._metrics.items():
-            if isinstance(metric, MetricCounter):
-                lines.append(f"# HELP {metric.name} {metric.help_text}")
-                lines.append(f"# TYPE {metric.name} counter")
-                lines.append(metric.get_prometheus_format())
-            
-            elif isinstance(metric, MetricGauge):
-                lines.append(f"# HELP {metric.name} {metric.help_text}")
-                lines.append(f"# TYPE {metric.name} gauge")
-                lines.append(metric.get_prometheus_format())
-            
-            elif isinstance(metric, MetricHistogram):
-                lines.append(f"# HELP {metric.name} {metric.help_text}")
-                lines.append(f"# TYPE {metric.name} histogram")
-                for line in metric.get_prometheus_format():
-                    lines.append(line)
-            
-            elif isinstance(metric, dict):  # gaps_by_severity, etc.
-                for sub_name, sub_metric in metric.items():
-                    if isinstance(sub_metric, (MetricCounter, MetricGauge)):
-                        lines.append(f"# HELP {sub_metric.name} {sub_metric.help_text}")
-                        lines.append(f"# TYPE {sub_metric.name} counter")
-                        lines.append(sub_metric.get_prometheus_format())
-        
-        return "\n".join(lines)
+        return self._registry.render()
     
     def export_json(self) -> Dict[str, Any]:
         """
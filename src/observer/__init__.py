@@ -205,6 +205,13 @@ async def run_observer_with_api(
         except Exception as e:
             log.error("Failed to initialize Universe Scheduler: %s", e)
 
+        # Track A → Track B trigger hand-off (same event loop here; channel is loop/thread agnostic)
+        trigger_channel = None
+        if track_a_enabled and track_b_enabled:
+            from trigger.snapshot_channel import SnapshotChannel
+
+            trigger_channel = SnapshotChannel()
+
         if track_a_enabled:
             try:
                 from provider import KISAuth, ProviderEngine
@@ -222,6 +229,7 @@ async def run_observer_with_api(
                     provider_engine_a,
                     config=track_a_config,
                     on_error=lambda msg: log.warning("swing Error: %s", msg),
+                    snapshot_channel=trigger_channel,
                 )
                 log.info("swing Collector configured (interval=5m)")
             except Exception as e:
@@ -245,7 +253,7 @@ async def run_observer_with_api(
                     market="kr_stocks",
                     session_id=session_id,
                     mode="DOCKER",
-                    max_slots=41,
+                    max_slots=provider_engine_b.max_ws_slots,  # 41 x KIS_WS_CONNECTIONS
                     trigger_check_interval_seconds=30,
                 )
                 scalp_collector = ScalpCollector(
@@ -253,8 +261,9 @@ async def run_observer_with_api(
                     trigger_engine=trigger_engine,
                     config=track_b_config,
                     on_error=lambda msg: log.warning("scalp Error: %s", msg),
+                    snapshot_channel=trigger_channel,
                 )
-                log.info("scalp Collector configured (max_slots=41)")
+                log.info("scalp Collector configured (max_slots=%d)", track_b_config.max_slots)
             except Exception as e:
                 log.error("Failed to initialize scalp Collector: %s", e)
     else:
@@ -1,12 +1,39 @@
 from __future__ import annotations
 
 import json
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from .contracts.pattern_record_contract import PatternRecordContract
 
+try:  # optional dependency
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+
+T = TypeVar("T")
+
+# JSONL files are read in byte ranges split at newline boundaries.
+# Only one range per in-flight chunk is held in memory.
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+
 
 class PatternLoadError(Exception):
     """Raised when pattern loader cannot read or parse input records."""
@@ -20,12 +47,99 @@ class LoadResult:
     skipped: int
 
 
+class RecordStream(Generic[T]):
+    """
+    Lazy record iterator returned by the iter_* loaders.
+
+    Counters (total_lines / loaded / skipped) reflect what has been consumed
+    so far and are final once the stream is exhausted.
+    """
+
+    def __init__(self, produce: Callable[["RecordStream[T]"], Iterator[T]]) -> None:
+        self.total_lines = 0
+        self.loaded = 0
+        self.skipped = 0
+        self._iter = produce(self)
+
+    def __iter__(self) -> "RecordStream[T]":
+        return self
+
+    def __next__(self) -> T:
+        return next(self._iter)
+
+    def close(self) -> None:
+        """Stop reading and release the file handle / worker processes."""
+        self._iter.close()
+
+    def __enter__(self) -> "RecordStream[T]":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def iter_pattern_records(
+    input_path: Union[str, Path],
+    *,
+    strict: bool = True,
+    max_records: Optional[int] = None,
+    encoding: str = "utf-8",
+    workers: int = 1,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    max_pending_chunks: Optional[int] = None,
+) -> RecordStream[PatternRecordContract]:
+    """
+    Stream PatternRecordContract in file order (same rules as load_pattern_records).
+
+    - .jsonl is read chunk by chunk, so memory stays bounded by
+      chunk_bytes * max_pending_chunks regardless of file size.
+    - workers > 1 parses chunks in a process pool. At most max_pending_chunks
+      (default: 2 * workers) chunks are in flight; no new chunk is submitted
+      until the consumer pulls, which gives backpressure. Parsed records are
+      pickled back to this process, so workers > 1 only pays off with idle
+      cores and the stdlib json parser (orjson is used when installed).
+    - The first records are yielded as soon as the first chunk is parsed.
+    - .json input is a single document and is loaded whole.
+    """
+    path = _check_input(
+        input_path, {".jsonl", ".json"}, PatternLoadError,
+        "expected .jsonl or .json",
+    )
+
+    def produce(stream: RecordStream[PatternRecordContract]) -> Iterator[PatternRecordContract]:
+        try:
+            if path.suffix.lower() == ".jsonl":
+                records = _stream_pattern_jsonl(
+                    stream, path, strict=strict, encoding=encoding, workers=workers,
+                    chunk_bytes=chunk_bytes, max_pending_chunks=max_pending_chunks,
+                )
+            else:
+                records = _stream_pattern_json(stream, path, strict=strict, encoding=encoding)
+
+            for rec in records:
+                stream.loaded += 1
+                yield rec
+                if max_records is not None and stream.loaded >= max_records:
+                    break
+
+        except PatternLoadError:
+            raise
+        except Exception as e:
+            raise PatternLoadError(f"Failed to load records from {path}: {e}") from e
+
+        if strict and stream.loaded == 0:
+            raise PatternLoadError("No valid records loaded in strict mode.")
+
+    return RecordStream(produce)
+
+
 def load_pattern_records(
     input_path: Union[str, Path],
     *,
     strict: bool = True,
     max_records: Optional[int] = None,
     encoding: str = "utf-8",
+    workers: int = 1,
 ) -> LoadResult:
     """
     Load output into PatternRecordContract.
@@ -37,96 +151,140 @@ def load_pattern_records(
         * if present, used directly
         * if absent, synthesized from top-level fields
     - _schema / _quality / _interpretation are OPTIONAL.
+
+    Materializes iter_pattern_records(); use the iterator directly to
+    process large files without holding every record in memory.
     """
-    path = Path(input_path)
+    stream = iter_pattern_records(
+        input_path,
+        strict=strict,
+        max_records=max_records,
+        encoding=encoding,
+        workers=workers,
+    )
+    records = list(stream)
 
-    if not path.exists():
-        raise PatternLoadError(f"Input file not found: {path}")
+    return LoadResult(
+        records=records,
+        total_lines=stream.total_lines,
+        loaded=stream.loaded,
+        skipped=stream.skipped,
+    )
 
-    suffix = path.suffix.lower()
-    if suffix not in {".jsonl", ".json"}:
-        raise PatternLoadError(
-            f"Unsupported input format: {suffix} (expected .jsonl or .json)"
-        )
 
-    records: List[PatternRecordContract] = []
-    total_lines = 0
-    loaded = 0
-    skipped = 0
+# =====================================================================
+# Internal helpers (Pattern Loader)
+# =====================================================================
 
-    try:
-        if suffix == ".jsonl":
-            for total_lines, raw in enumerate(
-                _iter_jsonl(path, encoding=encoding), start=1
-            ):
-                rec = _parse_one(raw, strict=strict, idx=total_lines)
-                if rec is None:
-                    skipped += 1
-                else:
-                    records.append(rec)
-                    loaded += 1
-
-                if max_records is not None and loaded >= max_records:
-                    break
+def _check_input(
+    input_path: Union[str, Path],
+    suffixes: Iterable[str],
+    error: type,
+    expected: str,
+) -> Path:
+    path = Path(input_path)
 
-        else:
-            data = _read_json(path, encoding=encoding)
-            if not isinstance(data, list):
-                raise PatternLoadError("JSON input must be a list of records.")
+    if not path.exists():
+        raise error(f"Input file not found: {path}")
 
-            total_lines = len(data)
+    suffix = path.suffix.lower()
+    if suffix not in suffixes:
+        raise error(f"Unsupported input format: {suffix} ({expected})")
+    return path
 
-            for idx, raw in enumerate(data, start=1):
-                rec = _parse_one(raw, strict=strict, idx=idx)
-                if rec is None:
-                    skipped += 1
-                else:
-                    records.append(rec)
-                    loaded += 1
 
-                if max_records is not None and loaded >= max_records:
-                    break
+def _stream_pattern_jsonl(
+    stream: RecordStream[PatternRecordContract],
+    path: Path,
+    *,
+    strict: bool,
+    encoding: str,
+    workers: int,
+    chunk_bytes: int,
+    max_pending_chunks: Optional[int],
+) -> Iterator[PatternRecordContract]:
+    base_line = 0
+    base_record = 0
+    emitted = 0
+    chunks = _iter_parsed_chunks(
+        path, _parse_pattern_chunk, (encoding, strict),
+        workers=workers, chunk_bytes=chunk_bytes, max_pending_chunks=max_pending_chunks,
+    )
+    for records, objects, lines, error in chunks:
+        for rel_record, rec in records:
+            # counters follow consumption so max_records stops them where it stops the loop
+            emitted += 1
+            stream.total_lines = base_record + rel_record
+            stream.skipped = stream.total_lines - emitted
+            yield rec
+        stream.total_lines = base_record + objects
+        stream.skipped = stream.total_lines - emitted
+
+        if error is not None:
+            kind, rel, message = error
+            if kind == "record":
+                raise PatternLoadError(f"[record {base_record + rel}] {message}")
+            raise PatternLoadError(_line_error_message(kind, base_line + rel, message))
+        base_line += lines
+        base_record += objects
+
+
+def _stream_pattern_json(
+    stream: RecordStream[PatternRecordContract],
+    path: Path,
+    *,
+    strict: bool,
+    encoding: str,
+) -> Iterator[PatternRecordContract]:
+    data = _read_json(path, encoding=encoding)
+    if not isinstance(data, list):
+        raise PatternLoadError("JSON input must be a list of records.")
+
+    stream.total_lines = len(data)
+
+    for idx, raw in enumerate(data, start=1):
+        rec = _parse_one(raw, strict=strict, idx=idx)
+        if rec is None:
+            stream.skipped += 1
+        else:
+            yield rec
 
-                    break
 
-    except PatternLoadError:
-        raise
-    except Exception as e:
-        raise PatternLoadError(f"Failed to load records from {path}: {e}") from e
+def _parse_pattern_chunk(
+    path: str, start: int, end: int, encoding: str, strict: bool
+) -> Tuple[List[Tuple[int, PatternRecordContract]], int, int, Optional[Tuple[str, int, str]]]:
+    """
+    Parse one byte range (runs in a worker process when workers > 1).
 
-    if strict and loaded == 0:
-        raise PatternLoadError("No valid records loaded in strict mode.")
+    Returns ([(record_no, record)], objects, physical_lines, error). Line and
+    record numbers are relative to the chunk; the caller rebases them.
+    """
+    records: List[Tuple[int, PatternRecordContract]] = []
+    objects = 0
+    lines = _read_chunk_lines(path, start, end)
+
+    for rel_line, line in enumerate(lines, start=1):
+        text = line.strip()
+        if not text:
+            continue
+        try:
+            obj = _loads(text, encoding)
+        except ValueError as e:
+            return records, objects, len(lines), ("json", rel_line, str(e))
 
-    return LoadResult(
-        records=records,
-        total_lines=total_lines,
-        loaded=loaded,
-        skipped=skipped,
-    )
+        if not isinstance(obj, dict):
+            return records, objects, len(lines), ("object", rel_line, "")
 
+        objects += 1
+        try:
+            rec = _parse_one(obj, strict=strict)
+        except PatternLoadError as e:
+            return records, objects, len(lines), ("record", objects, str(e))
 
-# =====================================================================
-# Internal helpers (Pattern Loader)
-# =====================================================================
+        if rec is not None:
+            records.append((objects, rec))
 
-def _iter_jsonl(path: Path, *, encoding: str) -> Iterable[Dict[str, Any]]:
-    with path.open("r", encoding=encoding) as f:
-        for line_no, line in enumerate(f, start=1):
-            text = line.strip()
-            if not text:
-                continue
-            try:
-                obj = json.loads(text)
-            except json.JSONDecodeError as e:
-                raise PatternLoadError(
-                    f"Invalid JSON at line {line_no}: {e}"
-                ) from e
-
-            if not isinstance(obj, dict):
-                raise PatternLoadError(
-                    f"JSONL record must be an object at line {line_no}"
-                )
-            yield obj
+    return records, objects, len(lines), None
 
 
 def _read_json(path: Path, *, encoding: str) -> Any:
@@ -188,12 +346,99 @@ def _parse_one(
         return None
 
 
+# =====================================================================
+# Chunked JSONL reading (shared by pattern / raw loaders)
+# =====================================================================
+
+def _iter_byte_ranges(path: Path, chunk_bytes: int) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) byte ranges of ~chunk_bytes, each ending at a newline."""
+    size = path.stat().st_size
+    with path.open("rb") as f:
+        start = 0
+        while start < size:
+            end = start + chunk_bytes
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            else:
+                end = size
+            yield start, end
+            start = end
+
+
+def _read_chunk_lines(path: str, start: int, end: int) -> List[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    lines = data.split(b"\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def _loads(text: bytes, encoding: str) -> Any:
+    if encoding.lower().replace("_", "-") not in {"utf-8", "utf8"}:
+        return json.loads(text.decode(encoding))
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # NaN / Infinity / big ints: fall back to the stdlib parser
+            pass
+    return json.loads(text)
+
+
+def _line_error_message(kind: str, line_no: int, detail: str) -> str:
+    if kind == "json":
+        return f"Invalid JSON at line {line_no}: {detail}"
+    return f"JSONL record must be an object at line {line_no}"
+
+
+def _iter_parsed_chunks(
+    path: Path,
+    parse_chunk: Callable[..., T],
+    args: Tuple[Any, ...],
+    *,
+    workers: int,
+    chunk_bytes: int,
+    max_pending_chunks: Optional[int],
+) -> Iterator[T]:
+    """
+    parse_chunk(path, start, end, *args) for each byte range, results in file order.
+
+    workers <= 1 parses in-process. Otherwise chunks go to a process pool
+    with a bounded in-flight window; the next chunk is submitted only after
+    the consumer takes the oldest result.
+    """
+    if chunk_bytes <= 0:
+        raise ValueError("chunk_bytes must be positive")
+
+    ranges = _iter_byte_ranges(path, chunk_bytes)
+    if workers <= 1 or path.stat().st_size <= chunk_bytes:
+        for start, end in ranges:
+            yield parse_chunk(str(path), start, end, *args)
+        return
+
+    window = max(1, max_pending_chunks or 2 * workers)
+    pending: Deque[Future] = deque()
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        for start, end in ranges:
+            pending.append(executor.submit(parse_chunk, str(path), start, end, *args))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 # =====================================================================
 # Raw Observation Log Loader (append-only)
 # =====================================================================
 
 from datetime import datetime, timezone
-from typing import Iterator, Tuple
 
 
 class RawLoadError(Exception):
@@ -261,27 +506,76 @@ def _extract_raw_timestamp(raw: Dict[str, Any]) -> datetime:
     )
 
 
-def _iter_jsonl_objects(
-    path: Path, *, encoding: str
-) -> Iterator[Tuple[int, Dict[str, Any]]]:
-    with path.open("r", encoding=encoding) as f:
-        for line_no, line in enumerate(f, start=1):
-            text = line.strip()
-            if not text:
-                continue
-            try:
-                obj = json.loads(text)
-            except json.JSONDecodeError as e:
-                raise RawLoadError(
-                    f"Invalid JSON at line {line_no}: {e}"
-                ) from e
-
-            if not isinstance(obj, dict):
-                raise RawLoadError(
-                    f"JSONL record must be an object at line {line_no}"
-                )
-            yield line_no, obj
+def _parse_raw_chunk(
+    path: str, start: int, end: int, encoding: str
+) -> Tuple[List[Tuple[int, datetime, Dict[str, Any]]], int, Optional[Tuple[str, int, str]]]:
+    """
+    Parse one byte range of a raw log (runs in a worker process when workers > 1).
+
+    Returns ([(relative line_no, ts_kst, payload)], physical_lines, error).
+    """
+    rows: List[Tuple[int, datetime, Dict[str, Any]]] = []
+    lines = _read_chunk_lines(path, start, end)
+
+    for rel_line, line in enumerate(lines, start=1):
+        text = line.strip()
+        if not text:
+            continue
+        try:
+            obj = _loads(text, encoding)
+        except ValueError as e:
+            return rows, len(lines), ("json", rel_line, str(e))
+
+        if not isinstance(obj, dict):
+            return rows, len(lines), ("object", rel_line, "")
+
+        try:
+            ts = _extract_raw_timestamp(obj)
+        except RawLoadError as e:
+            return rows, len(lines), ("timestamp", rel_line, str(e))
+        rows.append((rel_line, ts, obj))
+
+    return rows, len(lines), None
+
+
+def iter_observation_jsonl_records(
+    input_path: Union[str, Path],
+    *,
+    max_records: Optional[int] = None,
+    encoding: str = "utf-8",
+    workers: int = 1,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    max_pending_chunks: Optional[int] = None,
+) -> RecordStream[RawLogRecord]:
+    """
+    Stream raw observation logs in file order (see iter_pattern_records for
+    workers / chunk_bytes / max_pending_chunks).
+    """
+    path = _check_input(input_path, {".jsonl"}, RawLoadError, "expected .jsonl")
+
+    def produce(stream: RecordStream[RawLogRecord]) -> Iterator[RawLogRecord]:
+        base_line = 0
+        chunks = _iter_parsed_chunks(
+            path, _parse_raw_chunk, (encoding,),
+            workers=workers, chunk_bytes=chunk_bytes, max_pending_chunks=max_pending_chunks,
+        )
+        for rows, lines, error in chunks:
+            for rel_line, ts, raw in rows:
+                stream.total_lines = base_line + rel_line
+                stream.loaded += 1
+                yield RawLogRecord(line_no=stream.total_lines, ts_kst=ts, payload=raw)
 
+                if max_records is not None and stream.loaded >= max_records:
+                    return
+
+            if error is not None:
+                kind, rel_line, detail = error
+                if kind == "timestamp":
+                    raise RawLoadError(detail)
+                raise RawLoadError(_line_error_message(kind, base_line + rel_line, detail))
+            base_line += lines
+
+    return RecordStream(produce)
 
 
 def load_observation_jsonl_records(
@@ -289,6 +583,7 @@ def load_observation_jsonl_records(
     *,
     max_records: Optional[int] = None,
     encoding: str = "utf-8",
+    workers: int = 1,
 ) -> RawLoadResult:
     """
     Load raw observation logs.
@@ -296,35 +591,16 @@ def load_observation_jsonl_records(
     - Does NOT depend on PatternRecordContract.
     - Keeps raw payload intact for later analysis.
     """
-    path = Path(input_path)
-
-    if not path.exists():
-        raise RawLoadError(f"Input file not found: {path}")
-
-    if path.suffix.lower() != ".jsonl":
-        raise RawLoadError(
-            f"Unsupported input format: {path.suffix} (expected .jsonl)"
-        )
-
-    records: List[RawLogRecord] = []
-    total_lines = 0
-
-    for line_no, raw in _iter_jsonl_objects(path, encoding=encoding):
-        total_lines = line_no
-        ts = _extract_raw_timestamp(raw)
-        records.append(
-            RawLogRecord(
-                line_no=line_no,
-                ts_kst=ts,
-                payload=raw,
-            )
-        )
-
-        if max_records is not None and len(records) >= max_records:
-            break
+    stream = iter_observation_jsonl_records(
+        input_path,
+        max_records=max_records,
+        encoding=encoding,
+        workers=workers,
+    )
+    records = list(stream)
 
     return RawLoadResult(
         records=records,
-        total_lines=total_lines,
-        loaded=len(records),
+        total_lines=stream.total_lines,
+        loaded=stream.loaded,
     )
@@ -31,6 +31,7 @@ def run_offline_pattern_analysis(
     *,
     bucket_seconds: float = 1.0,
     max_records: Optional[int] = None,
+    workers: int = 1,
 ):
     """
     Execute Offline Analysis Pipeline.
@@ -43,6 +44,7 @@ def run_offline_pattern_analysis(
         input_path,
         strict=True,
         max_records=max_records,
+        workers=workers,
     )
 
     # 2) Time normalization
@@ -82,6 +84,7 @@ def run_replay_analysis(
     *,
     max_records: Optional[int] = None,
     enforce_monotonic: bool = False,
+    workers: int = 1,
 ) -> Dict[str, Any]:
     """
     Execute Analysis & Discovery Pipeline.
@@ -100,6 +103,7 @@ def run_replay_analysis(
         load_result: RawLoadResult = load_observation_jsonl_records(
             input_path,
             max_records=max_records,
+            workers=workers,
         )
 
         # 2) Deterministic time ordering (replay axis)
@@ -24,12 +24,13 @@ import psutil
 import threading
 import time
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from fastapi import FastAPI, Response
 from fastapi.responses import JSONResponse, PlainTextResponse
 from pydantic import BaseModel, Field
 import uvicorn
 
+from monitoring.prometheus_metrics import CollectedBlock, get_registry
 from observer.performance_metrics import get_metrics
 from observer.paths import observer_asset_dir, observer_log_dir
 from shared.timezone import now_kst
@@ -437,6 +438,46 @@ async def get_status():
     )
 
 
+def _gauge_block(name: str, help_text: str, value: Any, labels: str = "") -> CollectedBlock:
+    return CollectedBlock(name + labels, value, lambda: (
+        f"# HELP {name} {help_text}\n# TYPE {name} gauge\n{name}{labels} {value}"
+    ))
+
+
+def _status_metric_blocks() -> List[CollectedBlock]:
+    """Status tracker / system resource metrics, evaluated at scrape time."""
+    blocks = [
+        _gauge_block("observer_uptime_seconds", "Application uptime in seconds", status_tracker.get_uptime()),
+        _gauge_block(
+            "observer_ready", "Observer readiness status",
+            1 if status_tracker.is_ready() else 0,
+            f'{{state="{status_tracker.get_state()}"}}',
+        ),
+    ]
+
+    error_count = status_tracker.get_error_count()
+    blocks.append(CollectedBlock("observer_errors_total", error_count, lambda: (
+        f"# HELP observer_errors_total Total number of errors\n"
+        f"# TYPE observer_errors_total counter\n"
+        f"observer_errors_total {error_count}"
+    )))
+
+    system_metrics = get_system_metrics()
+    blocks.append(_gauge_block("system_cpu_percent", "CPU usage percentage", system_metrics.get("cpu_percent", 0)))
+    if "memory" in system_metrics and "percent" in system_metrics["memory"]:
+        blocks.append(_gauge_block(
+            "system_memory_percent", "Memory usage percentage", system_metrics["memory"]["percent"]
+        ))
+    if "disk" in system_metrics and "percent" in system_metrics["disk"]:
+        blocks.append(_gauge_block(
+            "system_disk_percent", "Disk usage percentage", system_metrics["disk"]["percent"]
+        ))
+    return blocks
+
+
+get_registry().register_collector("observer_status", _status_metric_blocks)
+
+
 @app.get("/metrics", response_class=PlainTextResponse)
 async def get_prometheus_metrics():
     """
@@ -445,91 +486,15 @@ async def get_prometheus_metrics():
     Returns metrics in Prometheus text exposition format for scraping
     by Prometheus or compatible monitoring systems.
 
+    All series come from the shared registry (monitoring.prometheus_metrics):
+    status/system gauges, observer performance counters/gauges/timing histograms,
+    DB COPY and KIS REST histograms. Only changed series are re-rendered.
+
     Returns:
         Metrics in Prometheus format
     """
-    metrics_lines = []
-
-    # Application metrics
-    uptime = status_tracker.get_uptime()
-    metrics_lines.append(f"# HELP observer_uptime_seconds Application uptime in seconds")
-    metrics_lines.append(f"# TYPE observer_uptime_seconds gauge")
-    metrics_lines.append(f"observer_uptime_seconds {uptime}")
-
-    # State metrics
-    state = status_tracker.get_state()
-    ready = 1 if status_tracker.is_ready() else 0
-    metrics_lines.append(f"# HELP observer_ready Observer readiness status")
-    metrics_lines.append(f"# TYPE observer_ready gauge")
-    metrics_lines.append(f'observer_ready{{state="{state}"}} {ready}')
-
-    # Error metrics
-    error_count = status_tracker.get_error_count()
-    metrics_lines.append(f"# HELP observer_errors_total Total number of errors")
-    metrics_lines.append(f"# TYPE observer_errors_total counter")
-    metrics_lines.append(f"observer_errors_total {error_count}")
-
-    # System metrics
-    system_metrics = get_system_metrics()
-
-    metrics_lines.append(f"# HELP system_cpu_percent CPU usage percentage")
-    metrics_lines.append(f"# TYPE system_cpu_percent gauge")
-    metrics_lines.append(f"system_cpu_percent {system_metrics.get('cpu_percent', 0)}")
-
-    if "memory" in system_metrics and "percent" in system_metrics["memory"]:
-        metrics_lines.append(f"# HELP system_memory_percent Memory usage percentage")
-        metrics_lines.append(f"# TYPE system_memory_percent gauge")
-        metrics_lines.append(f"system_memory_percent {system_metrics['memory']['percent']}")
-
-    if "disk" in system_metrics and "percent" in system_metrics["disk"]:
-        metrics_lines.append(f"# HELP system_disk_percent Disk usage percentage")
-        metrics_lines.append(f"# TYPE system_disk_percent gauge")
-        metrics_lines.append(f"system_disk_percent {system_metrics['disk']['percent']}")
-
-    # Observer-specific metrics from performance_metrics module
-    try:
-        metrics_obj = get_metrics()
-        observer_metrics = metrics_obj.get_metrics_summary()
-        
-        # Defensive: ensure observer_metrics is a dict
-        if not isinstance(observer_metrics, dict):
-            raise TypeError(f"Expected dict, got {type(observer_metrics).__name__}")
-
-        # Counters -> Prometheus counters
-        counters = observer_metrics.get("counters", {})
-        if isinstance(counters, dict):
-            for key, value in counters.items():
-                safe_key = key.replace(" ", "_").replace("-", "_").lower()
-                metrics_lines.append(f"# HELP observer_{safe_key}_total Observer counter: {key}")
-                metrics_lines.append(f"# TYPE observer_{safe_key}_total counter")
-                metrics_lines.append(f"observer_{safe_key}_total {value}")
-
-        # Gauges -> Prometheus gauges
-        gauges = observer_metrics.get("gauges", {})
-        if isinstance(gauges, dict):
-            for key, value in gauges.items():
-                safe_key = key.replace(" ", "_").replace("-", "_").lower()
-                metrics_lines.append(f"# HELP observer_{safe_key} Observer gauge: {key}")
-                metrics_lines.append(f"# TYPE observer_{safe_key} gauge")
-                metrics_lines.append(f"observer_{safe_key} {value}")
-
-        # Timing stats (export avg_ms as gauge)
-        timing_stats = observer_metrics.get("timing_stats", {})
-        if isinstance(timing_stats, dict):
-            for key, stats in timing_stats.items():
-                if isinstance(stats, dict) and "avg_ms" in stats:
-                    safe_key = key.replace(" ", "_").replace("-", "_").lower()
-                    metrics_lines.append(f"# HELP observer_{safe_key}_avg_ms Observer timing avg for {key}")
-                    metrics_lines.append(f"# TYPE observer_{safe_key}_avg_ms gauge")
-                    metrics_lines.append(f"observer_{safe_key}_avg_ms {stats['avg_ms']}")
-    except Exception as e:
-        logger.error(f"Error collecting observer metrics: {e}")
-        # Defensive: add error counter if metrics collection fails
-        metrics_lines.append(f"# HELP observer_metrics_errors_total Total metrics collection errors")
-        metrics_lines.append(f"# TYPE observer_metrics_errors_total counter")
-        metrics_lines.append(f"observer_metrics_errors_total 1")
-
-    return "\n".join(metrics_lines) + "\n"
+    get_metrics()  # observer performance collector 등록 보장
+    return get_registry().render()
 
 
 @app.get("/metrics/observer", response_model=MetricsResponse)
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import threading
 import time
@@ -10,6 +9,7 @@ from typing import List, Optional
 from dataclasses import dataclass, field
 
 from .pattern_record import PatternRecord
+from .record_encoder import encode_pattern_record
 from .snapshot import utc_now_ms
 from .log_rotation import RotationManager
 from .usage_metrics import UsageMetricsCollector
@@ -22,19 +22,31 @@ logger = logging.getLogger(__name__)
 # Buffer Configuration
 # ============================================================
 
+# High-watermark policies (active buffer full while the standby buffer is still being written)
+HIGH_WATERMARK_BLOCK = "block"  # producer waits for the standby buffer (no data loss)
+HIGH_WATERMARK_DROP = "drop"    # record is discarded and counted
+HIGH_WATERMARK_SPILL = "spill"  # record is written directly to the sink file by the producer
+HIGH_WATERMARK_POLICIES = (HIGH_WATERMARK_BLOCK, HIGH_WATERMARK_DROP, HIGH_WATERMARK_SPILL)
+
+
 @dataclass(frozen=True)
 class BufferConfig:
     """Configuration for time-based buffer flushing."""
     flush_interval_ms: float = 1000.0  # Flush interval in milliseconds
     max_buffer_size: int = 10000      # Maximum buffer size (safety limit)
     enable_buffering: bool = True      # Enable/disable buffering
+    high_watermark_policy: str = HIGH_WATERMARK_BLOCK  # block | drop | spill
+
+    def __post_init__(self) -> None:
+        if self.high_watermark_policy not in HIGH_WATERMARK_POLICIES:
+            raise ValueError(f"Unknown high_watermark_policy: {self.high_watermark_policy}")
 
 
 # ============================================================
 # In-Memory Buffer
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class BufferedRecord:
     """A buffered record with metadata."""
     record: PatternRecord
@@ -44,13 +56,16 @@ class BufferedRecord:
 
 class SnapshotBuffer:
     """
-    In-memory buffer for PatternRecords with time-based flushing.
+    In-memory double buffer for PatternRecords with time-based flushing.
     
     This buffer:
     - Accepts snapshots immediately (non-blocking)
-    - Flushes to disk at configurable time intervals
+    - Swaps the full active buffer into the standby slot in O(1) and signals
+      the flush thread; producers never perform the disk write themselves
+    - Flushes to disk at configurable time intervals (event-driven wait, no polling)
+    - Applies a high-watermark policy (block/drop/spill) when the active buffer
+      fills while the standby buffer is still being written
     - Populates buffer_depth and flush_reason metadata
-    - Does not block snapshot generation timing
     - Collects usage metrics for cost observability (Task 05)
     """
     
@@ -67,10 +82,22 @@ class SnapshotBuffer:
         self._metrics_collector = metrics_collector
         self._buffer: List[BufferedRecord] = []
         self._lock = threading.RLock()
+        self._standby_free = threading.Condition(self._lock)
         self._last_flush_ms = utc_now_ms()
         self._flush_thread: Optional[threading.Thread] = None
+        self._flush_signal = threading.Event()
         self._stop_event = threading.Event()
         self._running = False
+        
+        # Standby buffer handed to the flush thread (None = slot free)
+        self._standby: Optional[List[BufferedRecord]] = None
+        self._standby_reason = "time_based"
+        
+        # High-watermark statistics
+        self._dropped_records = 0
+        self._spilled_records = 0
+        self._stall_count = 0
+        self._stall_ms_total = 0.0
     
     def start(self) -> None:
         """Start the buffer and flush thread."""
@@ -96,6 +123,7 @@ class SnapshotBuffer:
                 extra={
                     "flush_interval_ms": self._config.flush_interval_ms,
                     "max_buffer_size": self._config.max_buffer_size,
+                    "high_watermark_policy": self._config.high_watermark_policy,
                 },
             )
     
@@ -107,6 +135,7 @@ class SnapshotBuffer:
         with self._lock:
             self._running = False
             self._stop_event.set()
+            self._flush_signal.set()
         
         if self._flush_thread and self._flush_thread.is_alive():
             self._flush_thread.join(timeout=5.0)
@@ -121,6 +150,9 @@ class SnapshotBuffer:
         Add a record to the buffer (non-blocking).
         
         This method must return immediately and not block snapshot generation.
+        When the active buffer is full it is swapped into the standby slot in O(1);
+        only the high-watermark case (standby still being written) can stall the
+        producer, and only under the ``block`` policy.
         """
         if not self._config.enable_buffering:
             # Direct write if buffering is disabled
@@ -128,69 +160,117 @@ class SnapshotBuffer:
             return
         
         current_time_ms = utc_now_ms()
+        spill = False
         
         with self._lock:
-            buffer_depth = len(self._buffer)
-            
-            # Create buffered record with metadata
-            buffered_record = BufferedRecord(
-                record=record,
-                received_at_ms=current_time_ms,
-                buffer_depth_at_time=buffer_depth,
-            )
+            if len(self._buffer) >= self._config.max_buffer_size:
+                if self._standby is None:
+                    self._swap_to_standby("buffer_full")
+                elif self._config.high_watermark_policy == HIGH_WATERMARK_BLOCK:
+                    self._wait_for_standby()
+                    self._swap_to_standby("buffer_full")
+                elif self._config.high_watermark_policy == HIGH_WATERMARK_DROP:
+                    self._dropped_records += 1
+                    get_metrics().increment_counter("records_dropped_high_watermark")
+                    return
+                else:
+                    spill = True
             
-            self._buffer.append(buffered_record)
+            buffer_depth = len(self._buffer)
+            if not spill:
+                # Create buffered record with metadata
+                self._buffer.append(BufferedRecord(
+                    record=record,
+                    received_at_ms=current_time_ms,
+                    buffer_depth_at_time=buffer_depth,
+                ))
             
             # Record usage metrics (Task 05)
             if self._metrics_collector:
                 self._metrics_collector.record_buffer_depth(buffer_depth)
-            
-            # Record performance metrics (Task 06)
-            # SAFETY: Metrics are purely observational, do NOT affect behavior
-            get_metrics().set_gauge("buffer_depth", buffer_depth)
-            get_metrics().increment_counter("records_buffered")
-            
-            # Safety check for buffer size
-            if len(self._buffer) >= self._config.max_buffer_size:
-                logger.warning(
-                    "Buffer size exceeded safety limit, forcing immediate flush",
-                    extra={"buffer_size": len(self._buffer), "max_size": self._config.max_buffer_size},
-                )
-                self._flush_buffer()
+        
+        # Record performance metrics (Task 06)
+        # SAFETY: Metrics are purely observational, do NOT affect behavior
+        metrics = get_metrics()
+        metrics.set_gauge("buffer_depth", buffer_depth)
+        metrics.increment_counter("records_buffered")
+        
+        if spill:
+            self._spilled_records += 1
+            metrics.increment_counter("records_spilled_high_watermark")
+            self._write_record_direct(record, buffer_depth=buffer_depth, flush_reason="high_watermark_spill")
+    
+    def _swap_to_standby(self, reason: str) -> None:
+        """Move the active buffer into the free standby slot and wake the flush thread (lock held)."""
+        self._standby = self._buffer
+        self._standby_reason = reason
+        self._buffer = []
+        self._last_flush_ms = utc_now_ms()
+        self._flush_signal.set()
+    
+    def _wait_for_standby(self) -> None:
+        """Block the producer until the flush thread releases the standby slot (lock held)."""
+        stall_start = time.perf_counter()
+        while self._standby is not None and self._flush_thread is not None and self._flush_thread.is_alive():
+            self._standby_free.wait(timeout=1.0)
+        if self._standby is not None:
+            # Flush thread is gone; write the standby buffer inline rather than deadlock
+            standby, reason = self._standby, self._standby_reason
+            self._standby = None
+            self._write_batch(standby, reason)
+        stall_ms = (time.perf_counter() - stall_start) * 1000
+        self._stall_count += 1
+        self._stall_ms_total += stall_ms
+        get_metrics().record_timing("buffer_producer_stall", stall_ms)
+        logger.warning(
+            "Buffer high watermark reached, producer stalled",
+            extra={"stall_ms": round(stall_ms, 3), "max_size": self._config.max_buffer_size},
+        )
     
     def _flush_loop(self) -> None:
-        """Background thread loop for time-based flushing."""
-        while self._running and not self._stop_event.is_set():
+        """Background thread loop: waits for a swap signal or the next flush deadline."""
+        interval_ms = self._config.flush_interval_ms
+        while not self._stop_event.is_set():
             try:
-                current_time_ms = utc_now_ms()
-                time_since_last_flush = current_time_ms - self._last_flush_ms
+                with self._lock:
+                    due = utc_now_ms() - self._last_flush_ms >= interval_ms
+                    if self._standby is None and self._buffer and due:
+                        self._swap_to_standby("time_based")
+                    elif due:
+                        self._last_flush_ms = utc_now_ms()
+                    batch, reason = self._standby, self._standby_reason
+                    wait_ms = max(interval_ms - (utc_now_ms() - self._last_flush_ms), 0.0)
+                    self._flush_signal.clear()
+                
+                if batch is None:
+                    self._flush_signal.wait(wait_ms / 1000.0)
+                    continue
                 
-                if time_since_last_flush >= self._config.flush_interval_ms:
-                    self._flush_buffer()
+                self._write_batch(batch, reason)
                 
-                # Sleep for a short interval to avoid busy waiting
-                sleep_time_ms = min(100.0, self._config.flush_interval_ms / 10.0)
-                self._stop_event.wait(sleep_time_ms / 1000.0)
+                with self._lock:
+                    self._standby = None
+                    self._standby_free.notify_all()
                 
             except Exception:
                 logger.exception("Error in flush loop")
                 time.sleep(1.0)  # Back off on error
     
     def _flush_buffer(self) -> None:
-        """Flush all buffered records to disk."""
+        """Flush all buffered records to disk (synchronous; used when no flush thread is running)."""
+        with self._lock:
+            if not self._buffer:
+                return
+            records_to_flush = self._buffer
+            self._buffer = []
+            self._last_flush_ms = utc_now_ms()
+        self._write_batch(records_to_flush, "time_based")
+    
+    def _write_batch(self, records_to_flush: List[BufferedRecord], flush_reason: str) -> None:
+        """Write one swapped-out buffer to disk and record flush metrics."""
         with LatencyTimer("flush_operation"):
-            with self._lock:
-                if not self._buffer:
-                    return
-                
-                # Copy buffer and clear it
-                records_to_flush = self._buffer.copy()
-                buffer_depth = len(self._buffer)
-                self._buffer.clear()
-                self._last_flush_ms = utc_now_ms()
-            
-            # Write records outside of lock to minimize blocking
-            bytes_written, records_written = self._write_records_to_disk(records_to_flush)
+            buffer_depth = len(records_to_flush)
+            bytes_written, records_written = self._write_records_to_disk(records_to_flush, flush_reason)
             
             # Record usage metrics (Task 05)
             if self._metrics_collector:
@@ -204,26 +284,33 @@ class SnapshotBuffer:
             # SAFETY: Metrics are purely observational, do NOT affect behavior
             get_metrics().increment_counter("flush_operations")
             get_metrics().increment_counter("records_flushed", records_written)
-            get_metrics().set_gauge("buffer_depth", 0)  # Reset after flush
+            get_metrics().set_gauge("buffer_depth", len(self._buffer))
             
             logger.debug(
                 "Flush completed",
-                extra={"records_flushed": len(records_to_flush)},
+                extra={"records_flushed": records_written, "flush_reason": flush_reason},
             )
     
     def _flush_remaining(self) -> None:
         """Flush any remaining records when stopping."""
         with self._lock:
+            pending = []
+            if self._standby:
+                pending.append((self._standby, self._standby_reason))
             if self._buffer:
-                records_to_flush = self._buffer.copy()
-                self._buffer.clear()
-                self._write_records_to_disk(records_to_flush)
-                logger.info(
-                    "Final flush completed",
-                    extra={"records_flushed": len(records_to_flush)},
-                )
+                pending.append((self._buffer, "time_based"))
+            self._standby = None
+            self._buffer = []
+            self._standby_free.notify_all()
+        
+        for records_to_flush, reason in pending:
+            self._write_records_to_disk(records_to_flush, reason)
+            logger.info(
+                "Final flush completed",
+                extra={"records_flushed": len(records_to_flush)},
+            )
     
-    def _write_records_to_disk(self, buffered_records: List[BufferedRecord]) -> tuple[int, int]:
+    def _write_records_to_disk(self, buffered_records: List[BufferedRecord], flush_reason: str = "time_based") -> tuple[int, int]:
         """Write buffered records to disk with metadata updates and rotation support.
         
         Returns:
@@ -235,9 +322,9 @@ class SnapshotBuffer:
         try:
             # Group records by time window if rotation is enabled
             if self._rotation_manager is not None:
-                bytes_written, records_written = self._write_records_with_rotation(buffered_records)
+                bytes_written, records_written = self._write_records_with_rotation(buffered_records, flush_reason)
             else:
-                bytes_written, records_written = self._write_records_to_single_file(buffered_records, self._sink_file_path)
+                bytes_written, records_written = self._write_records_to_single_file(buffered_records, self._sink_file_path, flush_reason)
                     
         except Exception:
             logger.exception(
@@ -247,7 +334,7 @@ class SnapshotBuffer:
         
         return bytes_written, records_written
     
-    def _write_records_with_rotation(self, buffered_records: List[BufferedRecord]) -> tuple[int, int]:
+    def _write_records_with_rotation(self, buffered_records: List[BufferedRecord], flush_reason: str = "time_based") -> tuple[int, int]:
         """Write records to appropriate files based on rotation time windows.
         
         Returns:
@@ -270,7 +357,7 @@ class SnapshotBuffer:
         
         # Write each group to its respective file
         for file_path, records in records_by_file.items():
-            bytes_written, records_written = self._write_records_to_single_file(records, file_path)
+            bytes_written, records_written = self._write_records_to_single_file(records, file_path, flush_reason)
             total_bytes += bytes_written
             total_records += records_written
         
@@ -291,7 +378,7 @@ class SnapshotBuffer:
         
         return total_bytes, total_records
     
-    def _write_records_to_single_file(self, buffered_records: List[BufferedRecord], file_path: str) -> tuple[int, int]:
+    def _write_records_to_single_file(self, buffered_records: List[BufferedRecord], file_path: str, flush_reason: str = "time_based") -> tuple[int, int]:
         """Write buffered records to a single file with metadata updates.
         
         Returns:
@@ -299,60 +386,32 @@ class SnapshotBuffer:
         """
         bytes_written = 0
         
-        with open(file_path, "a", encoding="utf-8") as f:
+        with open(file_path, "ab") as f:
             for buffered_record in buffered_records:
-                record = buffered_record.record
-                
-                # Create a copy of the record with updated metadata
-                # Since PatternRecord is frozen, we need to create a new one
-                updated_metadata = record.metadata.copy()
-                updated_metadata['buffer_depth'] = buffered_record.buffer_depth_at_time
-                updated_metadata['flush_reason'] = "time_based"
-                
-                # Create new record with updated metadata
-                from .pattern_record import PatternRecord
-                updated_record = PatternRecord(
-                    snapshot=record.snapshot,
-                    regime_tags=record.regime_tags,
-                    condition_tags=record.condition_tags,
-                    outcome_labels=record.outcome_labels,
-                    metadata=updated_metadata,
+                # PatternRecord는 frozen이므로 재생성하지 않고 인코딩 시점에 metadata만 덮어쓴다
+                line = encode_pattern_record(
+                    buffered_record.record,
+                    {"buffer_depth": buffered_record.buffer_depth_at_time, "flush_reason": flush_reason},
                 )
-                
-                # Write to file
-                line = json.dumps(updated_record.to_dict(), ensure_ascii=False) + "\n"
                 f.write(line)
-                bytes_written += len(line.encode('utf-8'))
+                bytes_written += len(line)
         
         return bytes_written, len(buffered_records)
     
-    def _write_record_direct(self, record: PatternRecord) -> None:
-        """Write a single record directly to disk (no buffering) with rotation support."""
+    def _write_record_direct(self, record: PatternRecord, buffer_depth: int = 0, flush_reason: str = "direct") -> None:
+        """Write a single record directly to disk (no buffering / high-watermark spill) with rotation support."""
         try:
-            # Update metadata for direct write
-            updated_metadata = record.metadata.copy()
-            updated_metadata['buffer_depth'] = 0
-            updated_metadata['flush_reason'] = "direct"
-            
-            # Create new record with updated metadata
-            from .pattern_record import PatternRecord
-            updated_record = PatternRecord(
-                snapshot=record.snapshot,
-                regime_tags=record.regime_tags,
-                condition_tags=record.condition_tags,
-                outcome_labels=record.outcome_labels,
-                metadata=updated_metadata,
-            )
-            
             # Determine target file path based on rotation
             if self._rotation_manager is not None:
                 target_file_path = str(self._rotation_manager.get_current_file_path())
             else:
                 target_file_path = self._sink_file_path
             
-            with open(target_file_path, "a", encoding="utf-8") as f:
+            with open(target_file_path, "ab") as f:
                 f.write(
-                    json.dumps(updated_record.to_dict(), ensure_ascii=False) + "\n"
+                    encode_pattern_record(
+                        record, {"buffer_depth": buffer_depth, "flush_reason": flush_reason}
+                    )
                 )
                 
         except Exception:
@@ -379,11 +438,17 @@ class SnapshotBuffer:
         with self._lock:
             return {
                 "buffer_size": len(self._buffer),
+                "standby_size": len(self._standby) if self._standby is not None else 0,
                 "max_buffer_size": self._config.max_buffer_size,
                 "flush_interval_ms": self._config.flush_interval_ms,
+                "high_watermark_policy": self._config.high_watermark_policy,
                 "last_flush_ms": self._last_flush_ms,
                 "running": self._running,
                 "time_since_last_flush_ms": utc_now_ms() - self._last_flush_ms if self._last_flush_ms > 0 else 0,
+                "dropped_records": self._dropped_records,
+                "spilled_records": self._spilled_records,
+                "producer_stall_count": self._stall_count,
+                "producer_stall_ms_total": self._stall_ms_total,
             }
     
     def set_metrics_collector(self, collector: UsageMetricsCollector) -> None:
@@ -38,6 +38,7 @@ class BufferedJsonlFileSink(SnapshotSink):
         flush_interval_ms: float = 1000.0,
         max_buffer_size: int = 10000,
         enable_buffering: bool = True,
+        high_watermark_policy: str = "block",
         rotation_config: Optional[RotationConfig] = None,
     ) -> None:
         """
@@ -48,6 +49,7 @@ class BufferedJsonlFileSink(SnapshotSink):
             flush_interval_ms: Time-based flush interval in milliseconds
             max_buffer_size: Maximum buffer size (safety limit)
             enable_buffering: Enable/disable buffering
+            high_watermark_policy: Policy when both buffers are full (block | drop | spill)
             rotation_config: Time-based rotation configuration (optional)
         """
         self.filename = filename
@@ -58,6 +60,7 @@ class BufferedJsonlFileSink(SnapshotSink):
             flush_interval_ms=flush_interval_ms,
             max_buffer_size=max_buffer_size,
             enable_buffering=enable_buffering,
+            high_watermark_policy=high_watermark_policy,
         )
         
         # Rotation setup
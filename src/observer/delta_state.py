@@ -0,0 +1,191 @@
+"""
+delta_state.py
+
+역할 요약:
+- build_snapshot()의 단기 delta(computed) 계산용 상태 저장소.
+- (session_id, symbol) 키별로 직전 가격/거래량을 보관한다.
+  → 여러 종목의 틱이 섞여 들어와도 price_delta_short 가 종목 간에 계산되지 않는다.
+- OrderedDict 기반 LRU: 조회/갱신 O(1), 비활성 종목은 max_keys 초과 시 자동 제거.
+- Track A / Track B 스레드가 동시에 호출해도 안전하도록 단일 Lock으로 보호한다.
+
+선택 통계 (기본 비활성):
+- price_ewma  : 지수이동평균 가격 (ewma_alpha 지정 시)
+- tick_count / tick_volume : 키별 누적 틱 수와 누적 체결량
+  (volume 입력은 누적 거래량으로 간주, 증가분만 합산)
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+def _is_number(x: Any) -> bool:
+    return isinstance(x, (int, float)) and not isinstance(x, bool)
+
+
+def _price_value(price: Any) -> Any:
+    """inputs["price"] 가 숫자 또는 {"current"/"close": ...} dict 인 경우 모두 지원"""
+    if isinstance(price, dict):
+        price = price.get("current", price.get("close"))
+    return price
+
+
+class _SymbolState:
+    __slots__ = ("last_price", "last_volume", "price_ewma", "tick_count", "tick_volume")
+
+    def __init__(self) -> None:
+        self.last_price: Optional[float] = None
+        self.last_volume: Optional[float] = None
+        self.price_ewma: Optional[float] = None
+        self.tick_count = 0
+        self.tick_volume = 0
+
+
+class DeltaStateStore:
+    """
+    (session_id, symbol) 키별 delta 상태 저장소 (LRU, thread-safe)
+    """
+
+    def __init__(
+        self,
+        max_keys: int = 4096,
+        ewma_alpha: Optional[float] = None,
+        track_tick_volume: bool = False,
+    ):
+        """
+        Args:
+            max_keys: 유지할 최대 (session_id, symbol) 키 수 (초과 시 가장 오래 미사용 키 제거)
+            ewma_alpha: price_ewma 평활 계수 (0 < alpha <= 1). None이면 계산하지 않음
+            track_tick_volume: tick_count / tick_volume 누적 여부
+        """
+        if max_keys <= 0:
+            raise ValueError("max_keys must be positive")
+        if ewma_alpha is not None and not 0 < ewma_alpha <= 1:
+            raise ValueError("ewma_alpha must be in (0, 1]")
+
+        self._max_keys = max_keys
+        self._ewma_alpha = ewma_alpha
+        self._track_tick_volume = track_tick_volume
+
+        self._states: "OrderedDict[Tuple[Optional[str], Optional[str]], _SymbolState]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 통계
+        self._updates = 0
+        self._evictions = 0
+
+    def update(
+        self,
+        inputs: Dict[str, Any],
+        *,
+        session_id: Optional[str] = None,
+        symbol: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        inputs의 price / volume 으로 키별 상태를 갱신하고 computed 필드를 반환한다.
+
+        - 판단/플래그 없음, 숫자값만 기록
+        - 키의 첫 관측값은 delta 0
+        """
+        price = _price_value(inputs.get("price"))
+        volume = inputs.get("volume")
+        has_price = _is_number(price)
+        has_volume = _is_number(volume)
+
+        computed: Dict[str, Any] = {}
+        if not has_price and not has_volume:
+            return computed
+
+        key = (session_id, symbol)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = _SymbolState()
+                self._states[key] = state
+                if len(self._states) > self._max_keys:
+                    self._states.popitem(last=False)
+                    self._evictions += 1
+            else:
+                self._states.move_to_end(key)
+            self._updates += 1
+
+            # ---- price delta ----
+            if has_price:
+                last = state.last_price
+                computed["price_delta_short"] = price - last if last is not None else 0
+                state.last_price = price
+
+                if self._ewma_alpha is not None:
+                    ewma = state.price_ewma
+                    ewma = price if ewma is None else ewma + self._ewma_alpha * (price - ewma)
+                    state.price_ewma = ewma
+                    computed["price_ewma"] = ewma
+
+            # ---- volume delta ----
+            if has_volume:
+                last = state.last_volume
+                delta = volume - last if last is not None else 0
+                computed["volume_delta_short"] = delta
+                state.last_volume = volume
+
+                if self._track_tick_volume and delta > 0:
+                    state.tick_volume += delta
+
+            if self._track_tick_volume:
+                state.tick_count += 1
+                computed["tick_count"] = state.tick_count
+                computed["tick_volume"] = state.tick_volume
+
+        return computed
+
+    def reset(self, session_id: Optional[str] = None) -> None:
+        """전체 또는 특정 세션의 상태 제거"""
+        with self._lock:
+            if session_id is None:
+                self._states.clear()
+                return
+            for key in [k for k in self._states if k[0] == session_id]:
+                del self._states[key]
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """통계 정보 반환"""
+        with self._lock:
+            return {
+                "keys": len(self._states),
+                "max_keys": self._max_keys,
+                "updates": self._updates,
+                "evictions": self._evictions,
+                "ewma_alpha": self._ewma_alpha,
+                "track_tick_volume": self._track_tick_volume,
+            }
+
+
+# ============================================================
+# Global store (process-wide default)
+# ============================================================
+
+_delta_state_store: Optional[DeltaStateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_delta_state_store() -> DeltaStateStore:
+    """프로세스 공용 DeltaStateStore 반환 (최초 호출 시 생성)"""
+    global _delta_state_store
+    if _delta_state_store is None:
+        with _store_lock:
+            if _delta_state_store is None:
+                _delta_state_store = DeltaStateStore()
+    return _delta_state_store
+
+
+def reset_delta_state_store() -> None:
+    """공용 저장소 초기화 (테스트용)"""
+    global _delta_state_store
+    with _store_lock:
+        _delta_state_store = None
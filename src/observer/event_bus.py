@@ -19,12 +19,12 @@ Observer-Core에서 생성된 PatternRecord를
   실제 파일 시스템 구조를 추론하지 않는다.
 """
 
-import json
 import logging
 from abc import ABC, abstractmethod
 from typing import Iterable, List, Optional
 
 from .pattern_record import PatternRecord
+from .record_encoder import encode_pattern_record
 from .log_rotation import RotationConfig, RotationManager, create_rotation_config, validate_rotation_config
 from observer.paths import observer_asset_dir, observer_asset_file
 
@@ -141,10 +141,8 @@ class JsonlFileSink(SnapshotSink):
                 if current_file_path != self.file_path:
                     self.file_path = current_file_path
             
-            with open(self.file_path, "a", encoding="utf-8") as f:
-                f.write(
-                    json.dumps(record.to_dict(), ensure_ascii=False) + "\n"
-                )
+            with open(self.file_path, "ab") as f:
+                f.write(encode_pattern_record(record))
         except Exception:
             # 파일 기록 실패는 Observer 전체를 멈추지 않는다.
             logger.exception(
@@ -31,6 +31,7 @@ from provider import KISAuth, ProviderEngine
 from collector.swing_collector import SwingCollector, SwingConfig
 from collector.scalp_collector import ScalpCollector, ScalpConfig
 from trigger.trigger_engine import TriggerEngine, TriggerConfig
+from trigger.snapshot_channel import SnapshotChannel
 from slot.slot_manager import SlotManager
 from datetime import datetime, timezone
 import asyncio
@@ -164,6 +165,11 @@ def run_observer_with_api():
     # Start scalp Collector in background if enabled
     swing_collector = None
     track_a_enabled = os.environ.get("TRACK_A_ENABLED", "true").lower() in ("true", "1", "yes")
+    track_b_enabled = os.environ.get("TRACK_B_ENABLED", "false").lower() in ("true", "1", "yes")
+
+    # Track A → Track B trigger hand-off (collectors run in separate threads / event loops)
+    trigger_channel = SnapshotChannel() if track_a_enabled and track_b_enabled else None
+
     if track_a_enabled and kis_app_key and kis_app_secret:
         log.info("Swing Collector will be enabled")
         try:
@@ -187,7 +193,8 @@ def run_observer_with_api():
                 provider_engine_a,
                 config=track_a_config,
                 universe_dir=str(universe_dir),
-                on_error=lambda msg: log.warning(f"Swing Error: {msg}")
+                on_error=lambda msg: log.warning(f"Swing Error: {msg}"),
+                snapshot_channel=trigger_channel,
             )
             log.info("Swing Collector configured: 5-minute interval (universe_dir=%s)", universe_dir)
         except Exception as e:
@@ -197,7 +204,6 @@ def run_observer_with_api():
 
     # Start Scalp Collector in background if enabled
     scalp_collector = None
-    track_b_enabled = os.environ.get("TRACK_B_ENABLED", "false").lower() in ("true", "1", "yes")
     if track_b_enabled and kis_app_key and kis_app_secret:
         log.info("Scalp Collector will be enabled")
         try:
@@ -215,7 +221,7 @@ def run_observer_with_api():
                 market="kr_stocks",
                 session_id=session_id,
                 mode="DOCKER",
-                max_slots=41,
+                max_slots=provider_engine_b.max_ws_slots,  # 41 x KIS_WS_CONNECTIONS
                 trigger_check_interval_seconds=30
             )
             
@@ -223,9 +229,10 @@ def run_observer_with_api():
                 provider_engine_b,
                 trigger_engine=trigger_engine,
                 config=track_b_config,
-                on_error=lambda msg: log.warning(f"Scalp Error: {msg}")
+                on_error=lambda msg: log.warning(f"Scalp Error: {msg}"),
+                snapshot_channel=trigger_channel,
             )
-            log.info("Scalp Collector configured: WebSocket real-time (41 slots)")
+            log.info(f"Scalp Collector configured: WebSocket real-time ({track_b_config.max_slots} slots)")
         except Exception as e:
             log.error(f"Failed to initialize Scalp Collector: {e}")
     else:
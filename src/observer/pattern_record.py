@@ -27,7 +27,7 @@ from .snapshot import ObservationSnapshot
 # Pattern Record (Observer Output Asset)
 # ============================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PatternRecord:
     """
     Observer-Core 최종 데이터 자산 단위
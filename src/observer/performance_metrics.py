@@ -37,18 +37,138 @@ Constraints from observer_scalp_task_06_performance_monitoring.md:
 - Additive field changes only
 """
 
+import itertools
 import time
 import threading
-from datetime import datetime, timezone
-from typing import Dict, Any, Optional
-from collections import defaultdict, deque
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 
 from shared.timezone import now_kst
+from monitoring.prometheus_metrics import CollectedBlock, format_value, get_registry
 
 logger = logging.getLogger(__name__)
 
 
+# ============================================================
+# Log-bucket histogram
+# ============================================================
+
+# HDR 스타일 log-linear 버킷 경계 (ms): 1µs ~ 100s, decade 당 11개
+_BUCKET_MANTISSAS = (1, 1.5, 2, 2.5, 3, 4, 5, 6, 7, 8, 9)
+TIMING_BUCKET_BOUNDS_MS: Tuple[float, ...] = tuple(
+    float(f"{m}e{e}") for e in range(-3, 5) for m in _BUCKET_MANTISSAS
+) + (1e5,)
+
+# Prometheus 노출용 경계 (TIMING_BUCKET_BOUNDS_MS 의 부분집합: decade 당 1 / 2.5 / 5)
+EXPOSITION_BUCKET_BOUNDS_MS: Tuple[float, ...] = tuple(
+    float(f"{m}e{e}") for e in range(-3, 5) for m in (1, 2.5, 5)
+) + (1e5,)
+
+# Prometheus histogram 경계 (seconds)
+EXPOSITION_BUCKET_BOUNDS_SECONDS: Tuple[float, ...] = tuple(round(b / 1000, 12) for b in EXPOSITION_BUCKET_BOUNDS_MS)
+
+# 샤드 간 "가장 최근 값" 판정용 전역 시퀀스 (next()는 GIL 하에서 원자적)
+_sequence = itertools.count(1)
+
+
+class LogHistogram:
+    """
+    Fixed log-bucket histogram for latency values in milliseconds.
+
+    - record() is O(log buckets) with no allocation and no timestamp strings
+    - merge() combines per-thread shards at scrape time
+    - quantile() interpolates inside the matching bucket (clamped to min/max)
+    """
+
+    __slots__ = ("counts", "count", "sum_ms", "min_ms", "max_ms", "latest_ms", "latest_seq")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(TIMING_BUCKET_BOUNDS_MS) + 1)  # 마지막 = overflow
+        self.count = 0
+        self.sum_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = float("-inf")
+        self.latest_ms = 0.0
+        self.latest_seq = 0
+
+    def record(self, value_ms: float) -> None:
+        self.counts[bisect_left(TIMING_BUCKET_BOUNDS_MS, value_ms)] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        if value_ms < self.min_ms:
+            self.min_ms = value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+        self.latest_ms = value_ms
+        self.latest_seq = next(_sequence)
+
+    def merge(self, other: "LogHistogram") -> None:
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.count += other.count
+        self.sum_ms += other.sum_ms
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+        if other.latest_seq > self.latest_seq:
+            self.latest_ms = other.latest_ms
+            self.latest_seq = other.latest_seq
+
+    def quantile(self, q: float) -> float:
+        """q (0~1) 분위수 추정값 (ms)"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, c in enumerate(self.counts):
+            if not c:
+                continue
+            if cumulative + c >= rank:
+                lower = TIMING_BUCKET_BOUNDS_MS[i - 1] if i > 0 else 0.0
+                upper = TIMING_BUCKET_BOUNDS_MS[i] if i < len(TIMING_BUCKET_BOUNDS_MS) else self.max_ms
+                value = lower + (upper - lower) * ((rank - cumulative) / c)
+                return min(max(value, self.min_ms), self.max_ms)
+            cumulative += c
+        return self.max_ms
+
+    def cumulative_counts(self, bounds: Tuple[float, ...] = EXPOSITION_BUCKET_BOUNDS_MS) -> List[int]:
+        """bounds 각각에 대한 누적(le) 카운트. bounds는 TIMING_BUCKET_BOUNDS_MS 의 부분집합이어야 한다."""
+        out: List[int] = []
+        cumulative = 0
+        i = 0
+        for bound in bounds:
+            stop = bisect_left(TIMING_BUCKET_BOUNDS_MS, bound) + 1
+            while i < stop:
+                cumulative += self.counts[i]
+                i += 1
+            out.append(cumulative)
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "latest_ms": self.latest_ms,
+            "avg_ms": self.sum_ms / self.count if self.count else 0.0,
+            "min_ms": self.min_ms if self.count else 0.0,
+            "max_ms": self.max_ms if self.count else 0.0,
+            "p50_ms": self.quantile(0.50),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+        }
+
+
+class _Shard:
+    """Per-thread metric storage (written only by its owner thread)."""
+
+    __slots__ = ("counters", "timings")
+
+    def __init__(self) -> None:
+        self.counters: Dict[str, int] = {}
+        self.timings: Dict[str, LogHistogram] = {}
+
+
 class PerformanceMetrics:
     """
     Internal performance metrics container for Observer operations.
@@ -61,7 +181,9 @@ class PerformanceMetrics:
     - Must NOT be accessed: External systems, decision engines
     
     All metrics are purely observational and do NOT influence behavior.
-    Thread-safe for concurrent access during high-frequency operations.
+    Thread-safe for concurrent access during high-frequency operations:
+    counters and timings are written to per-thread shards without locking
+    and merged only when a summary is requested (scrape time).
     
     NON-PERSISTENCE:
     - All metrics are IN-MEMORY ONLY
@@ -70,53 +192,125 @@ class PerformanceMetrics:
     """
     
     def __init__(self, max_history: int = 1000):
-        self._lock = threading.RLock()
+        # max_history: 이전 deque 기반 구현과의 호환용 (histogram 은 전체 구간을 누적)
         self._max_history = max_history
         
-        # Counters (monotonically increasing)
-        self._counters = defaultdict(int)
-        
-        # Gauges (current values)
-        self._gauges = defaultdict(float)
+        # Per-thread shards (counters + timing histograms)
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()  # 샤드 등록 / 병합 시에만 사용
         
-        # Timing data (recent history)
-        self._timings = defaultdict(lambda: deque(maxlen=max_history))
+        # Gauges (current values, last writer wins)
+        self._gauges: Dict[str, float] = {}
         
         # Start time for uptime calculation
         self._start_time = time.time()
     
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard()
+            self._local.shard = shard
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+    
     def increment_counter(self, name: str, value: int = 1) -> None:
         """Increment a counter metric."""
-        with self._lock:
-            self._counters[name] += value
+        counters = self._shard().counters
+        counters[name] = counters.get(name, 0) + value
     
     def set_gauge(self, name: str, value: float) -> None:
         """Set a gauge metric value."""
-        with self._lock:
-            self._gauges[name] = value
+        self._gauges[name] = value
     
     def record_timing(self, name: str, duration_ms: float) -> None:
         """Record a timing measurement in milliseconds."""
-        with self._lock:
-            self._timings[name].append({
-                "duration_ms": duration_ms,
-                "timestamp": now_kst().isoformat()
-            })
+        timings = self._shard().timings
+        hist = timings.get(name)
+        if hist is None:
+            hist = timings[name] = LogHistogram()
+        hist.record(duration_ms)
+    
+    def record_timing_ns(self, name: str, duration_ns: int) -> None:
+        """Record a timing measurement in nanoseconds (perf_counter_ns delta)."""
+        self.record_timing(name, duration_ns / 1_000_000)
+    
+    def _merged(self) -> Tuple[Dict[str, int], Dict[str, LogHistogram]]:
+        counters: Dict[str, int] = {}
+        timings: Dict[str, LogHistogram] = {}
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            # dict 복사는 GIL 하에서 원자적 → 소유 스레드의 동시 삽입과 충돌하지 않는다
+            for name, value in list(shard.counters.items()):
+                counters[name] = counters.get(name, 0) + value
+            for name, hist in list(shard.timings.items()):
+                merged = timings.get(name)
+                if merged is None:
+                    merged = timings[name] = LogHistogram()
+                merged.merge(hist)
+        return counters, timings
+    
+    def get_counter(self, name: str) -> int:
+        """Get merged counter value across all threads."""
+        total = 0
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            total += shard.counters.get(name, 0)
+        return total
     
     def get_snapshot_count(self) -> int:
         """Get total number of snapshots processed."""
-        with self._lock:
-            return self._counters["snapshots_processed"]
+        return self.get_counter("snapshots_processed")
     
     def get_buffer_depth(self) -> float:
         """Get current buffer depth gauge."""
-        with self._lock:
-            return self._gauges["buffer_depth"]
+        return self._gauges.get("buffer_depth", 0.0)
     
     def get_uptime_seconds(self) -> float:
         """Get observer uptime in seconds."""
         return time.time() - self._start_time
     
+    def get_timing_histograms(self) -> Dict[str, LogHistogram]:
+        """Get merged timing histograms (copies) keyed by metric name."""
+        return self._merged()[1]
+    
+    def prometheus_blocks(self) -> List[CollectedBlock]:
+        """
+        Scrape-time blocks for the shared Prometheus registry.
+        
+        - counters -> observer_<name>_total
+        - gauges   -> observer_<name>
+        - timings  -> observer_<name>_duration_seconds histogram (+ legacy observer_<name>_avg_ms gauge)
+        """
+        counters, timings = self._merged()
+        blocks: List[CollectedBlock] = []
+        
+        for key, value in counters.items():
+            metric = f"observer_{_safe_key(key)}_total"
+            blocks.append(CollectedBlock(metric, value, lambda m=metric, k=key, v=value: (
+                f"# HELP {m} Observer counter: {k}\n# TYPE {m} counter\n{m} {v}"
+            )))
+        
+        for key, value in list(self._gauges.items()):
+            metric = f"observer_{_safe_key(key)}"
+            blocks.append(CollectedBlock(metric, value, lambda m=metric, k=key, v=value: (
+                f"# HELP {m} Observer gauge: {k}\n# TYPE {m} gauge\n{m} {format_value(v)}"
+            )))
+        
+        for key, hist in timings.items():
+            if hist.count:
+                metric = f"observer_{_safe_key(key)}"
+                blocks.append(CollectedBlock(
+                    metric + "_duration_seconds",
+                    (hist.count, hist.sum_ms),
+                    lambda m=metric, k=key, h=hist: _render_timing(m, k, h),
+                ))
+        
+        return blocks
+    
     def get_metrics_summary(self) -> Dict[str, Any]:
         """
         Get comprehensive metrics summary for external access.
@@ -124,27 +318,37 @@ class PerformanceMetrics:
         Returns:
             Dictionary containing all current metrics
         """
-        with self._lock:
-            # Calculate timing statistics
-            timing_stats = {}
-            for name, history in self._timings.items():
-                if history:
-                    durations = [entry["duration_ms"] for entry in history]
-                    timing_stats[name] = {
-                        "count": len(durations),
-                        "latest_ms": durations[-1],
-                        "avg_ms": sum(durations) / len(durations),
-                        "min_ms": min(durations),
-                        "max_ms": max(durations)
-                    }
-            
-            return {
-                "timestamp": now_kst().isoformat(),
-                "uptime_seconds": self.get_uptime_seconds(),
-                "counters": dict(self._counters),
-                "gauges": dict(self._gauges),
-                "timing_stats": timing_stats
-            }
+        counters, timings = self._merged()
+        timing_stats = {name: hist.stats() for name, hist in timings.items() if hist.count}
+        
+        return {
+            "timestamp": now_kst().isoformat(),
+            "uptime_seconds": self.get_uptime_seconds(),
+            "counters": counters,
+            "gauges": dict(self._gauges),
+            "timing_stats": timing_stats
+        }
+
+
+def _safe_key(key: str) -> str:
+    return key.replace(" ", "_").replace("-", "_").lower()
+
+
+def _render_timing(metric: str, key: str, hist: LogHistogram) -> str:
+    name = f"{metric}_duration_seconds"
+    lines = [
+        f"# HELP {name} Observer timing for {key}",
+        f"# TYPE {name} histogram",
+    ]
+    for bound, cumulative in zip(EXPOSITION_BUCKET_BOUNDS_SECONDS, hist.cumulative_counts()):
+        lines.append(f'{name}_bucket{{le="{bound!r}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{le="+Inf"}} {hist.count}')
+    lines.append(f"{name}_sum {format_value(hist.sum_ms / 1000)}")
+    lines.append(f"{name}_count {hist.count}")
+    lines.append(f"# HELP {metric}_avg_ms Observer timing avg for {key}")
+    lines.append(f"# TYPE {metric}_avg_ms gauge")
+    lines.append(f"{metric}_avg_ms {format_value(hist.sum_ms / hist.count)}")
+    return "\n".join(lines)
 
 
 # Global metrics instance (singleton pattern for Observer)
@@ -160,6 +364,8 @@ def get_metrics() -> PerformanceMetrics:
     global _global_metrics
     if _global_metrics is None:
         _global_metrics = PerformanceMetrics()
+        # /metrics 공용 레지스트리에 scrape 시점 병합 블록으로 노출
+        get_registry().register_collector("observer_performance", _global_metrics.prometheus_blocks)
     return _global_metrics
 
 
@@ -171,6 +377,7 @@ def reset_metrics() -> None:
     """
     global _global_metrics
     _global_metrics = None
+    get_registry().unregister_collector("observer_performance")
 
 
 class LatencyTimer:
@@ -196,10 +403,9 @@ class LatencyTimer:
         self.start_time = None
     
     def __enter__(self):
-        self.start_time = time.time()
+        self.start_time = time.perf_counter_ns()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.start_time is not None:
-            duration_ms = (time.time() - self.start_time) * 1000
-            get_metrics().record_timing(self.metric_name, duration_ms)
+            get_metrics().record_timing_ns(self.metric_name, time.perf_counter_ns() - self.start_time)
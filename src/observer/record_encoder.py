@@ -0,0 +1,242 @@
+"""
+record_encoder.py
+
+역할 요약:
+- PatternRecord / ObservationSnapshot 을 JSONL 한 줄(bytes)로 직렬화하는 전용 인코더.
+- 고정 스키마(Meta / Context / Observation)는 미리 인코딩해 둔 키 조각으로 바로 조립하고,
+  자유 형식 dict(inputs/computed/state/metadata 등)만 캐시된 JSONEncoder에 위임한다.
+- buffer_depth / flush_reason 같은 flush 시점 metadata는 PatternRecord를 다시 만들지 않고
+  metadata 위에 덮어써서 인코딩한다.
+
+Backend:
+- "json"   (기본값): 표준 라이브러리 기반. 기존 경로
+               json.dumps(record.to_dict(), ensure_ascii=False) + "\\n" 과 바이트 단위로 동일.
+- "orjson" (선택):   orjson 이 설치된 경우 OBSERVER_JSONL_BACKEND=orjson 으로 활성화.
+               값은 동일하지만 구분자 공백이 없는 compact 포맷이므로 바이트 동일성은 보장하지 않는다.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from dataclasses import asdict, fields
+from json.encoder import encode_basestring
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .pattern_record import PatternRecord
+from .snapshot import Context, Meta, ObservationSnapshot
+
+try:  # optional dependency
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+BACKEND_JSON = "json"
+BACKEND_ORJSON = "orjson"
+
+# json.dumps(..., ensure_ascii=False) 는 호출마다 JSONEncoder 를 새로 만든다 → 1회 생성 후 재사용
+_ENCODER = json.JSONEncoder(ensure_ascii=False)
+_encode = _ENCODER.encode
+
+_INFINITY = float("inf")
+
+
+def _float_str(value: float) -> str:
+    # json.encoder 의 floatstr 과 동일한 규칙 (NaN/Infinity 허용)
+    if value != value:
+        return "NaN"
+    if value == _INFINITY:
+        return "Infinity"
+    if value == -_INFINITY:
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+def _scalar(value: Any) -> str:
+    """고정 스키마 필드 값 인코딩 (대부분 str / int / float / None)"""
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    cls = type(value)
+    if cls is str:
+        return encode_basestring(value)
+    if cls is int:
+        return int.__repr__(value)
+    if cls is float:
+        return _float_str(value)
+    return _encode(value)
+
+
+def _field_prefixes(cls: type) -> Tuple[Tuple[str, str], ...]:
+    """dataclass 필드 순서(asdict 순서)대로 '"name": ' 조각을 미리 만든다."""
+    out = []
+    for i, f in enumerate(fields(cls)):
+        sep = "" if i == 0 else ", "
+        out.append((f.name, f'{sep}{encode_basestring(f.name)}: '))
+    return tuple(out)
+
+
+_META_FIELDS = _field_prefixes(Meta)
+_CONTEXT_FIELDS = _field_prefixes(Context)
+
+
+def _encode_fixed(obj: Any, prefixes: Tuple[Tuple[str, str], ...]) -> str:
+    parts = ["{"]
+    for name, prefix in prefixes:
+        parts.append(prefix)
+        parts.append(_scalar(getattr(obj, name)))
+    parts.append("}")
+    return "".join(parts)
+
+
+def _snapshot_json(snapshot: ObservationSnapshot) -> str:
+    obs = snapshot.observation
+    return (
+        '{"meta": ' + _encode_fixed(snapshot.meta, _META_FIELDS)
+        + ', "context": ' + _encode_fixed(snapshot.context, _CONTEXT_FIELDS)
+        + ', "observation": {"inputs": ' + _encode(obs.inputs)
+        + ', "computed": ' + _encode(obs.computed)
+        + ', "state": ' + _encode(obs.state)
+        + "}}"
+    )
+
+
+def _merged_metadata(record: PatternRecord, overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not overrides:
+        return record.metadata
+    # dict.copy() + 키 대입과 동일한 키 순서 (기존 키 위치 유지, 새 키는 뒤에 추가)
+    return {**record.metadata, **overrides}
+
+
+# ============================================================
+# stdlib backend
+# ============================================================
+
+def _encode_record_json(record: PatternRecord, overrides: Optional[Dict[str, Any]] = None) -> bytes:
+    line = (
+        '{"snapshot": ' + _snapshot_json(record.snapshot)
+        + ', "regime_tags": ' + _encode(record.regime_tags)
+        + ', "condition_tags": ' + _encode(record.condition_tags)
+        + ', "outcome_labels": ' + _encode(record.outcome_labels)
+        + ', "metadata": ' + _encode(_merged_metadata(record, overrides))
+        + "}\n"
+    )
+    return line.encode("utf-8")
+
+
+def _encode_snapshot_json(snapshot: ObservationSnapshot) -> bytes:
+    return (_snapshot_json(snapshot) + "\n").encode("utf-8")
+
+
+# ============================================================
+# orjson backend (optional)
+# ============================================================
+
+def _fixed_dict(obj: Any, prefixes: Tuple[Tuple[str, str], ...]) -> Dict[str, Any]:
+    return {name: getattr(obj, name) for name, _ in prefixes}
+
+
+def _snapshot_dict(snapshot: ObservationSnapshot) -> Dict[str, Any]:
+    # asdict() 와 달리 내부 dict 를 deep copy 하지 않는다 (orjson 이 바로 직렬화)
+    obs = snapshot.observation
+    return {
+        "meta": _fixed_dict(snapshot.meta, _META_FIELDS),
+        "context": _fixed_dict(snapshot.context, _CONTEXT_FIELDS),
+        "observation": {"inputs": obs.inputs, "computed": obs.computed, "state": obs.state},
+    }
+
+
+def _encode_record_orjson(record: PatternRecord, overrides: Optional[Dict[str, Any]] = None) -> bytes:
+    return orjson.dumps(
+        {
+            "snapshot": _snapshot_dict(record.snapshot),
+            "regime_tags": record.regime_tags,
+            "condition_tags": record.condition_tags,
+            "outcome_labels": record.outcome_labels,
+            "metadata": _merged_metadata(record, overrides),
+        },
+        option=orjson.OPT_APPEND_NEWLINE,
+    )
+
+
+def _encode_snapshot_orjson(snapshot: ObservationSnapshot) -> bytes:
+    return orjson.dumps(_snapshot_dict(snapshot), option=orjson.OPT_APPEND_NEWLINE)
+
+
+# ============================================================
+# Public API
+# ============================================================
+
+_BACKENDS: Dict[str, Tuple[Callable[..., bytes], Callable[[ObservationSnapshot], bytes]]] = {
+    BACKEND_JSON: (_encode_record_json, _encode_snapshot_json),
+}
+if orjson is not None:
+    _BACKENDS[BACKEND_ORJSON] = (_encode_record_orjson, _encode_snapshot_orjson)
+
+_backend = BACKEND_JSON
+_encode_record_impl, _encode_snapshot_impl = _BACKENDS[BACKEND_JSON]
+
+
+def available_backends() -> List[str]:
+    return list(_BACKENDS)
+
+
+def get_backend() -> str:
+    return _backend
+
+
+def set_backend(name: str) -> str:
+    """
+    인코더 backend 선택.
+
+    orjson 이 설치되지 않은 상태에서 "orjson" 을 요청하면 경고 후 "json" 으로 남는다.
+
+    Returns:
+        실제 적용된 backend 이름
+    """
+    global _backend, _encode_record_impl, _encode_snapshot_impl
+
+    if name not in _BACKENDS:
+        if name == BACKEND_ORJSON:
+            logger.warning("orjson backend requested but orjson is not installed; using json")
+            name = BACKEND_JSON
+        else:
+            raise ValueError(f"Unknown JSONL encoder backend: {name!r}")
+
+    _backend = name
+    _encode_record_impl, _encode_snapshot_impl = _BACKENDS[name]
+    return _backend
+
+
+def encode_pattern_record(record: PatternRecord, metadata_overrides: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    PatternRecord 를 JSONL 한 줄(bytes, 개행 포함)로 인코딩한다.
+
+    Args:
+        record: 인코딩할 레코드 (수정하지 않음)
+        metadata_overrides: metadata 위에 덮어쓸 값 (예: buffer_depth / flush_reason)
+    """
+    try:
+        return _encode_record_impl(record, metadata_overrides)
+    except TypeError:
+        # 값 안에 dataclass 등 비표준 객체가 있는 경우: 기존 asdict 경로로 처리
+        data = asdict(record)
+        data["metadata"] = _merged_metadata(record, metadata_overrides)
+        return (json.dumps(data, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def encode_snapshot(snapshot: ObservationSnapshot) -> bytes:
+    """ObservationSnapshot 을 JSONL 한 줄(bytes, 개행 포함)로 인코딩한다."""
+    try:
+        return _encode_snapshot_impl(snapshot)
+    except TypeError:
+        return (json.dumps(asdict(snapshot), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+set_backend(os.environ.get("OBSERVER_JSONL_BACKEND", BACKEND_JSON))
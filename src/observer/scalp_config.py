@@ -58,6 +58,7 @@ class BufferConfig:
     flush_interval_ms: float = 1000.0
     max_buffer_size: int = 10000
     enable_buffering: bool = True
+    high_watermark_policy: str = "block"  # block | drop | spill
 
 
 @dataclass(frozen=True)
@@ -112,6 +113,9 @@ class ConfigValidator:
         
         if config.max_buffer_size <= 0:
             raise ValueError("buffer.max_buffer_size must be positive")
+        
+        if config.high_watermark_policy not in ["block", "drop", "spill"]:
+            raise ValueError("buffer.high_watermark_policy must be one of block, drop, spill")
     
     @staticmethod
     def validate_rotation(config: RotationConfig) -> None:
@@ -172,6 +176,7 @@ def load_config_from_dict(config_dict: Optional[Dict[str, Any]] = None) -> Scalp
         flush_interval_ms=buffer_dict.get("flush_interval_ms", 1000.0),
         max_buffer_size=buffer_dict.get("max_buffer_size", 10000),
         enable_buffering=buffer_dict.get("enable_buffering", True),
+        high_watermark_policy=buffer_dict.get("high_watermark_policy", "block"),
     )
     
     rotation_config = RotationConfig(
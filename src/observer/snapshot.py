@@ -18,13 +18,7 @@ import uuid
 
 from shared.timezone import KST, now_kst
 
-
-# ============================================================
-# Short-term State Cache (module-local, minimal)
-# ============================================================
-
-_last_price: Optional[float] = None
-_last_volume: Optional[float] = None
+from .delta_state import DeltaStateStore, get_delta_state_store
 
 
 # ============================================================
@@ -47,6 +41,14 @@ def kst_now_ms() -> int:
     return int(now_kst().timestamp() * 1000)
 
 
+def utc_now_ms() -> int:
+    """
+    현재 시간을 epoch milliseconds로 반환한다.
+    - 버퍼 flush / usage metrics 등 내부 타이밍 계산용 (epoch 값이므로 타임존 무관)
+    """
+    return int(datetime.now(timezone.utc).timestamp() * 1000)
+
+
 def new_run_id() -> str:
     """
     Snapshot 단위의 고유 ID를 생성한다.
@@ -59,7 +61,7 @@ def new_run_id() -> str:
 # Meta
 # ============================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Meta:
     """
     Snapshot 메타 정보 (언제/어떤 세션에서 기록됐는가)
@@ -99,7 +101,7 @@ class Meta:
 # Context
 # ============================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Context:
     """
     관측 컨텍스트 (관측 성격)
@@ -121,7 +123,7 @@ class Context:
 # Observation
 # ============================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Observation:
     """
     판단 없는 순수 관측 데이터
@@ -139,7 +141,7 @@ class Observation:
 # Observation Snapshot (Contract Unit)
 # ============================================================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ObservationSnapshot:
     """
     Observer Core - Minimal Observation Unit (Contract v1.0.0)
@@ -162,40 +164,22 @@ class ObservationSnapshot:
 # Internal helpers
 # ============================================================
 
-def _is_number(x: Any) -> bool:
-    return isinstance(x, (int, float)) and not isinstance(x, bool)
-
-
-def _compute_short_deltas(inputs: Dict[str, Any]) -> Dict[str, Any]:
+def _compute_short_deltas(
+    inputs: Dict[str, Any],
+    *,
+    session_id: Optional[str] = None,
+    symbol: Optional[str] = None,
+    store: Optional[DeltaStateStore] = None,
+) -> Dict[str, Any]:
     """
     직전 관측값 기준 단기 delta 계산
     - 판단/플래그 없음
     - 숫자값만 기록
+    - 직전 값은 (session_id, symbol) 키별로 보관 (종목 간 delta 혼입 없음)
     """
-    global _last_price, _last_volume
-
-    computed: Dict[str, Any] = {}
-
-    price = inputs.get("price")
-    volume = inputs.get("volume")
-
-    # ---- price delta ----
-    if _is_number(price):
-        if _last_price is not None:
-            computed["price_delta_short"] = price - _last_price
-        else:
-            computed["price_delta_short"] = 0
-        _last_price = price
-
-    # ---- volume delta ----
-    if _is_number(volume):
-        if _last_volume is not None:
-            computed["volume_delta_short"] = volume - _last_volume
-        else:
-            computed["volume_delta_short"] = 0
-        _last_volume = volume
-
-    return computed
+    if store is None:
+        store = get_delta_state_store()
+    return store.update(inputs, session_id=session_id, symbol=symbol)
 
 
 # ============================================================
@@ -222,6 +206,7 @@ def build_snapshot(
     tick_source: Optional[str] = None,
     buffer_depth: Optional[int] = None,
     flush_reason: Optional[str] = None,
+    delta_state: Optional[DeltaStateStore] = None,
 ) -> ObservationSnapshot:
     """
     초보자용 스냅샷 생성 함수 (권장 사용법)
@@ -242,10 +227,18 @@ def build_snapshot(
     포인트:
     - computed/state는 없으면 자동으로 빈 dict 처리된다.
     - timestamp / timestamp_ms / run_id 는 자동 생성된다(안전).
+    - delta_state를 넘기면 (session_id, symbol)별 단기 delta
+      (price_delta_short / volume_delta_short 등)를 computed에 채운다.
+      호출자가 넘긴 computed 값이 우선한다.
     """
     computed = computed or {}
     state = state or {}
 
+    if delta_state is not None:
+        deltas = _compute_short_deltas(inputs, session_id=session_id, symbol=symbol, store=delta_state)
+        if deltas:
+            computed = {**deltas, **computed}
+
     meta = Meta(
         timestamp=kst_now_iso(),
         timestamp_ms=kst_now_ms(),
@@ -10,16 +10,29 @@ from .kis import (
     KISAuth,
     KISRestProvider,
     KISWebSocketProvider,
+    KISWebSocketPool,
     RateLimiter,
+    AppKeyRateLimiter,
+    RequestPriority,
+    get_rate_limiter,
+    rest_priority,
     MarketDataContract,
 )
 from .provider_engine import ProviderEngine
+from .request_cache import ProviderCacheConfig, RequestCache
 
 __all__ = [
     "KISAuth",
     "KISRestProvider",
     "KISWebSocketProvider",
+    "KISWebSocketPool",
     "RateLimiter",
+    "AppKeyRateLimiter",
+    "RequestPriority",
+    "get_rate_limiter",
+    "rest_priority",
     "MarketDataContract",
     "ProviderEngine",
+    "ProviderCacheConfig",
+    "RequestCache",
 ]
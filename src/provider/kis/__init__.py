@@ -4,14 +4,31 @@ from __future__ import annotations
 KIS Provider Package Initialization
 """
 
+from .http_profile import ConnectorProfile
 from .kis_auth import KISAuth
 from .kis_rest_provider import KISRestProvider, RateLimiter
+from .rate_limit_service import AppKeyRateLimiter, RequestPriority, get_rate_limiter, rest_priority
 from .kis_websocket_provider import KISWebSocketProvider, MarketDataContract
+from .realtime_parser import ExecutionTick, parse_execution_frame
+from .subscription_reconciler import ReconcileResult, SubscriptionReconciler
+from .websocket_pool import ApprovalKeyCredential, KISWebSocketPool, create_websocket_provider
 
 __all__ = [
+    "ConnectorProfile",
     "KISAuth",
     "KISRestProvider",
     "RateLimiter",
+    "AppKeyRateLimiter",
+    "RequestPriority",
+    "get_rate_limiter",
+    "rest_priority",
     "KISWebSocketProvider",
     "MarketDataContract",
+    "ExecutionTick",
+    "parse_execution_frame",
+    "ReconcileResult",
+    "SubscriptionReconciler",
+    "ApprovalKeyCredential",
+    "KISWebSocketPool",
+    "create_websocket_provider",
 ]
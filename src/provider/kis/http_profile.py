@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+"""
+http_profile.py
+
+HTTP connector profile and lean decoding for KIS market-data REST traffic
+
+Responsibilities:
+- ConnectorProfile: TCPConnector / ClientTimeout settings tuned for a sustained
+  ~20 req/s workload against a single host (keep-alive, DNS cache, per-host limit),
+  overridable through KIS_HTTP_* environment variables
+- Per-request timing via aiohttp TraceConfig:
+  connect (new TCP/TLS connection only), TTFB (request start → response headers)
+  and connection reuse counts, exported to the shared metrics registry
+- LeanDecoder: pulls a fixed set of flat string fields out of a KIS JSON body
+  without building the full ~80-field dict; returns None (caller falls back to
+  a full JSON parse, orjson when installed) whenever the body is not in the
+  expected compact form
+
+Environment overrides (ConnectorProfile.from_env):
+- KIS_HTTP_LIMIT, KIS_HTTP_LIMIT_PER_HOST, KIS_HTTP_DNS_TTL,
+  KIS_HTTP_KEEPALIVE, KIS_HTTP_CONNECT_TIMEOUT, KIS_HTTP_READ_TIMEOUT, KIS_HTTP_TOTAL_TIMEOUT
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, fields
+from typing import Dict, Iterable, Optional, Tuple
+
+import aiohttp
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+from monitoring.prometheus_metrics import LATENCY_BUCKETS_SECONDS, MetricHistogram, get_registry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ConnectorProfile:
+    """Connection pool / timeout settings for one aiohttp session."""
+
+    limit: int = 40  # total pooled connections
+    limit_per_host: int = 24  # > 20 req/s with sub-second latency
+    ttl_dns_cache: int = 300  # seconds
+    keepalive_timeout: float = 30.0  # idle keep-alive per connection
+    connect_timeout: float = 3.0  # TCP + TLS handshake
+    sock_read_timeout: float = 10.0
+    total_timeout: float = 15.0
+    enable_cleanup_closed: bool = True
+
+    _ENV = {
+        "limit": "KIS_HTTP_LIMIT",
+        "limit_per_host": "KIS_HTTP_LIMIT_PER_HOST",
+        "ttl_dns_cache": "KIS_HTTP_DNS_TTL",
+        "keepalive_timeout": "KIS_HTTP_KEEPALIVE",
+        "connect_timeout": "KIS_HTTP_CONNECT_TIMEOUT",
+        "sock_read_timeout": "KIS_HTTP_READ_TIMEOUT",
+        "total_timeout": "KIS_HTTP_TOTAL_TIMEOUT",
+    }
+
+    @classmethod
+    def from_env(cls) -> "ConnectorProfile":
+        """기본값 + KIS_HTTP_* 환경변수 오버라이드"""
+        overrides = {}
+        types = {f.name: f.type for f in fields(cls)}
+        for name, env in cls._ENV.items():
+            raw = os.getenv(env)
+            if raw:
+                try:
+                    overrides[name] = int(raw) if types[name] in ("int", int) else float(raw)
+                except ValueError:
+                    logger.warning("Ignoring invalid %s=%r", env, raw)
+        return cls(**overrides)
+
+    def build_session(self, trace: bool = True) -> aiohttp.ClientSession:
+        """이 프로파일로 ClientSession 생성 (현재 event loop에 바인딩)"""
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=True,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=self.enable_cleanup_closed,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self.total_timeout,
+            sock_connect=self.connect_timeout,
+            sock_read=self.sock_read_timeout,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            trace_configs=[request_timing_trace()] if trace else None,
+        )
+
+
+# ============================================================
+# Request timing
+# ============================================================
+
+_histograms: Dict[Tuple[str, str], MetricHistogram] = {}
+
+
+def _timing_histogram(phase: str, endpoint: str) -> MetricHistogram:
+    key = (phase, endpoint)
+    hist = _histograms.get(key)
+    if hist is None:
+        hist = get_registry().histogram(
+            f"observer_kis_http_{phase}_seconds",
+            f"KIS REST {phase} time",
+            buckets=LATENCY_BUCKETS_SECONDS,
+            labels={"endpoint": endpoint},
+        )
+        _histograms[key] = hist
+    return hist
+
+
+def observe_parse(endpoint: str, seconds: float) -> None:
+    """응답 본문 디코딩 시간 기록 (TraceConfig 로는 측정할 수 없어 호출부에서 기록)"""
+    _timing_histogram("parse", endpoint).observe(seconds)
+
+
+def request_timing_trace() -> aiohttp.TraceConfig:
+    """connect / TTFB / 연결 재사용을 기록하는 TraceConfig"""
+    registry = get_registry()
+    created = registry.counter("observer_kis_http_connections_created_total", "New KIS REST connections")
+    reused = registry.counter("observer_kis_http_connections_reused_total", "KIS REST requests on a pooled connection")
+
+    async def on_request_start(session, ctx, params):
+        ctx.start = time.perf_counter()
+        ctx.endpoint = params.url.path.rsplit("/", 1)[-1] or "root"
+
+    async def on_connection_create_start(session, ctx, params):
+        ctx.connect_start = time.perf_counter()
+
+    async def on_connection_create_end(session, ctx, params):
+        created.increment()
+        _timing_histogram("connect", ctx.endpoint).observe(time.perf_counter() - ctx.connect_start)
+
+    async def on_connection_reuseconn(session, ctx, params):
+        reused.increment()
+
+    async def on_request_end(session, ctx, params):
+        # fired once response headers are received
+        _timing_histogram("ttfb", ctx.endpoint).observe(time.perf_counter() - ctx.start)
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_request_start)
+    trace.on_connection_create_start.append(on_connection_create_start)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace.on_request_end.append(on_request_end)
+    return trace
+
+
+# ============================================================
+# Lean decoding
+# ============================================================
+
+class LeanDecoder:
+    """
+    Extract a fixed set of flat string fields ("key":"value") from a KIS JSON body.
+
+    KIS quotation responses are compact JSON whose output values are all strings,
+    so the wanted fields are collected in one regex scan over the raw bytes
+    instead of materialising every field of the response.
+    """
+
+    __slots__ = ("_pattern", "_required")
+
+    def __init__(self, keys: Iterable[str], required: Iterable[str] = ("rt_cd",)) -> None:
+        alternation = b"|".join(re.escape(k.encode("ascii")) for k in keys)
+        self._pattern = re.compile(rb'"(' + alternation + rb')":"([^"]*)"')
+        self._required = tuple(required)
+
+    def decode(self, body: bytes) -> Optional[Dict[str, str]]:
+        """필드 추출. 예상 형식이 아니면 None (호출부에서 json 전체 파싱으로 fallback)"""
+        result: Dict[str, str] = {}
+        for match in self._pattern.finditer(body):
+            value = match.group(2)
+            if b"\\" in value:
+                return None  # escaped characters → full parse
+            result[match.group(1).decode("ascii")] = value.decode("utf-8")
+        for key in self._required:
+            if key not in result:
+                return None
+        return result
+
+
+def parse_json(body: bytes) -> Dict:
+    """전체 JSON 파싱 (LeanDecoder fallback, orjson 설치 시 사용)"""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
@@ -8,7 +8,7 @@ KIS (Korea Investment & Securities) OAuth 2.0 Authentication Module
 Responsibilities:
 - OAuth 2.0 token issuance and renewal (Memory-First)
 - Singleton pattern for shared access across the project
-- Persistent aiohttp session management (Connection Pooling)
+- Persistent aiohttp session management (Connection Pooling, one session per event loop)
 - Proactive validation with 1-hour buffer
 - Emergency 401 refresh support
 """
@@ -17,11 +17,15 @@ import asyncio
 import json
 import logging
 import os
+import weakref
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Optional
 import aiohttp
 
+from .http_profile import ConnectorProfile
+from .rate_limit_service import RequestPriority, get_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,7 +36,7 @@ class KISAuth:
     Features:
     - Thread-safe Singleton access via get_instance()
     - Memory-only token storage (No file caching/locking)
-    - Persistent aiohttp session for optimized network performance
+    - Persistent aiohttp session per event loop (ConnectorProfile keep-alive pool)
     - Strict memory-based validation
     """
     
@@ -96,8 +100,13 @@ class KISAuth:
         self.cache_dir = kis_token_cache_dir()
         self.cache_file = self.cache_dir / "token_cache.json"
 
-        # Session state (Singleton Session)
-        self._session: Optional[aiohttp.ClientSession] = None
+        # Session state: the singleton is shared by Track A / Track B / universe
+        # scheduler threads, each running its own event loop, and an aiohttp
+        # session is bound to the loop that created it → one session per loop.
+        self.connector_profile = ConnectorProfile.from_env()
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+            weakref.WeakKeyDictionary()
+        )
         self._refresh_lock = asyncio.Lock()
         
         # Validation
@@ -108,10 +117,14 @@ class KISAuth:
         logger.info(f"KISAuth Singleton initialized (mode={'virtual' if is_virtual else 'real'})")
 
     async def get_session(self) -> aiohttp.ClientSession:
-        """Get or create a persistent aiohttp session."""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
+        """Get or create the persistent aiohttp session for the running event loop."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = self.connector_profile.build_session()
+            self._sessions[loop] = session
+            logger.debug(f"KISAuth session created ({self.connector_profile})")
+        return session
 
     def _load_cached_token(self) -> Optional[Dict[str, str]]:
         """Load cached token from file if valid."""
@@ -223,6 +236,7 @@ class KISAuth:
         
         for attempt in range(max_retries + 1):
             try:
+                await get_rate_limiter(self.app_key).acquire(RequestPriority.EMERGENCY)
                 session = await self.get_session()
                 async with session.post(url, headers=headers, json=data) as response:
                     result = await response.json()
@@ -296,6 +310,7 @@ class KISAuth:
             "secretkey": self.app_secret,
         }
         
+        await get_rate_limiter(self.app_key).acquire(RequestPriority.EMERGENCY)
         session = await self.get_session()
         async with session.post(url, headers=headers, json=data) as response:
             result = await response.json()
@@ -305,7 +320,8 @@ class KISAuth:
             raise RuntimeError(f"Approval key request failed: {result}")
 
     async def close(self) -> None:
-        """Cleanup singleton session."""
-        if self._session and not self._session.closed:
-            await self._session.close()
-            logger.info("KISAuth singleton session closed")
+        """Cleanup the session owned by the running event loop."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session and not session.closed:
+            await session.close()
+            logger.info("KISAuth session closed")
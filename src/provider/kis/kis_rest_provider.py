@@ -8,9 +8,11 @@ KIS REST API Provider for Market Data
 Responsibilities:
 - Fetch current price data (FHKST01010100)
 - Fetch daily historical prices (FHKST01010400)
-- Rate limiting with conservative settings (15 req/sec, 900 req/min)
+- Fetch current prices for up to 30 symbols per request (FHKST11300006, multi-price)
+- Rate limiting via the process-wide per-app-key limiter (rate_limit_service)
 - Error handling and retry logic with exponential backoff
 - Data normalization to MarketDataContract
+- Lean decoding of inquire-price bodies + connect/TTFB/parse timings (http_profile.py)
 
 Official KIS API Rate Limits (2023.01.11):
 - REST API: 20 requests/sec, 1,000 requests/min, 500,000 requests/day
@@ -18,9 +20,10 @@ Official KIS API Rate Limits (2023.01.11):
 - GitHub samples: https://github.com/koreainvestment/open-trading-api
 
 Implementation Notes:
-- Using conservative limits (15/sec, 900/min) to prevent burst traffic errors
-- Token bucket algorithm with asyncio locks for concurrency
-- Exponential backoff on rate limit errors (429)
+- All providers for one app key share a single token budget (18/sec, 950/min by default)
+  across threads/event loops, with priority classes (see rate_limit_service.py)
+- Rate limit errors (429 / EGW00201) are reported to the shared limiter, which cuts the
+  rate for the whole app key (AIMD); successes raise it back towards the ceiling
 - Automatic token refresh on 401 errors
 
 Reference:
@@ -30,19 +33,71 @@ Reference:
 
 import asyncio
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List, Optional
 import aiohttp
 
+from monitoring.prometheus_metrics import LATENCY_BUCKETS_SECONDS, MetricHistogram, get_registry
+
+from .http_profile import LeanDecoder, observe_parse, orjson, parse_json
 from .kis_auth import KISAuth
+from .rate_limit_service import AppKeyRateLimiter, RequestPriority, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 
+def _rest_latency_histogram(endpoint: str) -> MetricHistogram:
+    """KIS REST 요청 지연 히스토그램 (공용 레지스트리, endpoint 레이블)"""
+    return get_registry().histogram(
+        "observer_api_request_duration_seconds",
+        "API request duration",
+        buckets=LATENCY_BUCKETS_SECONDS,
+        labels={"endpoint": endpoint},
+    )
+
+
+# _normalize_current_price 가 사용하는 필드만 (inquire-price 응답 ~80 필드 중)
+_PRICE_FIELDS = ("stck_prpr", "stck_oprc", "stck_hgpr", "stck_lwpr", "acml_vol", "bidp1", "askp1")
+_price_decoder = LeanDecoder(("rt_cd", "msg1") + _PRICE_FIELDS)
+
+
+def _decode_price_body(body: bytes) -> Dict:
+    """
+    inquire-price 응답 디코딩.
+
+    orjson 이 설치되어 있으면 전체 파싱이 더 빠르므로 그대로 사용하고,
+    아니면 lean 추출 (예상 형식이 아니면 json 전체 파싱으로 fallback).
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    flat = _price_decoder.decode(body)
+    if flat is None:
+        return parse_json(body)
+    return {
+        "rt_cd": flat.pop("rt_cd"),
+        "msg1": flat.pop("msg1", ""),
+        "output": flat,
+    }
+
+
+def _is_rate_limited(status: int, data: Dict) -> bool:
+    """KIS 유량 제한 응답 여부 (HTTP 429 / EGW00201 '초당 거래건수를 초과하였습니다.')"""
+    if status == 429:
+        return True
+    if data.get("msg_cd") == "EGW00201":
+        return True
+    error_msg = data.get("msg1") or ""
+    return "초당" in error_msg or "초과" in error_msg
+
+
 class RateLimiter:
     """
-    Token bucket rate limiter for KIS API.
+    Token bucket rate limiter for KIS API (per-instance, legacy).
+
+    KISRestProvider now defaults to the shared AppKeyRateLimiter; this class is
+    kept for callers/tests that want an isolated budget.
     
     Official KIS API Rate Limits (as of 2023.01.11):
     - REST API: 20 requests/sec, 1,000 requests/min, 500,000 requests/day
@@ -68,30 +123,28 @@ class RateLimiter:
         self.second_tokens = requests_per_second
         self.minute_tokens = requests_per_minute
         
-        # Last refill times
-        from zoneinfo import ZoneInfo
-        self.last_second_refill = datetime.now(ZoneInfo("Asia/Seoul"))
-        self.last_minute_refill = datetime.now(ZoneInfo("Asia/Seoul"))
+        # Last refill times (monotonic)
+        self.last_second_refill = time.monotonic()
+        self.last_minute_refill = self.last_second_refill
         
-        # Lock for thread safety
+        # Lock for FIFO ordering of waiters on one event loop
         self._lock = asyncio.Lock()
         
         logger.info(f"RateLimiter initialized: {requests_per_second} req/sec, {requests_per_minute} req/min")
     
-    async def acquire(self) -> None:
-        """Wait until a request can be made within rate limits."""
+    async def acquire(self, priority=None) -> None:
+        """Wait until a request can be made within rate limits (priority is ignored)."""
         async with self._lock:
             while True:
-                from zoneinfo import ZoneInfo
-                now = datetime.now(ZoneInfo("Asia/Seoul"))
+                now = time.monotonic()
                 
                 # Refill second bucket
-                if (now - self.last_second_refill).total_seconds() >= 1.0:
+                if now - self.last_second_refill >= 1.0:
                     self.second_tokens = self.rps_limit
                     self.last_second_refill = now
                 
                 # Refill minute bucket
-                if (now - self.last_minute_refill).total_seconds() >= 60.0:
+                if now - self.last_minute_refill >= 60.0:
                     self.minute_tokens = self.rpm_limit
                     self.last_minute_refill = now
                 
@@ -101,8 +154,12 @@ class RateLimiter:
                     self.minute_tokens -= 1
                     return
                 
-                # Wait a bit before retrying
-                await asyncio.sleep(0.1)
+                # Sleep exactly until the exhausted bucket refills
+                if self.minute_tokens <= 0:
+                    wait = self.last_minute_refill + 60.0 - now
+                else:
+                    wait = self.last_second_refill + 1.0 - now
+                await asyncio.sleep(max(wait, 0.001))
 
 
 class KISRestProvider:
@@ -120,7 +177,7 @@ class KISRestProvider:
     def __init__(
         self,
         auth: KISAuth,
-        rate_limiter: Optional[RateLimiter] = None,
+        rate_limiter: Optional[RateLimiter | AppKeyRateLimiter] = None,
         max_retries: int = 3,
     ) -> None:
         """
@@ -128,14 +185,51 @@ class KISRestProvider:
         
         Args:
             auth: KIS authentication manager
-            rate_limiter: Rate limiter (creates default if not provided)
+            rate_limiter: Rate limiter (default: process-wide limiter shared by app key)
             max_retries: Maximum retry attempts on failure
         """
         self.auth = auth
-        self.rate_limiter = rate_limiter or RateLimiter()
+        self.rate_limiter = rate_limiter or get_rate_limiter(getattr(auth, "app_key", None))
         self.max_retries = max_retries
         
+        # REST 지연 히스토그램 (응답 본문 파싱까지 포함)
+        self._price_latency = _rest_latency_histogram("inquire-price")
+        self._daily_latency = _rest_latency_histogram("inquire-daily-price")
+        self._stock_list_latency = _rest_latency_histogram("stock-list")
+        self._multi_price_latency = _rest_latency_histogram("intstock-multprice")
+
+        # 멀티종목 시세 엔드포인트 사용 가능 여부 (미지원 응답 시 종목별 호출로 영구 전환)
+        self.multi_price_supported = True
+        self._multi_price_errors = 0
+        
         logger.info("KISRestProvider initialized")
+
+    # ============================================================
+    # Adaptive rate feedback
+    # ============================================================
+
+    def _on_success(self) -> None:
+        """정상 응답 → 공용 limiter 의 rate 증가 (AIMD additive increase)"""
+        record = getattr(self.rate_limiter, "record_success", None)
+        if record is not None:
+            record()
+
+    async def _on_rate_limited(self, what: str, attempt: int) -> None:
+        """
+        유량 제한 응답 처리 후 재시도용 토큰 획득.
+
+        공용 limiter 는 app key 전체의 rate 를 줄이고 잠시 멈추므로 (AIMD multiplicative
+        decrease) 요청별 sleep 을 하지 않는다. 개별 RateLimiter 는 기존 지수 backoff.
+        """
+        record = getattr(self.rate_limiter, "record_throttle", None)
+        if record is not None:
+            rate = record()
+            logger.warning(f"Rate limit hit for {what}, shared rate now {rate:.1f} req/sec")
+        else:
+            wait_time = min(2 ** (attempt + 1), 16)
+            logger.warning(f"Rate limit hit for {what}, waiting {wait_time}s...")
+            await asyncio.sleep(wait_time)
+        await self.rate_limiter.acquire()
     
     # ============================================================
     # Current Price API
@@ -196,8 +290,13 @@ class KISRestProvider:
                 # This ensures that if a 401 refresh happens, the next retry uses the NEW token.
                 headers = self.auth.get_headers(tr_id="FHKST01010100")
                 
+                started = time.perf_counter()
                 async with session.get(url, headers=headers, params=params) as response:
-                    data = await response.json()
+                    body = await response.read()
+                    self._price_latency.observe(time.perf_counter() - started)
+                    parse_started = time.perf_counter()
+                    data = _decode_price_body(body)
+                    observe_parse("inquire-price", time.perf_counter() - parse_started)
                     
                     # Check for API errors
                     if data.get("rt_cd") != "0":
@@ -208,17 +307,24 @@ class KISRestProvider:
                         if response.status == 401:
                             logger.warning(f"401 Unauthorized for {symbol}, triggering emergency refresh...")
                             await self.auth.emergency_refresh()
+                            await self.rate_limiter.acquire(RequestPriority.EMERGENCY)
                             continue  # Loop will restart, headers will be re-generated with NEW token
                         
-                        # Handle rate limit errors
-                        if rt_cd == "1" or response.status == 429 or "초당" in error_msg or "초과" in error_msg:
+                        # Handle rate limit errors (shared backoff for the whole app key)
+                        if _is_rate_limited(response.status, data):
+                            await self._on_rate_limited(symbol, attempt)
+                            continue
+                        
+                        if rt_cd == "1":
                             wait_time = min(2 ** (attempt + 1), 16)
-                            logger.warning(f"Rate limit hit for {symbol}, waiting {wait_time}s...")
+                            logger.warning(f"API error for {symbol} ({error_msg}), retrying in {wait_time}s...")
                             await asyncio.sleep(wait_time)
+                            await self.rate_limiter.acquire()
                             continue
                         
                         raise RuntimeError(f"API error: {error_msg} (rt_cd: {rt_cd})")
                     
+                    self._on_success()
                     return self._normalize_current_price(data, symbol)
             
             except aiohttp.ClientError as e:
@@ -282,6 +388,152 @@ class KISRestProvider:
             ],
         }
     
+    # ============================================================
+    # Multi-symbol Current Price API
+    # ============================================================
+
+    MULTI_PRICE_BATCH = 30  # KIS 관심종목(멀티종목) 시세조회 최대 종목 수
+
+    @property
+    def quote_batch_size(self) -> int:
+        """요청 1회당 조회 가능한 종목 수 (멀티종목 미지원이면 1)"""
+        return self.MULTI_PRICE_BATCH if self.multi_price_supported else 1
+
+    async def fetch_current_prices(self, symbols: List[str]) -> List[Dict]:
+        """
+        Fetch current prices for many symbols.
+
+        API: GET /uapi/domestic-stock/v1/quotations/intstock-multprice
+        TR_ID: FHKST11300006 (up to 30 symbols per request)
+
+        Symbols missing from a multi-price response, and every symbol once the
+        endpoint reports it is unsupported, fall back to fetch_current_price().
+        Symbols that fail both ways are omitted (logged at debug level).
+
+        Returns:
+            List of normalized market data contracts (same shape as fetch_current_price)
+        """
+        results: Dict[str, Dict] = {}
+        fallback: List[str] = []
+
+        batches = [symbols[i:i + self.MULTI_PRICE_BATCH] for i in range(0, len(symbols), self.MULTI_PRICE_BATCH)]
+        for batch in batches:
+            if not self.multi_price_supported:
+                fallback.extend(batch)
+                continue
+            try:
+                found = await self._fetch_multi_price(batch)
+            except Exception as e:
+                logger.debug("Multi-price batch failed (%d symbols): %s", len(batch), e)
+                found = {}
+            results.update(found)
+            fallback.extend(sym for sym in batch if sym not in found)
+
+        if fallback:
+            async def single(sym: str) -> None:
+                try:
+                    results[sym] = await self.fetch_current_price(sym)
+                except Exception as e:
+                    logger.debug("Symbol %s fetch failed: %s", sym, e)
+
+            await asyncio.gather(*(single(sym) for sym in fallback))
+
+        return [results[sym] for sym in symbols if sym in results]
+
+    async def _fetch_multi_price(self, batch: List[str]) -> Dict[str, Dict]:
+        """멀티종목 시세 1회 요청. Returns: {symbol: contract}"""
+        await self.rate_limiter.acquire()
+        await self.auth.ensure_token()
+
+        url = f"{self.auth.base_url}/uapi/domestic-stock/v1/quotations/intstock-multprice"
+        params: Dict[str, str] = {}
+        for idx, sym in enumerate(batch, start=1):
+            params[f"FID_COND_MRKT_DIV_CODE_{idx}"] = "J"
+            params[f"FID_INPUT_ISCD_{idx}"] = sym
+
+        session = await self.auth.get_session()
+        for attempt in range(self.max_retries):
+            headers = self.auth.get_headers(tr_id="FHKST11300006")
+            started = time.perf_counter()
+            async with session.get(url, headers=headers, params=params) as response:
+                if response.status in (404, 405):
+                    self._disable_multi_price(f"HTTP {response.status}")
+                    return {}
+                data = await response.json()
+                self._multi_price_latency.observe(time.perf_counter() - started)
+
+                if response.status == 401:
+                    await self.auth.emergency_refresh()
+                    await self.rate_limiter.acquire(RequestPriority.EMERGENCY)
+                    continue
+
+                if data.get("rt_cd") != "0":
+                    error_msg = data.get("msg1", "Unknown error")
+                    if _is_rate_limited(response.status, data):
+                        await self._on_rate_limited(f"multi-price batch ({len(batch)} symbols)", attempt)
+                        continue
+                    # 연속 실패 시 (모의투자 등 멀티종목 TR 미지원) 종목별 호출로 전환
+                    self._multi_price_errors += 1
+                    if self._multi_price_errors >= self.max_retries:
+                        self._disable_multi_price(f"{error_msg} (rt_cd: {data.get('rt_cd')})")
+                    return {}
+
+                self._multi_price_errors = 0
+                self._on_success()
+                return self._normalize_multi_price(data)
+
+        raise RuntimeError(f"Max retries reached for multi-price batch ({len(batch)} symbols)")
+
+    def _disable_multi_price(self, reason: str) -> None:
+        if self.multi_price_supported:
+            logger.warning("Multi-price endpoint unavailable (%s) - falling back to per-symbol quotes", reason)
+        self.multi_price_supported = False
+
+    def _normalize_multi_price(self, data: Dict) -> Dict[str, Dict]:
+        """
+        Normalize multi-price response rows into per-symbol MarketDataContracts.
+        """
+        from zoneinfo import ZoneInfo
+        now_iso = datetime.now(ZoneInfo("Asia/Seoul")).isoformat()
+
+        def num(item: Dict, key: str) -> int:
+            try:
+                return int(item.get(key) or 0)
+            except (TypeError, ValueError):
+                return 0
+
+        results: Dict[str, Dict] = {}
+        for item in data.get("output") or []:
+            symbol = item.get("inter_shrn_iscd")
+            if not symbol:
+                continue
+            bid_price = num(item, "inter2_bidp")
+            ask_price = num(item, "inter2_askp")
+            results[symbol] = {
+                "meta": {
+                    "source": "kis",
+                    "market": "kr_stocks",
+                    "captured_at": now_iso,
+                    "schema_version": "1.0",
+                },
+                "instruments": [
+                    {
+                        "symbol": symbol,
+                        "timestamp": now_iso,
+                        "price": {
+                            "open": num(item, "inter2_oprc"),
+                            "high": num(item, "inter2_hgpr"),
+                            "low": num(item, "inter2_lwpr"),
+                            "close": num(item, "inter2_prpr"),
+                        },
+                        "volume": num(item, "acml_vol"),
+                        "bid_price": bid_price if bid_price > 0 else None,
+                        "ask_price": ask_price if ask_price > 0 else None,
+                    }
+                ],
+            }
+        return results
+
     # ============================================================
     # Daily Historical Price API
     # ============================================================
@@ -335,8 +587,10 @@ class KISRestProvider:
                 # HEADERS MUST BE GENERATED INSIDE THE LOOP
                 headers = self.auth.get_headers(tr_id="FHKST01010400")
                 
+                started = time.perf_counter()
                 async with session.get(url, headers=headers, params=params) as response:
                     data = await response.json()
+                    self._daily_latency.observe(time.perf_counter() - started)
                     
                     if data.get("rt_cd") != "0":
                         error_msg = data.get("msg1", "Unknown error")
@@ -345,17 +599,24 @@ class KISRestProvider:
                         if response.status == 401:
                             logger.warning(f"401 Unauthorized for {symbol}, triggering emergency refresh...")
                             await self.auth.emergency_refresh()
+                            await self.rate_limiter.acquire(RequestPriority.EMERGENCY)
+                            continue
+                        
+                        # Handle rate limit errors (shared backoff for the whole app key)
+                        if _is_rate_limited(response.status, data):
+                            await self._on_rate_limited(symbol, attempt)
                             continue
                         
-                        # Handle rate limit errors
-                        if rt_cd == "1" or response.status == 429 or "초당" in error_msg or "초과" in error_msg:
+                        if rt_cd == "1":
                             wait_time = min(2 ** (attempt + 1), 16)
-                            logger.warning(f"Rate limit hit for {symbol}, waiting {wait_time}s...")
+                            logger.warning(f"API error for {symbol} ({error_msg}), retrying in {wait_time}s...")
                             await asyncio.sleep(wait_time)
+                            await self.rate_limiter.acquire()
                             continue
                         
                         raise RuntimeError(f"API error: {error_msg} (rt_cd: {rt_cd})")
                     
+                    self._on_success()
                     return self._normalize_daily_prices(data, symbol)
             
             except aiohttp.ClientError as e:
@@ -494,16 +755,26 @@ class KISRestProvider:
                         headers["tr_cont"] = tr_cont
                         
                     session = await self.auth.get_session()
+                    started = time.perf_counter()
                     async with session.get(url, headers=headers, params=params) as response:
                         if response.status == 200:
                             data = await response.json()
+                            self._stock_list_latency.observe(time.perf_counter() - started)
                             if data.get("rt_cd") == "0":
+                                self._on_success()
                                 break # Success
+                            elif _is_rate_limited(response.status, data):
+                                await self._on_rate_limited(f"stock list {mkt_code}", attempt)
+                                continue
                             else:
                                 error_msg = data.get("msg1", "Unknown error")
                                 logger.error(f"API Error (Market {mkt_code}, Attempt {attempt+1}): {error_msg}")
                         elif response.status == 401:
                             await self.auth.emergency_refresh()
+                            await self.rate_limiter.acquire(RequestPriority.EMERGENCY)
+                        elif response.status == 429:
+                            await self._on_rate_limited(f"stock list {mkt_code}", attempt)
+                            continue
                         elif response.status == 404:
                             logger.error(f"❌ 404 Not Found (Market {mkt_code}): Endpoint may have been deprecated or moved to v2. TR_ID: HHKST01010100")
                             raise RuntimeError(f"KIS API 404: {url}")
@@ -14,18 +14,22 @@ Phase 05, Task 5.3: KIS WebSocket Provider Implementation
 from __future__ import annotations
 
 import asyncio
+import inspect
 import logging
 import os
 import json
 import ssl
+import time
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
-from typing import Callable, Optional, Dict, Any, Set
+from typing import Awaitable, Callable, Optional, Dict, Any, Set
 from dataclasses import dataclass, field
 import websockets
 from websockets.client import WebSocketClientProtocol
 
 from .kis_auth import KISAuth
+from .realtime_parser import ExecutionTick, decode_frame, parse_execution_frame, parse_record
+from .subscription_reconciler import ReconcileResult, SubscriptionReconciler
 
 logger = logging.getLogger(__name__)
 
@@ -121,13 +125,18 @@ class KISWebSocketProvider:
         # Subscription management
         self.subscribed_symbols: Set[str] = set()
         self.pending_symbols: Set[str] = set()
+        # Desired-state diff + pipelined frames + ack / first-tick tracking
+        self.reconciler = SubscriptionReconciler(self)
         
         # Connection state
         self.is_connected = False
         self.connection_lock = asyncio.Lock()
         
         # Event callbacks
-        self.on_price_update: Optional[Callable[[Dict[str, Any]], None]] = None
+        # 콜백이 awaitable을 반환하면(소비자 backpressure) 수신 루프가 await 한다
+        self.on_price_update: Optional[Callable[[Dict[str, Any]], Optional[Awaitable[None]]]] = None
+        # Compact H0STCNT0 ticks (ExecutionTick), called before on_price_update
+        self.on_tick: Optional[Callable[[ExecutionTick], None]] = None
         self.on_connection: Optional[Callable[[], None]] = None
         self.on_disconnection: Optional[Callable[[], None]] = None
         self.on_error: Optional[Callable[[str], None]] = None
@@ -227,6 +236,7 @@ class KISWebSocketProvider:
                 self.is_connected = False
                 self.subscribed_symbols.clear()
                 self.pending_symbols.clear()
+                self.reconciler.reset()
                 
                 logger.info("✅ WebSocket disconnected")
                 
@@ -300,9 +310,20 @@ class KISWebSocketProvider:
     
     async def unsubscribe_all(self) -> None:
         """Unsubscribe from all symbols"""
-        symbols = list(self.subscribed_symbols)
-        for symbol in symbols:
-            await self.unsubscribe(symbol)
+        if not self.is_connected:
+            self.subscribed_symbols.clear()
+            self.pending_symbols.clear()
+            return
+        await self.reconciler.reconcile(())
+    
+    async def reconcile_subscriptions(self, desired) -> ReconcileResult:
+        """
+        Bring subscriptions to the desired symbol set in one pipelined pass
+        
+        Unsubscribe frames go first (free capacity), then subscribe frames,
+        paced at KIS_WS_FRAMES_PER_SECOND without waiting for each ack.
+        """
+        return await self.reconciler.reconcile(desired)
     
     async def _send_login(self) -> None:
         """Optional: KIS may not require explicit login over WS."""
@@ -406,13 +427,15 @@ class KISWebSocketProvider:
             raw_message: Raw message bytes from WebSocket
         """
         try:
-            # Decode message (ws client may yield str already)
-            if isinstance(raw_message, bytes):
-                message_str = raw_message.decode('euc-kr')
-            else:
-                message_str = raw_message
+            # Decode message (ws client may yield str already; ASCII fast path, EUC-KR fallback)
+            message_str = decode_frame(raw_message)
             
-            # Log raw message at INFO level for debugging (Korean output)
+            # Real-time execution frames: fast path, no per-frame logging
+            if message_str[:2] in ("0|", "1|"):
+                await self._process_realtime_data(message_str)
+                return
+            
+            # Log system message at INFO level for debugging (Korean output)
             logger.info(f"[WS수신] {message_str[:150]}")
             
             # CRITICAL FIX: Handle PINGPONG for keep-alive
@@ -429,6 +452,10 @@ class KISWebSocketProvider:
                 # System message or subscription response: JSON format
                 message_data = json.loads(message_str)
                 
+                # Subscribe / unsubscribe acknowledgement
+                if self._handle_control_message(message_data):
+                    return
+                
                 # Extract price data (for JSON responses, e.g., H0UNASP0 bid/ask)
                 if "body" in message_data and isinstance(message_data["body"], dict):
                     price_data = self._normalize_price_data(message_data)
@@ -437,8 +464,7 @@ class KISWebSocketProvider:
                         logger.debug(f"📊 Price update: {price_data['symbol']}")
                         
                         # Trigger callback
-                        if self.on_price_update:
-                            self.on_price_update(price_data)
+                        await self._emit_price_update(price_data)
         
         except UnicodeDecodeError as e:
             logger.debug(f"⚠️ Could not decode message as EUC-KR: {e}")
@@ -448,6 +474,27 @@ class KISWebSocketProvider:
         except Exception as e:
             logger.error(f"❌ Error processing message: {e}")
     
+    def _handle_control_message(self, message: Dict[str, Any]) -> bool:
+        """
+        Route KIS subscription responses to the reconciler
+        
+        Format: {"header": {"tr_id": "H0STCNT0", "tr_key": "005930"},
+                 "body": {"rt_cd": "0", "msg1": "SUBSCRIBE SUCCESS", ...}}
+        
+        Returns:
+            True if the message was a subscription response
+        """
+        header = message.get("header")
+        body = message.get("body")
+        if not isinstance(header, dict) or not isinstance(body, dict):
+            return False
+        if header.get("tr_id") != self.MSG_SUBSCRIBE or "msg1" not in body:
+            return False
+        symbol = header.get("tr_key", "")
+        if symbol:
+            self.reconciler.on_control_message(symbol, body.get("rt_cd"), str(body.get("msg1", "")))
+        return True
+    
     def _normalize_price_data(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Normalize WebSocket message to standard price data format
@@ -469,7 +516,6 @@ class KISWebSocketProvider:
                 return None
             
             # Real-time execution data fields
-            from zoneinfo import ZoneInfo
             price_data = {
                 "symbol": symbol,
                 "timestamp": datetime.now(ZoneInfo("Asia/Seoul")).isoformat(),
@@ -494,51 +540,44 @@ class KISWebSocketProvider:
     
     async def _process_realtime_data(self, data_str: str) -> None:
         """
-        CRITICAL FIX: Process pipe-delimited real-time data (H0STCNT0)
+        Process pipe-delimited real-time data (H0STCNT0)
         
-        Format: 0|H0STCNT0|seq_num|field1^field2^field3^...
-        Example: 0|H0STCNT0|003|005930^112759^155200^2^3100^2.04^...
+        Format: 0|H0STCNT0|count|rec1_field0^...^rec1_field45^rec2_field0^...
+        Example: 0|H0STCNT0|001|005930^112759^155200^2^3100^2.04^...
         
-        IMPORTANT: ^ is field separator, NOT record separator
-        Each message contains ONE record with ^ separating its fields
+        count is the number of records in the frame (46 '^'-separated fields each);
+        parsing is done by realtime_parser.parse_execution_frame.
         
         Args:
             data_str: Pipe-delimited data string
         """
         try:
-            parts = data_str.split('|')
-            if len(parts) < 4:
-                logger.warning(f"⚠️ Invalid data format: {data_str[:50]}")
-                return
-            
-            msg_type = parts[0]      # '0' for real-time, '1' for notification
-            tr_id = parts[1]         # 'H0STCNT0' or other
-            seq_num = parts[2]       # Sequence number (NOT record count!)
-            payload = parts[3] if len(parts) > 3 else ""
-            
-            # Only process execution data (H0STCNT0)
-            if tr_id != "H0STCNT0":
-                logger.debug(f"Ignoring non-execution data: {tr_id}")
+            ticks = parse_execution_frame(data_str)
+            if not ticks:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Ignoring non-execution / invalid frame: {data_str[:50]}")
                 return
             
-            # Parse single record (fields separated by '^')
-            if not payload:
-                logger.debug("Empty payload for H0STCNT0")
-                return
-            
-            # Split payload into fields
-            fields = payload.split('^')
-            logger.debug(f"📊 Processing {len(fields)} fields (seq={seq_num})")
-            
-            # Parse the execution record
-            price_data = self._parse_execution_record(fields)
-            if price_data and self.on_price_update:
-                logger.debug(f"📡 Real-time tick: {price_data['symbol']} @ {price_data['price']['close']}")
-                self.on_price_update(price_data)
+            awaiting_first_tick = self.reconciler.awaiting_first_tick
+            for tick in ticks:
+                if awaiting_first_tick:
+                    self.reconciler.note_tick(tick.symbol)
+                if self.on_tick:
+                    self.on_tick(tick)
+                if self.on_price_update:
+                    await self._emit_price_update(tick.as_price_data())
         
         except Exception as e:
             logger.error(f"❌ Error processing real-time data: {e}")
     
+    async def _emit_price_update(self, price_data: Dict[str, Any]) -> None:
+        """Invoke on_price_update and await its result when the consumer applies backpressure"""
+        if not self.on_price_update:
+            return
+        result = self.on_price_update(price_data)
+        if inspect.isawaitable(result):
+            await result
+    
     def _parse_execution_record(self, fields: list[str]) -> Optional[Dict[str, Any]]:
         """
         Parse H0STCNT0 execution record fields
@@ -567,50 +606,22 @@ class KISWebSocketProvider:
         Returns:
             Normalized price data dict or None if invalid
         """
-        try:
-            if len(fields) < 13:
-                logger.debug(f"⚠️ Insufficient fields: {len(fields)} (need at least 13)")
-                return None
-            
-            symbol = fields[0]  # Symbol code
-            
-            return {
-                "symbol": symbol,
-                "execution_time": fields[1],  # HHMMSS
-                "timestamp": datetime.now(ZoneInfo("Asia/Seoul")).isoformat(),
-                "price": {
-                    "close": int(fields[2] or 0),    # Current price
-                    "change_amount": int(fields[4] or 0),
-                    "change_rate": float(fields[5] or 0),
-                    "open": int(fields[7] or 0),    # Open price
-                    "high": int(fields[8] or 0),    # High price
-                    "low": int(fields[9] or 0),     # Low price
-                },
-                "volume": {
-                    "tick": int(fields[12] or 0),  # Tick volume
-                    "accumulated": int(fields[13] or 0) if len(fields) > 13 else 0,  # Accumulated volume
-                    "trade_value": int(fields[14] or 0) if len(fields) > 14 else 0,
-                },
-                "bid_ask": {
-                    "ask_price": int(fields[10] or 0),  # Ask/Sell
-                    "bid_price": int(fields[11] or 0),  # Bid/Buy
-                },
-                "source": "kis_websocket"
-            }
-        
-        except (ValueError, IndexError) as e:
-            logger.debug(f"⚠️ Error parsing execution record: {e}")
+        tick = parse_record(fields, 0, time.monotonic())
+        if tick is None:
+            logger.debug(f"⚠️ Invalid execution record: {len(fields)} fields")
             return None
+        return tick.as_price_data()
     
     async def _resubscribe(self) -> None:
         """Resubscribe to all symbols after reconnection"""
-        symbols = list(self.subscribed_symbols | self.pending_symbols)
+        # 기존 구독 먼저, 그 다음 pending (정렬 → 41 제한에 걸려도 어떤 종목이 빠질지 결정적)
+        symbols = sorted(self.subscribed_symbols) + sorted(self.pending_symbols - self.subscribed_symbols)
         self.subscribed_symbols.clear()
         self.pending_symbols.clear()
+        self.reconciler.reset()
         
-        for symbol in symbols:
-            await asyncio.sleep(0.1)  # Small delay between subscriptions
-            await self.subscribe(symbol)
+        # pipelined at KIS_WS_FRAMES_PER_SECOND (was a fixed 0.1s sleep per symbol)
+        await self.reconciler.reconcile(symbols)
     
     async def _schedule_reconnection(self) -> None:
         """Schedule automatic reconnection attempt"""
@@ -652,3 +663,19 @@ class KISWebSocketProvider:
     def available_slots(self) -> int:
         """Get number of available subscription slots"""
         return self.MAX_SUBSCRIPTIONS - self.subscription_count
+    
+    @property
+    def subscription_stats(self) -> Dict[str, Any]:
+        """Subscription / acknowledgement statistics"""
+        return {
+            "connections": 1,
+            "connected": int(self.is_connected),
+            "per_connection": [
+                {
+                    "connected": self.is_connected,
+                    "subscriptions": len(self.subscribed_symbols),
+                    "pending": len(self.pending_symbols),
+                    **self.reconciler.stats,
+                }
+            ],
+        }
@@ -0,0 +1,524 @@
+from __future__ import annotations
+
+"""
+rate_limit_service.py
+
+Process-wide KIS REST rate limiter (one token budget per app key)
+
+Responsibilities:
+- Universe builder, Track A (swing) and Track B (scalp) run on separate threads and
+  event loops, but KIS enforces 20 req/s and 1,000 req/min per *app key*.
+  All KISRestProvider instances for the same app key share one AppKeyRateLimiter.
+- Weighted priority classes: EMERGENCY (token/401 recovery) > SWING > UNIVERSE
+  - each class must leave a reserve of tokens in the bucket for higher classes
+  - a lower class also yields while a higher class is waiting
+- Loop-agnostic: state is guarded by a threading.Lock and never held across an await.
+  Waiters queue FIFO per class and sleep on their own loop (or thread in acquire_sync):
+  only the head of the highest non-empty class sleeps until its token is due, every
+  other waiter sleeps until the waiter ahead of it leaves and hands off (no polling)
+- Adaptive rate (AIMD): the refill rate grows additively towards the ceiling while
+  requests succeed and is cut multiplicatively for every caller of the app key as soon
+  as KIS reports a rate-limit error (record_throttle), with a short global pause
+- Reports utilisation, current rate, throttle events and queueing delay
+  (shared metrics registry + stats property)
+
+Priority is normally set per call path with the rest_priority() context manager,
+which is inherited by tasks created inside it (contextvars):
+
+    with rest_priority(RequestPriority.UNIVERSE):
+        await asyncio.gather(*(engine.fetch_daily_prices(s) for s in symbols))
+
+Environment overrides:
+- KIS_REST_RPS (starting rate, default 18)
+- KIS_REST_RPS_CEILING (AIMD upper bound, default 20 = official limit)
+- KIS_REST_RPS_FLOOR (AIMD lower bound, default 2)
+- KIS_REST_RPM (default 950, official limit 1000)
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+from monitoring.prometheus_metrics import LATENCY_BUCKETS_SECONDS, get_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RPS = 18.0
+DEFAULT_RPS_CEILING = 20.0
+DEFAULT_RPS_FLOOR = 2.0
+DEFAULT_RPM = 950
+
+# minimum sleep between two attempts
+_MIN_WAIT_SECONDS = 0.001
+# "wait" returned to a waiter that is queued behind another one: sleep until _notify
+_UNTIL_NOTIFIED = float("inf")
+
+
+class RequestPriority(IntEnum):
+    """REST 요청 우선순위 (작을수록 높음)"""
+
+    EMERGENCY = 0  # token issuance / 401 recovery
+    SWING = 1  # Track A sweep, Track B REST calls (default)
+    UNIVERSE = 2  # daily universe build (bulk, deadline-tolerant)
+
+
+_current_priority: contextvars.ContextVar[RequestPriority] = contextvars.ContextVar(
+    "kis_rest_priority", default=RequestPriority.SWING
+)
+
+
+@contextmanager
+def rest_priority(priority: RequestPriority) -> Iterator[None]:
+    """이 컨텍스트(및 내부에서 생성된 task)의 REST 호출 우선순위 지정"""
+    token = _current_priority.set(RequestPriority(priority))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> RequestPriority:
+    return _current_priority.get()
+
+
+class AppKeyRateLimiter:
+    """
+    Thread-safe token bucket + 60s sliding window for one KIS app key.
+
+    - Token bucket: refills continuously at rps, capacity = rps (1-second burst)
+    - Sliding window: at most rpm grants in any 60-second window
+    - Reserve: a request of class P may only take a token if, after taking it,
+      at least reserves[P] tokens remain (EMERGENCY reserve is always 0);
+      the 60s window is capped for P in the same proportion
+    - AIMD: rps_limit (the current refill rate) is raised by increase_step every
+      increase_interval of successful traffic up to rps_ceiling, and multiplied by
+      decrease_factor (at most once per increase_interval) on a rate-limit error,
+      which also pauses all non-EMERGENCY grants for throttle_pause seconds
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        requests_per_minute: Optional[int] = None,
+        reserves: Optional[Dict[RequestPriority, float]] = None,
+        name: str = "default",
+        clock=time.monotonic,
+        rps_ceiling: Optional[float] = None,
+        rps_floor: Optional[float] = None,
+        increase_step: float = 0.5,
+        increase_interval: float = 1.0,
+        decrease_factor: float = 0.5,
+        throttle_pause: float = 1.0,
+    ) -> None:
+        """
+        Args:
+            requests_per_second: 초당 허용량 (None이면 KIS_REST_RPS 또는 18)
+            requests_per_minute: 분당 허용량 (None이면 KIS_REST_RPM 또는 950)
+            reserves: 우선순위별로 남겨둘 토큰 수 (기본: SWING 1개, UNIVERSE rps의 25%)
+            name: 로그/통계용 이름 (app key 자체는 노출하지 않음)
+            clock: 단조 시계 (테스트 주입용)
+            rps_ceiling: AIMD 상한 (None이면 KIS_REST_RPS_CEILING 또는 max(20, 시작값))
+            rps_floor: AIMD 하한 (None이면 KIS_REST_RPS_FLOOR 또는 min(2, 시작값))
+            increase_step: 성공 구간마다 올릴 초당 요청 수
+            increase_interval: 증가/감소 사이 최소 간격(초)
+            decrease_factor: rate-limit 오류 시 곱할 비율
+            throttle_pause: rate-limit 오류 후 전체 요청을 멈출 시간(초)
+        """
+        rps = float(requests_per_second or os.getenv("KIS_REST_RPS", DEFAULT_RPS))
+        rpm = int(requests_per_minute or os.getenv("KIS_REST_RPM", DEFAULT_RPM))
+        if rps <= 0 or rpm <= 0:
+            raise ValueError("requests_per_second and requests_per_minute must be positive")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be in (0, 1)")
+
+        self.rps_limit = rps  # current (adaptive) rate
+        self.rps_ceiling = max(rps, float(rps_ceiling or os.getenv("KIS_REST_RPS_CEILING", DEFAULT_RPS_CEILING)))
+        self.rps_floor = min(rps, float(rps_floor or os.getenv("KIS_REST_RPS_FLOOR", DEFAULT_RPS_FLOOR)))
+        self.rpm_limit = rpm
+        self.name = name
+        self._clock = clock
+        self._increase_step = increase_step
+        self._increase_interval = increase_interval
+        self._decrease_factor = decrease_factor
+        self._throttle_pause = throttle_pause
+
+        default_reserves = {
+            RequestPriority.EMERGENCY: 0.0,
+            RequestPriority.SWING: min(1.0, rps / 4),
+            RequestPriority.UNIVERSE: rps / 4,
+        }
+        if reserves:
+            default_reserves.update({RequestPriority(k): float(v) for k, v in reserves.items()})
+        default_reserves[RequestPriority.EMERGENCY] = 0.0
+        self._reserves = default_reserves
+
+        # 버킷 용량: 1초 burst, 단 가장 큰 reserve + 1 이상이어야 모든 클래스가 진행 가능
+        self._min_capacity = 1.0 + max(self._reserves.values())
+        self._capacity = max(rps, self._min_capacity)
+        # 분당 한도도 같은 비율로 상위 클래스 몫을 남긴다 (rpm 은 AIMD 대상이 아님)
+        self._window_limits = {
+            p: max(1, int(rpm * (1.0 - self._reserves[p] / self._capacity))) for p in RequestPriority
+        }
+
+        self._lock = threading.Lock()
+        self._tokens = self._capacity
+        self._last_refill = clock()
+        self._window: Deque[float] = deque()
+        self._waiting = {p: 0 for p in RequestPriority}
+        # 클래스별 대기자 wake-up 콜백, 등록 순서 = FIFO 순서 (id(wake) → wake)
+        self._sleepers: Dict[RequestPriority, Dict[int, Callable[[], None]]] = {p: {} for p in RequestPriority}
+
+        # AIMD 상태
+        self._paused_until = float("-inf")
+        self._last_increase = self._last_refill
+        self._last_decrease = float("-inf")
+        self._throttles = 0
+        self._rate_increases = 0
+        self._rate_decreases = 0
+
+        # 통계
+        self._granted = {p: 0 for p in RequestPriority}
+        self._delayed = {p: 0 for p in RequestPriority}
+        self._wait_seconds = {p: 0.0 for p in RequestPriority}
+        self._max_wait = {p: 0.0 for p in RequestPriority}
+
+        # 공용 레지스트리 (기존 대시보드의 observer_rate_limit_* 시리즈와 공유)
+        registry = get_registry()
+        self._tokens_counter = registry.counter("observer_rate_limit_tokens_total", "Total tokens consumed")
+        self._delays_counter = registry.counter("observer_rate_limit_delays_total", "Total rate limit delays")
+        self._delay_histogram = registry.histogram(
+            "observer_rate_limit_delay_duration_seconds",
+            "Rate limit delay duration",
+            buckets=LATENCY_BUCKETS_SECONDS,
+        )
+        self._queue_histograms = {
+            p: registry.histogram(
+                "observer_rate_limit_queue_seconds",
+                "Time spent queueing for a KIS REST token, by priority",
+                buckets=LATENCY_BUCKETS_SECONDS,
+                labels={"priority": p.name.lower()},
+            )
+            for p in RequestPriority
+        }
+        self._utilisation_gauge = registry.gauge(
+            "observer_rate_limit_utilisation_ratio",
+            "KIS REST grants in the last 60s relative to the per-minute limit",
+        )
+        self._rate_gauge = registry.gauge(
+            "observer_rate_limit_current_rps",
+            "Current adaptive KIS REST refill rate (requests/sec)",
+        )
+        self._throttle_counter = registry.counter(
+            "observer_rate_limit_throttle_events_total",
+            "KIS rate-limit errors (429 / rt_cd=1 / 초당 거래건수 초과) reported to the limiter",
+        )
+        self._rate_gauge.set(rps)
+
+        logger.info(
+            "AppKeyRateLimiter[%s] initialized: %.1f req/sec (%.1f..%.1f adaptive), %d req/min",
+            name, rps, self.rps_floor, self.rps_ceiling, rpm,
+        )
+
+    # ------------------------------------------------------------------
+    # Core
+    # ------------------------------------------------------------------
+
+    def _try_take(self, priority: RequestPriority) -> float:
+        """
+        토큰 획득 시도 (lock 보유 상태에서 호출).
+        Returns: 0.0 이면 획득 성공, 아니면 다시 시도하기까지 기다릴 시간(초)
+        """
+        now = self._clock()
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self._capacity, self._tokens + elapsed * self.rps_limit)
+            self._last_refill = now
+
+        window = self._window
+        cutoff = now - 60.0
+        while window and window[0] <= cutoff:
+            window.popleft()
+
+        # global pause after a rate-limit error (EMERGENCY is exempt)
+        if now < self._paused_until and priority != RequestPriority.EMERGENCY:
+            return self._paused_until - now
+
+        wait = 0.0
+        needed = 1.0 + self._reserves[priority]
+        if self._tokens < needed:
+            wait = (needed - self._tokens) / self.rps_limit
+        excess = len(window) - self._window_limits[priority]
+        if excess >= 0:
+            wait = max(wait, window[excess] + 60.0 - now)
+        if wait > 0:
+            return max(wait, _MIN_WAIT_SECONDS)
+
+        self._tokens -= 1.0
+        window.append(now)
+        return 0.0
+
+    def _grant(self, priority: RequestPriority, waited: float) -> None:
+        """획득 통계 반영 (lock 보유 상태에서 호출)"""
+        self._granted[priority] += 1
+        self._wait_seconds[priority] += waited
+        if waited > 0:
+            self._delayed[priority] += 1
+            if waited > self._max_wait[priority]:
+                self._max_wait[priority] = waited
+        utilisation = len(self._window) / self.rpm_limit
+
+        self._tokens_counter.increment()
+        self._queue_histograms[priority].observe(waited)
+        if waited > 0:
+            self._delays_counter.increment()
+            self._delay_histogram.observe(waited)
+        self._utilisation_gauge.set(round(utilisation, 3))
+
+    def _poll(
+        self,
+        priority: RequestPriority,
+        started: float,
+        registered: bool,
+        wake: Optional[Callable[[], None]] = None,
+    ):
+        """
+        acquire 1회 시도. Returns: (wait, registered, waited)
+        - wait == 0.0 이면 획득 성공 (waited = 총 대기 시간)
+        - wait == _UNTIL_NOTIFIED 이면 앞선 대기자가 있음 → wake 될 때까지 대기
+        - wake: 대기 등록 시 함께 등록할 wake-up 콜백 (앞선 대기자가 빠질 때 호출)
+        """
+        with self._lock:
+            if self._queued_behind(priority, registered, wake):
+                wait = _UNTIL_NOTIFIED
+            else:
+                wait = self._try_take(priority)
+            if wait == 0.0:
+                waited = 0.0
+                if registered:
+                    self._leave(priority, wake)
+                    waited = self._clock() - started
+                self._grant(priority, waited)
+                return 0.0, False, waited
+            if not registered:
+                self._waiting[priority] += 1
+                if wake is not None:
+                    self._sleepers[priority][id(wake)] = wake
+            return wait, True, 0.0
+
+    def _queued_behind(
+        self, priority: RequestPriority, registered: bool, wake: Optional[Callable[[], None]]
+    ) -> bool:
+        """앞선 대기자(상위 클래스 또는 같은 클래스의 먼저 온 대기자)가 있는지 (lock 보유 상태에서 호출)"""
+        if any(self._waiting[p] for p in RequestPriority if p < priority):
+            return True
+        if not registered:
+            return self._waiting[priority] > 0
+        sleepers = self._sleepers[priority]
+        return wake is not None and bool(sleepers) and next(iter(sleepers)) != id(wake)
+
+    def _leave(self, priority: RequestPriority, wake: Optional[Callable[[], None]]) -> None:
+        """대기열에서 제거 (lock 보유 상태에서 호출). 맨 앞 대기자가 빠지면 다음 대기자를 깨운다"""
+        self._waiting[priority] -= 1
+        sleepers = self._sleepers[priority]
+        was_head = wake is None or (bool(sleepers) and next(iter(sleepers)) == id(wake))
+        if wake is not None:
+            sleepers.pop(id(wake), None)
+        if was_head:
+            self._notify()
+
+    def _notify(self) -> None:
+        """가장 높은 비어 있지 않은 클래스의 맨 앞 대기자 하나만 깨운다 (FIFO hand-off)"""
+        for p in RequestPriority:
+            if self._waiting[p]:
+                sleepers = self._sleepers[p]
+                if sleepers:
+                    next(iter(sleepers.values()))()
+                return
+
+    def _unregister(self, priority: RequestPriority, wake: Optional[Callable[[], None]] = None) -> None:
+        with self._lock:
+            self._leave(priority, wake)
+
+    async def acquire(self, priority: Optional[RequestPriority] = None) -> float:
+        """
+        토큰 1개 획득까지 대기 (어느 event loop에서 호출해도 안전).
+
+        Returns: 대기한 시간(초)
+        """
+        priority = current_priority() if priority is None else RequestPriority(priority)
+        started = self._clock()
+        registered = False
+        loop = asyncio.get_running_loop()
+        woken = asyncio.Event()
+
+        def wake() -> None:
+            # may be called from another thread/loop holding self._lock
+            try:
+                loop.call_soon_threadsafe(woken.set)
+            except RuntimeError:  # loop closed
+                pass
+
+        try:
+            while True:
+                woken.clear()
+                wait, registered, waited = self._poll(priority, started, registered, wake)
+                if wait == 0.0:
+                    return waited
+                try:
+                    await asyncio.wait_for(woken.wait(), None if wait == _UNTIL_NOTIFIED else wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # cancelled while waiting
+            if registered:
+                self._unregister(priority, wake)
+
+    def acquire_sync(self, priority: Optional[RequestPriority] = None) -> float:
+        """acquire()의 동기 버전 (event loop 밖의 스레드용)"""
+        priority = current_priority() if priority is None else RequestPriority(priority)
+        started = self._clock()
+        registered = False
+        woken = threading.Event()
+        wake = woken.set
+        try:
+            while True:
+                woken.clear()
+                wait, registered, waited = self._poll(priority, started, registered, wake)
+                if wait == 0.0:
+                    return waited
+                woken.wait(None if wait == _UNTIL_NOTIFIED else wait)
+        finally:
+            if registered:
+                self._unregister(priority, wake)
+
+    # ------------------------------------------------------------------
+    # Adaptive rate (AIMD)
+    # ------------------------------------------------------------------
+
+    def _set_rate(self, rps: float) -> None:
+        """refill rate 변경 (lock 보유 상태에서 호출, 현재까지의 refill 은 이전 rate 로 정산)"""
+        now = self._clock()
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self._capacity, self._tokens + elapsed * self.rps_limit)
+            self._last_refill = now
+        self.rps_limit = rps
+        self._capacity = max(rps, self._min_capacity)
+        self._tokens = min(self._tokens, self._capacity)
+        self._rate_gauge.set(round(rps, 3))
+
+    def record_success(self) -> None:
+        """정상 응답 1건 보고 → increase_interval 마다 rate 를 increase_step 만큼 올린다"""
+        with self._lock:
+            if self.rps_limit >= self.rps_ceiling:
+                return
+            now = self._clock()
+            if now < self._paused_until or now - self._last_increase < self._increase_interval:
+                return
+            if now - self._last_decrease < self._increase_interval:
+                return
+            self._last_increase = now
+            self._rate_increases += 1
+            self._set_rate(min(self.rps_ceiling, self.rps_limit + self._increase_step))
+
+    def record_throttle(self) -> float:
+        """
+        rate-limit 오류 1건 보고 → rate 를 줄이고 전체 요청을 잠시 멈춘다.
+
+        같은 혼잡 구간(increase_interval 이내)의 연속 오류는 한 번만 감소시킨다.
+        Returns: 감소 후 rate (req/sec)
+        """
+        with self._lock:
+            now = self._clock()
+            self._throttles += 1
+            self._throttle_counter.increment()
+            self._paused_until = max(self._paused_until, now + self._throttle_pause)
+            self._last_increase = now
+            if now - self._last_decrease >= self._increase_interval:
+                self._last_decrease = now
+                self._rate_decreases += 1
+                previous = self.rps_limit
+                self._set_rate(max(self.rps_floor, previous * self._decrease_factor))
+                self._tokens = 0.0  # burst 도 비운다
+                logger.warning(
+                    "AppKeyRateLimiter[%s] throttled by KIS: %.1f → %.1f req/sec",
+                    self.name, previous, self.rps_limit,
+                )
+            return self.rps_limit
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """통계 정보 반환"""
+        with self._lock:
+            now = self._clock()
+            cutoff = now - 60.0
+            while self._window and self._window[0] <= cutoff:
+                self._window.popleft()
+            last_second = sum(1 for t in self._window if t > now - 1.0)
+            return {
+                "name": self.name,
+                "rps_limit": round(self.rps_limit, 3),
+                "rps_ceiling": self.rps_ceiling,
+                "rps_floor": self.rps_floor,
+                "throttle_events": self._throttles,
+                "rate_increases": self._rate_increases,
+                "rate_decreases": self._rate_decreases,
+                "paused_seconds": round(max(0.0, self._paused_until - now), 3),
+                "rpm_limit": self.rpm_limit,
+                "tokens_available": round(min(self._capacity, self._tokens + (now - self._last_refill) * self.rps_limit), 3),
+                "requests_last_second": last_second,
+                "requests_last_minute": len(self._window),
+                "utilisation": round(len(self._window) / self.rpm_limit, 3),
+                "priorities": {
+                    p.name.lower(): {
+                        "granted": self._granted[p],
+                        "delayed": self._delayed[p],
+                        "waiting": self._waiting[p],
+                        "reserve_tokens": self._reserves[p],
+                        "window_limit": self._window_limits[p],
+                        "avg_wait_ms": round(self._wait_seconds[p] / self._granted[p] * 1000, 3)
+                        if self._granted[p] else 0.0,
+                        "max_wait_ms": round(self._max_wait[p] * 1000, 3),
+                    }
+                    for p in RequestPriority
+                },
+            }
+
+
+# ============================================================
+# Process-wide registry (one limiter per app key)
+# ============================================================
+
+_limiters: Dict[str, AppKeyRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(app_key: Optional[str] = None) -> AppKeyRateLimiter:
+    """app key별 공용 AppKeyRateLimiter 반환 (최초 호출 시 생성)"""
+    key = app_key or "default"
+    limiter = _limiters.get(key)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(key)
+            if limiter is None:
+                # 로그/통계에는 app key 앞 4자리만 노출
+                limiter = AppKeyRateLimiter(name=f"{str(key)[:4]}***" if app_key else key)
+                _limiters[key] = limiter
+    return limiter
+
+
+def reset_rate_limiters() -> None:
+    """공용 limiter 초기화 (테스트용)"""
+    with _limiters_lock:
+        _limiters.clear()
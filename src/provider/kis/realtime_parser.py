@@ -0,0 +1,194 @@
+"""
+realtime_parser.py
+
+Fast path parser for KIS real-time execution frames (H0STCNT0)
+
+Frame format:
+    0|H0STCNT0|<count>|rec1_f0^...^rec1_f45^rec2_f0^...
+
+- <count> is the number of records in the frame; every record has
+  H0STCNT0_FIELD_COUNT (46) '^'-separated fields, records are concatenated
+- Real-time frames are pure ASCII → decode_frame() tries ASCII first and only
+  falls back to EUC-KR for system messages
+- Each record becomes an ExecutionTick (compact NamedTuple). The receive time is
+  a time.monotonic() reading; the ISO timestamp is formatted only on access
+  (ExecutionTick.timestamp / as_price_data()) by a cached KST formatter
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+H0STCNT0 = "H0STCNT0"
+H0STCNT0_FIELD_COUNT = 46
+
+# record field offsets (KIS H0STCNT0 spec)
+_SYMBOL, _EXEC_TIME, _CLOSE, _SIGN, _CHANGE, _CHANGE_RATE = 0, 1, 2, 3, 4, 5
+_OPEN, _HIGH, _LOW, _ASK, _BID, _TICK_VOL, _ACC_VOL, _TRADE_VALUE = 7, 8, 9, 10, 11, 12, 13, 14
+_MIN_FIELDS = 13
+
+_KST_OFFSET_SECONDS = 9 * 3600
+
+
+class MonotonicTimestamper:
+    """
+    time.monotonic() → KST ISO-8601 문자열 (wall clock 은 re-anchor 주기마다 한 번만 조회).
+
+    초 단위 prefix 를 캐시하므로 같은 초의 tick 은 문자열 연결만 수행한다.
+    """
+
+    def __init__(self, reanchor_seconds: float = 60.0) -> None:
+        self.reanchor_seconds = reanchor_seconds
+        self._anchor()
+        self._cached_second = -1
+        self._cached_prefix = ""
+
+    def _anchor(self) -> None:
+        self._mono_anchor = time.monotonic()
+        self._wall_anchor = time.time()
+
+    def wall_time(self, mono: float) -> float:
+        if mono - self._mono_anchor > self.reanchor_seconds:
+            self._anchor()
+        return self._wall_anchor + (mono - self._mono_anchor)
+
+    def isoformat(self, mono: float) -> str:
+        wall = self.wall_time(mono) + _KST_OFFSET_SECONDS
+        second = int(wall)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        return f"{self._cached_prefix}.{int((wall - second) * 1_000_000):06d}+09:00"
+
+
+timestamper = MonotonicTimestamper()
+
+
+class ExecutionTick(NamedTuple):
+    """One H0STCNT0 execution record"""
+
+    symbol: str
+    execution_time: str  # HHMMSS
+    close: int
+    change_amount: int
+    change_rate: float
+    open: int
+    high: int
+    low: int
+    ask_price: int
+    bid_price: int
+    tick_volume: int
+    accumulated_volume: int
+    trade_value: int
+    received_at: float  # time.monotonic()
+
+    @property
+    def timestamp(self) -> str:
+        return timestamper.isoformat(self.received_at)
+
+    def as_price_data(self) -> Dict[str, Any]:
+        """KISWebSocketProvider 의 기존 price_data dict 형식"""
+        return {
+            "symbol": self.symbol,
+            "execution_time": self.execution_time,
+            "timestamp": timestamper.isoformat(self.received_at),
+            "price": {
+                "close": self.close,
+                "change_amount": self.change_amount,
+                "change_rate": self.change_rate,
+                "open": self.open,
+                "high": self.high,
+                "low": self.low,
+            },
+            "volume": {
+                "tick": self.tick_volume,
+                "accumulated": self.accumulated_volume,
+                "trade_value": self.trade_value,
+            },
+            "bid_ask": {
+                "ask_price": self.ask_price,
+                "bid_price": self.bid_price,
+            },
+            "source": "kis_websocket",
+        }
+
+
+def decode_frame(raw: Union[bytes, str]) -> str:
+    """ASCII fast path, 실패 시 EUC-KR (시스템 메시지)"""
+    if isinstance(raw, str):
+        return raw
+    try:
+        return raw.decode("ascii")
+    except UnicodeDecodeError:
+        return raw.decode("euc-kr")
+
+
+def _int(value: str) -> int:
+    return int(value) if value else 0
+
+
+def parse_record(fields: List[str], base: int, received_at: float) -> Optional[ExecutionTick]:
+    """fields[base:base+46] 하나의 체결 레코드 → ExecutionTick (형식 오류 → None)"""
+    available = len(fields) - base
+    if available > _TRADE_VALUE:
+        try:
+            # fast path: 모든 숫자 필드가 채워진 일반 체결
+            return ExecutionTick(
+                fields[base], fields[base + 1], int(fields[base + 2]), int(fields[base + 4]),
+                float(fields[base + 5]), int(fields[base + 7]), int(fields[base + 8]), int(fields[base + 9]),
+                int(fields[base + 10]), int(fields[base + 11]), int(fields[base + 12]),
+                int(fields[base + 13]), int(fields[base + 14]), received_at,
+            )
+        except ValueError:
+            pass
+    elif available < _MIN_FIELDS:
+        return None
+    try:
+        return ExecutionTick(
+            fields[base + _SYMBOL],
+            fields[base + _EXEC_TIME],
+            _int(fields[base + _CLOSE]),
+            _int(fields[base + _CHANGE]),
+            float(fields[base + _CHANGE_RATE] or 0),
+            _int(fields[base + _OPEN]),
+            _int(fields[base + _HIGH]),
+            _int(fields[base + _LOW]),
+            _int(fields[base + _ASK]),
+            _int(fields[base + _BID]),
+            _int(fields[base + _TICK_VOL]),
+            _int(fields[base + _ACC_VOL]) if available > _ACC_VOL else 0,
+            _int(fields[base + _TRADE_VALUE]) if available > _TRADE_VALUE else 0,
+            received_at,
+        )
+    except ValueError:
+        return None
+
+
+def parse_execution_frame(frame: str, received_at: Optional[float] = None) -> List[ExecutionTick]:
+    """
+    '0|H0STCNT0|count|payload' → ExecutionTick 목록 (H0STCNT0 가 아니면 빈 목록).
+
+    count 와 필드 수가 맞지 않으면(구형/축약 payload) 단일 레코드로 처리한다.
+    """
+    parts = frame.split("|", 3)
+    if len(parts) < 4 or parts[1] != H0STCNT0 or not parts[3]:
+        return []
+    if received_at is None:
+        received_at = time.monotonic()
+    try:
+        count = int(parts[2])
+    except ValueError:
+        count = 1
+    # 단일 레코드는 필요한 앞 15개 필드만 분리 (나머지 31개는 하나의 문자열로 남김)
+    fields = parts[3].split("^") if count > 1 else parts[3].split("^", _TRADE_VALUE + 1)
+
+    if count > 1 and len(fields) >= count * H0STCNT0_FIELD_COUNT:
+        ticks = []
+        for base in range(0, count * H0STCNT0_FIELD_COUNT, H0STCNT0_FIELD_COUNT):
+            tick = parse_record(fields, base, received_at)
+            if tick is not None:
+                ticks.append(tick)
+        return ticks
+    tick = parse_record(fields, 0, received_at)
+    return [tick] if tick is not None else []
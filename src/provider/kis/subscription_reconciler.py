@@ -0,0 +1,244 @@
+"""
+subscription_reconciler.py
+
+Desired-state WebSocket subscription reconciliation for KIS H0STCNT0
+
+Responsibilities:
+- reconcile(desired): diff the target symbol set (e.g. SlotManager.allocated_symbols())
+  against the provider's subscribed_symbols, send unsubscribe frames first (frees
+  capacity), then subscribe frames, paced at frames_per_second without waiting for
+  acknowledgements in between (pipelined)
+- Acknowledgement tracking: KIS answers each frame with a JSON control message
+  (header.tr_key + body.rt_cd/msg1, e.g. "SUBSCRIBE SUCCESS"); the provider forwards
+  it to on_control_message(), which records ack latency or rejects the symbol
+- Time-to-first-tick: first H0STCNT0 record per newly subscribed symbol
+  (provider calls note_tick()), exported as a histogram
+
+Environment overrides:
+- KIS_WS_FRAMES_PER_SECOND (default 20): control frame pacing per connection
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from monitoring.prometheus_metrics import LATENCY_BUCKETS_SECONDS, get_registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FRAMES_PER_SECOND = 20.0
+
+# KIS control responses that still mean "symbol is subscribed"
+_ALREADY_SUBSCRIBED = ("ALREADY IN SUBSCRIBE",)
+
+
+@dataclass
+class ReconcileResult:
+    """Outcome of one reconcile() call"""
+    subscribed: List[str] = field(default_factory=list)
+    unsubscribed: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)  # over capacity / not connected
+    duration_seconds: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.subscribed or self.unsubscribed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "subscribed": len(self.subscribed),
+            "unsubscribed": len(self.unsubscribed),
+            "failed": len(self.failed),
+            "skipped": len(self.skipped),
+            "duration_seconds": round(self.duration_seconds, 4),
+        }
+
+
+class SubscriptionReconciler:
+    """
+    Reconciles one KISWebSocketProvider connection towards a desired symbol set.
+
+    The provider must expose subscribed_symbols, pending_symbols, is_connected,
+    MAX_SUBSCRIPTIONS and _send_subscription_request / _send_unsubscription_request.
+    """
+
+    def __init__(
+        self,
+        provider: Any,
+        frames_per_second: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.provider = provider
+        fps = float(frames_per_second or os.getenv("KIS_WS_FRAMES_PER_SECOND", DEFAULT_FRAMES_PER_SECOND))
+        if fps <= 0:
+            raise ValueError("frames_per_second must be positive")
+        self.frame_interval = 1.0 / fps
+        self._clock = clock
+        self._lock = asyncio.Lock()
+        self._next_frame_at = 0.0
+
+        # symbol -> frame sent at (awaiting ack / first tick)
+        self._awaiting_ack: Dict[str, float] = {}
+        self.awaiting_first_tick: Dict[str, float] = {}
+
+        self._stats = {
+            "reconciles": 0,
+            "frames_sent": 0,
+            "acks": 0,
+            "rejects": 0,
+            "first_ticks": 0,
+        }
+
+        registry = get_registry()
+        self._frames_counter = registry.counter(
+            "observer_ws_subscription_frames_total", "KIS WebSocket subscribe/unsubscribe frames sent"
+        )
+        self._reject_counter = registry.counter(
+            "observer_ws_subscription_rejects_total", "KIS WebSocket subscription frames rejected"
+        )
+        self._ack_histogram = registry.histogram(
+            "observer_ws_subscribe_ack_seconds",
+            "Subscribe frame → KIS acknowledgement",
+            buckets=LATENCY_BUCKETS_SECONDS,
+        )
+        self._first_tick_histogram = registry.histogram(
+            "observer_ws_time_to_first_tick_seconds",
+            "Subscribe frame → first H0STCNT0 tick for the symbol",
+            buckets=LATENCY_BUCKETS_SECONDS + (30.0, 60.0, 120.0),
+        )
+        self._reconcile_histogram = registry.histogram(
+            "observer_ws_reconcile_duration_seconds",
+            "Time to send all frames of one subscription reconcile",
+            buckets=LATENCY_BUCKETS_SECONDS,
+        )
+
+    # ------------------------------------------------------------------
+    # Reconcile
+    # ------------------------------------------------------------------
+
+    async def _pace(self) -> None:
+        """frames_per_second 간격 유지 (연속 reconcile 사이에도 적용)"""
+        now = self._clock()
+        if self._next_frame_at > now:
+            await asyncio.sleep(self._next_frame_at - now)
+            now = self._clock()
+        self._next_frame_at = max(now, self._next_frame_at) + self.frame_interval
+
+    async def reconcile(self, desired: Iterable[str]) -> ReconcileResult:
+        """
+        subscribed_symbols 를 desired 로 맞춘다 (해지 먼저, 그 다음 구독).
+
+        연결되지 않은 상태면 desired 를 pending_symbols 로 남겨 재연결 시 반영한다.
+        (더 이상 원하지 않는 기존 구독은 이때 정리 → 재연결 시 되살아나지 않음)
+        """
+        provider = self.provider
+        target = list(dict.fromkeys(desired))
+        result = ReconcileResult()
+        async with self._lock:
+            started = self._clock()
+            self._stats["reconciles"] += 1
+            if not provider.is_connected:
+                provider.pending_symbols = set(target)
+                provider.subscribed_symbols.intersection_update(provider.pending_symbols)
+                result.skipped = [s for s in target if s not in provider.subscribed_symbols]
+                return result
+
+            target_set = set(target)
+            stale = [s for s in provider.subscribed_symbols if s not in target_set]
+            missing = [s for s in target if s not in provider.subscribed_symbols]
+
+            for symbol in stale:
+                await self._pace()
+                try:
+                    await provider._send_unsubscription_request(symbol)
+                except Exception as e:
+                    logger.error(f"❌ Unsubscription failed for {symbol}: {e}")
+                    result.failed.append(symbol)
+                    continue
+                self._sent()
+                provider.subscribed_symbols.discard(symbol)
+                self._awaiting_ack.pop(symbol, None)
+                self.awaiting_first_tick.pop(symbol, None)
+                result.unsubscribed.append(symbol)
+
+            for symbol in missing:
+                if len(provider.subscribed_symbols) >= provider.MAX_SUBSCRIPTIONS:
+                    result.skipped.append(symbol)
+                    continue
+                await self._pace()
+                try:
+                    await provider._send_subscription_request(symbol)
+                except Exception as e:
+                    logger.error(f"❌ Subscription failed for {symbol}: {e}")
+                    result.failed.append(symbol)
+                    continue
+                self._sent()
+                sent_at = self._clock()
+                provider.subscribed_symbols.add(symbol)
+                self._awaiting_ack[symbol] = sent_at
+                self.awaiting_first_tick[symbol] = sent_at
+                result.subscribed.append(symbol)
+
+            provider.pending_symbols = set(result.skipped) | (set(result.failed) & target_set)
+            result.duration_seconds = self._clock() - started
+        if result.changed:
+            self._reconcile_histogram.observe(result.duration_seconds)
+            logger.info(
+                "📡 Subscriptions reconciled: +%d -%d (failed=%d, skipped=%d) in %.3fs",
+                len(result.subscribed), len(result.unsubscribed),
+                len(result.failed), len(result.skipped), result.duration_seconds,
+            )
+        return result
+
+    def _sent(self) -> None:
+        self._stats["frames_sent"] += 1
+        self._frames_counter.increment()
+
+    # ------------------------------------------------------------------
+    # Acknowledgements / first tick (called from the provider's receive loop)
+    # ------------------------------------------------------------------
+
+    def on_control_message(self, symbol: str, rt_cd: Optional[str], msg: str) -> None:
+        """KIS JSON 제어 응답 처리 (header.tr_key, body.rt_cd, body.msg1)"""
+        sent_at = self._awaiting_ack.pop(symbol, None)
+        if rt_cd == "0" or any(marker in msg for marker in _ALREADY_SUBSCRIBED):
+            if sent_at is not None:
+                self._stats["acks"] += 1
+                self._ack_histogram.observe(self._clock() - sent_at)
+            return
+        if sent_at is None and "UNSUBSCRIBE" in msg.upper():
+            return
+        # rejected (e.g. MAX SUBSCRIBE OVER, invalid tr_key)
+        self._stats["rejects"] += 1
+        self._reject_counter.increment()
+        self.provider.subscribed_symbols.discard(symbol)
+        self.awaiting_first_tick.pop(symbol, None)
+        logger.warning(f"⚠️ Subscription rejected for {symbol}: {msg} (rt_cd={rt_cd})")
+
+    def note_tick(self, symbol: str) -> None:
+        """첫 체결 수신 시 time-to-first-tick 기록"""
+        sent_at = self.awaiting_first_tick.pop(symbol, None)
+        if sent_at is not None:
+            self._stats["first_ticks"] += 1
+            self._first_tick_histogram.observe(self._clock() - sent_at)
+
+    def reset(self) -> None:
+        """연결 종료 시 ack / first-tick 대기 상태 초기화"""
+        self._awaiting_ack.clear()
+        self.awaiting_first_tick.clear()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """통계 정보 반환"""
+        return {
+            **self._stats,
+            "pending_acks": len(self._awaiting_ack),
+            "awaiting_first_tick": len(self.awaiting_first_tick),
+            "frames_per_second": round(1.0 / self.frame_interval, 3),
+        }
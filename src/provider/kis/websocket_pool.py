@@ -0,0 +1,325 @@
+"""
+websocket_pool.py
+
+Multi-connection KIS WebSocket fan-out (41 symbols per connection → N x 41)
+
+Responsibilities:
+- One KISWebSocketProvider per approval key (KIS allows one realtime session and
+  MAX_SUBSCRIPTIONS registrations per approval key)
+- Consistent symbol → connection assignment: rendezvous (highest random weight)
+  hashing, sticky while the symbol stays desired, spill to the next-ranked
+  connection when a shard is full
+- Each connection keeps its own reconnect loop; symbols of a dropped connection
+  stay assigned to it and are resubscribed when it comes back
+- All connections relay into one merged on_price_update callback, so the pool is a
+  drop-in replacement for KISWebSocketProvider inside ProviderEngine
+
+Environment:
+- KIS_WS_CONNECTIONS (default 1): number of connections to open
+- KIS_WS_APP_KEY_<n> / KIS_WS_APP_SECRET_<n> (n = 2..N): credentials of the extra
+  connections (connection 1 uses the main KISAuth); connections without
+  credentials are not created
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Union
+
+from .kis_auth import KISAuth
+from .kis_websocket_provider import KISWebSocketProvider
+from .realtime_parser import ExecutionTick
+from .rate_limit_service import RequestPriority, get_rate_limiter
+from .subscription_reconciler import ReconcileResult
+
+logger = logging.getLogger(__name__)
+
+
+class ApprovalKeyCredential:
+    """
+    Extra app key used only for a WebSocket approval key.
+
+    Shares base_url / HTTP session with the main KISAuth (KISAuth itself is a
+    process-wide singleton, so it cannot hold a second app key).
+    """
+
+    def __init__(self, auth: KISAuth, app_key: str, app_secret: str) -> None:
+        self.auth = auth
+        self.app_key = app_key
+        self.app_secret = app_secret
+        self.approval_key: Optional[str] = None
+
+    async def ensure_token(self) -> Optional[str]:
+        """approval 발급에는 access token 이 필요 없다 (connect() 호환용)"""
+        return None
+
+    async def get_approval_key(self) -> str:
+        if self.approval_key:
+            return self.approval_key
+        url = f"{self.auth.base_url}/oauth2/Approval"
+        data = {
+            "grant_type": "client_credentials",
+            "appkey": self.app_key,
+            "secretkey": self.app_secret,
+        }
+        await get_rate_limiter(self.app_key).acquire(RequestPriority.EMERGENCY)
+        session = await self.auth.get_session()
+        async with session.post(url, headers={"content-type": "application/json; charset=utf-8"}, json=data) as response:
+            result = await response.json()
+            if "approval_key" in result:
+                self.approval_key = result["approval_key"]
+                return self.approval_key
+            raise RuntimeError(f"Approval key request failed: {result}")
+
+
+def ws_credentials_from_env(auth: KISAuth, connections: Optional[int] = None) -> List[Union[KISAuth, ApprovalKeyCredential]]:
+    """KIS_WS_CONNECTIONS 만큼 연결용 credential 목록 생성 (1번은 main auth)"""
+    if connections is None:
+        try:
+            connections = int(os.getenv("KIS_WS_CONNECTIONS", "1"))
+        except ValueError:
+            connections = 1
+    credentials: List[Union[KISAuth, ApprovalKeyCredential]] = [auth]
+    for n in range(2, max(connections, 1) + 1):
+        app_key = os.getenv(f"KIS_WS_APP_KEY_{n}")
+        app_secret = os.getenv(f"KIS_WS_APP_SECRET_{n}")
+        if not app_key or not app_secret:
+            logger.warning(f"KIS_WS_APP_KEY_{n}/KIS_WS_APP_SECRET_{n} missing → using {len(credentials)} connection(s)")
+            break
+        credentials.append(ApprovalKeyCredential(auth, app_key, app_secret))
+    return credentials
+
+
+def _weight(symbol: str, index: int) -> int:
+    digest = hashlib.blake2b(f"{index}:{symbol}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def rank_connections(symbol: str, count: int) -> List[int]:
+    """rendezvous hashing: 종목별 연결 선호 순서 (연결 수가 바뀌어도 대부분 유지)"""
+    return sorted(range(count), key=lambda index: _weight(symbol, index), reverse=True)
+
+
+class KISWebSocketPool:
+    """Shards subscriptions across several KISWebSocketProvider connections."""
+
+    def __init__(self, providers: List[KISWebSocketProvider]) -> None:
+        if not providers:
+            raise ValueError("KISWebSocketPool needs at least one connection")
+        self.providers = providers
+        self.per_connection = min(p.MAX_SUBSCRIPTIONS for p in providers)
+        self.MAX_SUBSCRIPTIONS = self.per_connection * len(providers)
+        self._assignment: Dict[str, int] = {}
+
+        # Merged callbacks (same surface as KISWebSocketProvider)
+        self.on_price_update: Optional[Callable[[Dict[str, Any]], Optional[Awaitable[None]]]] = None
+        self.on_tick: Optional[Callable[[ExecutionTick], None]] = None
+        self.on_connection: Optional[Callable[[], None]] = None
+        self.on_disconnection: Optional[Callable[[], None]] = None
+        self.on_error: Optional[Callable[[str], None]] = None
+
+        for index, provider in enumerate(providers):
+            provider.on_price_update = self._relay_price
+            provider.on_tick = self._relay_tick
+            provider.on_connection = self._relay_connection(index)
+            provider.on_disconnection = self._relay_disconnection(index)
+            provider.on_error = self._relay_error(index)
+
+    # ------------------------------------------------------------------
+    # Callback relay
+    # ------------------------------------------------------------------
+
+    def _relay_price(self, data: Dict[str, Any]) -> Optional[Awaitable[None]]:
+        if self.on_price_update:
+            return self.on_price_update(data)
+        return None
+
+    def _relay_tick(self, tick: ExecutionTick) -> None:
+        if self.on_tick:
+            self.on_tick(tick)
+
+    def _relay_connection(self, index: int) -> Callable[[], None]:
+        def relay() -> None:
+            logger.info(f"WS pool connection #{index} connected")
+            if self.on_connection:
+                self.on_connection()
+        return relay
+
+    def _relay_disconnection(self, index: int) -> Callable[[], None]:
+        def relay() -> None:
+            logger.warning(f"WS pool connection #{index} disconnected")
+            if self.on_disconnection:
+                self.on_disconnection()
+        return relay
+
+    def _relay_error(self, index: int) -> Callable[[str], None]:
+        def relay(message: str) -> None:
+            if self.on_error:
+                self.on_error(f"[conn {index}] {message}")
+        return relay
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def is_connected(self) -> bool:
+        return any(p.is_connected for p in self.providers)
+
+    async def connect(self) -> bool:
+        """모든 연결을 동시에 시도. 하나라도 연결되면 True (실패한 연결은 각자 재연결)"""
+        results = await asyncio.gather(*(p.connect() for p in self.providers), return_exceptions=True)
+        connected = any(ok is True for ok in results)
+        for index, (provider, ok) in enumerate(zip(self.providers, results)):
+            if ok is True:
+                continue
+            logger.warning(f"WS pool connection #{index} failed to connect: {ok}")
+            if connected and not (provider._reconnect_task and not provider._reconnect_task.done()):
+                provider._reconnect_task = asyncio.create_task(provider._schedule_reconnection())
+        return connected
+
+    async def disconnect(self) -> None:
+        await asyncio.gather(*(p.disconnect() for p in self.providers))
+        self._assignment.clear()
+
+    async def close(self) -> None:
+        await asyncio.gather(*(p.close() for p in self.providers))
+        self._assignment.clear()
+
+    # ------------------------------------------------------------------
+    # Assignment
+    # ------------------------------------------------------------------
+
+    def _loads(self) -> List[int]:
+        loads = [0] * len(self.providers)
+        for index in self._assignment.values():
+            loads[index] += 1
+        return loads
+
+    def _place(self, symbol: str, loads: List[int]) -> Optional[int]:
+        """선호 순서대로 여유 있는 연결 선택 (기존 배정은 유지)"""
+        index = self._assignment.get(symbol)
+        if index is not None:
+            return index
+        for index in rank_connections(symbol, len(self.providers)):
+            if loads[index] < self.per_connection:
+                loads[index] += 1
+                self._assignment[symbol] = index
+                return index
+        return None
+
+    def connection_for(self, symbol: str) -> Optional[int]:
+        """현재 종목이 배정된 연결 index (미배정 → None)"""
+        return self._assignment.get(symbol)
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    @property
+    def subscribed_symbols(self) -> Set[str]:
+        symbols: Set[str] = set()
+        for provider in self.providers:
+            symbols |= provider.subscribed_symbols
+        return symbols
+
+    @property
+    def pending_symbols(self) -> Set[str]:
+        symbols: Set[str] = set()
+        for provider in self.providers:
+            symbols |= provider.pending_symbols
+        return symbols
+
+    @property
+    def subscription_count(self) -> int:
+        return sum(len(p.subscribed_symbols) for p in self.providers)
+
+    @property
+    def available_slots(self) -> int:
+        return self.MAX_SUBSCRIPTIONS - self.subscription_count
+
+    async def reconcile_subscriptions(self, desired: Iterable[str]) -> ReconcileResult:
+        """
+        desired 를 연결별로 나눠 각 연결의 reconciler 에 동시에 적용.
+
+        연결마다 approval key 가 달라 프레임 pacing 도 연결별로 독립이다.
+        """
+        target = list(dict.fromkeys(desired))
+        target_set = set(target)
+        for symbol in [s for s in self._assignment if s not in target_set]:
+            del self._assignment[symbol]
+
+        shards: List[List[str]] = [[] for _ in self.providers]
+        loads = self._loads()
+        overflow: List[str] = []
+        for symbol in target:
+            index = self._place(symbol, loads)
+            if index is None:
+                overflow.append(symbol)
+            else:
+                shards[index].append(symbol)
+
+        results = await asyncio.gather(
+            *(p.reconcile_subscriptions(shard) for p, shard in zip(self.providers, shards))
+        )
+        merged = ReconcileResult(skipped=overflow)
+        for result in results:
+            merged.subscribed += result.subscribed
+            merged.unsubscribed += result.unsubscribed
+            merged.failed += result.failed
+            merged.skipped += result.skipped
+            merged.duration_seconds = max(merged.duration_seconds, result.duration_seconds)
+        if overflow:
+            logger.warning(f"⚠️ WS pool full ({self.MAX_SUBSCRIPTIONS}): {len(overflow)} symbols not subscribed")
+        return merged
+
+    async def subscribe(self, symbol: str) -> bool:
+        index = self._place(symbol, self._loads())
+        if index is None:
+            logger.error(f"Cannot subscribe: all {len(self.providers)} connections full")
+            return False
+        ok = await self.providers[index].subscribe(symbol)
+        if not ok:
+            self._assignment.pop(symbol, None)
+        return ok
+
+    async def unsubscribe(self, symbol: str) -> bool:
+        index = self._assignment.pop(symbol, None)
+        if index is None:
+            return True
+        return await self.providers[index].unsubscribe(symbol)
+
+    async def unsubscribe_all(self) -> None:
+        await asyncio.gather(*(p.unsubscribe_all() for p in self.providers))
+        self._assignment.clear()
+
+    @property
+    def subscription_stats(self) -> Dict[str, Any]:
+        """연결별 구독 / ack 통계"""
+        return {
+            "connections": len(self.providers),
+            "connected": sum(1 for p in self.providers if p.is_connected),
+            "per_connection": [
+                {
+                    "connected": p.is_connected,
+                    "subscriptions": len(p.subscribed_symbols),
+                    "pending": len(p.pending_symbols),
+                    **p.reconciler.stats,
+                }
+                for p in self.providers
+            ],
+        }
+
+
+def create_websocket_provider(
+    auth: KISAuth, is_virtual: bool = False, connections: Optional[int] = None
+) -> Union[KISWebSocketProvider, KISWebSocketPool]:
+    """연결 1개면 KISWebSocketProvider, 여러 개면 KISWebSocketPool"""
+    credentials = ws_credentials_from_env(auth, connections)
+    if len(credentials) == 1:
+        return KISWebSocketProvider(auth, is_virtual=is_virtual)
+    logger.info(f"KIS WebSocket pool: {len(credentials)} connections")
+    return KISWebSocketPool([KISWebSocketProvider(c, is_virtual=is_virtual) for c in credentials])
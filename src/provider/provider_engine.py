@@ -8,9 +8,13 @@ Provider Engine: unifies REST and WebSocket providers for the Observer.
 Responsibilities:
 - Initialize and manage KIS REST + WebSocket providers (real/virtual)
 - Provide simple lifecycle (start/stop) for websocket streaming
-- Manage subscriptions with KIS slot limit (41)
+- Manage subscriptions with KIS slot limit (41 per connection; KIS_WS_CONNECTIONS
+  shards across several approval keys); reconcile_subscriptions() applies a
+  desired symbol set as one pipelined diff
 - Expose health information
 - Relay normalized streaming updates via a single callback
+- Coalesce identical concurrent REST requests and serve repeats from a short-TTL
+  LRU cache (request_cache.py); cached contracts are shared and read-only
 
 This module intentionally keeps a thin surface; higher-level components
 like Track A/Track B collectors can depend on this engine.
@@ -18,9 +22,17 @@ like Track A/Track B collectors can depend on this engine.
 
 import asyncio
 import logging
-from typing import Callable, Iterable, Optional, Set, Dict, Any
-
-from .kis import KISAuth, KISRestProvider, KISWebSocketProvider
+from typing import Awaitable, Callable, Iterable, Optional, Set, Dict, Any, Union
+
+from .kis import (
+    ExecutionTick,
+    KISAuth,
+    KISRestProvider,
+    KISWebSocketPool,
+    KISWebSocketProvider,
+    create_websocket_provider,
+)
+from .request_cache import ProviderCacheConfig, RequestCache
 
 logger = logging.getLogger(__name__)
 
@@ -34,22 +46,35 @@ class ProviderEngine:
         self,
         auth: KISAuth,
         rest_provider: Optional[KISRestProvider] = None,
-        ws_provider: Optional[KISWebSocketProvider] = None,
+        ws_provider: Optional[Union[KISWebSocketProvider, KISWebSocketPool]] = None,
         is_virtual: bool = False,
+        cache_config: Optional[ProviderCacheConfig] = None,
     ) -> None:
         self.auth = auth
         self.rest: KISRestProvider = rest_provider or KISRestProvider(auth)
-        self.ws: KISWebSocketProvider = ws_provider or KISWebSocketProvider(auth, is_virtual=is_virtual)
+        # KIS_WS_CONNECTIONS > 1 → KISWebSocketPool (41 symbols per approval key)
+        self.ws: Union[KISWebSocketProvider, KISWebSocketPool] = ws_provider or create_websocket_provider(
+            auth, is_virtual=is_virtual
+        )
+        max_slots = getattr(self.ws, "MAX_SUBSCRIPTIONS", None)
+        self.max_ws_slots = max_slots if isinstance(max_slots, int) else self.MAX_WS_SLOTS
         self.is_virtual = is_virtual
 
+        # REST single-flight + TTL cache (shared by universe builder / Track A / API callers)
+        self.cache_config = cache_config or ProviderCacheConfig()
+        self._cache = RequestCache(max_entries=self.cache_config.max_entries)
+
         # Subscription state (mirrors ws provider but tracked here for convenience)
         self._subs: Set[str] = set()
 
         # External event relay callback (normalized dict from ws provider)
-        self.on_price_update: Optional[Callable[[Dict[str, Any]], None]] = None
+        self.on_price_update: Optional[Callable[[Dict[str, Any]], Optional[Awaitable[None]]]] = None
+        # Compact H0STCNT0 ticks (tick-level trigger detection), relayed before on_price_update
+        self.on_tick: Optional[Callable[[ExecutionTick], None]] = None
 
         # Wire callbacks
         self.ws.on_price_update = self._handle_ws_update
+        self.ws.on_tick = self._handle_ws_tick
         self.ws.on_connection = lambda: logger.info("ProviderEngine: WS connected")
         self.ws.on_disconnection = lambda: logger.warning("ProviderEngine: WS disconnected")
         self.ws.on_error = lambda msg: logger.error("ProviderEngine WS error: %s", msg)
@@ -69,13 +94,52 @@ class ProviderEngine:
         self._subs.clear()
 
     # ---------------------------------------------------------------------
-    # REST access (pass-through)
+    # REST access (coalesced + cached)
     # ---------------------------------------------------------------------
     async def fetch_current_price(self, symbol: str) -> Dict[str, Any]:
-        return await self.rest.fetch_current_price(symbol)
+        if not self.cache_config.enabled:
+            return await self.rest.fetch_current_price(symbol)
+        data = await self._cache.load(
+            ("quote", symbol),
+            self.cache_config.quote_ttl_seconds,
+            lambda: self.rest.fetch_current_price(symbol),
+        )
+        if data is None:
+            # joined a batch flight that did not return this symbol
+            return await self.rest.fetch_current_price(symbol)
+        return data
+
+    async def fetch_current_prices(self, symbols: list[str]) -> list[Dict[str, Any]]:
+        """Batched quotes (multi-price endpoint with per-symbol fallback), in input order."""
+        if not self.cache_config.enabled:
+            return await self.rest.fetch_current_prices(list(symbols))
+
+        async def load(keys: list) -> Dict[Any, Dict[str, Any]]:
+            contracts = await self.rest.fetch_current_prices([key[1] for key in keys])
+            return {("quote", c["instruments"][0]["symbol"]): c for c in contracts}
+
+        found = await self._cache.load_many(
+            [("quote", sym) for sym in symbols], self.cache_config.quote_ttl_seconds, load
+        )
+        return [found[("quote", sym)] for sym in symbols if ("quote", sym) in found]
+
+    @property
+    def quote_batch_size(self) -> int:
+        return self.rest.quote_batch_size
 
     async def fetch_daily_prices(self, symbol: str, days: int = 30) -> Any:
-        return await self.rest.fetch_daily_prices(symbol, days=days)
+        if not self.cache_config.enabled:
+            return await self.rest.fetch_daily_prices(symbol, days=days)
+        return await self._cache.load(
+            ("daily", symbol, days),
+            self.cache_config.daily_ttl_seconds,
+            lambda: self.rest.fetch_daily_prices(symbol, days=days),
+        )
+
+    @property
+    def cache_stats(self) -> Dict[str, Any]:
+        """REST cache hit / miss / coalesced counters"""
+        return self._cache.stats
     
     async def fetch_stock_list(self, market: str = "ALL") -> list[str]:
         """Fetch all available stock symbols from provider."""
@@ -90,13 +154,13 @@ class ProviderEngine:
 
     @property
     def available_slots(self) -> int:
-        return self.MAX_WS_SLOTS - self.subscription_count
+        return self.max_ws_slots - self.subscription_count
 
     async def subscribe(self, symbol: str) -> bool:
         if symbol in self._subs:
             return True
-        if self.subscription_count >= self.MAX_WS_SLOTS:
-            logger.error("WS slot limit reached (%s)", self.MAX_WS_SLOTS)
+        if self.subscription_count >= self.max_ws_slots:
+            logger.error("WS slot limit reached (%s)", self.max_ws_slots)
             return False
         ok = await self.ws.subscribe(symbol)
         if ok:
@@ -110,6 +174,16 @@ class ProviderEngine:
             await asyncio.sleep(spacing_sec)
         return results
 
+    async def reconcile_subscriptions(self, desired: Iterable[str]) -> Dict[str, Any]:
+        """
+        Diff desired symbols against current WS subscriptions and pipeline the
+        unsubscribe/subscribe frames (see SubscriptionReconciler).
+        """
+        target = list(dict.fromkeys(desired))[: self.max_ws_slots]
+        result = await self.ws.reconcile_subscriptions(target)
+        self._subs = set(self.ws.subscribed_symbols)
+        return result.to_dict()
+
     async def unsubscribe(self, symbol: str) -> bool:
         ok = await self.ws.unsubscribe(symbol)
         if ok:
@@ -123,13 +197,18 @@ class ProviderEngine:
     # ---------------------------------------------------------------------
     # Events
     # ---------------------------------------------------------------------
-    def _handle_ws_update(self, data: Dict[str, Any]) -> None:
+    def _handle_ws_update(self, data: Dict[str, Any]) -> Optional[Awaitable[None]]:
+        """Relay a WS update; an awaitable result (consumer backpressure) is passed back to the WS reader."""
         symbol = data.get("symbol", "UNKNOWN")
-        logger.info(f"[엔진] 가격 업데이트 수신: {symbol}")
+        logger.debug("[엔진] 가격 업데이트 수신: %s", symbol)
         if self.on_price_update:
-            self.on_price_update(data)
-        else:
-            logger.warning("[엔진] on_price_update 콜백이 등록되지 않음! 메시지 유실 가능")
+            return self.on_price_update(data)
+        logger.warning("[엔진] on_price_update 콜백이 등록되지 않음! 메시지 유실 가능")
+        return None
+
+    def _handle_ws_tick(self, tick: ExecutionTick) -> None:
+        if self.on_tick:
+            self.on_tick(tick)
 
     # ---------------------------------------------------------------------
     # Health
@@ -150,6 +229,8 @@ class ProviderEngine:
             "ws_connected": self.ws.is_connected,
             "ws_subscriptions": self.subscription_count,
             "ws_available_slots": self.available_slots,
+            "ws_subscription_stats": self.ws.subscription_stats,
+            "rest_cache": self.cache_stats,
         }
 
     # ---------------------------------------------------------------------
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+"""
+request_cache.py
+
+Single-flight request coalescing + short-TTL LRU cache for ProviderEngine REST calls
+
+Responsibilities:
+- Single-flight: concurrent identical requests (same key) share one REST call.
+  The in-flight slot is a concurrent.futures.Future, so followers on another
+  thread / event loop (universe scheduler, Track A, API handlers) can join it too.
+- TTL cache: a completed result is served for ttl seconds, bounded by max_entries
+  with least-recently-used eviction.
+- Failures are never cached; every waiter of a failed flight receives the exception.
+  A cancelled leader does not cancel its followers: the flight is dropped and
+  a waiting follower retries as the new leader.
+- Hit / miss / coalesced / eviction counters (stats property + shared metrics registry)
+
+Cached values are shared between callers and must be treated as read-only.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from monitoring.prometheus_metrics import get_registry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProviderCacheConfig:
+    """ProviderEngine REST cache settings (ttl 0 → coalescing only, no caching)"""
+
+    enabled: bool = True
+    quote_ttl_seconds: float = 1.0  # current price
+    daily_ttl_seconds: float = 300.0  # daily OHLCV (closes change at most once a day)
+    max_entries: int = 4096
+
+
+class _LeaderCancelled(Exception):
+    """합류한 flight 의 leader 가 취소됨 (대기자는 재시도)"""
+
+
+class RequestCache:
+    """Thread-safe TTL/LRU cache with single-flight loading."""
+
+    def __init__(self, max_entries: int = 4096, clock: Callable[[], float] = time.monotonic) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._coalesced: Dict[str, int] = {}
+        self._evictions = 0
+
+        registry = get_registry()
+        self._registry = registry
+        self._evictions_counter = registry.counter(
+            "observer_provider_cache_evictions_total", "Provider REST cache LRU evictions"
+        )
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _count(self, table: Dict[str, int], metric: str, help_text: str, kind: str) -> None:
+        table[kind] = table.get(kind, 0) + 1
+        self._registry.counter(metric, help_text, labels={"kind": kind}).increment()
+
+    def _hit(self, kind: str) -> None:
+        self._count(self._hits, "observer_provider_cache_hits_total", "Provider REST cache hits", kind)
+
+    def _miss(self, kind: str) -> None:
+        self._count(self._misses, "observer_provider_cache_misses_total", "Provider REST cache misses", kind)
+
+    def _join(self, kind: str) -> None:
+        self._count(
+            self._coalesced,
+            "observer_provider_cache_coalesced_total",
+            "Provider REST requests joined to an identical in-flight request",
+            kind,
+        )
+
+    # ------------------------------------------------------------------
+    # Core
+    # ------------------------------------------------------------------
+
+    def _lookup(self, key: Hashable, now: float) -> Tuple[bool, Any]:
+        """(lock 보유 상태) 유효한 캐시 값 조회, 만료 항목은 제거"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: Any, ttl: float) -> None:
+        """(lock 보유 상태) 저장 + LRU 초과분 제거"""
+        if ttl <= 0:
+            return
+        self._entries[key] = (self._clock() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+            self._evictions_counter.increment()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """캐시 값만 조회 (통계 미반영). Returns: (found, value)"""
+        with self._lock:
+            return self._lookup(key, self._clock())
+
+    async def load(self, key: Hashable, ttl: float, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key 의 값을 반환. 캐시 hit → 즉시, 같은 key 가 진행 중 → 그 결과를 공유, 아니면 loader 실행.
+
+        Args:
+            key: (kind, ...) 튜플. kind(첫 원소)는 통계 레이블로 쓰인다
+            ttl: 결과 캐시 시간(초). 0 이면 캐시하지 않고 동시 요청만 합친다
+            loader: 실제 REST 호출 (인자 없는 coroutine 함수)
+        """
+        kind = str(key[0]) if isinstance(key, tuple) else "default"
+        while True:
+            with self._lock:
+                found, value = self._lookup(key, self._clock())
+                if found:
+                    self._hit(kind)
+                    return value
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._inflight[key] = Future()
+                    self._miss(kind)
+                else:
+                    self._join(kind)
+
+            if leader:
+                break
+            try:
+                return await self._wait(flight)
+            except _LeaderCancelled:
+                continue  # leader 취소 → 이 호출이 새 leader 로 재시도
+
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            self._abandon([key], [flight])
+            raise
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.set_exception(e)
+            # 아무도 기다리지 않았으면 "exception was never retrieved" 경고 방지
+            flight.exception()
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._store(key, value, ttl)
+        flight.set_result(value)
+        return value
+
+    async def load_many(
+        self,
+        keys: List[Hashable],
+        ttl: float,
+        loader: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+    ) -> Dict[Hashable, Any]:
+        """
+        여러 key 를 한 번에 조회. hit / 진행 중인 요청 합류 / 나머지는 loader(misses) 1회 호출.
+
+        loader 가 돌려주지 않은 key 는 결과에서 빠진다 (캐시되지 않음).
+        """
+        results: Dict[Hashable, Any] = {}
+        joined: Dict[Hashable, Future] = {}
+        owned: Dict[Hashable, Future] = {}
+        with self._lock:
+            now = self._clock()
+            for key in dict.fromkeys(keys):
+                kind = str(key[0]) if isinstance(key, tuple) else "default"
+                found, value = self._lookup(key, now)
+                if found:
+                    self._hit(kind)
+                    results[key] = value
+                elif key in self._inflight:
+                    self._join(kind)
+                    joined[key] = self._inflight[key]
+                else:
+                    self._miss(kind)
+                    owned[key] = self._inflight[key] = Future()
+
+        if owned:
+            try:
+                loaded = await loader(list(owned))
+            except asyncio.CancelledError:
+                self._abandon(list(owned), list(owned.values()))
+                raise
+            except BaseException as e:
+                with self._lock:
+                    for key in owned:
+                        self._inflight.pop(key, None)
+                for flight in owned.values():
+                    flight.set_exception(e)
+                    flight.exception()
+                raise
+            with self._lock:
+                for key in owned:
+                    self._inflight.pop(key, None)
+                    if key in loaded:
+                        self._store(key, loaded[key], ttl)
+            for key, flight in owned.items():
+                flight.set_result(loaded.get(key))
+                if key in loaded:
+                    results[key] = loaded[key]
+
+        retry: List[Hashable] = []
+        for key, flight in joined.items():
+            try:
+                value = await self._wait(flight)
+            except _LeaderCancelled:
+                retry.append(key)  # leader 취소 → 남은 key 는 다시 조회
+                continue
+            except Exception:
+                continue  # 다른 호출자의 실패 → 이 key 는 결과에서 제외
+            if value is not None:
+                results[key] = value
+        if retry:
+            results.update(await self.load_many(retry, ttl, loader))
+        return results
+
+    def _abandon(self, keys: List[Hashable], flights: List[Future]) -> None:
+        """leader 가 취소됨 → flight 를 결과 없이 취소 (대기자는 _LeaderCancelled 후 재시도)"""
+        with self._lock:
+            for key in keys:
+                self._inflight.pop(key, None)
+        for flight in flights:
+            flight.cancel()
+
+    @staticmethod
+    async def _wait(flight: Future) -> Any:
+        """
+        flight 결과 대기.
+
+        shield: 이 대기자가 취소돼도 공유 flight 는 취소하지 않는다.
+        leader 취소로 flight 가 취소되면 _LeaderCancelled 를 던진다.
+        """
+        try:
+            return await asyncio.shield(asyncio.wrap_future(flight))
+        except asyncio.CancelledError:
+            task = asyncio.current_task()
+            if flight.cancelled() and not (task is not None and task.cancelling()):
+                raise _LeaderCancelled() from None
+            raise
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """key 하나 또는 전체 캐시 제거 (진행 중 요청은 유지)"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """통계 정보 반환"""
+        with self._lock:
+            kinds = set(self._hits) | set(self._misses) | set(self._coalesced)
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "inflight": len(self._inflight),
+                "evictions": self._evictions,
+                "kinds": {
+                    kind: {
+                        "hits": self._hits.get(kind, 0),
+                        "misses": self._misses.get(kind, 0),
+                        "coalesced": self._coalesced.get(kind, 0),
+                    }
+                    for kind in sorted(kinds)
+                },
+            }
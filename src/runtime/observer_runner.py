@@ -11,6 +11,7 @@ from ops.observer.inputs import (
 from ops.observer.tick_events import ITickEventProvider, TickEvent
 from ops.observer.event_bus import EventBus, JsonlFileSink
 from ops.observer.buffered_sink import BufferedJsonlFileSink
+from ops.observer.delta_state import DeltaStateStore
 from ops.observer.observer import Observer
 from ops.observer.snapshot import (
     ObservationSnapshot,
@@ -86,6 +87,9 @@ class ObserverRunner:
             event_bus=bus,
         )
         
+        # 종목별 단기 delta (price_delta_short / volume_delta_short) 상태, runner 당 1개
+        self._delta_state = DeltaStateStore()
+
         # Extended meta fields tracking
         self._iteration_counter = 0
         self._last_loop_time = 0.0
@@ -258,6 +262,7 @@ class ObserverRunner:
                 tick_source=tick_source,
                 buffer_depth=None,  # Placeholder for now
                 flush_reason=None,  # Placeholder for now
+                delta_state=self._delta_state,
             )
 
         except Exception:
@@ -6,17 +6,28 @@ Key Responsibilities:
 - Priority-based slot allocation and replacement
 - Minimum dwell time enforcement (2 minutes)
 - Overflow ledger for rejected candidates
+
+Indexing (all operations O(log n) in the number of slots):
+- symbol → slot_id dict
+- free slot min-heap (lowest slot_id first, as before)
+- replacement min-heap keyed by (priority_score, allocated_at, slot_id) with lazy
+  invalidation; dwell eligibility is checked when popping, so min_dwell_seconds
+  may change at runtime
+- assign_many(): one trigger round (e.g. 100 candidates) with a single clock read
+  and a single overflow ledger write
 """
-import os
+import heapq
 import json
 from pathlib import Path
-from datetime import datetime, timezone, timedelta
-from dataclasses import dataclass, asdict
-from typing import Optional, List, Dict
-from collections import deque
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Iterable, Tuple
+from zoneinfo import ZoneInfo
 
 from observer.paths import system_log_dir
 
+_KST = ZoneInfo("Asia/Seoul")
+
 
 @dataclass
 class SlotCandidate:
@@ -66,6 +77,10 @@ class AllocationResult:
     reason: str
 
 
+# replacement heap entry: (priority_score, allocated_at, slot_id, symbol)
+_HeapEntry = Tuple[float, datetime, int, str]
+
+
 class SlotManager:
     """
     Manages 41 WebSocket subscription slots for Track B collector.
@@ -75,6 +90,7 @@ class SlotManager:
     - Minimum dwell time (2 minutes)
     - Automatic overflow ledger
     - Slot replacement policy
+    - Indexed lookups and batch assignment (assign_many)
     """
     
     def __init__(
@@ -89,6 +105,11 @@ class SlotManager:
         # Slot state: slot_id -> SlotInfo
         self.slots: Dict[int, Optional[SlotInfo]] = {i: None for i in range(max_slots)}
         
+        # Indexes
+        self._symbol_index: Dict[str, int] = {}
+        self._free: List[int] = list(range(max_slots))  # already a valid min-heap
+        self._replace_heap: List[_HeapEntry] = []
+        
         # Overflow ledger - resolve via paths.py or fallback
         if overflow_ledger_dir is not None:
             self.overflow_ledger_dir = Path(overflow_ledger_dir)
@@ -104,7 +125,7 @@ class SlotManager:
             "total_releases": 0
         }
     
-    def assign_slot(self, candidate: SlotCandidate) -> AllocationResult:
+    def assign_slot(self, candidate: SlotCandidate, now: Optional[datetime] = None) -> AllocationResult:
         """
         Assign a slot to a candidate.
         
@@ -116,11 +137,105 @@ class SlotManager:
         Returns:
             AllocationResult with success status and slot_id
         """
-        from zoneinfo import ZoneInfo
-        now = datetime.now(ZoneInfo("Asia/Seoul"))
+        now = now or datetime.now(_KST)
+        result = self._assign(candidate, now)
+        if result.overflow:
+            self._log_overflows([candidate], now)
+        return result
+    
+    def assign_many(
+        self,
+        candidates: Iterable[SlotCandidate],
+        now: Optional[datetime] = None,
+    ) -> List[AllocationResult]:
+        """
+        Assign one trigger round in a single pass.
+        
+        Candidates are processed in descending priority order (ties keep input
+        order), so the best candidates take empty slots first; overflows are
+        written to the ledger in one append.
         
+        Returns:
+            AllocationResults in the same order as the input candidates
+        """
+        candidates = list(candidates)
+        now = now or datetime.now(_KST)
+        results: List[Optional[AllocationResult]] = [None] * len(candidates)
+        overflowed: List[SlotCandidate] = []
+        order = sorted(range(len(candidates)), key=lambda i: -candidates[i].priority_score)
+        for i in order:
+            result = self._assign(candidates[i], now)
+            if result.overflow:
+                overflowed.append(candidates[i])
+            results[i] = result
+        if overflowed:
+            self._log_overflows(overflowed, now)
+        return results  # type: ignore[return-value]
+    
+    def release_slot(self, slot_id: int) -> bool:
+        """
+        Release a slot by slot_id.
+        
+        Returns:
+            True if slot was released, False if slot was already empty
+        """
+        if slot_id < 0 or slot_id >= self.max_slots:
+            return False
+        
+        slot_info = self.slots[slot_id]
+        if slot_info is not None:
+            self.slots[slot_id] = None
+            self._symbol_index.pop(slot_info.symbol, None)
+            heapq.heappush(self._free, slot_id)
+            self.stats["total_releases"] += 1
+            return True
+        return False
+    
+    def release_symbol(self, symbol: str) -> bool:
+        """
+        Release a slot by symbol.
+        
+        Returns:
+            True if slot was released, False if symbol not found
+        """
+        slot_id = self._symbol_index.get(symbol)
+        if slot_id is not None:
+            return self.release_slot(slot_id)
+        return False
+    
+    def get_slot_info(self, slot_id: int) -> Optional[SlotInfo]:
+        """Get information about a specific slot"""
+        if slot_id < 0 or slot_id >= self.max_slots:
+            return None
+        return self.slots[slot_id]
+    
+    def get_all_slots(self) -> List[SlotInfo]:
+        """Get information about all allocated slots"""
+        return [slot for slot in self.slots.values() if slot is not None]
+    
+    def get_symbol_slot(self, symbol: str) -> Optional[int]:
+        """Get slot_id for a symbol, or None if not allocated"""
+        return self._symbol_index.get(symbol)
+    
+    def allocated_symbols(self) -> Dict[str, int]:
+        """Target subscription set: symbol -> slot_id"""
+        return dict(self._symbol_index)
+    
+    def get_stats(self) -> dict:
+        """Get allocation statistics"""
+        allocated_count = len(self._symbol_index)
+        return {
+            **self.stats,
+            "allocated_slots": allocated_count,
+            "available_slots": self.max_slots - allocated_count
+        }
+    
+    # ---- Internal Methods ----
+    
+    def _assign(self, candidate: SlotCandidate, now: datetime) -> AllocationResult:
+        """Allocation without ledger I/O (caller logs overflows)"""
         # Step 1: Check if symbol already has a slot
-        existing_slot = self._find_slot_by_symbol(candidate.symbol)
+        existing_slot = self._symbol_index.get(candidate.symbol)
         if existing_slot is not None:
             # Update priority if higher
             slot_info = self.slots[existing_slot]
@@ -128,6 +243,7 @@ class SlotManager:
                 slot_info.priority_score = candidate.priority_score
                 slot_info.trigger_type = candidate.trigger_type
                 slot_info.last_update = now
+                self._push_replaceable(slot_info)
                 return AllocationResult(
                     success=True,
                     slot_id=existing_slot,
@@ -147,15 +263,7 @@ class SlotManager:
         # Step 2: Find an empty slot
         empty_slot = self._find_empty_slot()
         if empty_slot is not None:
-            slot_info = SlotInfo(
-                slot_id=empty_slot,
-                symbol=candidate.symbol,
-                trigger_type=candidate.trigger_type,
-                priority_score=candidate.priority_score,
-                allocated_at=now,
-                last_update=now
-            )
-            self.slots[empty_slot] = slot_info
+            self._occupy(empty_slot, candidate, now)
             self.stats["total_allocations"] += 1
             return AllocationResult(
                 success=True,
@@ -169,15 +277,8 @@ class SlotManager:
         replaceable_slot = self._find_replaceable_slot(candidate.priority_score, now)
         if replaceable_slot is not None:
             old_symbol = self.slots[replaceable_slot].symbol
-            slot_info = SlotInfo(
-                slot_id=replaceable_slot,
-                symbol=candidate.symbol,
-                trigger_type=candidate.trigger_type,
-                priority_score=candidate.priority_score,
-                allocated_at=now,
-                last_update=now
-            )
-            self.slots[replaceable_slot] = slot_info
+            self._symbol_index.pop(old_symbol, None)
+            self._occupy(replaceable_slot, candidate, now)
             self.stats["total_replacements"] += 1
             return AllocationResult(
                 success=True,
@@ -187,8 +288,7 @@ class SlotManager:
                 reason="replaced_lower_priority"
             )
         
-        # Step 4: Overflow - log to ledger
-        self._log_overflow(candidate, now)
+        # Step 4: Overflow
         self.stats["total_overflows"] += 1
         return AllocationResult(
             success=False,
@@ -198,72 +298,49 @@ class SlotManager:
             reason="overflow_all_slots_occupied"
         )
     
-    def release_slot(self, slot_id: int) -> bool:
-        """
-        Release a slot by slot_id.
-        
-        Returns:
-            True if slot was released, False if slot was already empty
-        """
-        if slot_id < 0 or slot_id >= self.max_slots:
-            return False
-        
-        if self.slots[slot_id] is not None:
-            self.slots[slot_id] = None
-            self.stats["total_releases"] += 1
-            return True
-        return False
-    
-    def release_symbol(self, symbol: str) -> bool:
-        """
-        Release a slot by symbol.
-        
-        Returns:
-            True if slot was released, False if symbol not found
-        """
-        slot_id = self._find_slot_by_symbol(symbol)
-        if slot_id is not None:
-            return self.release_slot(slot_id)
-        return False
-    
-    def get_slot_info(self, slot_id: int) -> Optional[SlotInfo]:
-        """Get information about a specific slot"""
-        if slot_id < 0 or slot_id >= self.max_slots:
-            return None
-        return self.slots[slot_id]
-    
-    def get_all_slots(self) -> List[SlotInfo]:
-        """Get information about all allocated slots"""
-        return [slot for slot in self.slots.values() if slot is not None]
+    def _occupy(self, slot_id: int, candidate: SlotCandidate, now: datetime) -> None:
+        slot_info = SlotInfo(
+            slot_id=slot_id,
+            symbol=candidate.symbol,
+            trigger_type=candidate.trigger_type,
+            priority_score=candidate.priority_score,
+            allocated_at=now,
+            last_update=now
+        )
+        self.slots[slot_id] = slot_info
+        self._symbol_index[candidate.symbol] = slot_id
+        self._push_replaceable(slot_info)
     
-    def get_symbol_slot(self, symbol: str) -> Optional[int]:
-        """Get slot_id for a symbol, or None if not allocated"""
-        return self._find_slot_by_symbol(symbol)
+    def _push_replaceable(self, slot_info: SlotInfo) -> None:
+        heap = self._replace_heap
+        heapq.heappush(heap, (slot_info.priority_score, slot_info.allocated_at, slot_info.slot_id, slot_info.symbol))
+        # stale entries (released / replaced / re-prioritised slots) are dropped lazily;
+        # rebuild once they dominate the heap
+        if len(heap) > 4 * self.max_slots + 64:
+            self._replace_heap = [e for e in heap if self._is_current(e)]
+            heapq.heapify(self._replace_heap)
     
-    def get_stats(self) -> dict:
-        """Get allocation statistics"""
-        allocated_count = sum(1 for slot in self.slots.values() if slot is not None)
-        return {
-            **self.stats,
-            "allocated_slots": allocated_count,
-            "available_slots": self.max_slots - allocated_count
-        }
-    
-    # ---- Internal Methods ----
+    def _is_current(self, entry: _HeapEntry) -> bool:
+        priority, allocated_at, slot_id, symbol = entry
+        slot_info = self.slots.get(slot_id)
+        return (
+            slot_info is not None
+            and slot_info.symbol == symbol
+            and slot_info.priority_score == priority
+            and slot_info.allocated_at == allocated_at
+        )
     
     def _find_empty_slot(self) -> Optional[int]:
-        """Find the first empty slot"""
-        for slot_id, slot_info in self.slots.items():
-            if slot_info is None:
+        """Pop the lowest empty slot_id"""
+        while self._free:
+            slot_id = heapq.heappop(self._free)
+            if self.slots.get(slot_id) is None:
                 return slot_id
         return None
     
     def _find_slot_by_symbol(self, symbol: str) -> Optional[int]:
         """Find slot_id by symbol"""
-        for slot_id, slot_info in self.slots.items():
-            if slot_info is not None and slot_info.symbol == symbol:
-                return slot_id
-        return None
+        return self._symbol_index.get(symbol)
     
     def _find_replaceable_slot(self, new_priority: float, now: datetime) -> Optional[int]:
         """
@@ -273,47 +350,47 @@ class SlotManager:
         1. Priority lower than new_priority
         2. Allocated for at least min_dwell_seconds
         
-        Returns the slot with lowest priority that meets criteria.
+        Returns the slot with lowest priority that meets criteria
+        (ties: longest-dwelling slot first).
         """
-        candidates = []
-        for slot_id, slot_info in self.slots.items():
-            if slot_info is None:
-                continue
-            
-            # Check priority
-            if slot_info.priority_score >= new_priority:
+        heap = self._replace_heap
+        skipped: List[_HeapEntry] = []
+        found: Optional[int] = None
+        while heap and heap[0][0] < new_priority:
+            entry = heapq.heappop(heap)
+            if not self._is_current(entry):
                 continue
-            
-            # Check min dwell time
-            dwell_time = (now - slot_info.allocated_at).total_seconds()
-            if dwell_time < self.min_dwell_seconds:
+            if (now - entry[1]).total_seconds() < self.min_dwell_seconds:
+                skipped.append(entry)  # still dwelling, keep for later rounds
                 continue
-            
-            candidates.append((slot_id, slot_info.priority_score))
-        
-        if not candidates:
-            return None
-        
-        # Return slot with lowest priority
-        candidates.sort(key=lambda x: x[1])
-        return candidates[0][0]
+            found = entry[2]
+            break
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return found
     
-    def _log_overflow(self, candidate: SlotCandidate, timestamp: datetime):
-        """Log overflow candidate to JSONL ledger"""
+    def _log_overflows(self, candidates: List[SlotCandidate], timestamp: datetime) -> None:
+        """Append overflow candidates to the JSONL ledger (one write per round)"""
         date_str = timestamp.strftime("%Y%m%d")
         ledger_file = self.overflow_ledger_dir / f"overflow_{date_str}.jsonl"
-        
-        record = {
-            "timestamp": timestamp.isoformat(),
-            "symbol": candidate.symbol,
-            "trigger_type": candidate.trigger_type,
-            "priority_score": candidate.priority_score,
-            "detected_at": candidate.detected_at.isoformat(),
-            "reason": "all_slots_occupied"
-        }
-        
+        ts = timestamp.isoformat()
+        lines = [
+            json.dumps({
+                "timestamp": ts,
+                "symbol": candidate.symbol,
+                "trigger_type": candidate.trigger_type,
+                "priority_score": candidate.priority_score,
+                "detected_at": candidate.detected_at.isoformat(),
+                "reason": "all_slots_occupied"
+            }, ensure_ascii=False) + "\n"
+            for candidate in candidates
+        ]
         with open(ledger_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.write("".join(lines))
+    
+    def _log_overflow(self, candidate: SlotCandidate, timestamp: datetime):
+        """Log overflow candidate to JSONL ledger"""
+        self._log_overflows([candidate], timestamp)
 
 
 # ---- CLI for Testing ----
@@ -0,0 +1,173 @@
+"""
+Track A → Track B Snapshot Channel
+
+SwingCollector 가 스윕 batch 를 받을 때마다 PriceSnapshot 을 publish 하고,
+ScalpCollector 가 이를 drain 하여 TriggerEngine.update → SlotManager 로 넘긴다.
+(하루치 JSONL 을 다시 읽는 parse_track_a_jsonl 경로를 대체)
+
+- 생산자/소비자가 서로 다른 스레드의 event loop 에 있어도 동작 (threading.Lock +
+  loop.call_soon_threadsafe 로 소비자 깨움). 같은 loop 에서도 그대로 동작
+- bounded: maxsize 초과 시 가장 오래된 snapshot 을 버림 (최신성 우선)
+- bounded latency: 첫 snapshot 도착 후 최대 max_latency_seconds 동안 뒤따르는
+  shard 를 모아 한 번에 전달 (shard 마다 trigger/구독 reconcile 을 돌리지 않도록)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from monitoring.prometheus_metrics import get_registry
+from trigger.trigger_engine import PriceSnapshot
+
+log = logging.getLogger("SnapshotChannel")
+
+
+class SnapshotChannel:
+    """Thread-safe bounded single-consumer hand-off of Track A snapshots."""
+
+    def __init__(self, maxsize: int = 20000, max_latency_seconds: float = 1.0) -> None:
+        """
+        Args:
+            maxsize: 보관 가능한 최대 snapshot 수 (초과 시 오래된 것부터 폐기)
+            max_latency_seconds: 첫 snapshot publish → 소비자 전달까지 최대 대기 (shard 병합 창)
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.max_latency_seconds = max(0.0, max_latency_seconds)
+
+        self._lock = threading.Lock()
+        self._buffer: Deque[PriceSnapshot] = deque()
+        self._first_at: Optional[float] = None  # 대기 중인 가장 오래된 publish 의 monotonic 시각
+
+        # 소비자 (next_batch 를 처음 호출한 event loop 에 바인딩)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Event] = None
+
+        # 통계
+        self._published = 0
+        self._drained = 0
+        self._dropped = 0
+        self._batches = 0
+        self._max_latency = 0.0
+
+        registry = get_registry()
+        self._published_total = registry.counter(
+            "observer_trigger_channel_published_total", "Track A snapshots published to the trigger channel"
+        )
+        self._dropped_total = registry.counter(
+            "observer_trigger_channel_dropped_total", "Track A snapshots dropped because the trigger channel was full"
+        )
+        self._handoff_latency = registry.histogram(
+            "observer_trigger_channel_latency_seconds",
+            "Oldest snapshot age when a batch is handed to the trigger engine",
+            buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
+        )
+
+    # -----------------------------------------------------
+    # Producer API (any thread)
+    # -----------------------------------------------------
+    def publish(self, snapshots: Iterable[PriceSnapshot]) -> int:
+        """snapshot 묶음 적재 (non-blocking). 적재한 개수 반환"""
+        snapshots = list(snapshots)
+        if not snapshots:
+            return 0
+        with self._lock:
+            was_empty = not self._buffer
+            if was_empty:
+                self._first_at = time.monotonic()
+            self._buffer.extend(snapshots)
+            overflow = len(self._buffer) - self.maxsize
+            for _ in range(max(0, overflow)):
+                self._buffer.popleft()
+            self._published += len(snapshots)
+            if overflow > 0:
+                self._dropped += overflow
+            loop, ready = self._loop, self._ready
+
+        self._published_total.increment(len(snapshots))
+        if overflow > 0:
+            self._dropped_total.increment(overflow)
+            log.warning("Trigger channel full (%d): dropped %d oldest snapshots", self.maxsize, overflow)
+        if was_empty and loop is not None:
+            self._wake(loop, ready)
+        return len(snapshots)
+
+    @staticmethod
+    def _wake(loop: asyncio.AbstractEventLoop, ready: asyncio.Event) -> None:
+        try:
+            loop.call_soon_threadsafe(ready.set)
+        except RuntimeError:
+            # 소비자 loop 종료 → 다음 next_batch 호출 시 새 loop 에 다시 바인딩
+            pass
+
+    # -----------------------------------------------------
+    # Consumer API
+    # -----------------------------------------------------
+    def drain(self) -> List[PriceSnapshot]:
+        """대기 중인 snapshot 전부 (publish 순서)"""
+        with self._lock:
+            if not self._buffer:
+                return []
+            batch = list(self._buffer)
+            self._buffer.clear()
+            first_at, self._first_at = self._first_at, None
+        latency = time.monotonic() - first_at if first_at is not None else 0.0
+        self._drained += len(batch)
+        self._batches += 1
+        self._max_latency = max(self._max_latency, latency)
+        self._handoff_latency.observe(latency)
+        return batch
+
+    async def next_batch(self, timeout: float) -> List[PriceSnapshot]:
+        """
+        다음 batch 대기 (최대 timeout 초, 없으면 빈 목록).
+
+        첫 snapshot 이 도착하면 그 시점부터 max_latency_seconds 가 지날 때까지
+        뒤따르는 shard 를 모은 뒤 drain 한다.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._ready = loop, asyncio.Event()
+        ready = self._ready
+        deadline = loop.time() + max(0.0, timeout)
+
+        while True:
+            with self._lock:
+                first_at = self._first_at if self._buffer else None
+                if first_at is None:
+                    ready.clear()
+            if first_at is not None:
+                break
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return []
+            try:
+                await asyncio.wait_for(ready.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return []
+
+        wait = self.max_latency_seconds - (time.monotonic() - first_at)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return self.drain()
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "published": self._published,
+            "drained": self._drained,
+            "dropped": self._dropped,
+            "batches": self._batches,
+            "pending": self.pending,
+            "max_latency_seconds": round(self._max_latency, 3),
+        }
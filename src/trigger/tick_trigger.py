@@ -0,0 +1,287 @@
+"""
+Tick-level Trigger Detector (Track B WebSocket H0STCNT0)
+
+TriggerEngine 은 5분 Track A snapshot 기반이라 2분 dwell 안의 슬롯 교체 판단에는 너무 거칠다.
+이 detector 는 구독 중인 종목의 체결 tick 마다 아래 신호를 평가해 SlotCandidate 를 즉시 만든다.
+
+- trade_velocity: 짧은 창(기본 5초)의 초당 체결 건수
+- tick_volume_burst: 짧은 창 초당 거래량 / 나머지 긴 창(기본 60초) 초당 거래량
+- spread_widening: 현재 호가 스프레드(bps) / 스프레드 EWMA
+
+Sliding window:
+- 종목별 고정 길이 bucket ring (bucket_seconds 단위, long_window 길이)
+- 짧은/긴 창의 체결 수·거래량은 running sum 으로 유지 → tick 당 O(1)
+  (bucket 경계를 넘을 때만 만료 bucket 을 빼며, 넘은 bucket 수만큼 = 초당 상수)
+- 시간 기준은 ExecutionTick.received_at (time.monotonic) → datetime 변환 없음
+
+CPU budget:
+- tick 처리 시간을 재서 tick_budget_us 초과 횟수 / 최대값을 stats 로 노출
+- 벤치마크: python tests/test_tick_trigger_detector.py
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, TYPE_CHECKING
+from zoneinfo import ZoneInfo
+
+from monitoring.prometheus_metrics import get_registry
+from slot.slot_manager import SlotCandidate
+
+if TYPE_CHECKING:
+    from provider.kis.realtime_parser import ExecutionTick
+
+log = logging.getLogger("TickTriggerDetector")
+
+_KST = ZoneInfo("Asia/Seoul")
+
+
+@dataclass
+class TickTriggerConfig:
+    """Tick-level trigger configuration."""
+    bucket_seconds: float = 1.0
+    short_window_seconds: float = 5.0
+    long_window_seconds: float = 60.0
+    min_history_seconds: float = 30.0  # baseline 이 쌓이기 전에는 burst / spread 평가 안 함
+
+    # Trade Velocity (TriggerConfig.trade_velocity_threshold 와 같은 단위: trades/sec)
+    trade_velocity_threshold: float = 10.0
+    trade_velocity_priority: float = 0.7
+
+    # Tick Volume Burst
+    volume_burst_ratio: float = 4.0
+    volume_burst_priority: float = 0.9
+
+    # Spread Widening
+    spread_widen_ratio: float = 3.0
+    spread_ewma_alpha: float = 0.05
+    spread_widen_priority: float = 0.5
+
+    # 신호 강도(임계값 대비 배수)에 따른 가산점 상한
+    strength_bonus: float = 0.05
+    cooldown_seconds: float = 30.0  # 종목별 후보 재발행 최소 간격
+    tick_budget_us: float = 20.0
+
+
+class _SymbolWindow:
+    """종목별 bucket ring + running sums"""
+
+    __slots__ = (
+        "counts", "volumes", "bucket", "first_bucket",
+        "short_count", "short_volume", "long_count", "long_volume",
+        "spread_ewma", "last_emit",
+    )
+
+    def __init__(self, buckets: int, bucket: int) -> None:
+        self.counts = [0] * buckets
+        self.volumes = [0] * buckets
+        self.bucket = bucket
+        self.first_bucket = bucket
+        self.short_count = 0
+        self.short_volume = 0
+        self.long_count = 0
+        self.long_volume = 0
+        self.spread_ewma = 0.0
+        self.last_emit = float("-inf")
+
+
+class TickTriggerDetector:
+    """
+    Per-symbol incremental tick trigger detection.
+
+    on_tick() 는 provider 의 on_tick 콜백으로 바로 등록할 수 있다. 후보가 생기면
+    SlotCandidate 를 반환하고 on_candidate 콜백도 호출한다.
+    """
+
+    def __init__(
+        self,
+        config: Optional[TickTriggerConfig] = None,
+        on_candidate: Optional[Callable[[SlotCandidate], None]] = None,
+    ) -> None:
+        self.config = cfg = config or TickTriggerConfig()
+        if not 0 < cfg.short_window_seconds < cfg.long_window_seconds:
+            raise ValueError("short_window_seconds must be positive and shorter than long_window_seconds")
+        self.on_candidate = on_candidate
+
+        self._inv_bucket = 1.0 / cfg.bucket_seconds
+        self._buckets = max(2, round(cfg.long_window_seconds / cfg.bucket_seconds))
+        self._short = max(1, min(self._buckets - 1, round(cfg.short_window_seconds / cfg.bucket_seconds)))
+        self._short_seconds = self._short * cfg.bucket_seconds
+        self._base_seconds = (self._buckets - self._short) * cfg.bucket_seconds
+        self._min_history = round(cfg.min_history_seconds / cfg.bucket_seconds)
+        self._windows: Dict[str, _SymbolWindow] = {}
+
+        # 통계
+        self._ticks = 0
+        self._candidates: Dict[str, int] = {"trade_velocity": 0, "tick_volume_burst": 0, "spread_widening": 0}
+        self._over_budget = 0
+        self._max_tick_ns = 0
+        self._budget_ns = int(cfg.tick_budget_us * 1000)
+
+        registry = get_registry()
+        self._candidates_total = {
+            trigger_type: registry.counter(
+                "observer_tick_trigger_candidates_total",
+                "Slot candidates emitted by the tick-level trigger detector",
+                labels={"trigger_type": trigger_type},
+            )
+            for trigger_type in self._candidates
+        }
+        self._over_budget_total = registry.counter(
+            "observer_tick_trigger_over_budget_total", "Ticks whose trigger evaluation exceeded the CPU budget"
+        )
+
+    # ---------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------
+    def on_tick(self, tick: "ExecutionTick") -> Optional[SlotCandidate]:
+        """ExecutionTick 하나 반영 + 평가"""
+        return self.observe(tick.symbol, tick.received_at, tick.tick_volume, tick.ask_price, tick.bid_price)
+
+    def observe(self, symbol: str, at: float, volume: int, ask: int = 0, bid: int = 0) -> Optional[SlotCandidate]:
+        """
+        체결 1건 반영 + 평가.
+
+        Args:
+            at: 수신 시각 (time.monotonic 기준 초)
+            volume: 체결 거래량
+            ask / bid: 매도 / 매수 1호가 (0 이면 스프레드 평가 생략)
+        """
+        started = time.perf_counter_ns()
+        self._ticks += 1
+        bucket = int(at * self._inv_bucket)
+        window = self._windows.get(symbol)
+        if window is None:
+            window = self._windows[symbol] = _SymbolWindow(self._buckets, bucket)
+        elif bucket > window.bucket:
+            self._advance(window, bucket)
+
+        index = window.bucket % self._buckets
+        window.counts[index] += 1
+        window.volumes[index] += volume
+        window.short_count += 1
+        window.short_volume += volume
+        window.long_count += 1
+        window.long_volume += volume
+
+        candidate = None
+        if at - window.last_emit >= self.config.cooldown_seconds:
+            candidate = self._evaluate(symbol, window, ask, bid)
+            if candidate is not None:
+                window.last_emit = at
+        if ask > 0 and bid > 0:
+            spread = (ask - bid) * 20000.0 / (ask + bid)
+            ewma = window.spread_ewma
+            window.spread_ewma = spread if ewma == 0.0 else ewma + self.config.spread_ewma_alpha * (spread - ewma)
+
+        elapsed = time.perf_counter_ns() - started
+        if elapsed > self._max_tick_ns:
+            self._max_tick_ns = elapsed
+        if elapsed > self._budget_ns:
+            self._over_budget += 1
+            self._over_budget_total.increment()
+
+        if candidate is not None:
+            self._candidates[candidate.trigger_type] += 1
+            self._candidates_total[candidate.trigger_type].increment()
+            if self.on_candidate:
+                self.on_candidate(candidate)
+        return candidate
+
+    def forget(self, symbol: str) -> None:
+        """구독 해지된 종목 상태 제거"""
+        self._windows.pop(symbol, None)
+
+    def window(self, symbol: str) -> Optional[Dict[str, float]]:
+        """종목의 현재 창 지표 (진단용)"""
+        window = self._windows.get(symbol)
+        if window is None:
+            return None
+        return {
+            "trades_per_second": window.short_count / self._short_seconds,
+            "short_volume": window.short_volume,
+            "long_volume": window.long_volume,
+            "long_count": window.long_count,
+            "spread_ewma_bps": round(window.spread_ewma, 3),
+        }
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "symbols": len(self._windows),
+            "ticks": self._ticks,
+            "candidates": dict(self._candidates),
+            "over_budget": self._over_budget,
+            "max_tick_us": round(self._max_tick_ns / 1000, 2),
+            "tick_budget_us": self.config.tick_budget_us,
+        }
+
+    # ---------------------------------------------------------
+    # Internal
+    # ---------------------------------------------------------
+    def _advance(self, window: _SymbolWindow, bucket: int) -> None:
+        """bucket 을 앞으로 이동하며 긴/짧은 창에서 빠지는 bucket 을 running sum 에서 제거"""
+        buckets = self._buckets
+        if bucket - window.bucket >= buckets:
+            window.counts = [0] * buckets
+            window.volumes = [0] * buckets
+            window.short_count = window.short_volume = window.long_count = window.long_volume = 0
+            window.bucket = bucket
+            return
+        counts, volumes, short = window.counts, window.volumes, self._short
+        for b in range(window.bucket + 1, bucket + 1):
+            index = b % buckets
+            # 긴 창에서 빠지는 bucket (b - buckets) 자리를 비움
+            window.long_count -= counts[index]
+            window.long_volume -= volumes[index]
+            counts[index] = 0
+            volumes[index] = 0
+            # 짧은 창에서 빠지는 bucket (b - short)
+            leaving = (b - short) % buckets
+            window.short_count -= counts[leaving]
+            window.short_volume -= volumes[leaving]
+        window.bucket = bucket
+
+    def _evaluate(self, symbol: str, window: _SymbolWindow, ask: int, bid: int) -> Optional[SlotCandidate]:
+        """가장 높은 우선순위 신호 하나 → SlotCandidate"""
+        cfg = self.config
+        best_type = None
+        best_priority = 0.0
+
+        velocity = window.short_count / self._short_seconds
+        if velocity >= cfg.trade_velocity_threshold:
+            best_type = "trade_velocity"
+            best_priority = self._priority(cfg.trade_velocity_priority, velocity / cfg.trade_velocity_threshold)
+
+        if window.bucket - window.first_bucket >= self._min_history:
+            base_volume = window.long_volume - window.short_volume
+            if base_volume > 0:
+                ratio = (window.short_volume / self._short_seconds) / (base_volume / self._base_seconds)
+                if ratio >= cfg.volume_burst_ratio:
+                    priority = self._priority(cfg.volume_burst_priority, ratio / cfg.volume_burst_ratio)
+                    if priority > best_priority:
+                        best_type, best_priority = "tick_volume_burst", priority
+
+            if ask > 0 and bid > 0 and window.spread_ewma > 0.0:
+                ratio = (ask - bid) * 20000.0 / (ask + bid) / window.spread_ewma
+                if ratio >= cfg.spread_widen_ratio:
+                    priority = self._priority(cfg.spread_widen_priority, ratio / cfg.spread_widen_ratio)
+                    if priority > best_priority:
+                        best_type, best_priority = "spread_widening", priority
+
+        if best_type is None:
+            return None
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Tick trigger %s: %s (priority=%.3f)", best_type, symbol, best_priority)
+        return SlotCandidate(
+            symbol=symbol,
+            trigger_type=best_type,
+            priority_score=best_priority,
+            detected_at=datetime.now(_KST),
+        )
+
+    def _priority(self, base: float, strength: float) -> float:
+        """임계값 대비 배수(strength >= 1)에 비례한 가산점 (strength 2배에서 상한)"""
+        return min(base + self.config.strength_bonus * min(strength - 1.0, 1.0), 1.0)
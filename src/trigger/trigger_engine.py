@@ -4,12 +4,29 @@ import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-from collections import deque
 from pathlib import Path
+from zoneinfo import ZoneInfo
 import json
 
+import numpy as np
+
 log = logging.getLogger("TriggerEngine")
 
+_KST = ZoneInfo("Asia/Seoul")
+
+
+def _nan(value: Optional[float]) -> float:
+    return np.nan if value is None else value
+
+
+def _none(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+
+def _number(value: float):
+    """정수 가격은 int 로 (details 직렬화 호환)"""
+    return int(value) if float(value).is_integer() else float(value)
+
 
 @dataclass
 class TriggerConfig:
@@ -73,197 +90,319 @@ class TriggerEngine:
     - Trade velocity increases (future: tick-level)
     
     Generates prioritized candidate queue for SlotManager.
+
+    History is a columnar ring buffer: one (symbols x HISTORY_DEPTH) NumPy matrix
+    per column (ts, price, volume, open, high, low). Per symbol the 10min volume
+    sum / count and the start of the 10min / 1min windows are kept as running
+    state and advanced incrementally, so a whole sweep is evaluated in a few
+    vectorized passes. Symbols whose snapshots arrive out of time order are
+    evaluated by a masked pass over their ring (same timestamp-filter semantics).
+    Each symbol is evaluated once per update() using its latest snapshot.
     """
+
+    HISTORY_DEPTH = 100  # keep last 100 snapshots per symbol
+    VOLUME_WINDOW_SECONDS = 600.0  # 10min average volume
+    PRICE_WINDOW_SECONDS = 60.0  # 1min price change
     
-    def __init__(self, config: Optional[TriggerConfig] = None) -> None:
+    def __init__(self, config: Optional[TriggerConfig] = None, initial_capacity: int = 256) -> None:
         self.cfg = config or TriggerConfig()
         
-        # Historical data buffer (symbol -> deque of snapshots)
-        self._history: Dict[str, deque[PriceSnapshot]] = {}
+        # Historical data buffer (columnar ring, row per symbol)
         self._history_window = timedelta(minutes=15)  # keep 15min of data
-        
-        # Recent trigger dedup (symbol -> last trigger time)
-        self._recent_triggers: Dict[str, datetime] = {}
+        self._rows: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._allocate(max(initial_capacity, 1))
         
         log.info("TriggerEngine initialized with config: %s", self.cfg)
+
+    def _allocate(self, capacity: int) -> None:
+        """행 용량 확보 (2배씩 증가, 기존 데이터 복사)"""
+        depth = self.HISTORY_DEPTH
+        old = getattr(self, "_capacity", 0)
+
+        def grow(name: str, shape, fill, dtype) -> None:
+            array = np.full(shape, fill, dtype=dtype)
+            if old:
+                array[:old] = getattr(self, name)
+            setattr(self, name, array)
+
+        for name in ("_ts", "_price", "_volume", "_open", "_high", "_low"):
+            grow(name, (capacity, depth), np.nan, np.float64)
+        grow("_end", capacity, 0, np.int64)  # 누적 append 수 (다음 seq)
+        grow("_start_vol", capacity, 0, np.int64)  # 10min 창 시작 seq
+        grow("_start_price", capacity, 0, np.int64)  # 1min 창 시작 seq
+        grow("_sum_vol", capacity, 0.0, np.float64)  # 10min 창 volume 합
+        grow("_last_ts", capacity, -np.inf, np.float64)
+        grow("_unordered", capacity, False, np.bool_)
+        grow("_last_trigger", capacity, -np.inf, np.float64)  # dedup
+        self._capacity = capacity
+
+    def _row(self, symbol: str) -> int:
+        row = self._rows.get(symbol)
+        if row is None:
+            row = len(self._symbols)
+            if row >= self._capacity:
+                self._allocate(self._capacity * 2)
+            self._rows[symbol] = row
+            self._symbols.append(symbol)
+        return row
     
     # ---------------------------------------------------------
     # Public API
     # ---------------------------------------------------------
-    def update(self, snapshots: List[PriceSnapshot]) -> List[TriggerCandidate]:
+    def update(self, snapshots: List[PriceSnapshot], now: Optional[datetime] = None) -> List[TriggerCandidate]:
         """
         Update engine with new snapshots and detect triggers.
         
         Args:
             snapshots: List of price snapshots from Track A
+            now: evaluation time (default: current KST time)
             
         Returns:
             List of triggered candidates sorted by priority (highest first)
         """
-        # Use aware datetime consistently
-        from zoneinfo import ZoneInfo
-        now = datetime.now(ZoneInfo("Asia/Seoul"))
-        candidates: List[TriggerCandidate] = []
-        
-        # Update history
-        for snap in snapshots:
-            self._add_to_history(snap)
-        
-        # Detect triggers for each symbol
-        for snap in snapshots:
-            # Skip if recently triggered (dedup)
-            if self._is_recently_triggered(snap.symbol, now):
-                continue
-            
-            # Check Volume Surge
-            vol_candidate = self._check_volume_surge(snap, now)
-            if vol_candidate:
-                candidates.append(vol_candidate)
-                self._mark_triggered(snap.symbol, now)
-                continue
-            
-            # Check Volatility Spike
-            vol_spike_candidate = self._check_volatility_spike(snap, now)
-            if vol_spike_candidate:
-                candidates.append(vol_spike_candidate)
-                self._mark_triggered(snap.symbol, now)
-                continue
-        
-        # Sort by priority (highest first) and limit
-        candidates.sort(key=lambda c: c.priority_score, reverse=True)
-        return candidates[:self.cfg.max_candidates]
+        if now is None:
+            now = datetime.now(_KST)
+        if not snapshots:
+            return []
+        now_ts = now.timestamp()
+
+        # 1) 행 매핑 + 컬럼 배열 (같은 종목이 여러 번이면 occurrence 순서대로 round 분리)
+        rows = np.empty(len(snapshots), dtype=np.int64)
+        occurrence = np.empty(len(snapshots), dtype=np.int64)
+        seen: Dict[int, int] = {}
+        last: Dict[int, int] = {}
+        for i, snap in enumerate(snapshots):
+            row = self._row(snap.symbol)
+            rows[i] = row
+            occurrence[i] = seen.get(row, 0)
+            seen[row] = occurrence[i] + 1
+            last[row] = i
+        ts = np.fromiter((s.timestamp.timestamp() for s in snapshots), np.float64, len(snapshots))
+        price = np.fromiter((s.price for s in snapshots), np.float64, len(snapshots))
+        volume = np.fromiter((s.volume for s in snapshots), np.float64, len(snapshots))
+        ohl = np.array(
+            [(_nan(s.open), _nan(s.high), _nan(s.low)) for s in snapshots], dtype=np.float64
+        ).reshape(len(snapshots), 3)
+
+        # 2) ring buffer append (round 내 행은 유일)
+        for k in range(int(occurrence.max()) + 1):
+            sel = np.flatnonzero(occurrence == k)
+            self._append(rows[sel], ts[sel], price[sel], volume[sel], ohl[sel])
+
+        # 3) 종목별 1회 평가 (최신 snapshot, 첫 등장 순서)
+        unique_rows = np.fromiter(last.keys(), np.int64, len(last))
+        latest = np.fromiter(last.values(), np.int64, len(last))
+        return self._evaluate(unique_rows, price[latest], volume[latest], now, now_ts)
     
     def get_history(self, symbol: str, minutes: int = 10) -> List[PriceSnapshot]:
         """Get recent history for a symbol."""
-        if symbol not in self._history:
+        row = self._rows.get(symbol)
+        if row is None:
             return []
         
-        from zoneinfo import ZoneInfo
-        cutoff = datetime.now(ZoneInfo("Asia/Seoul")) - timedelta(minutes=minutes)
-        return [s for s in self._history[symbol] if s.timestamp >= cutoff]
+        cutoff = datetime.now(_KST) - min(timedelta(minutes=minutes), self._history_window)
+        seqs = self._ring_seqs(np.array([row]))[0]
+        history: List[PriceSnapshot] = []
+        for slot in seqs[seqs >= 0] % self.HISTORY_DEPTH:
+            ts = datetime.fromtimestamp(self._ts[row, slot], _KST)
+            if ts >= cutoff:
+                history.append(
+                    PriceSnapshot(
+                        symbol=symbol,
+                        timestamp=ts,
+                        price=float(self._price[row, slot]),
+                        volume=int(self._volume[row, slot]),
+                        open=_none(self._open[row, slot]),
+                        high=_none(self._high[row, slot]),
+                        low=_none(self._low[row, slot]),
+                    )
+                )
+        return history
+
+    @property
+    def symbol_count(self) -> int:
+        return len(self._symbols)
     
     # ---------------------------------------------------------
-    # Trigger Detection
+    # Trigger Detection (vectorized)
     # ---------------------------------------------------------
-    def _check_volume_surge(
-        self, snap: PriceSnapshot, now: datetime
-    ) -> Optional[TriggerCandidate]:
+    def _evaluate(
+        self, rows: np.ndarray, price: np.ndarray, volume: np.ndarray, now: datetime, now_ts: float
+    ) -> List[TriggerCandidate]:
         """
-        Detect volume surge: 1min volume > 10min avg * ratio.
+        Volume surge: 현재 volume / 10min 평균 >= ratio (창 내 2개 이상)
+        Volatility spike: |현재가 - 1min 창 첫 가격| / 첫 가격 >= threshold (창 내 2개 이상)
         """
-        history = self.get_history(snap.symbol, minutes=10)
-        if len(history) < 2:
-            return None  # insufficient data
-        
-        # Calculate 10-min average volume
-        total_volume = sum(h.volume for h in history)
-        avg_volume = total_volume / len(history)
-        
-        if avg_volume == 0:
-            return None
-        
-        # Check if current volume is surge
-        surge_ratio = snap.volume / avg_volume
-        
-        # Debug logging
-        log.debug(f"Volume surge check for {snap.symbol}: "
-                 f"current={snap.volume}, avg={avg_volume:.0f}, "
-                 f"ratio={surge_ratio:.2f}, threshold={self.cfg.volume_surge_ratio}")
-        
-        # Add info logging for better debugging
-        log.info(f"Volume surge check for {snap.symbol}: "
-                f"current={snap.volume:,}, avg={avg_volume:.0f}, "
-                f"ratio={surge_ratio:.2f}, threshold={self.cfg.volume_surge_ratio}")
-        
-        if surge_ratio >= self.cfg.volume_surge_ratio:
-            log.info(f"🎯 VOLUME SURGE DETECTED: {snap.symbol} "
-                    f"ratio={surge_ratio:.2f} >= {self.cfg.volume_surge_ratio}")
-            return TriggerCandidate(
-                symbol=snap.symbol,
-                trigger_type="volume_surge",
-                priority_score=self.cfg.volume_surge_priority,
-                detected_at=now,
-                details={
-                    "current_volume": snap.volume,
-                    "avg_volume_10m": int(avg_volume),
-                    "surge_ratio": round(surge_ratio, 2),
-                },
+        cfg = self.cfg
+        cutoff_vol = now_ts - self.VOLUME_WINDOW_SECONDS
+        cutoff_price = now_ts - self.PRICE_WINDOW_SECONDS
+
+        unordered = self._unordered[rows]
+        ordered_rows = rows[~unordered]
+        self._advance(ordered_rows, self._start_vol, cutoff_vol, self._sum_vol)
+        self._advance(ordered_rows, self._start_price, cutoff_price)
+
+        count_vol = (self._end[rows] - self._start_vol[rows]).astype(np.float64)
+        sum_vol = self._sum_vol[rows].copy()
+        count_price = self._end[rows] - self._start_price[rows]
+        earliest = self._price[rows, self._start_price[rows] % self.HISTORY_DEPTH]
+        if unordered.any():
+            idx = np.flatnonzero(unordered)
+            sums, counts, firsts, price_counts = self._masked_windows(rows[idx], cutoff_vol, cutoff_price)
+            sum_vol[idx], count_vol[idx], earliest[idx], count_price[idx] = sums, counts, firsts, price_counts
+
+        recently = (now_ts - self._last_trigger[rows]) < cfg.dedup_window_seconds
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_vol = np.where(count_vol > 0, sum_vol / np.maximum(count_vol, 1), 0.0)
+            surge_ratio = np.where(avg_vol > 0, volume / avg_vol, 0.0)
+            price_change = np.where(earliest > 0, np.abs(price - earliest) / earliest, 0.0)
+        surge = ~recently & (count_vol >= 2) & (avg_vol > 0) & (surge_ratio >= cfg.volume_surge_ratio)
+        spike = ~recently & ~surge & (count_price >= 2) & (price_change >= cfg.volatility_spike_threshold)
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                "Trigger sweep: %d symbols evaluated, %d volume surges, %d volatility spikes, %d deduped",
+                len(rows), int(surge.sum()), int(spike.sum()), int(recently.sum()),
             )
+
+        candidates: List[TriggerCandidate] = []
+        for i in np.flatnonzero(surge | spike):
+            row = int(rows[i])
+            symbol = self._symbols[row]
+            if surge[i]:
+                log.info(f"🎯 VOLUME SURGE DETECTED: {symbol} "
+                         f"ratio={surge_ratio[i]:.2f} >= {cfg.volume_surge_ratio}")
+                candidates.append(TriggerCandidate(
+                    symbol=symbol,
+                    trigger_type="volume_surge",
+                    priority_score=cfg.volume_surge_priority,
+                    detected_at=now,
+                    details={
+                        "current_volume": int(volume[i]),
+                        "avg_volume_10m": int(avg_vol[i]),
+                        "surge_ratio": round(float(surge_ratio[i]), 2),
+                    },
+                ))
+            else:
+                candidates.append(TriggerCandidate(
+                    symbol=symbol,
+                    trigger_type="volatility_spike",
+                    priority_score=cfg.volatility_spike_priority,
+                    detected_at=now,
+                    details={
+                        "current_price": _number(price[i]),
+                        "previous_price": _number(earliest[i]),
+                        "price_change_pct": round(float(price_change[i]) * 100, 2),
+                    },
+                ))
+            self._last_trigger[row] = now_ts
         
-        return None
-    
-    def _check_volatility_spike(
-        self, snap: PriceSnapshot, now: datetime
-    ) -> Optional[TriggerCandidate]:
+        # Sort by priority (highest first) and limit
+        candidates.sort(key=lambda c: c.priority_score, reverse=True)
+        return candidates[:cfg.max_candidates]
+
+    def window_stats(self, symbols: List[str], now: Optional[datetime] = None) -> Dict[str, Dict[str, float]]:
         """
-        Detect volatility spike: price change > threshold in 1min.
+        종목별 창 통계 (avg_volume_10m, first/low/high/last price in 1min).
+
+        min/max 는 증분 유지하지 않고 요청 시 해당 행들만 masked reduction 으로 계산한다.
         """
-        history = self.get_history(snap.symbol, minutes=1)
-        if len(history) < 2:
-            return None  # insufficient data
-        
-        # Get earliest price in 1min window
-        earliest = history[0]
-        price_change = abs(snap.price - earliest.price) / earliest.price
-        
-        # Add info logging for better debugging
-        log.info(f"Volatility spike check for {snap.symbol}: "
-                f"price_change={price_change:.3f}, threshold={self.cfg.volatility_spike_threshold}")
-        
-        if price_change >= self.cfg.volatility_spike_threshold:
-            return TriggerCandidate(
-                symbol=snap.symbol,
-                trigger_type="volatility_spike",
-                priority_score=self.cfg.volatility_spike_priority,
-                detected_at=now,
-                details={
-                    "current_price": snap.price,
-                    "previous_price": earliest.price,
-                    "price_change_pct": round(price_change * 100, 2),
-                },
-            )
-        
-        return None
+        rows = np.array([self._rows[s] for s in symbols if s in self._rows], dtype=np.int64)
+        if rows.size == 0:
+            return {}
+        now_ts = (now or datetime.now(_KST)).timestamp()
+        seqs = self._ring_seqs(rows)
+        slots = np.where(seqs >= 0, seqs % self.HISTORY_DEPTH, 0)
+        ts = np.where(seqs >= 0, self._ts[rows[:, None], slots], -np.inf)
+        price = self._price[rows[:, None], slots]
+        in_vol = ts >= now_ts - self.VOLUME_WINDOW_SECONDS
+        in_price = ts >= now_ts - self.PRICE_WINDOW_SECONDS
+        count_vol = in_vol.sum(axis=1)
+        vol_sum = np.where(in_vol, self._volume[rows[:, None], slots], 0.0).sum(axis=1)
+        with np.errstate(invalid="ignore"):
+            low = np.where(in_price, price, np.inf).min(axis=1)
+            high = np.where(in_price, price, -np.inf).max(axis=1)
+        has_price = in_price.any(axis=1)
+        first = price[np.arange(len(rows)), in_price.argmax(axis=1)]
+        last = price[np.arange(len(rows)), np.where(has_price, seqs.shape[1] - 1 - in_price[:, ::-1].argmax(axis=1), 0)]
+        result: Dict[str, Dict[str, float]] = {}
+        for i, row in enumerate(rows):
+            result[self._symbols[int(row)]] = {
+                "avg_volume_10m": float(vol_sum[i] / count_vol[i]) if count_vol[i] else 0.0,
+                "samples_1m": int(in_price[i].sum()),
+                "first_price_1m": float(first[i]) if has_price[i] else float("nan"),
+                "last_price_1m": float(last[i]) if has_price[i] else float("nan"),
+                "low_1m": float(low[i]) if has_price[i] else float("nan"),
+                "high_1m": float(high[i]) if has_price[i] else float("nan"),
+            }
+        return result
     
     # ---------------------------------------------------------
-    # History Management
+    # History Management (ring buffer)
     # ---------------------------------------------------------
-    def _add_to_history(self, snap: PriceSnapshot) -> None:
-        """Add snapshot to history buffer."""
-        if snap.symbol not in self._history:
-            self._history[snap.symbol] = deque(maxlen=100)  # keep last 100 snapshots
-        
-        self._history[snap.symbol].append(snap)
-        
-        # Clean old history
-        from zoneinfo import ZoneInfo
-        cutoff = datetime.now(ZoneInfo("Asia/Seoul")) - self._history_window
-        while (
-            self._history[snap.symbol]
-            and self._history[snap.symbol][0].timestamp < cutoff
-        ):
-            self._history[snap.symbol].popleft()
-    
-    def _is_recently_triggered(self, symbol: str, now: datetime) -> bool:
-        """Check if symbol was recently triggered (dedup)."""
-        if symbol not in self._recent_triggers:
-            return False
-        
-        last_trigger = self._recent_triggers[symbol]
-        elapsed = (now - last_trigger).total_seconds()
-        return elapsed < self.cfg.dedup_window_seconds
-    
-    def _mark_triggered(self, symbol: str, now: datetime) -> None:
-        """Mark symbol as triggered."""
-        self._recent_triggers[symbol] = now
-        
-        # Clean old triggers
-        cutoff = now - timedelta(seconds=self.cfg.dedup_window_seconds * 2)
-        to_remove = [
-            sym for sym, ts in self._recent_triggers.items() if ts < cutoff
-        ]
-        for sym in to_remove:
-            del self._recent_triggers[sym]
+    def _append(self, rows: np.ndarray, ts: np.ndarray, price: np.ndarray, volume: np.ndarray, ohl: np.ndarray) -> None:
+        """행이 유일한 배치를 ring 에 기록 (가득 찬 행은 가장 오래된 항목을 덮어씀)"""
+        depth = self.HISTORY_DEPTH
+        end = self._end[rows]
+        slot = end % depth
+
+        # 덮어쓰일 항목(seq = end - depth)이 아직 창 안이면 창 시작을 한 칸 당긴다
+        evicted = end - depth
+        full = evicted >= 0
+        if full.any():
+            for start, sums in ((self._start_vol, self._sum_vol), (self._start_price, None)):
+                hit = full & (start[rows] == evicted)
+                if hit.any():
+                    hit_rows = rows[hit]
+                    if sums is not None:
+                        sums[hit_rows] -= self._volume[hit_rows, slot[hit]]
+                    start[hit_rows] += 1
+
+        self._ts[rows, slot] = ts
+        self._price[rows, slot] = price
+        self._volume[rows, slot] = volume
+        self._open[rows, slot] = ohl[:, 0]
+        self._high[rows, slot] = ohl[:, 1]
+        self._low[rows, slot] = ohl[:, 2]
+        self._unordered[rows] |= ts < self._last_ts[rows]
+        self._last_ts[rows] = np.maximum(self._last_ts[rows], ts)
+        self._end[rows] = end + 1
+        self._sum_vol[rows] += volume
+
+    def _advance(self, rows: np.ndarray, start: np.ndarray, cutoff: float, sums: Optional[np.ndarray] = None) -> None:
+        """창 시작을 cutoff 이전 항목만큼 전진 (시간순 행 전용, 반복 횟수 = 행당 최대 만료 수)"""
+        depth = self.HISTORY_DEPTH
+        while rows.size:
+            seq = start[rows]
+            expired = (seq < self._end[rows]) & (self._ts[rows, seq % depth] < cutoff)
+            if not expired.any():
+                return
+            rows = rows[expired]
+            seq = seq[expired]
+            if sums is not None:
+                sums[rows] -= self._volume[rows, seq % depth]
+            start[rows] = seq + 1
+
+    def _ring_seqs(self, rows: np.ndarray) -> np.ndarray:
+        """행별 ring 내용의 seq (삽입 순서, 빈 칸은 -1)"""
+        depth = self.HISTORY_DEPTH
+        end = self._end[rows]
+        first = np.maximum(end - depth, 0)
+        seqs = first[:, None] + np.arange(depth)[None, :]
+        return np.where(seqs < end[:, None], seqs, -1)
+
+    def _masked_windows(self, rows: np.ndarray, cutoff_vol: float, cutoff_price: float):
+        """시간 역순 입력이 있었던 행: timestamp 필터로 창 통계 계산"""
+        seqs = self._ring_seqs(rows)
+        valid = seqs >= 0
+        slots = np.where(valid, seqs % self.HISTORY_DEPTH, 0)
+        ts = self._ts[rows[:, None], slots]
+        in_vol = valid & (ts >= cutoff_vol)
+        in_price = valid & (ts >= cutoff_price)
+        sums = np.where(in_vol, self._volume[rows[:, None], slots], 0.0).sum(axis=1)
+        firsts = self._price[rows[:, None], slots][np.arange(len(rows)), in_price.argmax(axis=1)]
+        return sums, in_vol.sum(axis=1).astype(np.float64), firsts, in_price.sum(axis=1)
     
     # ---------------------------------------------------------
     # Config Management
@@ -293,6 +432,20 @@ class TriggerEngine:
 
 
 # ---------------- Utility: Parse Track A JSONL ----------------
+def snapshot_from_record(record: Dict) -> PriceSnapshot:
+    """Track A record (SwingCollector._build_record / JSONL 한 줄) → PriceSnapshot"""
+    price = record.get("price") or {}
+    return PriceSnapshot(
+        symbol=record["symbol"],
+        timestamp=datetime.fromisoformat(record["ts"].replace("Z", "+00:00")),
+        price=price.get("close") or 0,
+        volume=record.get("volume") or 0,
+        open=price.get("open"),
+        high=price.get("high"),
+        low=price.get("low"),
+    )
+
+
 def parse_track_a_jsonl(log_path: Path) -> List[PriceSnapshot]:
     """Parse Track A JSONL log file into PriceSnapshots."""
     snapshots: List[PriceSnapshot] = []
@@ -300,17 +453,7 @@ def parse_track_a_jsonl(log_path: Path) -> List[PriceSnapshot]:
     try:
         with open(log_path, "r", encoding="utf-8") as f:
             for line in f:
-                record = json.loads(line.strip())
-                snap = PriceSnapshot(
-                    symbol=record["symbol"],
-                    timestamp=datetime.fromisoformat(record["ts"].replace("Z", "+00:00")),
-                    price=record["price"]["close"] or 0,
-                    volume=record.get("volume", 0),
-                    open=record["price"].get("open"),
-                    high=record["price"].get("high"),
-                    low=record["price"].get("low"),
-                )
-                snapshots.append(snap)
+                snapshots.append(snapshot_from_record(json.loads(line.strip())))
     except Exception as e:
         log.error("Failed to parse Track A log %s: %s", log_path, e)
     
@@ -1,5 +1,7 @@
 __all__ = [
     "UniverseManager",
+    "PrevCloseStore",
 ]
 
+from .prev_close_store import PrevCloseStore
 from .universe_manager import UniverseManager
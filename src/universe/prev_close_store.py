@@ -0,0 +1,158 @@
+"""
+prev_close_store.py
+
+역할 요약:
+- 유니버스 빌드용 전일 종가 로컬 저장소 (SQLite, 표준 라이브러리만 사용).
+- (symbol, trading_day) → close 를 보관하고, 종목별 "어느 날짜까지 완전한지"(covered_through)를 함께 기록한다.
+  → covered_through >= 목표일 이면 그 사이에 없는 날짜는 휴장/거래정지일이므로
+    목표일 이전 최신 종가를 그대로 사용할 수 있다 (API 호출 불필요).
+- 채우는 경로:
+  - UniverseManager: fetch_daily_prices() 응답의 확정 종가 행
+  - SwingCollector: 장 마감 이후 스윕의 현재가 (= 당일 종가)
+- 여러 스레드(유니버스 스케줄러 / Track A)에서 호출해도 안전하도록 단일 Lock으로 보호한다.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("UniverseManager")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prev_close (
+    symbol TEXT NOT NULL,
+    trading_day TEXT NOT NULL,
+    close INTEGER NOT NULL,
+    PRIMARY KEY (symbol, trading_day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    symbol TEXT PRIMARY KEY,
+    covered_through TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class PrevCloseStore:
+    """
+    (symbol, trading_day) 종가 저장소
+    """
+
+    def __init__(self, path: Path | str, retention_days: int = 30):
+        """
+        Args:
+            path: SQLite 파일 경로 (":memory:" 가능)
+            retention_days: 보관 기간 (prune() 시 이보다 오래된 행 삭제)
+        """
+        self.path = str(path)
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        # 통계
+        self._hits = 0
+        self._misses = 0
+        self._rows_written = 0
+
+    # ----------------------- Write -----------------------
+    def record_closes(
+        self,
+        rows: Iterable[Tuple[str, date, int]],
+        covered_through: Optional[date] = None,
+    ) -> int:
+        """
+        종가 행 저장.
+
+        Args:
+            rows: (symbol, trading_day, close) — 확정 종가만 넣을 것
+            covered_through: 지정 시 rows 에 등장한 종목의 완전 구간을 이 날짜까지로 갱신
+        Returns: 저장한 행 수
+        """
+        data = [(sym, day.isoformat(), int(close)) for sym, day, close in rows if close is not None]
+        if not data:
+            return 0
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN")
+            try:
+                cur.executemany("INSERT OR REPLACE INTO prev_close VALUES (?, ?, ?)", data)
+                if covered_through is not None:
+                    through = covered_through.isoformat()
+                    cur.executemany(
+                        "INSERT INTO coverage VALUES (?, ?) ON CONFLICT(symbol) DO UPDATE "
+                        "SET covered_through = MAX(covered_through, excluded.covered_through)",
+                        [(sym, through) for sym in {row[0] for row in data}],
+                    )
+                cur.execute("COMMIT")
+            except Exception:
+                cur.execute("ROLLBACK")
+                raise
+            self._rows_written += len(data)
+        return len(data)
+
+    def record_day(self, day: date, closes: Dict[str, int]) -> int:
+        """하루치 종가 저장 (해당 종목은 day 까지 완전)"""
+        return self.record_closes(((sym, day, close) for sym, close in closes.items()), covered_through=day)
+
+    # ----------------------- Read -----------------------
+    def lookup(self, symbols: Iterable[str], as_of: date) -> Tuple[Dict[str, int], List[str]]:
+        """
+        as_of 기준 전일 종가 조회.
+
+        Returns:
+            (hits, misses) — hits: {symbol: close}, misses: 저장소로 판단할 수 없는 종목
+        """
+        symbols = list(symbols)
+        as_of_s = as_of.isoformat()
+        with self._lock:
+            covered = {
+                sym: close
+                for sym, close in self._conn.execute(
+                    """
+                    SELECT c.symbol,
+                           (SELECT p.close FROM prev_close p
+                             WHERE p.symbol = c.symbol AND p.trading_day <= ?
+                             ORDER BY p.trading_day DESC LIMIT 1)
+                      FROM coverage c
+                     WHERE c.covered_through >= ?
+                    """,
+                    (as_of_s, as_of_s),
+                )
+                if close is not None
+            }
+            hits = {sym: covered[sym] for sym in symbols if sym in covered}
+            misses = [sym for sym in symbols if sym not in covered]
+            self._hits += len(hits)
+            self._misses += len(misses)
+        return hits, misses
+
+    # ----------------------- Maintenance -----------------------
+    def prune(self, today: Optional[date] = None) -> int:
+        """retention_days 보다 오래된 종가 행 삭제. Returns: 삭제 행 수"""
+        cutoff = ((today or date.today()) - timedelta(days=self.retention_days)).isoformat()
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM prev_close WHERE trading_day < ?", (cutoff,))
+            return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """통계 정보 반환"""
+        with self._lock:
+            rows = self._conn.execute("SELECT COUNT(*) FROM prev_close").fetchone()[0]
+            return {
+                "rows": rows,
+                "hits": self._hits,
+                "misses": self._misses,
+                "rows_written": self._rows_written,
+            }
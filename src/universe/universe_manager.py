@@ -7,7 +7,12 @@ from datetime import date, datetime, timedelta
 from pathlib import Path
 from typing import Iterable, List, Optional, Dict, Any
 import glob
+import time
 
+from monitoring.prometheus_metrics import get_registry
+from provider.kis.rate_limit_service import RequestPriority, rest_priority
+
+from .prev_close_store import PrevCloseStore
 from .symbol_generator import SymbolGenerator
 
 logger = logging.getLogger("UniverseManager")
@@ -65,6 +70,29 @@ class UniverseManager:
         # Initialize SymbolGenerator
         # This will also perform its own path check
         self.symbol_gen = SymbolGenerator(self.engine, base_dir=str(self.base_path))
+
+        # Previous-close cache: universe build becomes a local filter, only misses hit the API
+        self.prev_close_store: Optional[PrevCloseStore] = None
+        try:
+            self.prev_close_store = PrevCloseStore(self.universe_dir / "prev_close.sqlite3")
+            self.prev_close_store.prune()
+        except Exception as e:
+            logger.warning(f"Previous-close cache disabled (API-only universe build): {e}")
+
+        registry = get_registry()
+        self._build_duration = registry.histogram(
+            "observer_universe_build_duration_seconds",
+            "Daily universe snapshot build duration",
+            buckets=[1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0],
+        )
+        self._cache_hits = registry.counter(
+            "observer_universe_prev_close_cache_hits_total",
+            "Universe candidates filtered from the local previous-close cache",
+        )
+        self._cache_misses = registry.counter(
+            "observer_universe_prev_close_cache_misses_total",
+            "Universe candidates that required a daily-price API call",
+        )
         
         # [Requirement] Cleanup old universe files (14 days to cover 5 business days)
         self._cleanup_old_universe_files()
@@ -148,6 +176,7 @@ class UniverseManager:
         Create daily universe snapshot using latest symbols from SymbolGenerator.
         Returns the written file path.
         """
+        build_started = time.perf_counter()
         target_date = self._as_date(day)
         prev_trading = self._previous_trading_day(target_date)
 
@@ -169,17 +198,39 @@ class UniverseManager:
         # 2. Filter symbols by price
         selected: List[str] = []
         failed_symbols: List[tuple] = []  # (symbol, error_type, error_msg)
+
+        # 2-a. Local filter from the previous-close cache
+        to_fetch: List[str] = list(candidates)
+        cache_hits = 0
+        if self.prev_close_store is not None:
+            try:
+                cached, to_fetch = self.prev_close_store.lookup(candidates, as_of=prev_trading)
+                cache_hits = len(cached)
+                selected.extend(sym for sym, close in cached.items() if close >= self.min_price)
+            except Exception as e:
+                logger.warning("Previous-close cache lookup failed, fetching all candidates: %s", e)
+                to_fetch = list(candidates)
+        self._cache_hits.increment(cache_hits)
+        self._cache_misses.increment(len(to_fetch))
+        logger.info("Universe build: %d/%d candidates from prev-close cache, %d via API",
+                    cache_hits, len(candidates), len(to_fetch))
+
+        # 2-b. API for the remaining symbols
         sem = asyncio.Semaphore(15)  # Optimized concurrency
         processed_count = 0
-        total_candidates = len(candidates)
+        total_candidates = len(to_fetch)
+        fetched_rows: List[tuple] = []  # (symbol, trading_day, close) — 확정 종가만
 
         async def fetch_and_filter(sym: str) -> None:
             nonlocal processed_count
             async with sem:
                 try:
                     # Filter uses previous trading day's close
-                    data = await self.engine.fetch_daily_prices(sym, days=2)
-                    close = self._extract_prev_close(data, symbol=sym)
+                    # (10 calendar days so weekends/holidays still include that row)
+                    data = await self.engine.fetch_daily_prices(sym, days=10)
+                    closes = self._daily_closes(data, as_of=prev_trading)
+                    fetched_rows.extend((sym, d, c) for d, c in closes)
+                    close = closes[0][1] if closes else self._extract_prev_close(data, symbol=sym)
 
                     if close is not None and close >= self.min_price:
                         selected.append(sym)
@@ -192,7 +243,15 @@ class UniverseManager:
                         logger.info("Universe build: %d/%d processed (selected=%d, failed=%d)...",
                                     processed_count, total_candidates, len(selected), len(failed_symbols))
 
-        await asyncio.gather(*(fetch_and_filter(s) for s in candidates))
+        # Bulk build: lowest REST priority so Track A/B keep their share of the app-key budget
+        with rest_priority(RequestPriority.UNIVERSE):
+            await asyncio.gather(*(fetch_and_filter(s) for s in to_fetch))
+
+        if fetched_rows and self.prev_close_store is not None:
+            try:
+                self.prev_close_store.record_closes(fetched_rows, covered_through=prev_trading)
+            except Exception as e:
+                logger.warning("Failed to persist previous closes: %s", e)
 
         # Log aggregated failure summary
         if failed_symbols:
@@ -214,6 +273,7 @@ class UniverseManager:
                 },
                 "generated_at": datetime.now().isoformat(),
                 "count": len(selected),
+                "prev_close_cache_hits": cache_hits,
             },
             "symbols": sorted(selected),
         }
@@ -222,7 +282,10 @@ class UniverseManager:
         with open(path, "w", encoding="utf-8") as f:
             json.dump(snapshot, f, ensure_ascii=False, indent=2)
             
-        logger.info(f"Daily snapshot created: {path} ({len(selected)} symbols)")
+        elapsed = time.perf_counter() - build_started
+        self._build_duration.observe(elapsed)
+        logger.info(f"Daily snapshot created: {path} ({len(selected)} symbols, {elapsed:.1f}s, "
+                    f"cache_hits={cache_hits}, api={total_candidates})")
         print(f"[UniverseManager] Daily snapshot created: {path} (count={len(selected)})")
         sys.stdout.flush()
         return str(path)
@@ -386,6 +449,36 @@ class UniverseManager:
             td -= timedelta(days=1)
         return td
 
+    def _daily_closes(self, payload: Any, as_of: date) -> List[tuple]:
+        """
+        fetch_daily_prices() 응답에서 as_of 이전(포함)의 확정 종가 (trading_day, close) 목록.
+        최신순 정렬. 영업일자가 없는 행은 제외한다.
+        """
+        rows: List[tuple] = []
+        if not isinstance(payload, list):
+            return rows
+        for entry in payload:
+            try:
+                inst = entry["instruments"][0]
+                day = date.fromisoformat(str(inst["timestamp"])[:10])
+                close = inst["price"]["close"]
+            except (KeyError, IndexError, TypeError, ValueError):
+                continue
+            if close and day <= as_of:
+                rows.append((day, int(close)))
+        rows.sort(reverse=True)
+        return rows
+
+    def record_closes(self, day: date, closes: Dict[str, int]) -> int:
+        """장 마감 후 확정된 당일 종가를 캐시에 기록 (예: Track A 마감 스윕)"""
+        if self.prev_close_store is None or not closes:
+            return 0
+        try:
+            return self.prev_close_store.record_day(day, closes)
+        except Exception as e:
+            logger.warning("Failed to record closes for %s: %s", day, e)
+            return 0
+
     def _extract_prev_close(self, payload: Any, symbol: Optional[str] = None) -> Optional[int]:
         """Defensive extraction of close price with detailed error logging."""
         tag = "DAILY"
@@ -9,7 +9,7 @@ from datetime import datetime, date, time, timedelta, timezone
 from typing import Optional, Callable, List, Dict, Any
 from zoneinfo import ZoneInfo
 
-from provider import KISAuth, ProviderEngine
+from provider import KISAuth, ProviderEngine, RequestPriority, rest_priority
 from universe.universe_manager import UniverseManager
 
 log = logging.getLogger("UniverseScheduler")
@@ -75,7 +75,8 @@ class UniverseScheduler:
             
             # 1. 심볼 데이터 무결성 체크 (없으면 생성, 있으면 유효성 검증 후 스킵)
             # force=False로 호출하여 'Smart Check'를 수행합니다. (파일이 정상이면 API 호출 안 함)
-            await self._manager.symbol_gen.execute(force=False)
+            with rest_priority(RequestPriority.UNIVERSE):
+                await self._manager.symbol_gen.execute(force=False)
             
             # 2. 유니버스 스냅샷 체크
             today = date.today()
@@ -154,7 +155,9 @@ class UniverseScheduler:
         
         try:
             log.info("[%s] Starting scheduled universe snapshot for %s", tag, today.isoformat())
-            path = await self._manager.create_daily_snapshot(today)
+            # 유니버스 빌드는 최하위 REST 우선순위 (Track A/B 와 app key 예산 공유)
+            with rest_priority(RequestPriority.UNIVERSE):
+                path = await self._manager.create_daily_snapshot(today)
             
             current_symbols = self._manager.load_universe(today)
             # Find the MOST RECENT snapshot for comparison (might be yesterday PM or today AM)
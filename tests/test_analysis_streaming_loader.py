@@ -0,0 +1,131 @@
+"""
+Streaming PatternRecord / raw observation loader 테스트
+
+- iter_* 는 load_* 와 같은 레코드·카운터를 내며, workers > 1 (process pool) 에서도 파일 순서 유지
+- chunk 하나만 파싱된 시점에 첫 레코드 소비 가능 (전체 파일을 읽기 전)
+- 오류 위치(line / record 번호)는 chunk 경계를 넘어도 파일 기준
+- max_records 에서 멈추면 total_lines / skipped 도 그 지점까지만
+
+벤치마크: python tests/test_analysis_streaming_loader.py
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from observer.analysis import loader as loader_module
+from observer.analysis.loader import (
+    PatternLoadError,
+    RawLoadError,
+    iter_observation_jsonl_records,
+    iter_pattern_records,
+    load_observation_jsonl_records,
+    load_pattern_records,
+)
+
+
+def _record(n: int, valid: bool = True) -> dict:
+    record = {
+        "captured_at": f"2026-02-02T10:{n // 60 % 60:02d}:{n % 60:02d}+09:00",
+        "observation": {"inputs": {"symbol": f"{n % 50:06d}", "price": 70000 + n}},
+        "_schema": {"version": "1.0"},
+    }
+    if valid:
+        record["metadata"] = {"session_id": "s1", "generated_at": record["captured_at"]}
+    return record
+
+
+def _write(path: Path, count: int, invalid_every: int = 0) -> Path:
+    with path.open("w", encoding="utf-8") as f:
+        for n in range(count):
+            f.write(json.dumps(_record(n, valid=not invalid_every or (n + 1) % invalid_every)) + "\n")
+            if n % 7 == 0:
+                f.write("\n")
+    return path
+
+
+def test_stream_matches_list_loader_sequential_and_parallel(tmp_path):
+    path = _write(tmp_path / "patterns.jsonl", 500, invalid_every=9)
+    expected = load_pattern_records(path, strict=False)
+    assert expected.loaded + expected.skipped == expected.total_lines == 500
+
+    for workers in (1, 3):
+        stream = iter_pattern_records(path, strict=False, workers=workers, chunk_bytes=2048)
+        records = list(stream)
+        assert records == expected.records
+        assert (stream.total_lines, stream.loaded, stream.skipped) == (500, expected.loaded, expected.skipped)
+
+    raw = load_observation_jsonl_records(path)
+    parallel = list(iter_observation_jsonl_records(path, workers=3, chunk_bytes=2048))
+    assert parallel == raw.records
+    assert raw.total_lines == raw.records[-1].line_no == 500 + 500 // 7 + 1
+
+
+def test_first_record_before_whole_file_is_parsed(tmp_path, monkeypatch):
+    path = _write(tmp_path / "patterns.jsonl", 300)
+    parsed = []
+    original = loader_module._parse_pattern_chunk
+
+    def counting(*args):
+        parsed.append(args[1:3])
+        return original(*args)
+
+    monkeypatch.setattr(loader_module, "_parse_pattern_chunk", counting)
+    with iter_pattern_records(path, chunk_bytes=1024) as stream:
+        first = next(stream)
+        assert first.observation["inputs"]["price"] == 70000
+        assert len(parsed) == 1
+        assert path.stat().st_size > parsed[0][1]
+
+
+def test_error_positions_are_file_relative(tmp_path):
+    path = _write(tmp_path / "bad.jsonl", 200)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    lines[180] = "{broken"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    for workers in (1, 2):
+        with pytest.raises(PatternLoadError, match="Invalid JSON at line 181:"):
+            list(iter_pattern_records(path, workers=workers, chunk_bytes=1024))
+        with pytest.raises(RawLoadError, match="Invalid JSON at line 181:"):
+            list(iter_observation_jsonl_records(path, workers=workers, chunk_bytes=1024))
+
+    strict_path = _write(tmp_path / "strict.jsonl", 200, invalid_every=150)
+    with pytest.raises(PatternLoadError, match=r"^\[record 150\] Missing or invalid 'metadata'"):
+        list(iter_pattern_records(strict_path, chunk_bytes=1024))
+
+
+def test_max_records_stops_counters(tmp_path):
+    path = _write(tmp_path / "patterns.jsonl", 100, invalid_every=4)
+    result = load_pattern_records(path, strict=False, max_records=10)
+    # n=3, 7, 11 은 metadata 없음 → 10번째 유효 레코드는 13번째 object (n=12)
+    assert (result.total_lines, result.loaded, result.skipped) == (13, 10, 3)
+
+    raw = load_observation_jsonl_records(path, max_records=5)
+    assert [r.line_no for r in raw.records] == [1, 3, 4, 5, 6]
+    assert raw.total_lines == 6
+
+
+def run_benchmark(count: int = 200_000, workers: int = 4) -> None:
+    path = _write(Path(tempfile.mkdtemp()) / "patterns.jsonl", count)
+    size_mb = path.stat().st_size / 1e6
+    for label, kwargs in (("sequential", {"workers": 1}), (f"workers={workers}", {"workers": workers})):
+        started = time.perf_counter()
+        stream = iter_pattern_records(path, **kwargs)
+        first = None
+        for _ in stream:
+            if first is None:
+                first = time.perf_counter() - started
+        elapsed = time.perf_counter() - started
+        print(f"{label}: {count} records ({size_mb:.0f} MB) in {elapsed:.2f}s, "
+              f"first record after {first * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
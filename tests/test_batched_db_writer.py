@@ -0,0 +1,123 @@
+"""
+BatchedRealtimeDBWriter 타이머 플러시 테스트
+
+- 틱 유입이 멈춰도 flush_interval_ms 내에 부분 배치가 COPY 되는지
+- COPY 왕복 중에도 생산자가 append 락에 막히지 않는지
+- 배치 크기 / 지연 히스토그램 기록
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from db.realtime_writer import BatchedRealtimeDBWriter
+
+
+class _FakeConn:
+    def __init__(self, pool):
+        self._pool = pool
+
+    async def copy_records_to_table(self, table, records, columns):
+        self._pool.copy_started.set()
+        await asyncio.sleep(self._pool.copy_delay)
+        self._pool.copies.append(list(records))
+
+
+class _Acquire:
+    def __init__(self, pool):
+        self._pool = pool
+
+    async def __aenter__(self):
+        return _FakeConn(self._pool)
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakePool:
+    def __init__(self, copy_delay=0.0):
+        self.copy_delay = copy_delay
+        self.copies = []
+        self.copy_started = asyncio.Event()
+
+    def acquire(self):
+        return _Acquire(self)
+
+    async def close(self):
+        pass
+
+
+def _tick(i):
+    return {
+        "symbol": "005930",
+        "timestamp": "2026-02-02T10:00:00+09:00",
+        "price": {"current": 70000 + i},
+        "volume": {"accumulated": i},
+        "bid_ask": {"bid_price": 69900, "ask_price": 70100},
+    }
+
+
+def test_timer_flushes_partial_batch_when_ticks_stop():
+    async def scenario():
+        writer = BatchedRealtimeDBWriter(batch_size=100, flush_interval_ms=30)
+        writer._pool = FakePool()
+        writer._connected = True
+        writer.start()
+
+        await writer.save_scalp_tick(_tick(1), "s1")
+        await writer.save_scalp_tick(_tick(2), "s1")
+        assert writer.stats["pending_batch_size"] == 2
+
+        await asyncio.sleep(0.15)  # no more ticks
+        pool = writer._pool
+        await writer.close()
+        return writer, pool
+
+    writer, pool = asyncio.run(scenario())
+    assert sum(len(c) for c in pool.copies) == 2
+    assert writer.stats["timer_flushes"] >= 1
+    assert writer.stats["total_saved"] == 2
+
+
+def test_producers_not_blocked_during_copy():
+    async def scenario():
+        writer = BatchedRealtimeDBWriter(batch_size=2, flush_interval_ms=10_000)
+        pool = FakePool(copy_delay=0.2)
+        writer._pool = pool
+        writer._connected = True
+
+        flush = asyncio.create_task(writer.save_scalp_ticks([_tick(1), _tick(2)], "s1"))
+        await pool.copy_started.wait()
+
+        # COPY 진행 중 append는 즉시 완료되어야 한다
+        await asyncio.wait_for(writer.save_scalp_tick(_tick(3), "s1"), timeout=0.05)
+        assert writer.stats["pending_batch_size"] == 1
+
+        await flush
+        await writer.stop()
+        return writer, pool
+
+    writer, pool = asyncio.run(scenario())
+    assert [len(c) for c in pool.copies] == [2, 1]
+
+
+def test_histograms_record_batch_size_and_latency():
+    # 히스토그램은 공용 레지스트리에 있으므로 다른 writer의 기록과 누적된다 → 증가분으로 검증
+    batch_hist, latency_hist = BatchedRealtimeDBWriter().histograms
+    before = (batch_hist.count, batch_hist.sum_value, latency_hist.count)
+
+    async def scenario():
+        writer = BatchedRealtimeDBWriter(batch_size=3, flush_interval_ms=10_000)
+        writer._pool = FakePool()
+        writer._connected = True
+        await writer.save_scalp_ticks([_tick(i) for i in range(3)], "s1")
+        return writer
+
+    writer = asyncio.run(scenario())
+    assert writer.histograms[0] is batch_hist and writer.histograms[1] is latency_hist
+    assert batch_hist.count - before[0] == 1
+    assert batch_hist.sum_value - before[1] == 3
+    assert latency_hist.count - before[2] == 1
+    assert writer.stats["avg_copy_ms"] >= 0.0
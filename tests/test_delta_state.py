@@ -0,0 +1,110 @@
+"""
+DeltaStateStore / build_snapshot(delta_state=...) 테스트
+
+- 종목이 섞여 들어와도 price_delta_short 가 종목별로 계산되는지
+- LRU 제거 (비활성 종목)
+- 선택 통계: price_ewma / tick_count / tick_volume
+- 멀티 스레드 갱신 시 상태 일관성
+"""
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from observer.delta_state import DeltaStateStore
+from observer.snapshot import build_snapshot
+
+
+def _snap(store, symbol, price, volume=None, computed=None, session_id="s1"):
+    inputs = {"price": price}
+    if volume is not None:
+        inputs["volume"] = volume
+    return build_snapshot(
+        session_id=session_id, mode="DEV", source="market", stage="raw",
+        inputs=inputs, computed=computed, symbol=symbol, delta_state=store,
+    )
+
+
+def test_interleaved_symbols_do_not_mix_deltas():
+    store = DeltaStateStore()
+    seq = [("005930", 70000), ("000660", 120000), ("005930", 70100), ("000660", 119500)]
+    deltas = [_snap(store, sym, p).observation.computed["price_delta_short"] for sym, p in seq]
+    assert deltas == [0, 0, 100, -500]
+
+
+def test_sessions_are_isolated():
+    store = DeltaStateStore()
+    _snap(store, "005930", 70000, session_id="a")
+    snap = _snap(store, "005930", 71000, session_id="b")
+    assert snap.observation.computed["price_delta_short"] == 0
+
+
+def test_without_store_computed_is_untouched():
+    snap = _snap(None, "005930", 70000, computed={"rsi": 40})
+    assert snap.observation.computed == {"rsi": 40}
+
+
+def test_caller_computed_takes_precedence_and_price_dict_supported():
+    store = DeltaStateStore()
+    _snap(store, "005930", {"current": 70000})
+    snap = _snap(store, "005930", {"current": 70200}, computed={"price_delta_short": "given"})
+    assert snap.observation.computed["price_delta_short"] == "given"
+    assert store.update({"price": {"close": 70300}}, session_id="s1", symbol="005930") == {
+        "price_delta_short": 100,
+    }
+
+
+def test_lru_evicts_inactive_symbols():
+    store = DeltaStateStore(max_keys=2)
+    store.update({"price": 1}, symbol="A")
+    store.update({"price": 1}, symbol="B")
+    store.update({"price": 2}, symbol="A")  # A 최근 사용 → B가 제거 대상
+    store.update({"price": 1}, symbol="C")
+
+    assert len(store) == 2
+    assert store.stats["evictions"] == 1
+    assert store.update({"price": 5}, symbol="A")["price_delta_short"] == 3
+    assert store.update({"price": 5}, symbol="B")["price_delta_short"] == 0  # 재생성
+
+
+def test_optional_ewma_and_tick_volume():
+    store = DeltaStateStore(ewma_alpha=0.5, track_tick_volume=True)
+    store.update({"price": 100, "volume": 1000}, symbol="A")
+    store.update({"price": 110, "volume": 1030}, symbol="A")
+    out = store.update({"price": 120, "volume": 1050}, symbol="A")
+
+    assert out["price_ewma"] == pytest.approx(112.5)
+    assert out["volume_delta_short"] == 20
+    assert out["tick_count"] == 3
+    assert out["tick_volume"] == 50
+
+
+def test_invalid_arguments_rejected():
+    with pytest.raises(ValueError):
+        DeltaStateStore(max_keys=0)
+    with pytest.raises(ValueError):
+        DeltaStateStore(ewma_alpha=1.5)
+
+
+def test_concurrent_updates_are_consistent():
+    store = DeltaStateStore(track_tick_volume=True)
+
+    def worker(symbol):
+        for i in range(2000):
+            store.update({"price": i, "volume": i}, symbol=symbol)
+
+    threads = [threading.Thread(target=worker, args=(f"S{n}",)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for n in range(4):
+        out = store.update({"price": 2000, "volume": 2000}, symbol=f"S{n}")
+        assert out["price_delta_short"] == 1
+        assert out["tick_count"] == 2001
+        assert out["tick_volume"] == 2000
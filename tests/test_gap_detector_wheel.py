@@ -0,0 +1,195 @@
+"""
+GapDetector timer wheel 테스트
+
+- severity 승격마다 1회 보고 (minor → major → critical), 갱신 시 minor 부터 재시작
+- check_all_track_b_gaps 는 deadline 이 도래한 종목만 방문
+- gap ledger 는 check 1회당 한 번에 append, scalp_gaps 는 flush_db 로 배치 COPY
+- scalp_gaps 는 gap 1건당 1행 (공백 종료 시 최고 severity + 실제 복구 시각), flush 는 check tick 에서 예약
+
+벤치마크: python tests/test_gap_detector_wheel.py
+"""
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from db.realtime_writer import RealtimeDBWriter
+from gap.gap_detector import GapDetector, GapDetectorConfig
+
+KST = ZoneInfo("Asia/Seoul")
+T0 = datetime(2026, 2, 2, 10, 0, tzinfo=KST)
+
+
+def _detector(tmp_path, **kwargs):
+    return GapDetector(GapDetectorConfig(gap_ledger_dir=str(tmp_path)), **kwargs)
+
+
+def test_each_severity_reported_once_and_update_resets(tmp_path):
+    detector = _detector(tmp_path)
+    detector.update_track_b("005930", T0)
+    detector.update_track_b("000660", T0)
+
+    assert detector.check_all_track_b_gaps(T0 + timedelta(seconds=9.5)) == []
+    minor = detector.check_all_track_b_gaps(T0 + timedelta(seconds=10))
+    assert sorted((g.symbol, g.gap_type) for g in minor) == [("000660", "minor"), ("005930", "minor")]
+    assert detector.check_all_track_b_gaps(T0 + timedelta(seconds=30)) == []  # 같은 severity 재보고 없음
+
+    detector.update_track_b("000660", T0 + timedelta(seconds=55))  # 복구
+    major = detector.check_all_track_b_gaps(T0 + timedelta(seconds=61))
+    assert [(g.symbol, g.gap_type) for g in major] == [("005930", "major")]
+    assert detector.get_status()["track_b_symbols_with_gaps"] == 1
+
+    # 긴 공백을 한 번에 건너뛰면 가장 높은 severity 하나만
+    late = detector.check_all_track_b_gaps(T0 + timedelta(minutes=20))
+    assert sorted((g.symbol, g.gap_type) for g in late) == [("000660", "critical"), ("005930", "critical")]
+    assert detector.check_all_track_b_gaps(T0 + timedelta(hours=1)) == []
+
+    detector.remove_track_b("005930")
+    assert detector.get_status()["track_b_monitored_symbols"] == 1
+
+
+def test_only_due_symbols_are_visited(tmp_path):
+    detector = _detector(tmp_path)
+    symbols = [f"{n:06d}" for n in range(3000)]
+    for step in range(20):  # 2Hz 로 10초 동안 갱신, 마지막 종목만 첫 갱신 후 멈춤
+        at = T0 + timedelta(seconds=step * 0.5)
+        for symbol in symbols if step == 0 else symbols[:-1]:
+            detector.update_track_b(symbol, at)
+
+    gaps = detector.check_all_track_b_gaps(T0 + timedelta(seconds=11))
+    assert [g.symbol for g in gaps] == [symbols[-1]]
+    assert detector.stats["track_b_visited"] == 1
+
+
+class _Writer:
+    is_connected = True
+
+    def __init__(self):
+        self.batches = []
+
+    async def save_scalp_gaps(self, gaps, session_id):
+        self.batches.append((gaps, session_id))
+        return True
+
+
+def test_ledger_batched_and_db_flush(tmp_path):
+    writer = _Writer()
+    detector = _detector(tmp_path, db_writer=writer)
+    for n in range(50):
+        detector.update_track_b(f"{n:06d}", T0)
+    gaps = detector.check_all_track_b_gaps(T0 + timedelta(seconds=15))
+
+    lines = (tmp_path / "gap_20260202.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == len(gaps) == 50
+    assert detector.stats["ledger_writes"] == 1
+    assert json.loads(lines[0])["track_type"] == "track_b"
+
+    # 열린 gap 은 아직 적재하지 않는다
+    detector.check_all_track_b_gaps(T0 + timedelta(seconds=70))
+    assert asyncio.run(detector.flush_db()) == 0
+
+    for n in range(50):
+        detector.update_track_b(f"{n:06d}", T0 + timedelta(seconds=80))
+    assert asyncio.run(detector.flush_db()) == 50
+    [(rows, session_id)] = writer.batches
+    assert len(rows) == 50 and session_id == "track_b_session"
+    assert {(r["gap_type"], r["gap_duration_seconds"]) for r in rows} == {("major", 80.0)}
+    assert asyncio.run(detector.flush_db()) == 0
+
+
+def test_flush_is_scheduled_from_check_tick(tmp_path):
+    writer = _Writer()
+    detector = _detector(tmp_path, db_writer=writer)
+
+    async def main():
+        detector.update_track_b("005930", T0)
+        detector.check_all_track_b_gaps(T0 + timedelta(seconds=12))
+        detector.update_track_b("005930", T0 + timedelta(seconds=20))  # 복구 → 1행 대기
+        detector.check_all_track_b_gaps(T0 + timedelta(seconds=21))
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    [(rows, _)] = writer.batches
+    assert [(r["symbol"], r["gap_type"], r["recovered_at"]) for r in rows] == [
+        ("005930", "minor", (T0 + timedelta(seconds=20)).isoformat())
+    ]
+    assert detector.get_status()["db_pending"] == 0
+
+
+class _Conn:
+    def __init__(self, copies):
+        self.copies = copies
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copies.append((table, list(records), columns))
+
+
+class _Acquire:
+    def __init__(self, copies):
+        self.copies = copies
+
+    async def __aenter__(self):
+        return _Conn(self.copies)
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Pool:
+    def __init__(self):
+        self.copies = []
+
+    def acquire(self):
+        return _Acquire(self.copies)
+
+
+def test_scalp_gaps_copy_records(tmp_path):
+    detector = _detector(tmp_path, db_writer=_Writer())
+    detector.update_track_b("005930", T0)
+    for seconds in (10, 60, 75.4):  # minor → major 승격은 행을 늘리지 않는다
+        detector.check_all_track_b_gaps(T0 + timedelta(seconds=seconds))
+    detector.update_track_b("005930", T0 + timedelta(seconds=90.2))
+    [gap] = detector._db_pending
+
+    writer = RealtimeDBWriter()
+    writer._pool = _Pool()
+    assert asyncio.run(writer.save_scalp_gaps([gap.to_dict()], "s1"))
+    [(table, records, columns)] = writer._pool.copies
+    assert table == "scalp_gaps"
+    assert columns == ["gap_start_ts", "gap_end_ts", "gap_seconds", "scope", "reason", "session_id"]
+    assert records == [(T0, T0 + timedelta(seconds=90.2), 90, "005930", "track_b:major", "s1")]
+
+
+def run_benchmark(symbols: int = 5000, rounds: int = 20) -> None:
+    detector = GapDetector(GapDetectorConfig(gap_ledger_dir=tempfile.mkdtemp()))
+    names = [f"{n:06d}" for n in range(symbols)]
+    started = time.perf_counter()
+    for step in range(rounds):
+        at = T0 + timedelta(seconds=step * 0.5)
+        for symbol in names:
+            detector.update_track_b(symbol, at)
+    update_us = (time.perf_counter() - started) / (symbols * rounds) * 1e6
+
+    now = T0 + timedelta(seconds=rounds * 0.5)
+    started = time.perf_counter()
+    for _ in range(1000):
+        detector.check_all_track_b_gaps(now)
+    check_us = (time.perf_counter() - started) / 1000 * 1e6
+
+    started = time.perf_counter()
+    for _ in range(10):
+        [(now - detector._track_b_last_updates[s]).total_seconds() for s in names]
+    scan_us = (time.perf_counter() - started) / 10 * 1e6
+    print(f"{symbols} symbols: update_track_b {update_us:.2f} us, check_all (no gaps) {check_us:.2f} us, "
+          f"previous full scan {scan_us:.0f} us")
+
+
+if __name__ == "__main__":
+    run_benchmark()
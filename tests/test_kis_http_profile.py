@@ -0,0 +1,127 @@
+"""
+KIS REST HTTP 프로파일 / lean 디코더 테스트
+
+- ConnectorProfile: 기본값과 KIS_HTTP_* 환경변수 오버라이드
+- LeanDecoder: inquire-price 응답에서 json 전체 파싱과 같은 필드 값, 예외 형식은 fallback
+- fetch_current_price: read() 본문을 디코딩하고 (orjson 없으면 lean) parse 시간을 기록
+
+벤치마크: python tests/test_kis_http_profile.py
+"""
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from provider.kis.http_profile import ConnectorProfile, LeanDecoder, _timing_histogram
+from provider.kis import kis_rest_provider as rest_module
+from provider.kis.kis_rest_provider import KISRestProvider, RateLimiter, _decode_price_body
+
+
+def _inquire_price_body(price=71500, **overrides) -> bytes:
+    """실제 inquire-price 응답과 비슷한 크기 (~80 필드)의 compact JSON"""
+    output = {f"field_{i:02d}": str(i * 1000) for i in range(70)}
+    output.update({
+        "iscd_stat_cls_code": "55", "bstp_kor_isnm": "전기.전자",
+        "stck_prpr": str(price), "stck_oprc": "71000", "stck_hgpr": "72000",
+        "stck_lwpr": "70500", "acml_vol": "12345678", "bidp1": "71400", "askp1": "71600",
+    })
+    output.update(overrides)
+    payload = {"output": output, "rt_cd": "0", "msg_cd": "MCA00000", "msg1": "정상처리 되었습니다."}
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def test_profile_defaults_and_env_overrides(monkeypatch):
+    profile = ConnectorProfile.from_env()
+    assert profile.limit_per_host >= 20 and profile.keepalive_timeout > 0
+
+    monkeypatch.setenv("KIS_HTTP_LIMIT_PER_HOST", "8")
+    monkeypatch.setenv("KIS_HTTP_CONNECT_TIMEOUT", "1.5")
+    monkeypatch.setenv("KIS_HTTP_KEEPALIVE", "not-a-number")
+    profile = ConnectorProfile.from_env()
+    assert profile.limit_per_host == 8
+    assert profile.connect_timeout == 1.5
+    assert profile.keepalive_timeout == ConnectorProfile().keepalive_timeout
+
+
+def test_lean_decode_matches_full_parse(monkeypatch):
+    monkeypatch.setattr(rest_module, "orjson", None)  # lean 경로 강제
+    body = _inquire_price_body()
+    lean = _decode_price_body(body)
+    full = json.loads(body)
+
+    assert lean["rt_cd"] == full["rt_cd"] and lean["msg1"] == full["msg1"]
+    for key, value in lean["output"].items():
+        assert full["output"][key] == value
+    provider = KISRestProvider(auth=MagicMock(), rate_limiter=RateLimiter())
+    a = provider._normalize_current_price(lean, "005930")["instruments"][0]
+    b = provider._normalize_current_price(full, "005930")["instruments"][0]
+    assert {k: a[k] for k in ("price", "volume", "bid_price", "ask_price")} == \
+        {k: b[k] for k in ("price", "volume", "bid_price", "ask_price")}
+
+
+def test_unexpected_bodies_fall_back_to_full_parse(monkeypatch):
+    monkeypatch.setattr(rest_module, "orjson", None)
+    decoder = LeanDecoder(("rt_cd", "msg1"))
+    assert decoder.decode(b'{"rt_cd": "0"}') is None  # 공백 포함 → fallback
+    assert decoder.decode(b'{"rt_cd":"1","msg1":"a\\"b"}') is None  # escape → fallback
+
+    spaced = b'{"rt_cd": "1", "msg1": "\xec\xb4\x88\xeb\x8b\xb9 \xea\xb1\xb0\xeb\x9e\x98\xea\xb1\xb4\xec\x88\x98 \xec\xb4\x88\xea\xb3\xbc"}'
+    data = _decode_price_body(spaced)
+    assert data["rt_cd"] == "1" and "초과" in data["msg1"]
+
+
+class _Response:
+    status = 200
+
+    def __init__(self, body):
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def test_fetch_current_price_records_parse_timing():
+    session = MagicMock()
+    session.get = MagicMock(return_value=_Response(_inquire_price_body(price=80100)))
+    auth = MagicMock()
+    auth.base_url = "https://mock.api.com"
+    auth.ensure_token = AsyncMock()
+    auth.get_headers = MagicMock(return_value={})
+    auth.get_session = AsyncMock(return_value=session)
+    provider = KISRestProvider(auth=auth, rate_limiter=RateLimiter(requests_per_second=1000))
+
+    hist = _timing_histogram("parse", "inquire-price")
+    before = hist.count
+    contract = asyncio.run(provider.fetch_current_price("005930"))
+
+    assert contract["instruments"][0]["price"]["close"] == 80100
+    assert hist.count == before + 1
+
+
+def run_benchmark(iterations: int = 20000) -> None:
+    body = _inquire_price_body()
+    print(f"inquire-price body: {len(body)} bytes, {iterations} iterations")
+    decoders = [("json.loads", json.loads), ("lean decode", rest_module._price_decoder.decode)]
+    if rest_module.orjson is not None:
+        decoders.append(("orjson", rest_module.orjson.loads))
+    for name, fn in decoders:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn(body)
+        elapsed = time.perf_counter() - started
+        print(f"  {name:<12} {elapsed / iterations * 1e6:8.2f} us/body")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,128 @@
+"""
+KISRestProvider.fetch_current_prices (멀티종목 시세) 테스트
+
+- mock KIS 서버: 1,000 종목 유니버스에서 요청 수가 1,000 → 34 로 감소
+- 응답에 빠진 종목 / 미지원 엔드포인트는 종목별 inquire-price 로 fallback
+- 결과는 fetch_current_price 와 같은 형태의 contract 리스트 (입력 순서 유지)
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from provider.kis.kis_rest_provider import KISRestProvider, RateLimiter
+
+
+class _Response:
+    def __init__(self, status, payload):
+        self.status = status
+        self._payload = payload
+
+    async def json(self):
+        return self._payload
+
+    async def read(self):
+        return json.dumps(self._payload, separators=(",", ":")).encode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class MockKISServer:
+    """inquire-price / intstock-multprice 만 흉내 내는 mock 세션"""
+
+    def __init__(self, multi_supported=True, drop=()):
+        self.multi_supported = multi_supported
+        self.drop = set(drop)
+        self.requests = {"inquire-price": 0, "intstock-multprice": 0}
+
+    @staticmethod
+    def _price(symbol):
+        return 1000 + int(symbol) % 997
+
+    def get(self, url, headers=None, params=None):
+        endpoint = url.rsplit("/", 1)[-1]
+        self.requests[endpoint] += 1
+        if endpoint == "inquire-price":
+            sym = params["FID_INPUT_ISCD"]
+            return _Response(200, {"rt_cd": "0", "output": {
+                "stck_prpr": str(self._price(sym)), "stck_oprc": "1", "stck_hgpr": "2",
+                "stck_lwpr": "1", "acml_vol": "10",
+            }})
+        if not self.multi_supported:
+            return _Response(404, {})
+        rows = []
+        for key, sym in params.items():
+            if key.startswith("FID_INPUT_ISCD_") and sym not in self.drop:
+                rows.append({
+                    "inter_shrn_iscd": sym, "inter2_prpr": str(self._price(sym)),
+                    "inter2_oprc": "1", "inter2_hgpr": "2", "inter2_lwpr": "1",
+                    "acml_vol": "10", "inter2_bidp": "0", "inter2_askp": "3",
+                })
+        return _Response(200, {"rt_cd": "0", "output": rows})
+
+
+def _provider(server):
+    auth = MagicMock()
+    auth.base_url = "https://mock.api.com"
+    auth.ensure_token = AsyncMock()
+    auth.get_headers = MagicMock(return_value={"Authorization": "Bearer token"})
+    auth.get_session = AsyncMock(return_value=server)
+    auth.emergency_refresh = AsyncMock()
+    limiter = RateLimiter(requests_per_second=100000, requests_per_minute=1000000)
+    return KISRestProvider(auth=auth, rate_limiter=limiter)
+
+
+UNIVERSE = [f"{n:06d}" for n in range(1000)]
+
+
+def test_request_count_drops_for_1000_symbols():
+    per_symbol = MockKISServer()
+    provider = _provider(per_symbol)
+
+    async def one_by_one():
+        return await asyncio.gather(*(provider.fetch_current_price(s) for s in UNIVERSE))
+
+    singles = asyncio.run(one_by_one())
+    assert per_symbol.requests["inquire-price"] == 1000
+
+    batched = MockKISServer()
+    provider = _provider(batched)
+    contracts = asyncio.run(provider.fetch_current_prices(UNIVERSE))
+
+    assert batched.requests == {"inquire-price": 0, "intstock-multprice": 34}
+    assert [c["instruments"][0]["symbol"] for c in contracts] == UNIVERSE
+    assert [c["instruments"][0]["price"]["close"] for c in contracts] == [
+        s["instruments"][0]["price"]["close"] for s in singles
+    ]
+    first = contracts[0]["instruments"][0]
+    assert first["bid_price"] is None and first["ask_price"] == 3
+    assert set(contracts[0]["meta"]) == set(singles[0]["meta"])
+
+
+def test_missing_rows_fall_back_to_single_quotes():
+    server = MockKISServer(drop={"000007", "000042"})
+    provider = _provider(server)
+    contracts = asyncio.run(provider.fetch_current_prices(UNIVERSE[:60]))
+
+    assert len(contracts) == 60
+    assert server.requests == {"inquire-price": 2, "intstock-multprice": 2}
+    assert provider.multi_price_supported
+
+
+def test_unsupported_endpoint_switches_to_per_symbol():
+    server = MockKISServer(multi_supported=False)
+    provider = _provider(server)
+    contracts = asyncio.run(provider.fetch_current_prices(UNIVERSE[:90]))
+
+    assert len(contracts) == 90
+    assert server.requests["intstock-multprice"] == 1  # 첫 404 이후 재시도하지 않음
+    assert server.requests["inquire-price"] == 90
+    assert provider.quote_batch_size == 1
@@ -0,0 +1,273 @@
+"""
+AppKeyRateLimiter (provider.kis.rate_limit_service) 테스트
+
+- 초당/분당 한도와 우선순위별 reserve
+- 상위 우선순위 대기 중에는 하위 우선순위가 양보하는지
+- 여러 스레드 / event loop 에서 하나의 예산을 공유하는지
+- rest_priority() 컨텍스트가 gather 로 만든 task 에 전파되는지
+- AIMD: 유량 제한 오류 시 app key 전체 rate 감소 + 일시 정지, 성공 시 상한까지 증가
+- 상위 클래스 대기가 끝나면 하위 클래스 대기자를 즉시 깨우는지
+- 같은 클래스 대기자는 FIFO 순서로 한 명씩 깨우고, 뒤에 선 대기자는 polling 없이 잠드는지
+"""
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from monitoring.prometheus_metrics import get_registry
+from provider.kis.rate_limit_service import (
+    AppKeyRateLimiter,
+    RequestPriority,
+    current_priority,
+    get_rate_limiter,
+    reset_rate_limiters,
+    rest_priority,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _drain(limiter, priority):
+    """대기 없이 획득 가능한 토큰 수"""
+    n = 0
+    while limiter._poll(priority, limiter._clock(), False)[0] == 0.0:
+        n += 1
+    limiter._unregister(priority)  # 마지막 실패한 시도는 대기열에서 제거
+    return n
+
+
+def test_priority_reserves_on_token_bucket():
+    clock = FakeClock()
+    limiter = AppKeyRateLimiter(requests_per_second=20, requests_per_minute=1000, clock=clock)
+
+    assert _drain(limiter, RequestPriority.UNIVERSE) == 15  # 25% reserve
+    assert _drain(limiter, RequestPriority.SWING) == 4  # 1 token left for emergency
+    assert _drain(limiter, RequestPriority.EMERGENCY) == 1
+
+    clock.now += 0.5  # 10 tokens refilled
+    assert _drain(limiter, RequestPriority.UNIVERSE) == 5
+
+
+def test_minute_window_is_enforced():
+    clock = FakeClock()
+    limiter = AppKeyRateLimiter(requests_per_second=100, requests_per_minute=120, clock=clock)
+    granted = 0
+    for _ in range(20):
+        granted += _drain(limiter, RequestPriority.SWING)
+        clock.now += 1.0
+    assert granted <= 120
+    assert limiter.stats["requests_last_minute"] == granted
+
+    clock.now += 60.0
+    assert _drain(limiter, RequestPriority.SWING) > 0
+
+
+def test_lower_priority_yields_to_waiting_higher_priority():
+    clock = FakeClock()
+    limiter = AppKeyRateLimiter(requests_per_second=10, requests_per_minute=1000, clock=clock)
+    _drain(limiter, RequestPriority.EMERGENCY)
+
+    wait, registered, _ = limiter._poll(RequestPriority.SWING, clock(), False)
+    assert wait > 0 and registered
+
+    clock.now += 5.0  # bucket full again, but SWING is still queued
+    wait, _, _ = limiter._poll(RequestPriority.UNIVERSE, clock(), False)
+    assert wait == float("inf")  # 50ms polling 없이 wake 될 때까지 대기
+    wait, registered, _ = limiter._poll(RequestPriority.SWING, clock() - 5.0, True)
+    assert wait == 0.0 and not registered
+
+    stats = limiter.stats["priorities"]
+    assert stats["swing"]["delayed"] == 1
+    assert stats["swing"]["max_wait_ms"] == pytest.approx(5000.0)
+    assert stats["universe"]["waiting"] == 1  # 위의 UNIVERSE 시도는 아직 대기열에 있음
+
+
+def test_shared_budget_across_event_loops():
+    limiter = AppKeyRateLimiter(requests_per_second=50, requests_per_minute=10000)
+    per_thread = 30
+    done = []
+
+    def run():
+        async def main():
+            await asyncio.gather(*(limiter.acquire() for _ in range(per_thread)))
+        asyncio.run(main())
+        done.append(1)
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=run) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+    elapsed = time.monotonic() - started
+
+    assert len(done) == 3
+    # 90 requests: 49 from the burst (SWING keeps 1 token for EMERGENCY), then 50/s
+    assert elapsed >= 0.75
+    assert limiter.stats["priorities"]["swing"]["granted"] == 90
+
+
+def test_acquire_sync_and_cancellation_cleanup():
+    limiter = AppKeyRateLimiter(requests_per_second=5, requests_per_minute=1000)
+    _drain(limiter, RequestPriority.EMERGENCY)
+    assert limiter.acquire_sync(RequestPriority.EMERGENCY) > 0
+
+    async def cancelled():
+        task = asyncio.ensure_future(limiter.acquire(RequestPriority.UNIVERSE))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancelled())
+    assert limiter.stats["priorities"]["universe"]["waiting"] == 0
+
+
+def test_rest_priority_propagates_to_tasks():
+    async def main():
+        async def probe():
+            return current_priority()
+
+        assert await probe() == RequestPriority.SWING
+        with rest_priority(RequestPriority.UNIVERSE):
+            results = await asyncio.gather(probe(), probe())
+        assert results == [RequestPriority.UNIVERSE] * 2
+        assert current_priority() == RequestPriority.SWING
+
+    asyncio.run(main())
+
+
+def test_limiter_registry_is_per_app_key():
+    reset_rate_limiters()
+    try:
+        a = get_rate_limiter("KEY-A")
+        assert get_rate_limiter("KEY-A") is a
+        assert get_rate_limiter("KEY-B") is not a
+        assert "KEY-A" not in a.stats["name"]
+    finally:
+        reset_rate_limiters()
+
+
+def test_aimd_decrease_pause_and_recovery():
+    clock = FakeClock()
+    limiter = AppKeyRateLimiter(
+        requests_per_second=16, requests_per_minute=10000, clock=clock,
+        rps_ceiling=20, rps_floor=2, increase_step=1.0, increase_interval=1.0, throttle_pause=0.5,
+    )
+    assert limiter.record_throttle() == 8.0
+    assert limiter.record_throttle() == 8.0  # 같은 혼잡 구간 → 한 번만 감소
+    assert limiter._poll(RequestPriority.SWING, clock(), False)[0] == pytest.approx(0.5)
+    limiter._unregister(RequestPriority.SWING)
+    # burst 는 비워지고, 복구 요청은 정지 없이 새 rate 로 다음 토큰만 기다린다
+    assert limiter._poll(RequestPriority.EMERGENCY, clock(), False)[0] == pytest.approx(1 / 8)
+    limiter._unregister(RequestPriority.EMERGENCY)
+
+    clock.now += 0.5
+    limiter.record_success()  # 감소 직후 구간에서는 증가하지 않음
+    assert limiter.rps_limit == 8.0
+    for _ in range(20):
+        clock.now += 1.0
+        limiter.record_success()
+    assert limiter.rps_limit == 20.0  # ceiling
+
+    stats = limiter.stats
+    assert stats["throttle_events"] == 2 and stats["rate_decreases"] == 1
+    assert stats["rate_increases"] == 12
+    assert get_registry().get("observer_rate_limit_current_rps").value == 20.0
+
+
+def test_lower_priority_waiter_is_woken_when_higher_class_is_served():
+    clock = FakeClock()
+    limiter = AppKeyRateLimiter(requests_per_second=10, requests_per_minute=1000, clock=clock)
+    _drain(limiter, RequestPriority.EMERGENCY)
+
+    woken = []
+
+    def swing():
+        woken.append("swing")
+
+    _, registered, _ = limiter._poll(RequestPriority.SWING, clock(), False, swing)
+    wait, _, _ = limiter._poll(RequestPriority.UNIVERSE, clock(), False, lambda: woken.append("universe"))
+    assert wait > 0
+
+    clock.now += 1.0
+    wait, _, _ = limiter._poll(RequestPriority.SWING, clock() - 1.0, registered, swing)
+    assert wait == 0.0
+    assert woken == ["universe"]
+
+
+def test_same_class_waiters_are_served_fifo_one_at_a_time():
+    clock = FakeClock()
+    limiter = AppKeyRateLimiter(requests_per_second=10, requests_per_minute=1000, clock=clock)
+    _drain(limiter, RequestPriority.SWING)
+
+    woken = []
+    wakes = [lambda n=n: woken.append(n) for n in range(3)]
+    waits = [limiter._poll(RequestPriority.SWING, clock(), False, wake)[0] for wake in wakes]
+    # 맨 앞 대기자만 토큰 시각까지 자고, 나머지는 hand-off 까지 잔다
+    assert 0 < waits[0] < 1.0
+    assert waits[1:] == [float("inf")] * 2
+
+    clock.now += 5.0
+    # 토큰이 충분해도 뒤에 선 대기자는 앞지르지 못한다
+    assert limiter._poll(RequestPriority.SWING, clock(), True, wakes[2])[0] == float("inf")
+    assert limiter._poll(RequestPriority.SWING, clock(), True, wakes[0])[0] == 0.0
+    assert woken == [1]  # 다음 대기자 한 명만 깨운다
+    assert limiter._poll(RequestPriority.SWING, clock(), True, wakes[1])[0] == 0.0
+    assert woken == [1, 2]
+
+    # 마지막 SWING 대기자가 취소되면 하위 클래스의 맨 앞 대기자에게 넘긴다
+    limiter._poll(RequestPriority.UNIVERSE, clock(), False, lambda: woken.append("u"))
+    limiter._unregister(RequestPriority.SWING, wakes[2])
+    assert woken == [1, 2, "u"]
+
+
+def test_provider_backs_off_through_shared_limiter():
+    from unittest.mock import AsyncMock, MagicMock
+
+    from provider.kis.kis_rest_provider import KISRestProvider
+
+    class _Response:
+        def __init__(self, status, payload):
+            self.status = status
+            self._payload = payload
+
+        async def json(self):
+            return self._payload
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    throttled = {"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "초당 거래건수를 초과하였습니다."}
+    ok = {"rt_cd": "0", "output": []}
+    session = MagicMock()
+    session.get = MagicMock(side_effect=[_Response(500, throttled), _Response(200, ok)])
+    auth = MagicMock()
+    auth.base_url = "https://mock.api.com"
+    auth.ensure_token = AsyncMock()
+    auth.get_headers = MagicMock(return_value={})
+    auth.get_session = AsyncMock(return_value=session)
+
+    limiter = AppKeyRateLimiter(requests_per_second=10, requests_per_minute=1000, throttle_pause=0.05)
+    provider = KISRestProvider(auth=auth, rate_limiter=limiter)
+
+    started = time.monotonic()
+    assert asyncio.run(provider.fetch_daily_prices("005930")) == []
+    assert time.monotonic() - started < 1.0  # 요청별 2**n 초 sleep 없음
+    assert limiter.stats["throttle_events"] == 1
+    assert limiter.rps_limit == 5.0
@@ -0,0 +1,148 @@
+"""
+H0STCNT0 fast path parser 테스트
+
+- 기록된 프레임(tests/test_data/h0stcnt0_frames.txt, 46 필드/레코드)의 단일·다중 레코드 파싱
+- count 와 필드 수가 맞지 않는 축약 payload 는 단일 레코드로 처리
+- ASCII fast path / EUC-KR fallback, timestamp 는 접근 시 monotonic 기준으로 포맷
+- provider 경로: 다중 레코드 프레임 → 레코드마다 on_tick / on_price_update
+
+벤치마크: python tests/test_kis_realtime_parser.py
+"""
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import MagicMock
+from zoneinfo import ZoneInfo
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from provider.kis.kis_websocket_provider import KISWebSocketProvider
+from provider.kis.realtime_parser import (
+    H0STCNT0_FIELD_COUNT,
+    MonotonicTimestamper,
+    decode_frame,
+    parse_execution_frame,
+)
+
+FRAMES = (_root / "tests" / "test_data" / "h0stcnt0_frames.txt").read_text(encoding="ascii").splitlines()
+
+
+def test_recorded_frames_parse_every_record():
+    total = 0
+    for frame in FRAMES:
+        count = int(frame.split("|")[2])
+        ticks = parse_execution_frame(frame)
+        assert len(ticks) == count
+        total += count
+    assert total == 120
+
+    first = parse_execution_frame(FRAMES[0], received_at=5.0)
+    assert [t.symbol for t in first] == ["005930", "000660", "051910"]
+    tick = first[0]
+    assert (tick.execution_time, tick.close, tick.ask_price, tick.bid_price) == ("090000", 70050, 70100, 70000)
+    assert tick.accumulated_volume == 1000 and tick.received_at == 5.0
+    assert all(t.received_at == 5.0 for t in first)
+
+
+def test_short_payload_and_non_execution_frames():
+    short = "0|H0STCNT0|001|005930^093001^71000^2^100^0.14^71000^70900^71500^70800^71100^71000^10"
+    ticks = parse_execution_frame(short)
+    assert len(ticks) == 1 and ticks[0].accumulated_volume == 0 and ticks[0].trade_value == 0
+
+    # count 가 2 지만 레코드 하나 분량 → 단일 레코드
+    one_record = "^".join(["005930"] + ["1"] * (H0STCNT0_FIELD_COUNT - 1))
+    assert len(parse_execution_frame(f"0|H0STCNT0|002|{one_record}")) == 1
+
+    assert parse_execution_frame("0|H0STASP0|001|005930^1^2") == []
+    assert parse_execution_frame("0|H0STCNT0|001|") == []
+    assert parse_execution_frame("0|H0STCNT0|001|005930^abc^x^2^1^1^1^1^1^1^1^1^1") == []
+
+
+def test_decode_fast_path_and_fallback():
+    assert decode_frame(FRAMES[1].encode("ascii")) == FRAMES[1]
+    assert decode_frame("이미 str") == "이미 str"
+    assert decode_frame('{"msg1":"정상처리"}'.encode("euc-kr")) == '{"msg1":"정상처리"}'
+
+
+def test_lazy_timestamp_matches_wall_clock():
+    stamper = MonotonicTimestamper()
+    mono = time.monotonic()
+    formatted = datetime.fromisoformat(stamper.isoformat(mono))
+    assert formatted.utcoffset() == timedelta(hours=9)
+    assert abs(formatted - datetime.now(timezone.utc)) < timedelta(seconds=1)
+    later = datetime.fromisoformat(stamper.isoformat(mono + 1.25))
+    assert abs((later - formatted).total_seconds() - 1.25) < 1e-5
+
+
+def test_provider_emits_each_record_of_a_multi_record_frame():
+    provider = KISWebSocketProvider(MagicMock())
+    compact, dicts = [], []
+    provider.on_tick = compact.append
+    provider.on_price_update = dicts.append
+
+    asyncio.run(provider._process_message(FRAMES[0].encode("ascii")))
+
+    assert [t.symbol for t in compact] == ["005930", "000660", "051910"]
+    assert [d["symbol"] for d in dicts] == ["005930", "000660", "051910"]
+    data = dicts[0]
+    assert data["price"]["close"] == 70050 and data["bid_ask"] == {"ask_price": 70100, "bid_price": 70000}
+    assert data["volume"]["accumulated"] == 1000
+    assert datetime.fromisoformat(data["timestamp"]).tzinfo is not None
+
+
+def _legacy_parse(message: bytes):
+    """기존 경로: EUC-KR decode → split → 레코드 1개 → dict + datetime.now()"""
+    data_str = message.decode("euc-kr")
+    parts = data_str.split("|")
+    fields = parts[3].split("^")
+    return {
+        "symbol": fields[0],
+        "execution_time": fields[1],
+        "timestamp": datetime.now(ZoneInfo("Asia/Seoul")).isoformat(),
+        "price": {
+            "close": int(fields[2] or 0),
+            "change_amount": int(fields[4] or 0),
+            "change_rate": float(fields[5] or 0),
+            "open": int(fields[7] or 0),
+            "high": int(fields[8] or 0),
+            "low": int(fields[9] or 0),
+        },
+        "volume": {
+            "tick": int(fields[12] or 0),
+            "accumulated": int(fields[13] or 0),
+            "trade_value": int(fields[14] or 0),
+        },
+        "bid_ask": {"ask_price": int(fields[10] or 0), "bid_price": int(fields[11] or 0)},
+        "source": "kis_websocket",
+    }
+
+
+def run_benchmark(repeat: int = 200) -> None:
+    single = [f.encode("ascii") for f in FRAMES if f.split("|")[2] == "001"]
+    multi = [f.encode("ascii") for f in FRAMES if f.split("|")[2] != "001"]
+
+    def timed(fn, frames):
+        records = sum(int(f.split(b"|")[2]) for f in frames) * repeat
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for frame in frames:
+                fn(frame)
+        return (time.perf_counter() - started) / records * 1e6
+
+    def fast(frame):
+        return parse_execution_frame(decode_frame(frame))
+
+    def fast_dict(frame):
+        return [t.as_price_data() for t in parse_execution_frame(decode_frame(frame))]
+
+    print(f"single-record frames ({len(single)} x {repeat}): legacy {timed(_legacy_parse, single):.2f} us, "
+          f"ExecutionTick {timed(fast, single):.2f} us, ExecutionTick+dict {timed(fast_dict, single):.2f} us per record")
+    print(f"multi-record frames ({len(multi)} x {repeat}): ExecutionTick {timed(fast, multi):.2f} us, "
+          f"ExecutionTick+dict {timed(fast_dict, multi):.2f} us per record (legacy drops all but the first record)")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,141 @@
+"""
+KISWebSocketPool 테스트 (연결 N개 x 41 종목)
+
+- 종목 → 연결 배정이 일관적 (rendezvous hash, 유지되는 종목은 연결 고정)
+- 연결별 41 제한, 초과 시 다음 선호 연결로 분산
+- 연결 하나가 끊겨도 나머지는 정상 구독, 끊긴 연결의 종목은 pending 으로 재연결 대기
+- 모든 연결의 체결이 하나의 on_price_update 로 합쳐짐
+- ScalpCollector 슬롯 수 = 엔진의 WS 용량 (연결 2개 → 82 슬롯)
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from collector import scalp_collector as scalp_module
+from collector.scalp_collector import ScalpCollector, ScalpConfig
+from provider.kis.kis_websocket_provider import KISWebSocketProvider
+from provider.kis.subscription_reconciler import SubscriptionReconciler
+from provider.kis.websocket_pool import KISWebSocketPool, rank_connections
+from provider.provider_engine import ProviderEngine
+from slot.slot_manager import SlotCandidate
+
+
+class _Socket:
+    def __init__(self):
+        self.frames = []
+
+    async def send(self, message):
+        frame = json.loads(message)
+        self.frames.append((frame["header"]["tr_type"], frame["body"]["input"]["tr_key"]))
+
+
+def _connection():
+    auth = MagicMock()
+
+    async def approval_key():
+        return "approval"
+
+    auth.get_approval_key = approval_key
+    provider = KISWebSocketProvider(auth)
+    provider.reconciler = SubscriptionReconciler(provider, frames_per_second=10000.0)
+    provider.websocket = _Socket()
+    provider.is_connected = True
+    return provider
+
+
+def _symbols(n, start=0):
+    return [f"{i:06d}" for i in range(start, start + n)]
+
+
+def test_symbols_are_sharded_consistently_within_capacity():
+    pool = KISWebSocketPool([_connection() for _ in range(3)])
+    assert pool.MAX_SUBSCRIPTIONS == 123
+
+    result = asyncio.run(pool.reconcile_subscriptions(_symbols(110)))
+    assert len(result.subscribed) == 110 and not result.skipped
+    assert all(len(p.subscribed_symbols) <= 41 for p in pool.providers)
+    # 각 종목은 정확히 한 연결에만 구독
+    assert sum(len(p.subscribed_symbols) for p in pool.providers) == len(pool.subscribed_symbols) == 110
+
+    before = {s: pool.connection_for(s) for s in _symbols(50)}
+    asyncio.run(pool.reconcile_subscriptions(_symbols(50) + _symbols(20, start=500)))
+    assert {s: pool.connection_for(s) for s in _symbols(50)} == before
+    assert pool.subscription_count == 70
+
+    # 여유 있는 상태의 신규 종목은 첫 번째 선호 연결로
+    assert pool.connection_for("000505") == rank_connections("000505", 3)[0]
+
+
+def test_overflow_beyond_pool_capacity_is_skipped():
+    pool = KISWebSocketPool([_connection() for _ in range(2)])
+    result = asyncio.run(pool.reconcile_subscriptions(_symbols(90)))
+    assert len(result.subscribed) == 82
+    assert len(result.skipped) == 8
+    assert [len(p.subscribed_symbols) for p in pool.providers] == [41, 41]
+
+
+def test_disconnected_connection_keeps_its_shard_pending():
+    pool = KISWebSocketPool([_connection() for _ in range(3)])
+    down = pool.providers[1]
+    down.is_connected = False
+
+    asyncio.run(pool.reconcile_subscriptions(_symbols(60)))
+    shard = {s for s in _symbols(60) if pool.connection_for(s) == 1}
+    assert shard and down.pending_symbols == shard
+    assert down.websocket.frames == []
+    assert pool.subscription_count == 60 - len(shard)
+
+    # 재연결 → 해당 연결만 자기 종목 재구독
+    down.is_connected = True
+    asyncio.run(down._resubscribe())
+    assert down.subscribed_symbols == shard
+    assert pool.subscription_count == 60
+
+
+def test_ticks_from_all_connections_merge_into_engine_callback():
+    pool = KISWebSocketPool([_connection() for _ in range(2)])
+    engine = ProviderEngine(MagicMock(), rest_provider=MagicMock(), ws_provider=pool)
+    assert engine.max_ws_slots == 82
+    received = []
+    engine.on_price_update = lambda data: received.append(data["symbol"])
+
+    asyncio.run(engine.reconcile_subscriptions(_symbols(10)))
+    assert engine.subscription_count == 10
+
+    def tick(symbol):
+        fields = [symbol, "093001", "1000", "2", "10", "1.0", "1000", "990", "1010", "980",
+                  "1010", "1000", "5", "500", "500000"]
+        return "0|H0STCNT0|001|" + "^".join(fields)
+
+    async def feed():
+        for symbol in _symbols(10):
+            await pool.providers[pool.connection_for(symbol)]._process_message(tick(symbol))
+
+    asyncio.run(feed())
+    assert received == _symbols(10)
+    assert {pool.connection_for(s) for s in _symbols(10)} == {0, 1}
+    stats = pool.subscription_stats
+    assert stats["connections"] == 2 and stats["connected"] == 2
+    assert sum(c["first_ticks"] for c in stats["per_connection"]) == 10
+
+
+def test_scalp_slots_scale_with_pool_capacity(tmp_path, monkeypatch):
+    monkeypatch.setattr(scalp_module, "observer_asset_dir", lambda: tmp_path / "assets")
+    monkeypatch.setattr(scalp_module, "observer_log_dir", lambda: tmp_path / "logs")
+    pool = KISWebSocketPool([_connection() for _ in range(2)])
+    engine = ProviderEngine(MagicMock(), rest_provider=MagicMock(), ws_provider=pool)
+    # observer_runner 와 같은 구성: 슬롯 수 = WS 용량
+    collector = ScalpCollector(engine, config=ScalpConfig(max_slots=engine.max_ws_slots))
+    assert collector.slot_manager.max_slots == 82
+
+    candidates = [SlotCandidate(symbol=s, trigger_type="volume_surge", priority_score=0.9,
+                                detected_at=collector._now()) for s in _symbols(60)]
+    collector._assign_candidates(candidates)
+    asyncio.run(collector._sync_subscriptions())
+    assert len(pool.subscribed_symbols) == 60
+    assert all(len(p.subscribed_symbols) <= 41 for p in pool.providers)
@@ -0,0 +1,125 @@
+"""
+performance_metrics 저오버헤드 코어 테스트
+
+- per-thread 샤드에 기록된 counter / timing 이 scrape 시점에 정확히 병합되는지
+- log-bucket histogram 의 p50/p95/p99 추정 정확도
+- LatencyTimer (perf_counter_ns) 기록
+
+벤치마크 실행 (record_timing 1회 비용):
+    python tests/test_performance_metrics_core.py
+"""
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from observer.performance_metrics import (
+    EXPOSITION_BUCKET_BOUNDS_MS,
+    LatencyTimer,
+    LogHistogram,
+    PerformanceMetrics,
+    TIMING_BUCKET_BOUNDS_MS,
+    get_metrics,
+    reset_metrics,
+)
+
+
+def test_sharded_counters_and_timings_merge_at_scrape():
+    metrics = PerformanceMetrics()
+
+    def worker(offset):
+        for i in range(1000):
+            metrics.increment_counter("snapshots_processed")
+            metrics.record_timing("snapshot_processing", 1.0 + offset)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    summary = metrics.get_metrics_summary()
+    assert summary["counters"]["snapshots_processed"] == 4000
+    assert metrics.get_snapshot_count() == 4000
+
+    stats = summary["timing_stats"]["snapshot_processing"]
+    assert stats["count"] == 4000
+    assert stats["min_ms"] == 1.0
+    assert stats["max_ms"] == 4.0
+    assert stats["avg_ms"] == pytest.approx(2.5)
+
+
+def test_quantiles_track_exact_percentiles():
+    rng = random.Random(7)
+    values = sorted(rng.expovariate(1 / 5.0) for _ in range(20000))
+    hist = LogHistogram()
+    for v in values:
+        hist.record(v)
+
+    for q in (0.5, 0.95, 0.99):
+        exact = values[int(q * len(values)) - 1]
+        assert hist.quantile(q) == pytest.approx(exact, rel=0.1)
+
+
+def test_latest_value_follows_most_recent_shard():
+    metrics = PerformanceMetrics()
+    metrics.record_timing("t", 5.0)
+    t = threading.Thread(target=metrics.record_timing, args=("t", 9.0))
+    t.start()
+    t.join()
+    assert metrics.get_metrics_summary()["timing_stats"]["t"]["latest_ms"] == 9.0
+
+
+def test_cumulative_counts_on_exposition_bounds():
+    assert set(EXPOSITION_BUCKET_BOUNDS_MS) <= set(TIMING_BUCKET_BOUNDS_MS)
+    hist = LogHistogram()
+    for v in (0.5, 1.0, 3.0, 200_000.0):
+        hist.record(v)
+    cumulative = dict(zip(EXPOSITION_BUCKET_BOUNDS_MS, hist.cumulative_counts()))
+    assert cumulative[0.5] == 1
+    assert cumulative[1.0] == 2
+    assert cumulative[5.0] == 3
+    assert cumulative[1e5] == 3  # overflow 는 +Inf 에만 포함
+    assert hist.count == 4
+
+
+def test_latency_timer_records_with_perf_counter():
+    reset_metrics()
+    try:
+        with LatencyTimer("unit_op"):
+            time.sleep(0.002)
+        stats = get_metrics().get_metrics_summary()["timing_stats"]["unit_op"]
+        assert stats["count"] == 1
+        assert stats["latest_ms"] >= 2.0
+    finally:
+        reset_metrics()
+
+
+def run_benchmark(n: int = 200000) -> dict:
+    metrics = PerformanceMetrics()
+    start = time.perf_counter_ns()
+    for i in range(n):
+        metrics.record_timing("bench", 0.5)
+    record_ns = (time.perf_counter_ns() - start) / n
+
+    start = time.perf_counter_ns()
+    for _ in range(n // 10):
+        with LatencyTimer("bench_timer"):
+            pass
+    timer_ns = (time.perf_counter_ns() - start) / (n // 10)
+
+    start = time.perf_counter_ns()
+    metrics.get_metrics_summary()
+    scrape_us = (time.perf_counter_ns() - start) / 1000
+    return {"record_timing_ns": record_ns, "latency_timer_ns": timer_ns, "scrape_us": scrape_us}
+
+
+if __name__ == "__main__":
+    for key, value in run_benchmark().items():
+        print(f"{key:>18}: {value:.1f}")
@@ -0,0 +1,94 @@
+"""
+PrevCloseStore / 증분 유니버스 빌드 테스트
+
+- (symbol, trading_day) 종가 저장과 covered_through 기반 조회
+- 휴장일: 목표일 이전 최신 종가 사용
+- create_daily_snapshot: 두 번째 빌드는 API 호출 없이 캐시로 필터링
+"""
+import asyncio
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from universe.prev_close_store import PrevCloseStore
+from universe.universe_manager import UniverseManager
+
+
+def test_lookup_requires_coverage(tmp_path):
+    store = PrevCloseStore(tmp_path / "pc.sqlite3")
+    d1, d2 = date(2026, 2, 5), date(2026, 2, 6)
+    store.record_closes([("A", d1, 5000), ("B", d1, 3000)], covered_through=d1)
+
+    hits, misses = store.lookup(["A", "B", "C"], as_of=d1)
+    assert hits == {"A": 5000, "B": 3000}
+    assert misses == ["C"]
+
+    # d2 는 아직 채워지지 않음 → d1 종가로 대체하지 않는다
+    hits, misses = store.lookup(["A"], as_of=d2)
+    assert hits == {} and misses == ["A"]
+
+    store.record_day(d2, {"A": 5100})
+    assert store.lookup(["A", "B"], as_of=d2) == ({"A": 5100}, ["B"])
+    assert store.stats["hits"] == 3
+
+
+def test_holiday_gap_uses_latest_close_before_target(tmp_path):
+    store = PrevCloseStore(tmp_path / "pc.sqlite3")
+    friday, holiday_monday = date(2026, 2, 13), date(2026, 2, 16)
+    store.record_closes([("A", friday, 7000)], covered_through=holiday_monday)
+    assert store.lookup(["A"], as_of=holiday_monday) == ({"A": 7000}, [])
+
+
+def test_persisted_across_instances_and_pruned(tmp_path):
+    path = tmp_path / "pc.sqlite3"
+    old, recent = date(2026, 1, 2), date(2026, 2, 10)
+    store = PrevCloseStore(path, retention_days=30)
+    store.record_closes([("A", old, 1), ("A", recent, 2)], covered_through=recent)
+    store.close()
+
+    store = PrevCloseStore(path, retention_days=30)
+    assert store.prune(today=date(2026, 2, 11)) == 1
+    assert store.lookup(["A"], as_of=recent) == ({"A": 2}, [])
+
+
+class _Engine:
+    def __init__(self, closes):
+        self.closes = closes
+        self.calls = []
+
+    async def fetch_daily_prices(self, symbol, days=2):
+        self.calls.append(symbol)
+        rows = []
+        for back in range(days):
+            day = date.today() - timedelta(days=back)
+            rows.append({"instruments": [{
+                "symbol": symbol,
+                "timestamp": datetime(day.year, day.month, day.day).isoformat(),
+                "price": {"close": self.closes[symbol]},
+            }]})
+        return rows
+
+
+def test_second_build_is_local_filter(tmp_path):
+    closes = {"A": 5000, "B": 3000, "C": 12000}
+    engine = _Engine(closes)
+    manager = UniverseManager(engine, min_price=4000, min_count=1, data_dir=str(tmp_path))
+
+    async def candidates():
+        return list(closes)
+
+    manager._load_robust_candidates = candidates
+
+    first = asyncio.run(manager.create_daily_snapshot(date.today()))
+    assert sorted(engine.calls) == ["A", "B", "C"]
+    assert manager.load_universe(date.today()) == ["A", "C"]
+
+    engine.calls.clear()
+    second = asyncio.run(manager.create_daily_snapshot(date.today()))
+    assert second == first
+    assert engine.calls == []
+    assert manager.load_universe(date.today()) == ["A", "C"]
+    assert manager.prev_close_store.stats["hits"] == 3
@@ -0,0 +1,141 @@
+"""
+MetricsRegistry (monitoring.prometheus_metrics) 테스트
+
+- get-or-create 로 같은 (name, labels) 시리즈를 공유하는지
+- 레이블 포함 histogram 의 _bucket / _sum / _count 포맷
+- 변경된 시리즈만 다시 렌더링하고, 변경이 없으면 캐시된 텍스트를 그대로 반환하는지
+- observer.performance_metrics 타이밍이 실제 histogram 으로 노출되는지
+- 여러 스레드의 동시 갱신이 유실되지 않는지
+"""
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from monitoring.prometheus_metrics import CollectedBlock, MetricsRegistry, PrometheusMetricsCollector
+from observer.performance_metrics import PerformanceMetrics
+
+
+def test_get_or_create_shares_series():
+    registry = MetricsRegistry()
+    a = registry.counter("observer_x_total", "x")
+    b = registry.counter("observer_x_total", "x")
+    c = registry.counter("observer_x_total", "x", labels={"k": "v"})
+    assert a is b
+    assert a is not c
+    with pytest.raises(ValueError):
+        registry.gauge("observer_x_total", "x")
+
+
+def test_labelled_histogram_exposition():
+    registry = MetricsRegistry()
+    hist = registry.histogram("req_seconds", "Request latency", buckets=[0.1, 1.0], labels={"endpoint": "price"})
+    for v in (0.05, 0.5, 5.0):
+        hist.observe(v)
+
+    text = registry.render()
+    assert "# TYPE req_seconds histogram" in text
+    assert 'req_seconds_bucket{endpoint="price",le="0.1"} 1' in text
+    assert 'req_seconds_bucket{endpoint="price",le="1.0"} 2' in text
+    assert 'req_seconds_bucket{endpoint="price",le="+Inf"} 3' in text
+    assert 'req_seconds_sum{endpoint="price"} 5.55' in text
+    assert 'req_seconds_count{endpoint="price"} 3' in text
+    assert text.count("# HELP req_seconds ") == 1
+
+
+def test_render_reuses_cache_and_rerenders_only_changed_blocks():
+    registry = MetricsRegistry()
+    counter = registry.counter("c_total", "c")
+    renders = []
+
+    def collect():
+        def render():
+            renders.append(1)
+            return "# TYPE static gauge\nstatic 1"
+        return [CollectedBlock("static", 1, render)]
+
+    registry.register_collector("static", collect)
+
+    first = registry.render()
+    assert registry.render() is first  # 변경 없음 → 같은 텍스트 객체
+    assert len(renders) == 1
+
+    counter.increment()
+    second = registry.render()
+    assert "c_total 1.0" in second
+    assert len(renders) == 1  # 변경되지 않은 collector 블록은 다시 렌더링하지 않음
+
+
+def test_failing_collector_counts_error():
+    registry = MetricsRegistry()
+
+    def broken():
+        raise RuntimeError("boom")
+
+    registry.register_collector("broken", broken)
+    registry.render()
+    assert registry.get("observer_metrics_errors_total").value == 1
+    assert "observer_metrics_errors_total 2.0" in registry.render()  # scrape마다 누적
+
+
+def test_performance_metrics_timings_exported_as_histogram():
+    registry = MetricsRegistry()
+    metrics = PerformanceMetrics()
+    registry.register_collector("perf", metrics.prometheus_blocks)
+
+    metrics.increment_counter("snapshots_processed", 3)
+    for v in (0.4, 2.0, 30.0):
+        metrics.record_timing("snapshot_processing", v)
+
+    text = registry.render()
+    assert "observer_snapshots_processed_total 3" in text
+    assert "# TYPE observer_snapshot_processing_duration_seconds histogram" in text
+    assert 'observer_snapshot_processing_duration_seconds_bucket{le="0.0005"} 1' in text
+    assert 'observer_snapshot_processing_duration_seconds_bucket{le="0.0025"} 2' in text
+    assert 'observer_snapshot_processing_duration_seconds_bucket{le="+Inf"} 3' in text
+    assert "observer_snapshot_processing_duration_seconds_count 3" in text
+    assert "observer_snapshot_processing_avg_ms" in text
+
+
+def test_collector_writes_into_given_registry():
+    registry = MetricsRegistry()
+    collector = PrometheusMetricsCollector(registry=registry)
+    collector.record_api_request(0.2, error=True)
+
+    text = collector.export_prometheus_text()
+    assert registry.get("observer_api_requests_total").value == 1
+    assert 'observer_api_request_duration_seconds_bucket{le="0.25"} 1' in text
+    assert collector.get_metric_summary()["api"]["total_errors"] == 1
+
+
+def test_concurrent_updates_are_not_lost():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # 스레드 전환을 잦게 해서 경합 유도
+    try:
+        registry = MetricsRegistry()
+        counter = registry.counter("observer_race_total", "race")
+        gauge = registry.gauge("observer_race_gauge", "race")
+        histogram = registry.histogram("observer_race_seconds", "race", buckets=[0.5, 1.0])
+
+        def work():
+            for i in range(20000):
+                counter.increment()
+                gauge.increment()
+                histogram.observe(0.25 if i % 2 else 0.75)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert counter.value == gauge.value == 80000
+    assert histogram.count == 80000 and histogram.sum_value == 80000 * 0.5
+    assert histogram.bucket_counts == {0.5: 40000, 1.0: 80000}
+    assert 'observer_race_seconds_bucket{le="+Inf"} 80000' in registry.render()
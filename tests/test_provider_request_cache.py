@@ -0,0 +1,182 @@
+"""
+ProviderEngine REST single-flight + TTL/LRU 캐시 테스트
+
+- 같은 종목의 동시 요청은 REST 1회로 합쳐진다 (다른 스레드 / event loop 포함)
+- TTL 만료, LRU 제거, 실패는 캐시하지 않음
+- fetch_current_prices: 캐시된 종목은 빼고 나머지만 배치 요청
+"""
+import asyncio
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from provider.provider_engine import ProviderEngine
+from provider.request_cache import ProviderCacheConfig, RequestCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Rest:
+    def __init__(self, delay=0.02, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.calls = []
+        self.quote_batch_size = 30
+
+    def _contract(self, symbol):
+        return {"instruments": [{"symbol": symbol, "price": {"close": 1000}}]}
+
+    async def fetch_current_price(self, symbol):
+        self.calls.append(("quote", symbol))
+        await asyncio.sleep(self.delay)
+        if symbol in self.fail:
+            raise RuntimeError("boom")
+        return self._contract(symbol)
+
+    async def fetch_current_prices(self, symbols):
+        self.calls.append(("batch", tuple(symbols)))
+        await asyncio.sleep(self.delay)
+        return [self._contract(s) for s in symbols if s not in self.fail]
+
+    async def fetch_daily_prices(self, symbol, days=30):
+        self.calls.append(("daily", symbol, days))
+        await asyncio.sleep(self.delay)
+        return [{"days": days}]
+
+
+def _engine(rest, **cfg):
+    return ProviderEngine(MagicMock(), rest_provider=rest, ws_provider=MagicMock(),
+                          cache_config=ProviderCacheConfig(**cfg))
+
+
+def test_concurrent_identical_requests_are_coalesced():
+    rest = _Rest()
+    engine = _engine(rest)
+
+    async def main():
+        return await asyncio.gather(*(engine.fetch_current_price("005930") for _ in range(10)))
+
+    results = asyncio.run(main())
+    assert rest.calls == [("quote", "005930")]
+    assert all(r is results[0] for r in results)
+
+    asyncio.run(engine.fetch_current_price("005930"))  # TTL 이내 → hit
+    stats = engine.cache_stats["kinds"]["quote"]
+    assert stats == {"hits": 1, "misses": 1, "coalesced": 9}
+
+
+def test_coalescing_across_event_loops():
+    rest = _Rest(delay=0.2)
+    engine = _engine(rest, daily_ttl_seconds=0)  # coalescing only
+    results = []
+
+    def run():
+        results.append(asyncio.run(engine.fetch_daily_prices("005930", days=10)))
+
+    threads = [threading.Thread(target=run) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert rest.calls == [("daily", "005930", 10)]
+    assert results == [[{"days": 10}]] * 3
+    asyncio.run(engine.fetch_daily_prices("005930", days=10))  # ttl 0 → 다시 요청
+    assert len(rest.calls) == 2
+
+
+def test_ttl_expiry_lru_eviction_and_failures():
+    clock = FakeClock()
+    cache = RequestCache(max_entries=2, clock=clock)
+    calls = []
+
+    async def load(key, value=1):
+        async def loader():
+            calls.append(key)
+            return value
+        return await cache.load(key, 5.0, loader)
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    async def main():
+        await load(("q", "A"))
+        await load(("q", "B"))
+        await load(("q", "A"))  # hit → A 가 최근 사용
+        await load(("q", "C"))  # B 제거
+        assert cache.get(("q", "B")) == (False, None)
+        clock.now += 5.0
+        await load(("q", "A"))  # 만료 → 다시 로드
+        with pytest.raises(RuntimeError):
+            await cache.load(("q", "X"), 5.0, fail)
+        assert cache.get(("q", "X")) == (False, None)
+
+    asyncio.run(main())
+    assert calls == [("q", "A"), ("q", "B"), ("q", "C"), ("q", "A")]
+    assert cache.stats["evictions"] >= 1
+    assert cache.stats["inflight"] == 0
+
+
+def test_cancelled_leader_hands_flight_to_follower():
+    cache = RequestCache()
+    calls = []
+
+    def loader(value, delay):
+        async def load():
+            calls.append(value)
+            await asyncio.sleep(delay)
+            return value
+        return load
+
+    async def many_loader(keys):
+        calls.append(tuple(keys))
+        await asyncio.sleep(0.02)
+        return {key: key[1] for key in keys}
+
+    async def main():
+        # 단건: leader 가 wait_for deadline 으로 취소돼도 follower 는 새 leader 로 재시도
+        leader = asyncio.create_task(asyncio.wait_for(cache.load(("q", "A"), 5.0, loader("slow", 1.0)), 0.05))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(cache.load(("q", "A"), 5.0, loader("retry", 0.01)))
+        with pytest.raises(asyncio.TimeoutError):
+            await leader
+        assert await follower == "retry"
+
+        # 배치: 합류한 key 의 leader 가 취소돼도 자기 key 와 재조회한 key 를 모두 반환
+        batch_leader = asyncio.create_task(cache.load(("q", "B"), 5.0, loader("slow", 1.0)))
+        await asyncio.sleep(0.01)
+        batch = asyncio.create_task(cache.load_many([("q", "B"), ("q", "C")], 5.0, many_loader))
+        await asyncio.sleep(0.005)
+        batch_leader.cancel()
+        return await batch
+
+    batch = asyncio.run(main())
+    assert calls == ["slow", "retry", "slow", (("q", "C"),), (("q", "B"),)]
+    assert batch == {("q", "B"): "B", ("q", "C"): "C"}
+    assert cache.stats["inflight"] == 0
+
+
+def test_batch_quotes_reuse_cache_and_keep_order():
+    rest = _Rest(fail={"000003"})
+    engine = _engine(rest)
+    symbols = [f"{n:06d}" for n in range(6)]
+
+    async def main():
+        await engine.fetch_current_price("000004")
+        return await engine.fetch_current_prices(symbols)
+
+    contracts = asyncio.run(main())
+    assert [c["instruments"][0]["symbol"] for c in contracts] == ["000000", "000001", "000002", "000004", "000005"]
+    assert rest.calls[-1] == ("batch", ("000000", "000001", "000002", "000003", "000005"))
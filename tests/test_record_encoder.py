@@ -0,0 +1,158 @@
+"""
+record_encoder 테스트 + 마이크로벤치마크
+
+- 기본(json) backend 출력이 기존 경로
+  json.dumps(PatternRecord(...metadata 갱신...).to_dict(), ensure_ascii=False) + "\\n"
+  과 바이트 단위로 동일한지
+- metadata override가 원본 레코드를 변경하지 않는지
+- orjson backend(설치된 경우)가 같은 값을 만드는지
+
+벤치마크 실행:
+    python tests/test_record_encoder.py
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from observer import record_encoder
+from observer.pattern_record import PatternRecord
+from observer.record_encoder import encode_pattern_record, encode_snapshot
+from observer.snapshot import Context, Meta, Observation, ObservationSnapshot
+
+
+def _record(seq: int, metadata=None) -> PatternRecord:
+    snapshot = ObservationSnapshot(
+        meta=Meta(
+            timestamp="2026-02-02T10:00:00.123+09:00",
+            timestamp_ms=1769994000123 + seq,
+            session_id="세션_001",
+            run_id=f"run{seq:08d}",
+            mode="PROD",
+            iteration_id=seq,
+            loop_interval_ms=1000.0,
+            latency_ms=0.1 * seq,
+            tick_source="websocket" if seq % 2 else None,
+        ),
+        context=Context(source="market", stage="raw", symbol="005930", market="KOSPI" if seq % 3 else None),
+        observation=Observation(
+            inputs={
+                "price": 70000 + seq,
+                "volume": 1.5e-05 * seq,
+                "name": "삼성전자 \"우\"\t\\",
+                "bid_ask": {"bid": [69900, 69800], "ask": (70100, 70200)},
+                "flags": [True, False, None],
+                "nan": float("nan") if seq % 5 == 0 else -0.0,
+            },
+            computed={"price_delta_short": seq - 1.25},
+            state={},
+        ),
+    )
+    return PatternRecord(
+        snapshot=snapshot,
+        regime_tags={},
+        condition_tags=[{"tag": "x", "v": seq}],
+        outcome_labels={},
+        metadata=metadata if metadata is not None else {"schema_version": "1.0", "buffer_depth": 7},
+    )
+
+
+def _legacy_line(record: PatternRecord, buffer_depth: int, flush_reason: str) -> bytes:
+    """SnapshotBuffer 기존 경로 (레코드 재생성 + asdict)"""
+    updated_metadata = record.metadata.copy()
+    updated_metadata["buffer_depth"] = buffer_depth
+    updated_metadata["flush_reason"] = flush_reason
+    updated = PatternRecord(
+        snapshot=record.snapshot,
+        regime_tags=record.regime_tags,
+        condition_tags=record.condition_tags,
+        outcome_labels=record.outcome_labels,
+        metadata=updated_metadata,
+    )
+    return (json.dumps(updated.to_dict(), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+@pytest.fixture
+def json_backend():
+    previous = record_encoder.get_backend()
+    record_encoder.set_backend(record_encoder.BACKEND_JSON)
+    yield
+    record_encoder.set_backend(previous)
+
+
+def test_json_backend_is_byte_identical_to_legacy_path(json_backend):
+    for seq in range(50):
+        record = _record(seq)
+        assert encode_pattern_record(record, {"buffer_depth": seq, "flush_reason": "time_based"}) == \
+            _legacy_line(record, seq, "time_based")
+        assert encode_pattern_record(record) == \
+            (json.dumps(record.to_dict(), ensure_ascii=False) + "\n").encode("utf-8")
+        assert encode_snapshot(record.snapshot) == \
+            (json.dumps(record.snapshot.to_dict(), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def test_metadata_override_does_not_mutate_record(json_backend):
+    record = _record(1, metadata={"schema_version": "1.0"})
+    encode_pattern_record(record, {"buffer_depth": 3, "flush_reason": "buffer_full"})
+    assert record.metadata == {"schema_version": "1.0"}
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        record_encoder.set_backend("pickle")
+
+
+@pytest.mark.skipif("orjson" not in record_encoder.available_backends(), reason="orjson not installed")
+def test_orjson_backend_produces_same_values():
+    previous = record_encoder.set_backend(record_encoder.BACKEND_ORJSON)
+    try:
+        record = _record(1)  # NaN 없는 레코드 (orjson은 NaN을 null로 기록)
+        line = encode_pattern_record(record, {"buffer_depth": 2, "flush_reason": "direct"})
+        assert line.endswith(b"\n")
+        assert json.loads(line) == json.loads(_legacy_line(record, 2, "direct"))
+    finally:
+        record_encoder.set_backend(record_encoder.BACKEND_JSON if previous == "orjson" else previous)
+
+
+# ============================================================
+# Microbenchmark
+# ============================================================
+
+def run_benchmark(n: int = 20000) -> dict:
+    records = [_record(i) for i in range(200)]
+    overrides = {"buffer_depth": 10, "flush_reason": "time_based"}
+    results = {}
+
+    start = time.perf_counter()
+    for i in range(n):
+        _legacy_line(records[i % 200], 10, "time_based")
+    results["legacy_us"] = (time.perf_counter() - start) / n * 1e6
+
+    for backend in record_encoder.available_backends():
+        record_encoder.set_backend(backend)
+        start = time.perf_counter()
+        for i in range(n):
+            encode_pattern_record(records[i % 200], overrides)
+        results[f"{backend}_us"] = (time.perf_counter() - start) / n * 1e6
+    record_encoder.set_backend(record_encoder.BACKEND_JSON)
+
+    identical = all(
+        encode_pattern_record(r, overrides) == _legacy_line(r, 10, "time_based") for r in records
+    )
+    results["byte_identical"] = identical
+    return results
+
+
+def test_benchmark_smoke(json_backend):
+    results = run_benchmark(n=200)
+    assert results["byte_identical"] is True
+
+
+if __name__ == "__main__":
+    for key, value in run_benchmark().items():
+        print(f"{key:>16}: {value:.2f}" if isinstance(value, float) else f"{key:>16}: {value}")
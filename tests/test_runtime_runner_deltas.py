@@ -0,0 +1,57 @@
+"""
+runtime.ObserverRunner 단기 delta 테스트
+
+- runner 가 DeltaStateStore 를 만들어 build_snapshot 에 넘기므로
+  loop 스냅샷 computed 에 price_delta_short / volume_delta_short 가 채워지는지 (종목별)
+
+runtime.observer_runner 는 배포 레이아웃 경로(ops.observer)로 import 하므로
+테스트에서는 ops.observer 를 src/observer 패키지로 매핑한다.
+"""
+import sys
+import types
+from pathlib import Path
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+import observer
+
+sys.modules.setdefault("ops", types.ModuleType("ops"))
+sys.modules.setdefault("ops.observer", observer)
+
+from runtime.observer_runner import ObserverRunner
+
+
+class _Provider:
+    def __init__(self, ticks):
+        self.ticks = list(ticks)
+
+    def fetch(self):
+        if not self.ticks:
+            return None
+        symbol, close, volume = self.ticks.pop(0)
+        return {
+            "meta": {"source": "mock", "market": "KRX"},
+            "instruments": [{
+                "symbol": symbol,
+                "price": {"open": close, "high": close, "low": close, "close": close},
+                "volume": volume,
+                "timestamp": "2026-02-02T10:00:00+09:00",
+            }],
+        }
+
+    def close(self):
+        pass
+
+
+def test_loop_snapshots_carry_short_deltas():
+    provider = _Provider([("005930", 70000, 100), ("000660", 150000, 10), ("005930", 70300, 160)])
+    runner = ObserverRunner(provider, interval_sec=0, enable_buffering=False, enable_usage_metrics=False)
+    snapshots = []
+    runner._observer.on_snapshot = snapshots.append
+
+    runner.run()
+
+    deltas = [(s.context.symbol, s.observation.computed.get("price_delta_short"),
+               s.observation.computed.get("volume_delta_short")) for s in snapshots]
+    assert deltas == [("005930", 0, 0), ("000660", 0, 0), ("005930", 300, 60)]
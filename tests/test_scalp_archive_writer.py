@@ -0,0 +1,114 @@
+"""
+ScalpArchiveWriter 테스트
+
+- 시간별 파티션(YYYYMMDD_HH.jsonl)으로 라우팅되는지
+- 핸들을 유지하고 정각 경계에서만 파일을 교체하는지
+- fsync 정책(N 레코드)이 적용되는지
+- 큐 한도 초과 시 드롭 카운트
+- 쓰기 OSError 시 실패 카운트 + 핸들 초기화 (다음 flush 에서 복구)
+"""
+import json
+import sys
+from pathlib import Path
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from collector.scalp_archive_writer import ScalpArchiveWriter, ArchiveWriterConfig
+
+
+def _read_jsonl(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def test_records_routed_by_hour_partition(tmp_path):
+    writer = ScalpArchiveWriter(tmp_path, ArchiveWriterConfig(fsync_interval_ms=0))
+
+    writer.write({"symbol": "005930", "seq": 1}, "20260202_10")
+    writer.write({"symbol": "000660", "seq": 2}, "20260202_10")
+    writer.write({"symbol": "005930", "seq": 3}, "20260202_11")
+
+    assert writer.flush() == 3
+    writer.stop()
+
+    first = _read_jsonl(tmp_path / "20260202_10.jsonl")
+    second = _read_jsonl(tmp_path / "20260202_11.jsonl")
+    assert [r["seq"] for r in first] == [1, 2]
+    assert [r["seq"] for r in second] == [3]
+
+
+def test_handle_kept_open_within_hour(tmp_path):
+    writer = ScalpArchiveWriter(tmp_path, ArchiveWriterConfig(fsync_interval_ms=0))
+
+    writer.write({"seq": 1}, "20260202_10")
+    writer.flush()
+    handle = writer._file
+    writer.write({"seq": 2}, "20260202_10")
+    writer.flush()
+
+    assert writer._file is handle
+    assert writer.stats["current_hour"] == "20260202_10"
+    writer.stop()
+    assert writer._file is None
+
+
+def test_fsync_every_n_records(tmp_path):
+    cfg = ArchiveWriterConfig(fsync_interval_ms=0, fsync_every_records=2)
+    writer = ScalpArchiveWriter(tmp_path, cfg)
+
+    writer.write({"seq": 1}, "20260202_10")
+    writer.flush()
+    assert writer.stats["total_fsyncs"] == 0
+
+    writer.write({"seq": 2}, "20260202_10")
+    writer.flush()
+    assert writer.stats["total_fsyncs"] == 1
+    writer.stop()
+
+
+def test_queue_limit_drops_records(tmp_path):
+    writer = ScalpArchiveWriter(tmp_path, ArchiveWriterConfig(max_queue_size=2, fsync_interval_ms=0))
+
+    assert writer.write({"seq": 1}, "20260202_10")
+    assert writer.write({"seq": 2}, "20260202_10")
+    assert not writer.write({"seq": 3}, "20260202_10")
+
+    assert writer.stats["total_dropped"] == 1
+    assert writer.queue_depth == 2
+    writer.stop()
+    assert len(_read_jsonl(tmp_path / "20260202_10.jsonl")) == 2
+
+
+def test_background_thread_flushes_on_interval(tmp_path):
+    import time
+
+    writer = ScalpArchiveWriter(tmp_path, ArchiveWriterConfig(flush_interval_ms=20, fsync_interval_ms=0))
+    writer.start()
+    writer.write({"seq": 1}, "20260202_10")
+
+    deadline = time.monotonic() + 2.0
+    while writer.stats["total_written"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert writer.stats["total_written"] == 1
+    writer.stop()
+
+
+def test_write_error_counts_failed_and_recovers(tmp_path):
+    base = tmp_path / "scalp"
+    base.write_text("not a directory", encoding="utf-8")  # mkdir 이 OSError
+    writer = ScalpArchiveWriter(base, ArchiveWriterConfig(fsync_interval_ms=0))
+
+    writer.write({"symbol": "005930", "seq": 1}, "20260202_10")
+    writer.write({"symbol": "005930", "seq": 2}, "20260202_10")
+    assert writer.flush() == 0
+    assert writer.stats["total_failed"] == 2
+    assert writer.stats["current_hour"] is None
+
+    base.unlink()
+    writer.write({"symbol": "005930", "seq": 3}, "20260202_10")
+    assert writer.flush() == 1
+    writer.stop()
+    assert [r["seq"] for r in _read_jsonl(base / "20260202_10.jsonl")] == [3]
+    assert writer.stats["total_written"] == 1
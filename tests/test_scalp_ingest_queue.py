@@ -0,0 +1,141 @@
+"""
+ScalpTickIngestQueue 테스트
+
+- 단일 소비자가 틱을 모아 writer.save_scalp_ticks()로 전달하는지
+- overflow 정책별 동작 (drop_oldest / spill / block)과 카운터
+- writer hand-off 실패 시 failed 로 집계 (spill 정책이면 spill 파일로)
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from db.ingest_queue import ScalpTickIngestQueue, OverflowPolicy
+
+
+class FakeBatchedWriter:
+    """BatchedRealtimeDBWriter 대역 (DB 없이 호출만 기록)"""
+
+    def __init__(self):
+        self.batches = []
+        self.flushes = 0
+
+    async def save_scalp_ticks(self, items, session_id):
+        self.batches.append((list(items), session_id))
+        return True
+
+    async def flush(self):
+        self.flushes += 1
+        return True
+
+
+def _tick(seq):
+    return {"symbol": "005930", "timestamp": "2026-02-02T10:00:00+09:00", "seq": seq}
+
+
+def test_consumer_batches_ticks_into_writer():
+    async def scenario():
+        writer = FakeBatchedWriter()
+        q = ScalpTickIngestQueue(writer, session_id="s1", maxsize=100)
+        for i in range(10):
+            assert q.offer(_tick(i)) is None
+        q.start()
+        await asyncio.sleep(0.05)
+        await q.stop()
+        return writer, q
+
+    writer, q = asyncio.run(scenario())
+    seqs = [t["seq"] for items, _ in writer.batches for t in items]
+    assert seqs == list(range(10))
+    assert all(sid == "s1" for _, sid in writer.batches)
+    assert len(writer.batches) == 1  # drained in one hand-off
+    assert q.stats["queued"] == 10
+    assert q.stats["handed_off"] == 10
+
+
+def test_drop_oldest_policy():
+    async def scenario():
+        writer = FakeBatchedWriter()
+        q = ScalpTickIngestQueue(writer, session_id="s1", maxsize=3, policy="drop_oldest")
+        for i in range(5):
+            q.offer(_tick(i))
+        await q.stop()
+        return writer, q
+
+    writer, q = asyncio.run(scenario())
+    seqs = [t["seq"] for items, _ in writer.batches for t in items]
+    assert seqs == [2, 3, 4]
+    assert q.stats["dropped"] == 2
+
+
+def test_spill_policy_writes_jsonl(tmp_path):
+    async def scenario():
+        writer = FakeBatchedWriter()
+        q = ScalpTickIngestQueue(
+            writer, session_id="s1", maxsize=2,
+            policy=OverflowPolicy.SPILL, spill_dir=tmp_path,
+        )
+        for i in range(4):
+            q.offer(_tick(i))
+        await q.stop()
+        return q
+
+    q = asyncio.run(scenario())
+    assert q.stats["spilled"] == 2
+    lines = (tmp_path / "20260202.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["seq"] for line in lines] == [2, 3]
+
+
+def test_spill_policy_requires_dir():
+    with pytest.raises(ValueError):
+        ScalpTickIngestQueue(FakeBatchedWriter(), session_id="s1", policy="spill")
+
+
+def test_block_policy_returns_awaitable_until_consumed():
+    async def scenario():
+        writer = FakeBatchedWriter()
+        q = ScalpTickIngestQueue(writer, session_id="s1", maxsize=1, policy="block")
+        assert q.offer(_tick(0)) is None
+        pending = q.offer(_tick(1))
+        assert pending is not None
+        q.start()
+        await asyncio.wait_for(pending, timeout=1.0)
+        await q.stop()
+        return writer, q
+
+    writer, q = asyncio.run(scenario())
+    seqs = [t["seq"] for items, _ in writer.batches for t in items]
+    assert seqs == [0, 1]
+    assert q.stats["blocked"] == 1
+    assert q.stats["dropped"] == 0
+
+
+class FailingWriter(FakeBatchedWriter):
+    async def save_scalp_ticks(self, items, session_id):
+        raise ConnectionError("pool closed")
+
+
+@pytest.mark.parametrize("policy", [OverflowPolicy.DROP_OLDEST, OverflowPolicy.SPILL])
+def test_failed_hand_off_is_counted_or_spilled(tmp_path, policy):
+    async def scenario():
+        q = ScalpTickIngestQueue(FailingWriter(), session_id="s1", maxsize=100,
+                                 policy=policy, spill_dir=tmp_path)
+        for i in range(5):
+            q.offer(_tick(i))
+        q.start()
+        await asyncio.sleep(0.05)
+        await q.stop()
+        return q.stats
+
+    stats = asyncio.run(scenario())
+    assert stats["handed_off"] == 0
+    if policy is OverflowPolicy.SPILL:
+        assert (stats["failed"], stats["spilled"]) == (0, 5)
+        assert len((tmp_path / "20260202.jsonl").read_text(encoding="utf-8").splitlines()) == 5
+    else:
+        assert (stats["failed"], stats["spilled"]) == (5, 0)
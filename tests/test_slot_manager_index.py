@@ -0,0 +1,136 @@
+"""
+SlotManager 인덱스 / assign_many 테스트
+
+- 무작위 할당·해제 시나리오에서 기존 선형 탐색 정책과 같은 결과
+- 교체: 가장 낮은 우선순위 + 최소 체류시간 경과 슬롯
+- assign_many: 우선순위 높은 후보부터, 결과는 입력 순서, overflow 는 한 번에 기록
+
+벤치마크: python tests/test_slot_manager_index.py
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from slot.slot_manager import SlotCandidate, SlotManager
+
+T0 = datetime(2026, 2, 2, 9, 0, tzinfo=ZoneInfo("Asia/Seoul"))
+
+
+def _cand(symbol, priority, at=T0):
+    return SlotCandidate(symbol=symbol, trigger_type="volume_surge", priority_score=priority, detected_at=at)
+
+
+class _LinearReference:
+    """기존 구현의 선형 탐색 정책 (비교용)"""
+
+    def __init__(self, max_slots, min_dwell):
+        self.slots = {i: None for i in range(max_slots)}
+        self.min_dwell = min_dwell
+
+    def assign(self, symbol, priority, now):
+        for sid, info in self.slots.items():
+            if info and info[0] == symbol:
+                if priority > info[1]:
+                    self.slots[sid] = (symbol, priority, info[2])
+                return sid, None
+        for sid, info in self.slots.items():
+            if info is None:
+                self.slots[sid] = (symbol, priority, now)
+                return sid, None
+        eligible = [
+            (info[1], sid) for sid, info in self.slots.items()
+            if info[1] < priority and (now - info[2]).total_seconds() >= self.min_dwell
+        ]
+        if not eligible:
+            return None, None
+        lowest = min(p for p, _ in eligible)
+        sid = min(s for p, s in eligible if p == lowest)
+        old = self.slots[sid][0]
+        self.slots[sid] = (symbol, priority, now)
+        return sid, old
+
+    def release(self, symbol):
+        for sid, info in self.slots.items():
+            if info and info[0] == symbol:
+                self.slots[sid] = None
+
+
+def test_matches_linear_policy_under_random_churn(tmp_path):
+    rng = random.Random(7)
+    manager = SlotManager(max_slots=8, min_dwell_seconds=60, overflow_ledger_dir=str(tmp_path))
+    ref = _LinearReference(8, 60)
+    now = T0
+    for step in range(2000):
+        now += timedelta(seconds=rng.choice([0, 5, 30]))
+        symbol = f"S{rng.randrange(30):02d}"
+        if rng.random() < 0.15:
+            manager.release_symbol(symbol)
+            ref.release(symbol)
+            continue
+        # 우선순위는 고유값 → 동점 처리 차이 없이 비교
+        priority = round(rng.random(), 6) + step * 1e-9
+        result = manager.assign_slot(_cand(symbol, priority), now=now)
+        sid, replaced = ref.assign(symbol, priority, now)
+        assert result.slot_id == sid, step
+        assert result.replaced_symbol == replaced, step
+        assert manager.allocated_symbols() == {
+            info[0]: s for s, info in ref.slots.items() if info
+        }
+
+
+def test_replacement_respects_dwell_and_picks_lowest_priority(tmp_path):
+    manager = SlotManager(max_slots=3, min_dwell_seconds=120, overflow_ledger_dir=str(tmp_path))
+    manager.assign_many([_cand("A", 0.5), _cand("B", 0.2), _cand("C", 0.3)], now=T0)
+    later = T0 + timedelta(seconds=60)
+    manager.assign_slot(_cand("D", 0.9), now=later)  # dwell 미충족 → overflow
+    assert manager.get_symbol_slot("D") is None
+
+    manager.release_symbol("C")
+    manager.assign_slot(_cand("E", 0.1), now=later)  # 빈 슬롯 재사용
+    result = manager.assign_slot(_cand("F", 0.9), now=T0 + timedelta(seconds=130))
+    assert result.replaced_symbol == "B"  # E(0.1)는 아직 체류시간 미달
+    assert manager.get_stats()["allocated_slots"] == 3
+
+
+def test_assign_many_orders_by_priority_and_logs_overflow_once(tmp_path):
+    manager = SlotManager(max_slots=41, min_dwell_seconds=120, overflow_ledger_dir=str(tmp_path))
+    candidates = [_cand(f"{n:06d}", (n % 100) / 100) for n in range(100)]
+    results = manager.assign_many(candidates, now=T0)
+
+    assert len(results) == 100
+    allocated = {c.symbol for c, r in zip(candidates, results) if r.success}
+    assert allocated == {c.symbol for c in sorted(candidates, key=lambda c: -c.priority_score)[:41]}
+    assert sum(r.overflow for r in results) == 59
+
+    ledger = tmp_path / f"overflow_{T0:%Y%m%d}.jsonl"
+    assert len(ledger.read_text(encoding="utf-8").splitlines()) == 59
+
+
+def run_benchmark(rounds: int = 200, per_round: int = 100, max_slots: int = 41) -> None:
+    import tempfile
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SlotManager(max_slots=max_slots, min_dwell_seconds=60, overflow_ledger_dir=tmp)
+        now = T0
+        rounds_data = []
+        for _ in range(rounds):
+            now += timedelta(seconds=30)
+            rounds_data.append((now, [_cand(f"{rng.randrange(2000):06d}", rng.random()) for _ in range(per_round)]))
+        started = time.perf_counter()
+        for at, candidates in rounds_data:
+            manager.assign_many(candidates, now=at)
+        elapsed = time.perf_counter() - started
+    print(f"{rounds} rounds x {per_round} candidates, {max_slots} slots: "
+          f"{elapsed / rounds * 1000:.3f} ms/round ({manager.get_stats()})")
+
+
+if __name__ == "__main__":
+    run_benchmark()
+    run_benchmark(max_slots=123)
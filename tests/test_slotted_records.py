@@ -0,0 +1,141 @@
+"""
+Slotted snapshot / record 타입 테스트 + 메모리·생성시간 벤치마크
+
+- Meta / Context / Observation / ObservationSnapshot / PatternRecord / BufferedRecord 가
+  __slots__ 기반인지 (인스턴스 __dict__ 없음)
+- 공개 계약 유지: frozen, to_dict(), dataclasses.replace, pickle
+
+벤치마크 실행 (동일 필드의 dict 기반 dataclass 와 비교):
+    python tests/test_slotted_records.py
+"""
+import dataclasses
+import gc
+import pickle
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from observer.buffer_flush import BufferedRecord
+from observer.pattern_record import PatternRecord
+from observer.snapshot import Context, Meta, Observation, ObservationSnapshot, build_snapshot
+
+HOT_PATH_TYPES = (Meta, Context, Observation, ObservationSnapshot, PatternRecord, BufferedRecord)
+
+
+def _record(seq: int) -> PatternRecord:
+    snapshot = build_snapshot(
+        session_id="test", mode="DEV", source="market", stage="raw",
+        inputs={"price": 70000 + seq}, symbol="005930",
+    )
+    return PatternRecord(snapshot=snapshot, regime_tags={}, condition_tags=[], outcome_labels={}, metadata={})
+
+
+@pytest.mark.parametrize("cls", HOT_PATH_TYPES, ids=lambda c: c.__name__)
+def test_hot_path_types_are_slotted(cls):
+    assert "__slots__" in cls.__dict__
+
+
+def test_public_contract_preserved():
+    record = _record(1)
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        record.metadata = {}
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        record.snapshot.meta.session_id = "other"
+
+    data = record.to_dict()
+    assert data["snapshot"]["observation"]["inputs"]["price"] == 70001
+    assert record.snapshot.to_dict() == data["snapshot"]
+
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert dataclasses.replace(record, metadata={"a": 1}).metadata == {"a": 1}
+
+
+# ============================================================
+# Benchmark
+# ============================================================
+
+def _dict_backed(cls, namespace):
+    """같은 필드를 가진 dict 기반(비 slotted) dataclass — 비교 기준"""
+    spec = []
+    for f in dataclasses.fields(cls):
+        if f.default is not dataclasses.MISSING:
+            spec.append((f.name, f.type, dataclasses.field(default=f.default)))
+        else:
+            spec.append((f.name, f.type))
+    params = getattr(cls, "__dataclass_params__")
+    twin = dataclasses.make_dataclass(f"Dict{cls.__name__}", spec, frozen=params.frozen)
+    namespace[cls.__name__] = twin
+    return twin
+
+
+def _builders():
+    legacy = {}
+    for cls in HOT_PATH_TYPES:
+        _dict_backed(cls, legacy)
+
+    def build(types, i):
+        meta = types["Meta"](
+            timestamp="2026-02-02T10:00:00.000+09:00", timestamp_ms=1769994000000 + i,
+            session_id="s1", run_id="r", mode="PROD", iteration_id=i,
+        )
+        snapshot = types["ObservationSnapshot"](
+            meta=meta,
+            context=types["Context"](source="market", stage="raw", symbol="005930"),
+            observation=types["Observation"](inputs={}, computed={}, state={}),
+        )
+        record = types["PatternRecord"](
+            snapshot=snapshot, regime_tags={}, condition_tags=[], outcome_labels={}, metadata={},
+        )
+        return types["BufferedRecord"](record=record, received_at_ms=i, buffer_depth_at_time=i)
+
+    slotted = {cls.__name__: cls for cls in HOT_PATH_TYPES}
+    return build, slotted, legacy
+
+
+def _measure(build, types, n):
+    # 생성 시간 (tracemalloc 오버헤드 제외)
+    gc.collect()
+    start = time.perf_counter()
+    items = [build(types, i) for i in range(n)]
+    elapsed = time.perf_counter() - start
+    del items
+
+    # 레코드당 유지 메모리
+    gc.collect()
+    tracemalloc.start()
+    items = [build(types, i) for i in range(n)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return current / n, elapsed / n * 1e6
+
+
+def run_benchmark(n: int = 10000) -> dict:
+    build, slotted, legacy = _builders()
+    dict_bytes, dict_us = _measure(build, legacy, n)
+    slot_bytes, slot_us = _measure(build, slotted, n)
+    return {
+        "records": n,
+        "dict_bytes_per_record": dict_bytes,
+        "slots_bytes_per_record": slot_bytes,
+        "bytes_saved_per_record": dict_bytes - slot_bytes,
+        "dict_construct_us": dict_us,
+        "slots_construct_us": slot_us,
+    }
+
+
+def test_benchmark_slotted_uses_less_memory():
+    results = run_benchmark(n=2000)
+    assert results["slots_bytes_per_record"] < results["dict_bytes_per_record"]
+
+
+if __name__ == "__main__":
+    for key, value in run_benchmark().items():
+        print(f"{key:>24}: {value:.2f}" if isinstance(value, float) else f"{key:>24}: {value}")
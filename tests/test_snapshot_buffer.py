@@ -0,0 +1,130 @@
+"""
+SnapshotBuffer double-buffer tests
+
+- 가득 찬 active 버퍼는 standby로 O(1) 교체되고 flush 스레드가 즉시 기록
+- standby가 아직 기록 중일 때 high-watermark 정책 (block / drop / spill)
+- producer stall 시간 통계
+"""
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from observer.buffer_flush import BufferConfig, SnapshotBuffer
+from observer.pattern_record import PatternRecord
+from observer.snapshot import build_snapshot
+
+
+def _record(seq: int) -> PatternRecord:
+    snapshot = build_snapshot(
+        session_id="test", mode="DEV", source="market", stage="raw",
+        inputs={"seq": seq}, symbol="005930",
+    )
+    return PatternRecord(
+        snapshot=snapshot, regime_tags={}, condition_tags=[], outcome_labels={}, metadata={},
+    )
+
+
+def _read(path: Path):
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line]
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_full_buffer_is_swapped_and_flushed_without_waiting_for_interval(tmp_path):
+    sink = tmp_path / "observer.jsonl"
+    buf = SnapshotBuffer(BufferConfig(flush_interval_ms=60_000, max_buffer_size=3), str(sink))
+    buf.start()
+    try:
+        for i in range(4):
+            buf.add_record(_record(i))
+        assert _wait_until(lambda: len(_read(sink)) == 3)
+    finally:
+        buf.stop()
+
+    rows = _read(sink)
+    assert [r["snapshot"]["observation"]["inputs"]["seq"] for r in rows] == [0, 1, 2, 3]
+    assert [r["metadata"]["flush_reason"] for r in rows[:3]] == ["buffer_full"] * 3
+
+
+def test_drop_policy_discards_when_standby_busy(tmp_path):
+    sink = tmp_path / "observer.jsonl"
+    cfg = BufferConfig(max_buffer_size=2, high_watermark_policy="drop")
+    buf = SnapshotBuffer(cfg, str(sink))  # flush thread not started: standby stays occupied
+
+    for i in range(5):
+        buf.add_record(_record(i))
+
+    stats = buf.get_buffer_stats()
+    assert stats["standby_size"] == 2
+    assert stats["buffer_size"] == 2
+    assert stats["dropped_records"] == 1
+    assert _read(sink) == []
+
+
+def test_spill_policy_writes_record_directly(tmp_path):
+    sink = tmp_path / "observer.jsonl"
+    cfg = BufferConfig(max_buffer_size=2, high_watermark_policy="spill")
+    buf = SnapshotBuffer(cfg, str(sink))
+
+    for i in range(5):
+        buf.add_record(_record(i))
+
+    rows = _read(sink)
+    assert len(rows) == 1
+    assert rows[0]["snapshot"]["observation"]["inputs"]["seq"] == 4
+    assert rows[0]["metadata"]["flush_reason"] == "high_watermark_spill"
+    assert buf.get_buffer_stats()["spilled_records"] == 1
+
+
+def test_block_policy_stalls_producer_until_standby_written(tmp_path):
+    sink = tmp_path / "observer.jsonl"
+    cfg = BufferConfig(flush_interval_ms=60_000, max_buffer_size=2, high_watermark_policy="block")
+    buf = SnapshotBuffer(cfg, str(sink))
+
+    release = threading.Event()
+    original = buf._write_records_to_disk
+
+    def slow_write(records, flush_reason="time_based"):
+        release.wait(2.0)
+        return original(records, flush_reason)
+
+    buf._write_records_to_disk = slow_write
+    buf.start()
+    try:
+        for i in range(4):
+            buf.add_record(_record(i))  # 3rd record swaps, standby now busy
+
+        producer = threading.Thread(target=buf.add_record, args=(_record(4),))
+        producer.start()
+        time.sleep(0.05)
+        assert producer.is_alive()  # blocked at the high watermark
+
+        release.set()
+        producer.join(timeout=2.0)
+        assert not producer.is_alive()
+    finally:
+        buf.stop()
+
+    stats = buf.get_buffer_stats()
+    assert stats["producer_stall_count"] == 1
+    assert stats["producer_stall_ms_total"] > 0
+    assert len(_read(sink)) == 5
+
+
+def test_invalid_high_watermark_policy_rejected():
+    import pytest
+
+    with pytest.raises(ValueError):
+        BufferConfig(high_watermark_policy="unbounded")
@@ -0,0 +1,126 @@
+"""
+Track A sweep scheduling 테스트
+
+- SweepScheduler: 레이트 예산 기반 capacity / 안정적인 rolling shard
+- SwingCollector.collect_once: shard 선택, 도착 즉시 JSONL 기록, 데드라인 초과 시 skip 보고
+"""
+import asyncio
+import json
+import sys
+from datetime import time
+from pathlib import Path
+
+import pytest
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from collector import swing_collector as swing_module
+from collector.sweep_scheduler import SweepScheduler
+from collector.swing_collector import SwingCollector, SwingConfig
+
+
+def test_capacity_and_shard_count():
+    sched = SweepScheduler(interval_seconds=300, budget_rps=5, utilisation=0.8, deadline_ratio=0.9)
+    assert sched.capacity == 1080  # 5 * 270 * 0.8
+    assert sched.shard_count(1000) == 1
+    assert sched.shard_count(2500) == 3
+
+
+def test_rolling_shards_cover_universe_once_per_cadence():
+    universe = [f"{n:06d}" for n in range(2500)]
+    sched = SweepScheduler(interval_seconds=300, budget_rps=5)
+    plans = [sched.plan(universe, i) for i in range(3)]
+
+    seen = [s for p in plans for s in p.symbols]
+    assert sorted(seen) == universe  # 3 sweeps → 모든 종목 정확히 1회
+    assert all(p.cadence_seconds == 900 for p in plans)
+    # 같은 슬롯은 universe 순서와 무관하게 같은 종목
+    assert sched.plan(list(reversed(universe)), 4).symbols == list(reversed(plans[1].symbols))
+
+
+def test_invalid_arguments_rejected():
+    with pytest.raises(ValueError):
+        SweepScheduler(interval_seconds=0, budget_rps=5)
+    with pytest.raises(ValueError):
+        SweepScheduler(interval_seconds=60, budget_rps=5, deadline_ratio=1.5)
+
+
+class _Engine:
+    def __init__(self, delay=0.0, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.calls = []
+
+    async def fetch_current_price(self, symbol):
+        self.calls.append(symbol)
+        await asyncio.sleep(self.delay)
+        if symbol in self.fail:
+            raise RuntimeError("boom")
+        return {"instruments": [{"symbol": symbol, "price": {"close": 10000}, "volume": 1}]}
+
+
+def _collector(tmp_path, monkeypatch, engine, universe, **cfg):
+    monkeypatch.setattr(swing_module, "observer_asset_dir", lambda: tmp_path / "assets")
+    monkeypatch.setattr(swing_module, "observer_log_dir", lambda: tmp_path / "logs")
+    config = SwingConfig(trading_end=time(23, 59, 59), **cfg)
+    collector = SwingCollector(engine, config=config, universe_dir=str(tmp_path / "universe"))
+    collector._manager.get_current_universe = lambda: list(universe)
+    return collector
+
+
+def test_collect_once_streams_shard_and_reports(tmp_path, monkeypatch):
+    universe = [f"{n:06d}" for n in range(30)]
+    engine = _Engine(fail={"000003"})
+    collector = _collector(tmp_path, monkeypatch, engine, universe, sweep_budget_rps=0.05, interval_minutes=5)
+    # capacity = 0.05 * 270 * 0.8 = 10 → 3 shards
+
+    scheduled = collector._now().replace(year=2026, month=2, day=2, hour=9, minute=10, second=0, microsecond=0)
+    result = asyncio.run(collector.collect_once(scheduled_at=scheduled))
+    sweep = result["sweep"]
+
+    assert sweep["shards"] == 3
+    assert sweep["shard"] == 2  # (09:10 - 09:00) / 5m = sweep 2
+    assert sorted(engine.calls) == collector._sweeper.plan(universe, 2).symbols
+    assert sweep["fetched"] + sweep["failed"] == sweep["planned"]
+    assert sweep["lag_seconds"] > 0
+
+    lines = Path(result["log_file"]).read_text(encoding="utf-8").splitlines()
+    assert len(lines) == result["published"] == sweep["fetched"]
+    assert json.loads(lines[0])["dataset"] == "track_a_swing"
+
+
+def test_deadline_skips_remaining_symbols(tmp_path, monkeypatch):
+    universe = [f"{n:06d}" for n in range(20)]
+    engine = _Engine(delay=0.05)
+    collector = _collector(
+        tmp_path, monkeypatch, engine, universe,
+        sweep_budget_rps=1000, semaphore_limit=2, interval_minutes=1,
+    )
+    collector._sweeper.interval_seconds = 0.1  # deadline 0.09s → 2 workers * 1 round
+
+    result = asyncio.run(collector.collect_once())
+    sweep = result["sweep"]
+    assert sweep["deadline_missed"]
+    assert sweep["skipped"] > 0
+    assert sweep["fetched"] + sweep["skipped"] == 20
+    assert collector.last_sweep.coverage < 1.0
+
+
+class _BatchEngine(_Engine):
+    quote_batch_size = 30
+
+    async def fetch_current_prices(self, symbols):
+        self.calls.append(tuple(symbols))
+        return [await _Engine.fetch_current_price(self, s) for s in symbols if s != "000005"]
+
+
+def test_batched_engine_fetches_by_chunk(tmp_path, monkeypatch):
+    universe = [f"{n:06d}" for n in range(100)]
+    engine = _BatchEngine()
+    collector = _collector(tmp_path, monkeypatch, engine, universe, sweep_budget_rps=5)
+
+    sweep = asyncio.run(collector.collect_once())["sweep"]
+    batches = [c for c in engine.calls if isinstance(c, tuple)]
+    assert len(batches) == 4
+    assert sweep["fetched"] == 99 and sweep["failed"] == 1
@@ -0,0 +1,151 @@
+"""
+Tick-level trigger detector 테스트
+
+- trade_velocity / tick_volume_burst / spread_widening 신호와 종목별 cooldown
+- bucket ring running sum 이 전체 재계산(brute force) 과 일치 (창보다 긴 공백 포함)
+- provider on_tick → ProviderEngine.on_tick → ScalpCollector → SlotManager 반영
+- tick 당 평균 처리 시간이 tick_budget_us 이내
+
+벤치마크: python tests/test_tick_trigger_detector.py
+"""
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from collector import scalp_collector as scalp_module
+from collector.scalp_collector import ScalpCollector, ScalpConfig
+from provider.kis.kis_websocket_provider import KISWebSocketProvider
+from provider.provider_engine import ProviderEngine
+from trigger.tick_trigger import TickTriggerConfig, TickTriggerDetector
+
+
+def _baseline(detector, symbol="005930", seconds=40, start=1000.0):
+    """1초에 1건, 거래량 100, 스프레드 1호가"""
+    for i in range(seconds):
+        assert detector.observe(symbol, start + i, 100, ask=70100, bid=70000) is None
+    return start + seconds
+
+
+def test_trade_velocity_and_cooldown():
+    detector = TickTriggerDetector(TickTriggerConfig(trade_velocity_threshold=10.0, cooldown_seconds=30.0))
+    at = _baseline(detector)
+    emitted = []
+    for i in range(60):  # 12 trades/sec, 거래량은 평소와 같음
+        candidate = detector.observe("005930", at + i / 12, 8, ask=70100, bid=70000)
+        if candidate:
+            emitted.append(candidate)
+    assert [c.trigger_type for c in emitted] == ["trade_velocity"]  # cooldown → 1회
+    assert 0.7 <= emitted[0].priority_score <= 0.75
+    assert detector.stats["candidates"]["trade_velocity"] == 1
+
+
+def test_tick_volume_burst_and_spread_widening():
+    detector = TickTriggerDetector()
+    at = _baseline(detector)
+    burst = detector.observe("005930", at, 5000, ask=70100, bid=70000)
+    assert burst.trigger_type == "tick_volume_burst"
+    assert burst.priority_score == pytest.approx(0.95)  # 임계값 2배 이상 → 가산점 상한
+
+    other = TickTriggerDetector()
+    at = _baseline(other, symbol="000660")
+    wide = other.observe("000660", at, 100, ask=70500, bid=70000)
+    assert wide.trigger_type == "spread_widening"
+    # baseline 이 짧으면 burst / spread 는 평가하지 않음
+    fresh = TickTriggerDetector()
+    _baseline(fresh, symbol="A", seconds=5)
+    assert fresh.observe("A", 1005.0, 5000, ask=70500, bid=70000) is None
+
+
+def test_running_sums_match_brute_force():
+    cfg = TickTriggerConfig(trade_velocity_threshold=1e9, volume_burst_ratio=1e9, spread_widen_ratio=1e9)
+    detector = TickTriggerDetector(cfg)
+    rng = random.Random(7)
+    history = []
+    at = 0.0
+    for _ in range(5000):
+        at += rng.choice([0.01, 0.2, 0.7, 1.5, 3.0, 75.0]) if rng.random() < 0.3 else 0.05
+        volume = rng.randint(1, 500)
+        detector.observe("A", at, volume)
+        history.append((int(at), volume))
+        now = int(at)
+        short = [v for b, v in history if now - 5 < b <= now]
+        long = [v for b, v in history if now - 60 < b <= now]
+        window = detector.window("A")
+        assert (window["short_volume"], window["long_volume"], window["long_count"]) == (sum(short), sum(long), len(long))
+        assert window["trades_per_second"] == len(short) / 5
+
+
+def test_ticks_from_provider_reach_scalp_slots(tmp_path, monkeypatch):
+    monkeypatch.setattr(scalp_module, "observer_asset_dir", lambda: tmp_path / "assets")
+    monkeypatch.setattr(scalp_module, "observer_log_dir", lambda: tmp_path / "logs")
+    ws = KISWebSocketProvider(MagicMock())
+    engine = ProviderEngine(MagicMock(), rest_provider=MagicMock(), ws_provider=ws)
+    collector = ScalpCollector(engine, config=ScalpConfig(max_slots=3, tick_trigger_flush_ms=10))
+    collector._debug_mode = True
+    collector._register_websocket_callback()
+    collector._log_scalp_data = lambda data: None
+    assert ws.on_tick is not None and engine.on_tick == collector.tick_detector.on_tick
+
+    def frame(symbol, volume):
+        fields = [symbol, "093001", "70000", "2", "100", "0.14", "70000", "69900", "70100", "69800",
+                  "70100", "70000", str(volume), "1000", "70000000"]
+        return "0|H0STCNT0|001|" + "^".join(fields)
+
+    async def feed():
+        for i in range(12):
+            await ws._process_message(frame("005930", 100 if i < 11 else 1))
+        await asyncio.sleep(0.1)
+
+    collector.tick_detector.config.trade_velocity_threshold = 2.0  # 같은 초에 12건
+    asyncio.run(feed())
+    slot_id = collector.slot_manager.get_symbol_slot("005930")
+    assert slot_id is not None
+    assert collector.slot_manager.get_slot_info(slot_id).trigger_type == "trade_velocity"
+    assert collector.get_stats()["tick_trigger_stats"]["ticks"] == 12
+
+
+def _stream(symbols, ticks, seed=1):
+    rng = random.Random(seed)
+    names = [f"{n:06d}" for n in range(symbols)]
+    at = 0.0
+    stream = []
+    for _ in range(ticks):
+        at += rng.expovariate(200.0)  # 전체 200 ticks/sec
+        bid = rng.choice([70000, 70000, 70000, 69900])
+        stream.append((rng.choice(names), at, rng.randint(1, 300) * rng.choice([1, 1, 1, 20]), bid + 100, bid))
+    return stream
+
+
+def _per_tick_us(detector, stream):
+    observe = detector.observe
+    started = time.perf_counter()
+    for symbol, at, volume, ask, bid in stream:
+        observe(symbol, at, volume, ask, bid)
+    return (time.perf_counter() - started) / len(stream) * 1e6
+
+
+def test_mean_tick_cost_within_budget():
+    detector = TickTriggerDetector()
+    per_tick = _per_tick_us(detector, _stream(41, 50_000))
+    assert per_tick < detector.config.tick_budget_us
+
+
+def run_benchmark(symbols: int = 123, ticks: int = 500_000) -> None:
+    stream = _stream(symbols, ticks)
+    detector = TickTriggerDetector()
+    per_tick = _per_tick_us(detector, stream)
+    stats = detector.stats
+    print(f"{symbols} symbols x {ticks} ticks: {per_tick:.2f} us/tick (budget {stats['tick_budget_us']} us), "
+          f"max {stats['max_tick_us']} us, over budget {stats['over_budget']}, candidates {stats['candidates']}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,145 @@
+"""
+TriggerEngine 컬럼형 ring buffer 테스트
+
+- 무작위 sweep 시나리오에서 기존 deque 구현(참조)과 같은 후보 (ring overflow 포함)
+- 시간 역순 입력 종목은 timestamp 필터 의미 유지
+- window_stats: 10분 평균 거래량, 1분 first/low/high/last
+
+벤치마크: python tests/test_trigger_engine_columnar.py
+"""
+import random
+import sys
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from trigger.trigger_engine import PriceSnapshot, TriggerConfig, TriggerEngine
+
+KST = ZoneInfo("Asia/Seoul")
+T0 = datetime(2026, 2, 2, 9, 0, tzinfo=KST)
+
+
+class _DequeReference:
+    """기존 구현: 종목별 deque(maxlen=100), 매 검사마다 필터링한 리스트 재생성"""
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.history = {}
+        self.recent = {}
+
+    def update(self, snapshots, now):
+        for snap in snapshots:
+            self.history.setdefault(snap.symbol, deque(maxlen=100)).append(snap)
+        result = []
+        for snap in snapshots:
+            last = self.recent.get(snap.symbol)
+            if last is not None and (now - last).total_seconds() < self.cfg.dedup_window_seconds:
+                continue
+            hist10 = [h for h in self.history[snap.symbol] if h.timestamp >= now - timedelta(minutes=10)]
+            if len(hist10) >= 2:
+                avg = sum(h.volume for h in hist10) / len(hist10)
+                if avg and snap.volume / avg >= self.cfg.volume_surge_ratio:
+                    result.append((snap.symbol, "volume_surge"))
+                    self.recent[snap.symbol] = now
+                    continue
+            hist1 = [h for h in self.history[snap.symbol] if h.timestamp >= now - timedelta(minutes=1)]
+            if len(hist1) >= 2 and hist1[0].price:
+                if abs(snap.price - hist1[0].price) / hist1[0].price >= self.cfg.volatility_spike_threshold:
+                    result.append((snap.symbol, "volatility_spike"))
+                    self.recent[snap.symbol] = now
+        return result
+
+
+def _sweep(rng, symbols, at, state):
+    snapshots = []
+    for symbol in symbols:
+        price, volume = state.get(symbol, (10000.0, 1000))
+        price = max(price * (1 + rng.gauss(0, 0.006)), 100.0)
+        volume = int(volume * rng.choice([0.5, 0.8, 1.0, 1.2, 3.0]) + 1)
+        state[symbol] = (price, min(volume, 10**7))
+        snapshots.append(PriceSnapshot(symbol=symbol, timestamp=at, price=round(price), volume=volume))
+    return snapshots
+
+
+def test_matches_deque_reference_over_random_sweeps():
+    rng = random.Random(3)
+    cfg = TriggerConfig(dedup_window_seconds=60)
+    engine = TriggerEngine(cfg, initial_capacity=4)  # 행 확장 경로 포함
+    ref = _DequeReference(cfg)
+    symbols = [f"{n:06d}" for n in range(60)]
+    state = {}
+    at = T0
+    for step in range(260):  # 종목당 100개 초과 → ring 덮어쓰기
+        at += timedelta(seconds=rng.choice([5, 10, 20]))
+        batch = _sweep(rng, rng.sample(symbols, 40), at, state)
+        got = [(c.symbol, c.trigger_type) for c in engine.update(batch, now=at)]
+        expected = ref.update(batch, at)
+        # 우선순위 정렬은 stable → 기대값도 같은 기준으로 정렬
+        expected.sort(key=lambda c: cfg.volatility_spike_priority if c[1] == "volatility_spike" else cfg.volume_surge_priority,
+                      reverse=True)
+        assert got == expected, step
+
+
+def test_out_of_order_history_uses_timestamp_windows():
+    engine = TriggerEngine()
+    now = T0 + timedelta(minutes=30)
+    # 최신 → 과거 순서로 입력 (역순)
+    baseline = [PriceSnapshot("005930", now - timedelta(minutes=i), 70000, 100000) for i in range(12)]
+    assert engine.update(baseline, now=now - timedelta(seconds=1)) == []
+    [candidate] = engine.update([PriceSnapshot("005930", now, 70000, 1000000)], now=now)
+    assert candidate.trigger_type == "volume_surge"
+    # 10분 창 (경계 포함): baseline now-0..now-10 11개 + 새 snapshot → (11 x 100000 + 1000000) / 12
+    assert candidate.details["avg_volume_10m"] == 175000
+
+
+def test_window_stats_and_history():
+    engine = TriggerEngine()
+    now = datetime.now(KST)
+    prices = [100, 103, 98, 101]
+    engine.update(
+        [PriceSnapshot("A", now - timedelta(seconds=50 - 10 * i), p, 10 * (i + 1)) for i, p in enumerate(prices)],
+        now=now,
+    )
+    stats = engine.window_stats(["A", "unknown"], now=now)["A"]
+    assert stats["samples_1m"] == 4
+    assert (stats["first_price_1m"], stats["low_1m"], stats["high_1m"], stats["last_price_1m"]) == (100, 98, 103, 101)
+    assert stats["avg_volume_10m"] == pytest.approx(25.0)
+
+    history = engine.get_history("A", minutes=10)
+    assert [h.price for h in history] == prices
+    assert history[0].timestamp == pytest.approx(now - timedelta(seconds=50), abs=timedelta(milliseconds=1))
+
+
+def run_benchmark(symbols: int = 2000, sweeps: int = 60) -> None:
+    rng = random.Random(1)
+    names = [f"{n:06d}" for n in range(symbols)]
+    state = {}
+    batches = []
+    at = T0
+    for _ in range(sweeps):
+        at += timedelta(seconds=10)
+        batches.append((at, _sweep(rng, names, at, state)))
+
+    engine = TriggerEngine()
+    ref = _DequeReference(TriggerConfig())
+    started = time.perf_counter()
+    for now, batch in batches:
+        engine.update(batch, now=now)
+    columnar = (time.perf_counter() - started) / sweeps * 1000
+    started = time.perf_counter()
+    for now, batch in batches:
+        ref.update(batch, now)
+    legacy = (time.perf_counter() - started) / sweeps * 1000
+    print(f"{symbols} symbols x {sweeps} sweeps: columnar {columnar:.2f} ms/sweep, "
+          f"deque reference (no logging) {legacy:.2f} ms/sweep")
+
+
+if __name__ == "__main__":
+    run_benchmark()
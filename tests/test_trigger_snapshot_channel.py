@@ -0,0 +1,147 @@
+"""
+Track A → Track B SnapshotChannel 테스트
+
+- 다른 스레드(별도 event loop)의 publish 가 소비자 loop 를 깨우고, max_latency 창 안의 shard 를 한 batch 로 전달
+- maxsize 초과 시 가장 오래된 snapshot 폐기
+- SwingCollector.collect_once (스레드 A) → ScalpCollector 트리거 소비 (스레드 B) → SlotManager / 구독 reconcile
+"""
+import asyncio
+import sys
+import threading
+import time
+from datetime import datetime, time as dtime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from collector import scalp_collector as scalp_module
+from collector import swing_collector as swing_module
+from collector.scalp_collector import ScalpCollector, ScalpConfig
+from collector.swing_collector import SwingCollector, SwingConfig
+from trigger.snapshot_channel import SnapshotChannel
+from trigger.trigger_engine import PriceSnapshot
+
+KST = ZoneInfo("Asia/Seoul")
+
+
+def _snaps(symbols, volume=100):
+    now = datetime.now(KST)
+    return [PriceSnapshot(symbol=s, timestamp=now, price=1000, volume=volume) for s in symbols]
+
+
+def test_cross_thread_publish_wakes_consumer_within_latency():
+    channel = SnapshotChannel(max_latency_seconds=0.1)
+
+    def producer():
+        time.sleep(0.05)
+        channel.publish(_snaps(["A", "B"]))
+        time.sleep(0.02)
+        channel.publish(_snaps(["C"]))  # 같은 창 → 같은 batch
+
+    async def consume():
+        thread = threading.Thread(target=producer)
+        thread.start()
+        started = time.monotonic()
+        batch = await channel.next_batch(timeout=5.0)
+        elapsed = time.monotonic() - started
+        thread.join()
+        return batch, elapsed, await channel.next_batch(timeout=0.05)
+
+    batch, elapsed, empty = asyncio.run(consume())
+    assert [s.symbol for s in batch] == ["A", "B", "C"]
+    assert 0.14 <= elapsed < 1.0  # 첫 publish(0.05s) + 병합 창(0.1s), timeout(5s) 까지 기다리지 않음
+    assert empty == []
+    assert channel.stats["batches"] == 1 and channel.stats["pending"] == 0
+    assert channel.stats["max_latency_seconds"] >= 0.1
+
+
+def test_overflow_drops_oldest():
+    channel = SnapshotChannel(maxsize=3)
+    channel.publish(_snaps(["A", "B"]))
+    channel.publish(_snaps(["C", "D"]))
+    assert [s.symbol for s in channel.drain()] == ["B", "C", "D"]
+    assert channel.stats["dropped"] == 1 and channel.stats["published"] == 4
+    assert channel.drain() == []
+
+
+class _SwingEngine:
+    """세 번째 스윕에서 000007 거래량 급증"""
+
+    def __init__(self):
+        self.sweeps = 0
+
+    async def fetch_current_price(self, symbol):
+        volume = 100000 if self.sweeps >= 2 and symbol == "000007" else 1000
+        return {"instruments": [{"symbol": symbol, "price": {"close": 10000}, "volume": volume}]}
+
+
+class _Ws:
+    def __init__(self):
+        self.subscribed_symbols = set()
+
+
+class _ScalpEngine:
+    def __init__(self):
+        self.ws = _Ws()
+        self.desired = []
+
+    async def reconcile_subscriptions(self, desired):
+        self.desired = list(desired)
+        self.ws.subscribed_symbols = set(desired)
+        return {"subscribed": list(desired), "unsubscribed": []}
+
+
+def test_swing_sweeps_feed_scalp_slots_across_threads(tmp_path, monkeypatch):
+    for module in (swing_module, scalp_module):
+        monkeypatch.setattr(module, "observer_asset_dir", lambda: tmp_path / "assets")
+        monkeypatch.setattr(module, "observer_log_dir", lambda: tmp_path / "logs")
+    channel = SnapshotChannel(max_latency_seconds=0.05)
+
+    swing_engine = _SwingEngine()
+    swing = SwingCollector(
+        swing_engine,
+        config=SwingConfig(trading_end=dtime(23, 59, 59), semaphore_limit=4),
+        universe_dir=str(tmp_path / "universe"),
+        snapshot_channel=channel,
+    )
+    swing._manager.get_current_universe = lambda: [f"{n:06d}" for n in range(10)]
+
+    scalp_engine = _ScalpEngine()
+    scalp = ScalpCollector(scalp_engine, config=ScalpConfig(max_slots=5), snapshot_channel=channel)
+    scalp._debug_mode = True  # 장중 시간 체크 우회
+
+    def run_swing():
+        # Track A 스레드: 자체 event loop 에서 스윕 3회
+        loop = asyncio.new_event_loop()
+        try:
+            for sweep in range(3):
+                swing_engine.sweeps = sweep
+                loop.run_until_complete(swing.collect_once(full=True))
+                time.sleep(0.1)
+        finally:
+            loop.close()
+
+    async def run_scalp():
+        scalp._running = True
+        consumer = asyncio.create_task(scalp._consume_snapshots())
+        thread = threading.Thread(target=run_swing)
+        thread.start()
+        for _ in range(100):
+            if scalp.slot_manager.get_symbol_slot("000007") is not None:
+                break
+            await asyncio.sleep(0.05)
+        scalp._running = False
+        consumer.cancel()
+        thread.join()
+
+    asyncio.run(run_scalp())
+
+    slot_id = scalp.slot_manager.get_symbol_slot("000007")
+    assert slot_id is not None
+    assert scalp.slot_manager.get_slot_info(slot_id).trigger_type == "volume_surge"
+    assert scalp_engine.desired == ["000007"]
+    assert scalp.get_stats()["subscribed_symbols"] == 1
+    assert channel.stats["published"] == 30
+    assert scalp.trigger_engine.symbol_count == 10
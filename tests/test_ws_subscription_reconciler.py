@@ -0,0 +1,147 @@
+"""
+KIS WebSocket 구독 reconcile 테스트
+
+- 목표 집합과의 diff: 해지 먼저, 그 다음 구독 (41 제한 유지)
+- 프레임은 ack 를 기다리지 않고 frames_per_second 간격으로 연속 전송
+- 구독 응답(ack) / 거부 / 첫 체결(time-to-first-tick) 추적
+- 재연결 시 _resubscribe 가 종목당 0.1s sleep 없이 일괄 반영
+"""
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_root / "src"))
+
+from provider.kis.kis_websocket_provider import KISWebSocketProvider
+from provider.kis.subscription_reconciler import SubscriptionReconciler
+
+
+class _Socket:
+    def __init__(self):
+        self.frames = []
+
+    async def send(self, message):
+        frame = json.loads(message)
+        self.frames.append((frame["header"]["tr_type"], frame["body"]["input"]["tr_key"]))
+
+
+def _provider(fps=1000.0):
+    auth = MagicMock()
+
+    async def approval_key():
+        return "approval"
+
+    auth.get_approval_key = approval_key
+    provider = KISWebSocketProvider(auth)
+    provider.reconciler = SubscriptionReconciler(provider, frames_per_second=fps)
+    provider.websocket = _Socket()
+    provider.is_connected = True
+    return provider
+
+
+def _tick(symbol, seq, price):
+    fields = [symbol, "093001", str(price), "2", "100", "0.14", str(price), "70900", "71500",
+              "70800", str(price + 100), str(price), "10", "12345", "876543210"]
+    return f"0|H0STCNT0|{seq:03d}|" + "^".join(fields)
+
+
+def _ack(symbol, rt_cd="0", msg="SUBSCRIBE SUCCESS"):
+    return json.dumps({
+        "header": {"tr_id": "H0STCNT0", "tr_key": symbol, "encrypt": "N"},
+        "body": {"rt_cd": rt_cd, "msg_cd": "OPSP0000", "msg1": msg},
+    })
+
+
+def test_reconcile_unsubscribes_first_and_respects_capacity():
+    provider = _provider()
+    provider.subscribed_symbols = {"OLD001", "KEEP01"}
+    desired = ["KEEP01"] + [f"{n:06d}" for n in range(45)]
+
+    result = asyncio.run(provider.reconcile_subscriptions(desired))
+
+    frames = provider.websocket.frames
+    assert frames[0] == ("0", "OLD001")
+    assert all(tr_type == "1" for tr_type, _ in frames[1:])
+    assert len(provider.subscribed_symbols) == KISWebSocketProvider.MAX_SUBSCRIPTIONS
+    assert "KEEP01" in provider.subscribed_symbols and "OLD001" not in provider.subscribed_symbols
+    assert result.unsubscribed == ["OLD001"]
+    assert len(result.subscribed) == 40 and len(result.skipped) == 5
+    assert provider.pending_symbols == set(result.skipped)
+
+    # 이미 목표 상태 → 프레임 없음
+    asyncio.run(provider.reconcile_subscriptions(provider.subscribed_symbols))
+    assert len(provider.websocket.frames) == len(frames)
+
+
+def test_frames_are_paced_without_waiting_for_acks():
+    provider = _provider(fps=200.0)
+    symbols = [f"{n:06d}" for n in range(21)]
+
+    started = time.perf_counter()
+    result = asyncio.run(provider.reconcile_subscriptions(symbols))
+    elapsed = time.perf_counter() - started
+
+    assert len(result.subscribed) == 21
+    assert 0.09 <= elapsed < 0.5  # 20 intervals x 5ms (기존: 21 x 0.1s sleep)
+
+
+def test_acks_rejects_and_first_tick_are_tracked():
+    provider = _provider()
+    asyncio.run(provider.reconcile_subscriptions(["005930", "000660", "035720"]))
+    received = []
+    provider.on_price_update = received.append
+
+    async def feed():
+        await provider._process_message(_ack("005930"))
+        await provider._process_message(_ack("000660", rt_cd="1", msg="ALREADY IN SUBSCRIBE"))
+        await provider._process_message(_ack("035720", rt_cd="1", msg="MAX SUBSCRIBE OVER"))
+        await provider._process_message(_tick("005930", 1, 71000))
+        await provider._process_message(_tick("005930", 2, 71100))
+
+    asyncio.run(feed())
+
+    stats = provider.reconciler.stats
+    assert stats["acks"] == 2 and stats["rejects"] == 1
+    assert stats["pending_acks"] == 0
+    assert stats["first_ticks"] == 1
+    assert provider.subscribed_symbols == {"005930", "000660"}
+    assert set(provider.reconciler.awaiting_first_tick) == {"000660"}
+    assert [r["symbol"] for r in received] == ["005930", "005930"]  # 제어 응답은 가격으로 전달되지 않음
+
+
+def test_resubscribe_and_disconnected_reconcile():
+    provider = _provider()
+    provider.is_connected = False
+    result = asyncio.run(provider.reconcile_subscriptions(["AAA001", "BBB002"]))
+    assert result.skipped == ["AAA001", "BBB002"]
+    assert provider.pending_symbols == {"AAA001", "BBB002"}
+    assert provider.websocket.frames == []
+
+    provider.is_connected = True
+    asyncio.run(provider._resubscribe())
+    assert provider.subscribed_symbols == {"AAA001", "BBB002"}
+    assert provider.pending_symbols == set()
+    assert sorted(key for _, key in provider.websocket.frames) == ["AAA001", "BBB002"]
+
+
+def test_symbols_changed_during_disconnect_are_not_resurrected():
+    provider = _provider()
+    old = [f"{n:06d}" for n in range(41)]
+    asyncio.run(provider.reconcile_subscriptions(old))
+    assert len(provider.subscribed_symbols) == 41
+
+    # 수신 오류로 끊김 → subscribed_symbols 는 그대로 남은 상태에서 목표가 바뀜
+    provider.is_connected = False
+    desired = old[:20] + [f"{n:06d}" for n in range(100, 121)]
+    asyncio.run(provider.reconcile_subscriptions(desired))
+    assert provider.subscribed_symbols == set(old[:20])
+
+    provider.is_connected = True
+    provider.websocket.frames.clear()
+    asyncio.run(provider._resubscribe())
+    assert provider.subscribed_symbols == set(desired)
+    assert [tr_type for tr_type, _ in provider.websocket.frames] == ["1"] * 41